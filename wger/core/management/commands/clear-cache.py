@@ -21,13 +21,11 @@ from django.core.management.base import (
 )
 
 # wger
-from wger.manager.models import (
-    Workout,
-    WorkoutLog,
-)
+from wger.manager.models import Workout
 from wger.utils.cache import (
     reset_workout_canonical_form,
     reset_workout_log,
+    tagged_cache,
 )
 
 
@@ -57,6 +55,16 @@ class Command(BaseCommand):
             help='Clear only the workout canonical view'
         )
 
+        parser.add_argument(
+            '--tag',
+            action='append',
+            dest='tags',
+            default=[],
+            metavar='TAG',
+            help='Invalidate all entries with the given tag, e.g. "exercise-base:42" '
+            'or "plan:3". Can be used more than once.'
+        )
+
         parser.add_argument(
             '--clear-all',
             action='store_true',
@@ -71,7 +79,7 @@ class Command(BaseCommand):
         """
 
         if (
-            not options['clear_template'] and not options['clear_workout']
+            not options['clear_template'] and not options['clear_workout'] and not options['tags']
             and not options['clear_all']
         ):
             raise CommandError('Please select what cache you need to delete, see help')
@@ -84,30 +92,19 @@ class Command(BaseCommand):
             for user in User.objects.all():
                 if int(options['verbosity']) >= 2:
                     self.stdout.write(f"* Processing user {user.username}")
-
-                for entry in WorkoutLog.objects.filter(user=user).dates('date', 'year'):
-
-                    if int(options['verbosity']) >= 3:
-                        self.stdout.write(f"  Year {entry.year}")
-                    for month in WorkoutLog.objects.filter(user=user, date__year=entry.year
-                                                           ).dates('date', 'month'):
-                        if int(options['verbosity']) >= 3:
-                            self.stdout.write(f"    Month {entry.month}")
-                        reset_workout_log(user.id, entry.year, entry.month)
-                        for day in WorkoutLog.objects.filter(
-                            user=user,
-                            date__year=entry.year,
-                            date__month=month.month,
-                        ).dates('date', 'day'):
-                            if int(options['verbosity']) >= 3:
-                                self.stdout.write(f"      Day {day.day}")
-                            reset_workout_log(user.id, entry.year, entry.month, day)
+                reset_workout_log(user.id)
 
         # Workout canonical form
         if options['clear_workout']:
             for w in Workout.objects.all():
                 reset_workout_canonical_form(w.pk)
 
+        # Everything depending on the given objects
+        if options['tags']:
+            if int(options['verbosity']) >= 2:
+                self.stdout.write(f"*** Invalidating tags {', '.join(options['tags'])}")
+            tagged_cache.invalidate(*options['tags'])
+
         # Nuclear option, clear all
         if options['clear_all']:
             cache.clear()
@@ -0,0 +1,34 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.core.management.base import BaseCommand
+
+# wger
+from wger.utils.pdf_render import delete_expired_pdfs
+
+
+class Command(BaseCommand):
+    """
+    Deletes the stored PDFs that are not used anymore, to be called e.g. by
+    cron if celery beat is not running
+    """
+
+    help = 'Deletes the stored PDFs that are not used anymore'
+
+    def handle(self, **options):
+        counter = delete_expired_pdfs()
+        self.stdout.write(f'Deleted {counter} expired PDFs')
@@ -0,0 +1,73 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+
+# Django
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+# wger
+from wger.core.models import MediaBlob
+
+
+class Command(BaseCommand):
+    """
+    Deletes the files of the media store that no image uses anymore, to be
+    called e.g. by cron
+    """
+
+    help = 'Deletes the downloaded files (and their thumbnails) that are not ' \
+           'used by any exercise, ingredient or gallery image'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            action='store',
+            dest='min_age',
+            type=int,
+            default=1,
+            help='Only delete files stored at least this many days ago, so that '
+            'files of a running sync are kept. Default: 1'
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Only list the files that would be deleted'
+        )
+
+    def handle(self, **options):
+        blobs = MediaBlob.unreferenced().filter(
+            created__lte=now() - datetime.timedelta(days=options['min_age'])
+        )
+
+        counter = 0
+        size = 0
+        for blob in blobs.iterator():
+            # The list is read lazily, check again that the file is still unused
+            if not options['dry_run'] and not blob.delete_if_unreferenced():
+                continue
+            if int(options['verbosity']) >= 2 or options['dry_run']:
+                self.stdout.write(f'* {blob.name}')
+            counter += 1
+            size += blob.size
+
+        action = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f'{action} {counter} unused files ({size / 1024 / 1024:.1f} MB)')
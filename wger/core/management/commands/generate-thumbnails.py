@@ -0,0 +1,91 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# wger
+from wger.utils.models import generate_thumbnails
+
+
+THUMBNAIL_MODELS = ('exercises.exerciseimage', 'nutrition.image', 'gallery.image')
+
+
+def generate(model: str, pk: int) -> bool:
+    """
+    Generates the thumbnails of one image, also used in the worker processes
+    """
+    instance = apps.get_model(model).objects.filter(pk=pk).first()
+    return instance is not None and generate_thumbnails(instance)
+
+
+class Command(BaseCommand):
+    """
+    Generates the missing thumbnails of the exercise, ingredient and gallery images
+    """
+
+    help = 'Generates the thumbnails (and their manifest) of all images that ' \
+           'have none or whose image changed since they were generated.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            action='store',
+            dest='processes',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of worker processes. Use 1 to generate the thumbnails '
+            'in this process. Default: number of CPUs'
+        )
+
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            dest='force',
+            default=False,
+            help='Rebuild the manifests of all images, not only missing or stale ones'
+        )
+
+    def handle(self, **options):
+        pending = []
+        for model in THUMBNAIL_MODELS:
+            images = apps.get_model(model).objects.exclude(image='').only('image', 'thumbnails')
+            pending += [
+                (model, image.pk) for image in images.iterator()
+                if options['force'] or not image.has_current_thumbnails
+            ]
+
+        if int(options['verbosity']) >= 2:
+            self.stdout.write(f'*** Generating the thumbnails of {len(pending)} images')
+
+        if options['processes'] > 1 and len(pending) > 1:
+            # The connections can't be shared with the forked workers
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['processes']) as executor:
+                results = list(executor.map(generate, *zip(*pending), chunksize=16))
+        else:
+            results = [generate(model, pk) for model, pk in pending]
+
+        failed = results.count(False)
+        self.stdout.write(f'Generated the thumbnails of {len(results) - failed} images')
+        if failed:
+            self.stdout.write(f'{failed} images could not be read, see the log')
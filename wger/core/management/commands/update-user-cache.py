@@ -13,11 +13,10 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
 
 # wger
-from wger.gym.helpers import get_user_last_activity
+from wger.gym.helpers import update_user_last_activity
 
 
 class Command(BaseCommand):
@@ -35,6 +34,4 @@ class Command(BaseCommand):
         """
 
         print('** Updating last activity')
-        for user in User.objects.all():
-            user.usercache.last_activity = get_user_last_activity(user)
-            user.usercache.save()
+        update_user_last_activity()
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-17 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_alter_language_short_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCheckpoint',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('remote_url', models.CharField(max_length=200)),
+                ('endpoint', models.CharField(max_length=50)),
+                ('last_update', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='synccheckpoint',
+            constraint=models.UniqueConstraint(
+                fields=('remote_url', 'endpoint'), name='unique_sync_checkpoint'
+            ),
+        ),
+    ]
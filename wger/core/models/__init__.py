@@ -19,6 +19,8 @@ from .cache import UserCache
 from .days_of_week import DaysOfWeek
 from .language import Language
 from .license import License
+from .media import MediaBlob
 from .profile import UserProfile
 from .rep_unit import RepetitionUnit
+from .sync import SyncCheckpoint
 from .weight_unit import WeightUnit
@@ -33,8 +33,8 @@ class UserCache(models.Model):
     """
     The user's last activity.
 
-    Values for this entry are saved by signals as calculated by the
-    get_user_last_activity helper function.
+    Values for this entry are saved by signals, see register_user_activity
+    and update_user_last_activity in wger.gym.helpers.
     """
 
     def __str__(self):
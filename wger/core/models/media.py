@@ -0,0 +1,248 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import hashlib
+import os
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Django
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import (
+    IntegrityError,
+    models,
+    transaction,
+)
+
+# Third Party
+from easy_thumbnails.models import Source
+
+# wger
+from wger.utils.requests import (
+    DOWNLOAD_WORKERS,
+    fetch_etag,
+    fetch_many,
+)
+
+
+class MediaBlob(models.Model):
+    """
+    A file in the content-addressed media store
+
+    Downloaded images are stored only once, under the SHA-256 of their content,
+    and all images with the same content point to the same file. A file is
+    referenced by the images in IMAGE_MODELS whose image has its name, files
+    that are not referenced anymore are removed by the delete-unused-blobs
+    command.
+    """
+
+    BLOB_DIR = 'blobs'
+    IMAGE_MODELS = ('exercises.exerciseimage', 'nutrition.image', 'gallery.image')
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    """SHA-256 of the content"""
+
+    name = models.CharField(max_length=255)
+    """Name of the file in the storage"""
+
+    size = models.IntegerField()
+    """Size of the file in bytes"""
+
+    source_url = models.CharField(max_length=1000, blank=True, db_index=True)
+    """URL the file was last downloaded from"""
+
+    etag = models.CharField(max_length=255, blank=True)
+    """ETag sent by the server when the file was last downloaded"""
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return self.name
+
+    @staticmethod
+    def get_name(sha256: str, extension: str) -> str:
+        return f'{MediaBlob.BLOB_DIR}/{sha256[:2]}/{sha256}{extension.lower()}'
+
+    @staticmethod
+    def is_blob(name: str) -> bool:
+        """
+        Whether a file name belongs to the media store
+        """
+        return bool(name) and name.startswith(f'{MediaBlob.BLOB_DIR}/')
+
+    @staticmethod
+    def get_sha256(name: str) -> Optional[str]:
+        """
+        Returns the SHA-256 of a file in the media store from its name
+        """
+        if not MediaBlob.is_blob(name):
+            return None
+        return os.path.splitext(os.path.basename(name))[0]
+
+    @classmethod
+    def store(cls, content: bytes, extension: str, source_url='', etag='') -> 'MediaBlob':
+        """
+        Stores a file, unless a file with the same content is already there
+
+        :param content: The content of the file
+        :param extension: Extension of the file name, e.g. '.jpg'
+        :param source_url: The URL the file was downloaded from
+        :param etag: The ETag of the download
+        """
+        sha256 = hashlib.sha256(content).hexdigest()
+        etag = etag or ''
+        blob = cls.objects.filter(sha256=sha256).first()
+        if blob is None:
+            name = cls.get_name(sha256, extension)
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(content))
+            blob = cls(sha256=sha256, name=name, size=len(content))
+        elif not source_url or (blob.source_url, blob.etag) == (source_url, etag):
+            return blob
+
+        if source_url:
+            blob.source_url = source_url
+            blob.etag = etag
+
+        try:
+            with transaction.atomic():
+                blob.save()
+        # Another process stored the same content in the meantime
+        except IntegrityError:
+            blob = cls.objects.get(sha256=sha256)
+        return blob
+
+    @classmethod
+    def from_response(cls, response, url: str) -> 'MediaBlob':
+        """
+        Stores the content of a download
+        """
+        return cls.store(
+            response.content,
+            os.path.splitext(url)[1],
+            source_url=url,
+            etag=response.headers.get('ETag', ''),
+        )
+
+    @classmethod
+    def find(cls, url: str, sha256: Optional[str] = None, headers=None) -> Optional['MediaBlob']:
+        """
+        Returns the stored file for a URL, if it is known without downloading it
+
+        The file is known if the server sent its SHA-256, or if it was already
+        downloaded from the same URL and its ETag didn't change.
+        """
+        if sha256:
+            blob = cls.objects.filter(sha256=sha256).first()
+            if blob:
+                return blob
+
+        blob = cls.objects.filter(source_url=url).exclude(etag='').first()
+        if blob and fetch_etag(url, headers=headers) == blob.etag:
+            return blob
+        return None
+
+    @classmethod
+    def fetch_many(
+        cls,
+        files: List[Tuple[str, Optional[str]]],
+        headers=None,
+        max_workers=DOWNLOAD_WORKERS,
+    ) -> Iterator['MediaBlob']:
+        """
+        Returns the stored files for several URLs, only downloading unknown ones
+
+        :param files: The URLs with their SHA-256 if the server sent one
+        :param headers: Optional headers to send with the requests.
+        :param max_workers: Number of parallel downloads.
+        :return: Generator with the files, in the same order as the URLs.
+        """
+        known = [cls.find(url, sha256, headers=headers) for url, sha256 in files]
+        downloads = fetch_many(
+            [url for (url, _), blob in zip(files, known) if blob is None],
+            headers=headers,
+            max_workers=max_workers,
+        )
+        for (url, _), blob in zip(files, known):
+            yield blob if blob is not None else cls.from_response(next(downloads), url)
+
+    @classmethod
+    def get_image_models(cls) -> Iterable:
+        return [apps.get_model(model) for model in cls.IMAGE_MODELS]
+
+    @property
+    def reference_count(self) -> int:
+        """
+        Number of images using the file
+        """
+        return sum(
+            model.objects.filter(image=self.name).count() for model in self.get_image_models()
+        )
+
+    @classmethod
+    def unreferenced(cls) -> models.QuerySet:
+        """
+        Returns the files that no image uses
+        """
+        blobs = cls.objects.all()
+        for model in cls.get_image_models():
+            blobs = blobs.exclude(name__in=model.objects.values('image'))
+        return blobs
+
+    def delete_if_unreferenced(self) -> bool:
+        """
+        Deletes the file, unless an image started using it in the meantime,
+        e.g. because a sync found it by its SHA-256 or ETag
+
+        The row is locked while checking and deleting, so that the file is only
+        deleted once.
+        """
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(pk=self.pk).first()
+            if blob is None or blob.reference_count:
+                return False
+            blob.delete()
+        return True
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the file and its thumbnails (in all formats) as well
+        """
+        directory, filename = os.path.split(self.name)
+        try:
+            files = default_storage.listdir(directory)[1]
+        except FileNotFoundError:
+            files = []
+
+        # The file and its thumbnails, e.g. <sha256>.jpg.200x200_q85.jpg.webp
+        for name in files:
+            if name.startswith(filename):
+                default_storage.delete(f'{directory}/{name}')
+
+        # The thumbnails easy-thumbnails knows about
+        Source.objects.filter(name=self.name).delete()
+        return super().delete(*args, **kwargs)
@@ -402,8 +402,10 @@ by the US Department of Agriculture. It is extremely complete, with around
             'street': '',
             'phone': '',
         }
-        if self.user.contract_member.exists():
-            last_contract = self.user.contract_member.last()
+        # Use all() so that prefetched contracts are used, e.g. in the exports
+        contracts = self.user.contract_member.all()
+        if contracts:
+            last_contract = contracts[len(contracts) - 1]
             out['zip_code'] = last_contract.zip_code
             out['city'] = last_contract.city
             out['street'] = last_contract.street
@@ -0,0 +1,82 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from typing import Optional
+
+# Django
+from django.db import models
+
+
+class SyncCheckpoint(models.Model):
+    """
+    High-water mark of the data already synchronized from a remote wger instance
+
+    This is used by the incremental synchronization so that only entries that
+    were modified on the server after the last run are requested.
+    """
+
+    remote_url = models.CharField(max_length=200)
+    """The remote wger instance"""
+
+    endpoint = models.CharField(max_length=50)
+    """The API endpoint the checkpoint applies to"""
+
+    last_update = models.DateTimeField()
+    """Newest modification timestamp (as reported by the server) seen so far"""
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['remote_url', 'endpoint'],
+                name='unique_sync_checkpoint',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f"Sync checkpoint for {self.remote_url} - {self.endpoint}: {self.last_update}"
+
+    @classmethod
+    def get_mark(cls, remote_url: str, endpoint: str) -> Optional[datetime.datetime]:
+        """
+        Returns the stored high-water mark or None if nothing was synchronized yet
+        """
+        return cls.objects.filter(
+            remote_url=remote_url,
+            endpoint=endpoint,
+        ).values_list('last_update', flat=True).first()
+
+    @classmethod
+    def set_mark(cls, remote_url: str, endpoint: str, last_update: Optional[datetime.datetime]):
+        """
+        Stores the high-water mark, it is never moved backwards
+        """
+        if last_update is None:
+            return
+
+        current = cls.get_mark(remote_url, endpoint)
+        if current and current >= last_update:
+            return
+
+        cls.objects.update_or_create(
+            remote_url=remote_url,
+            endpoint=endpoint,
+            defaults={'last_update': last_update},
+        )
@@ -152,6 +152,15 @@ def get_item(dictionary, key):
     return dictionary.get(key)
 
 
+@register.filter
+def image_thumbnail(image, alias):
+    """
+    Returns the URL of a pregenerated thumbnail, or the original image if it
+    is not available yet
+    """
+    return image.get_thumbnail_url(alias) or image.image.url
+
+
 @register.filter
 def minus(a, b):
     """
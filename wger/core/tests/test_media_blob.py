@@ -0,0 +1,213 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+import hashlib
+import io
+import os
+import tempfile
+from unittest import mock
+from uuid import uuid4
+
+# Django
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+
+# wger
+from wger.core.models import MediaBlob
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    ExerciseBase,
+    ExerciseImage,
+)
+
+
+class MockResponse:
+
+    def __init__(self, content, etag=None):
+        self.status_code = 200
+        self.content = content
+        self.headers = {'ETag': etag} if etag else {}
+
+
+class MediaBlobTestCase(WgerTestCase):
+    """
+    Test the content-addressed media store
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+
+        with open('wger/exercises/tests/protestschwein.jpg', 'rb') as image_file:
+            self.content = image_file.read()
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self):
+        self.settings.disable()
+        super().tearDown()
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def create_image(self, blob):
+        json_data = {
+            'uuid': str(uuid4()),
+            'is_main': False,
+            'license': 1,
+            'license_title': '',
+            'license_object_url': '',
+            'license_author': 'Tester',
+            'license_author_url': '',
+            'license_derivative_source_url': '',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return ExerciseImage.from_json(ExerciseBase.objects.get(pk=1), blob, json_data)
+
+    def test_store(self):
+        """
+        Test that files with the same content are only stored once
+        """
+        blob = MediaBlob.store(self.content, '.JPG')
+        self.assertEqual(blob.name, f'blobs/{self.sha256[:2]}/{self.sha256}.jpg')
+        self.assertEqual(blob.size, len(self.content))
+        self.assertTrue(self.exists(blob.name))
+
+        url = 'https://example.com/image.jpg'
+        self.assertEqual(MediaBlob.store(self.content, '.png', source_url=url).pk, blob.pk)
+        self.assertEqual(MediaBlob.objects.count(), 1)
+        self.assertEqual(MediaBlob.objects.get().source_url, url)
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root, 'blobs', self.sha256[:2])),
+            [f'{self.sha256}.jpg']
+        )
+
+    def test_find_sha256(self):
+        """
+        Test that files are found by the SHA-256 sent by the server
+        """
+        blob = MediaBlob.store(self.content, '.jpg')
+        with mock.patch('wger.core.models.media.fetch_etag') as fetch_etag:
+            self.assertEqual(MediaBlob.find('https://example.com/a.jpg', self.sha256), blob)
+            self.assertIsNone(MediaBlob.find('https://example.com/a.jpg', '1234'))
+        fetch_etag.assert_not_called()
+
+    def test_find_etag(self):
+        """
+        Test that files downloaded before are found if their ETag didn't change
+        """
+        url = 'https://example.com/a.jpg'
+        blob = MediaBlob.store(self.content, '.jpg', source_url=url, etag='"abc"')
+
+        with mock.patch('wger.core.models.media.fetch_etag', return_value='"abc"'):
+            self.assertEqual(MediaBlob.find(url), blob)
+        with mock.patch('wger.core.models.media.fetch_etag', return_value='"def"'):
+            self.assertIsNone(MediaBlob.find(url))
+        with mock.patch('wger.core.models.media.fetch_etag') as fetch_etag:
+            self.assertIsNone(MediaBlob.find('https://example.com/b.jpg'))
+        fetch_etag.assert_not_called()
+
+    def test_fetch_many(self):
+        """
+        Test that only the unknown files are downloaded
+        """
+        blob = MediaBlob.store(self.content, '.jpg')
+        files = [
+            ('https://example.com/a.jpg', None),
+            ('https://example.com/b.jpg', self.sha256),
+            ('https://example.com/c.png', None),
+        ]
+        responses = [MockResponse(b'123', '"a"'), MockResponse(b'456')]
+        with mock.patch('wger.core.models.media.fetch_many', return_value=iter(responses)) as fetch:
+            blobs = list(MediaBlob.fetch_many(files))
+
+        self.assertEqual(
+            fetch.call_args[0][0], ['https://example.com/a.jpg', 'https://example.com/c.png']
+        )
+        self.assertEqual(blobs[1], blob)
+        self.assertEqual(blobs[0].sha256, hashlib.sha256(b'123').hexdigest())
+        self.assertEqual(blobs[0].etag, '"a"')
+        self.assertTrue(blobs[2].name.endswith('.png'))
+
+    def test_shared_image(self):
+        """
+        Test that images with the same content share the file
+        """
+        blob = MediaBlob.store(self.content, '.jpg')
+        image1 = self.create_image(blob)
+        image2 = self.create_image(blob)
+        self.assertEqual(image1.image.name, blob.name)
+        self.assertEqual(image2.image.name, blob.name)
+        self.assertEqual(image1.sha256, self.sha256)
+        self.assertEqual(blob.reference_count, 2)
+
+        response = self.client.get(reverse('exerciseimage-detail', kwargs={'pk': image1.pk}))
+        self.assertEqual(response.data['sha256'], self.sha256)
+
+        # Deleting an image keeps the file and the thumbnails of the other one
+        thumbnail = image2.get_thumbnail('small')
+        image1.delete()
+        self.assertEqual(blob.reference_count, 1)
+        self.assertTrue(self.exists(blob.name))
+        self.assertTrue(self.exists(thumbnail['name']))
+        self.assertTrue(self.exists(thumbnail['formats']['webp']['name']))
+
+    def test_delete_unused(self):
+        """
+        Test the command deleting the files no image uses
+        """
+        used = MediaBlob.store(self.content, '.jpg')
+        image = self.create_image(used)
+        unused = MediaBlob.store(b'1234', '.jpg')
+        MediaBlob.objects.update(created=now() - datetime.timedelta(days=2))
+
+        out = io.StringIO()
+        call_command('delete-unused-blobs', dry_run=True, stdout=out)
+        self.assertIn(unused.name, out.getvalue())
+        self.assertEqual(MediaBlob.objects.count(), 2)
+
+        image.delete()
+        call_command('delete-unused-blobs', stdout=out)
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(self.exists(used.name))
+        self.assertFalse(self.exists(unused.name))
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'blobs', self.sha256[:2])), [])
+
+    def test_delete_unused_reused(self):
+        """
+        Test that files an image started using after they were listed are kept
+        """
+        blob = MediaBlob.store(self.content, '.jpg')
+        self.create_image(blob)
+        MediaBlob.objects.update(created=now() - datetime.timedelta(days=2))
+
+        with mock.patch.object(MediaBlob, 'unreferenced', return_value=MediaBlob.objects.all()):
+            call_command('delete-unused-blobs', stdout=io.StringIO())
+        self.assertTrue(MediaBlob.objects.filter(pk=blob.pk).exists())
+        self.assertTrue(self.exists(blob.name))
+
+    def test_delete_unused_min_age(self):
+        """
+        Test that recently stored files are kept, they might be used by a running sync
+        """
+        MediaBlob.store(b'1234', '.jpg')
+        call_command('delete-unused-blobs', stdout=io.StringIO())
+        self.assertEqual(MediaBlob.objects.count(), 1)
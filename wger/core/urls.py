@@ -79,6 +79,7 @@ patterns_user = [
     path('registration', user.registration, name='registration'),
     path('preferences', user.preferences, name='preferences'),
     path('api-key', user.api_key, name='api-key'),
+    path('export/<slug:token>', user.export_download, name='export-download'),
     path('demo-entries', misc.demo_entries, name='demo-entries'),
     path('<int:pk>/activate', user.UserActivateView.as_view(), name='activate'),
     path('<int:pk>/deactivate', user.UserDeactivateView.as_view(), name='deactivate'),
@@ -198,6 +199,9 @@ urlpatterns = [
     # The dashboard
     path('dashboard', misc.dashboard, name='dashboard'),
 
+    # PDFs rendered in the background
+    path('pdf/<slug:key>', misc.pdf_download, name='pdf-download'),
+
     # Others
     path(
         'imprint',
@@ -23,7 +23,13 @@ from django.contrib import messages
 from django.contrib.auth import login as django_login
 from django.contrib.auth.decorators import login_required
 from django.core import mail
-from django.http import HttpResponseRedirect
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+)
 from django.shortcuts import render
 from django.template.loader import render_to_string
 from django.urls import (
@@ -49,6 +55,11 @@ from wger.core.forms import (
 )
 from wger.core.models import DaysOfWeek
 from wger.manager.models import Schedule
+from wger.utils.cache import cache_mapper
+from wger.utils.pdf_render import (
+    get_storage_name,
+    stored_pdf_response,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -139,6 +150,30 @@ def dashboard(request):
     return render(request, 'index.html', context)
 
 
+def pdf_download(request, key):
+    """
+    Downloads a PDF that is rendered in the background
+
+    Until the file is ready, a page that reloads itself is returned. The key is
+    only known to whoever was allowed to request the document.
+    """
+    filename = cache.get(cache_mapper.get_pdf_key(key))
+    if not filename:
+        raise Http404
+
+    name = get_storage_name(key)
+    if not default_storage.exists(name):
+        response = HttpResponse(
+            _('Your PDF is being prepared, please wait a moment.'),
+            content_type='text/plain',
+            status=202,
+        )
+        response['Refresh'] = '5'
+        return response
+
+    return stored_pdf_response(name, filename)
+
+
 class FeedbackClass(FormView):
     template_name = 'form.html'
     success_url = reverse_lazy('software:about-us')
@@ -37,7 +37,11 @@ from django.contrib.auth.views import (
     PasswordResetConfirmView,
     PasswordResetView,
 )
+from django.core.cache import cache
 from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
     HttpResponseForbidden,
     HttpResponseNotFound,
     HttpResponseRedirect,
@@ -97,6 +101,8 @@ from wger.manager.models import (
 )
 from wger.nutrition.models import NutritionPlan
 from wger.utils.api_token import create_token
+from wger.utils.cache import cache_mapper
+from wger.utils.export import open_prepared_export
 from wger.utils.generic_views import (
     WgerFormMixin,
     WgerMultiplePermissionRequiredMixin,
@@ -498,6 +504,37 @@ def api_key(request):
     return render(request, 'user/api_key.html', context)
 
 
+@login_required
+def export_download(request, token):
+    """
+    Downloads a CSV export that was prepared in the background
+
+    Until the file is ready, a page that reloads itself is returned.
+    """
+    key = cache_mapper.get_export_key(token)
+    entry = cache.get(key)
+    if not entry or entry['user'] != request.user.pk:
+        raise Http404
+
+    if not entry['file']:
+        response = HttpResponse(
+            _('Your export is being prepared, please wait a moment.'),
+            content_type='text/plain',
+            status=202,
+        )
+        response['Refresh'] = '5'
+        return response
+
+    # The file is deleted once it was sent, so the link can only be used once
+    cache.delete(key)
+    return FileResponse(
+        open_prepared_export(entry['file']),
+        as_attachment=True,
+        filename=entry['filename'],
+        content_type='text/csv',
+    )
+
+
 class UserDetailView(LoginRequiredMixin, WgerMultiplePermissionRequiredMixin, DetailView):
     """
     User overview for gyms
@@ -0,0 +1,66 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.db.models import Q
+
+# Third Party
+from django_filters import rest_framework as filters
+
+# wger
+from wger.exercises.models import (
+    DeletionLog,
+    ExerciseBase,
+)
+
+
+class ExerciseBaseInfoFilterSet(filters.FilterSet):
+    last_update_global__gt = filters.IsoDateTimeFilter(method='filter_last_update_global')
+    """
+    Bases where the base itself or any translation, image or video was modified
+    after the given timestamp. Used by the incremental synchronization.
+    """
+
+    class Meta:
+        model = ExerciseBase
+        fields = {
+            'uuid': ['exact'],
+            'category': ['exact'],
+            'muscles': ['exact'],
+            'muscles_secondary': ['exact'],
+            'equipment': ['exact'],
+            'variations': ['exact'],
+            'license': ['exact'],
+            'license_author': ['exact'],
+            'last_update': ['exact', 'gt', 'lt'],
+        }
+
+    def filter_last_update_global(self, queryset, name, value):
+        return queryset.filter(
+            Q(last_update__gt=value)
+            | Q(exercises__last_update__gt=value)
+            | Q(exerciseimage__last_update__gt=value)
+            | Q(exercisevideo__last_update__gt=value)
+        ).distinct()
+
+
+class DeletionLogFilterSet(filters.FilterSet):
+
+    class Meta:
+        model = DeletionLog
+        fields = {
+            'model_type': ['exact'],
+            'timestamp': ['exact', 'gt', 'lt'],
+        }
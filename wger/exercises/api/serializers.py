@@ -14,7 +14,6 @@
 
 # Django
 from django.conf import settings
-from django.core.cache import cache
 from django.db.models import Q
 
 # Third Party
@@ -34,7 +33,10 @@ from wger.exercises.models import (
     Muscle,
     Variation,
 )
-from wger.utils.cache import CacheKeyMapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 class ExerciseBaseSerializer(serializers.ModelSerializer):
@@ -90,6 +92,8 @@ class ExerciseImageSerializer(serializers.ModelSerializer):
     """
     author_history = serializers.ListSerializer(child=serializers.CharField(), read_only=True)
     exercise_base_uuid = serializers.ReadOnlyField(source='exercise_base.uuid')
+    srcset = serializers.ReadOnlyField(source='thumbnail_srcset')
+    sha256 = serializers.ReadOnlyField()
 
     class Meta:
         model = ExerciseImage
@@ -99,6 +103,8 @@ class ExerciseImageSerializer(serializers.ModelSerializer):
             'exercise_base',
             'exercise_base_uuid',
             'image',
+            'srcset',
+            'sha256',
             'is_main',
             'style',
             'license',
@@ -469,12 +475,13 @@ class ExerciseBaseInfoSerializer(serializers.ModelSerializer):
         """
         Cache the response
         """
-        key = CacheKeyMapper.get_exercise_api_key(instance.uuid)
-
-        representation = cache.get(key)
-        if representation:
-            return representation
-
-        representation = super().to_representation(instance)
-        cache.set(key, representation, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
-        return representation
+        return tagged_cache.get_or_set(
+            cache_mapper.get_exercise_api_key(instance.uuid),
+            lambda: super(ExerciseBaseInfoSerializer, self).to_representation(instance),
+            tags=[cache_mapper.get_exercise_base_tag(instance.id)],
+            value_tags=lambda representation: [
+                cache_mapper.get_muscle_tag(muscle['id'])
+                for muscle in [*representation['muscles'], *representation['muscles_secondary']]
+            ],
+            timeout=settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'],
+        )
@@ -19,7 +19,7 @@ from uuid import UUID
 
 # Django
 from django.conf import settings
-from django.db.models import Q
+from django.utils.cache import add_never_cache_headers
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.decorators.cache import cache_page
@@ -35,8 +35,6 @@ from drf_spectacular.utils import (
     inline_serializer,
 )
 from easy_thumbnails.alias import aliases
-from easy_thumbnails.exceptions import InvalidImageFormatError
-from easy_thumbnails.files import get_thumbnailer
 from rest_framework import viewsets
 from rest_framework.decorators import (
     action,
@@ -50,6 +48,10 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 # wger
+from wger.exercises.api.filtersets import (
+    DeletionLogFilterSet,
+    ExerciseBaseInfoFilterSet,
+)
 from wger.exercises.api.permissions import CanContributeExercises
 from wger.exercises.api.serializers import (
     DeletionLogSerializer,
@@ -76,6 +78,7 @@ from wger.exercises.models import (
     ExerciseCategory,
     ExerciseComment,
     ExerciseImage,
+    ExerciseSearchTerm,
     ExerciseVideo,
     Muscle,
     Variation,
@@ -345,34 +348,16 @@ def search(request):
         return Response(response)
 
     languages = [load_language(l) for l in language_codes.split(',')]
-    translations = Exercise.objects \
-        .filter(Q(name__icontains=q) | Q(alias__alias__icontains=q)) \
-        .filter(language__in=languages) \
-        .order_by('exercise_base__category__name', 'name') \
-        .distinct()
-
-    for translation in translations:
-        image = None
-        thumbnail = None
-        if translation.main_image:
-            image_obj = translation.main_image
-            image = image_obj.image.url
-            t = get_thumbnailer(image_obj.image)
-            thumbnail = None
-            try:
-                thumbnail = t.get_thumbnail(aliases.get('micro_cropped')).url
-            except InvalidImageFormatError:
-                pass
-
+    for entry in ExerciseSearchTerm.search(q, languages):
         result_json = {
-            'value': translation.name,
+            'value': entry.name,
             'data': {
-                'id': translation.id,
-                'base_id': translation.exercise_base_id,
-                'name': translation.name,
-                'category': _(translation.category.name),
-                'image': image,
-                'image_thumbnail': thumbnail
+                'id': entry.translation_id,
+                'base_id': entry.exercise_base_id,
+                'name': entry.name,
+                'category': _(entry.category),
+                'image': entry.image,
+                'image_thumbnail': entry.image_thumbnail
             }
         }
         results.append(result_json)
@@ -420,16 +405,7 @@ class ExerciseBaseInfoViewset(viewsets.ReadOnlyModelViewSet):
     queryset = ExerciseBase.objects.all()
     serializer_class = ExerciseBaseInfoSerializer
     ordering_fields = '__all__'
-    filterset_fields = (
-        'uuid',
-        'category',
-        'muscles',
-        'muscles_secondary',
-        'equipment',
-        'variations',
-        'license',
-        'license_author',
-    )
+    filterset_class = ExerciseBaseInfoFilterSet
 
 
 class EquipmentViewSet(viewsets.ReadOnlyModelViewSet):
@@ -457,7 +433,7 @@ class DeletionLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = DeletionLog.objects.all()
     serializer_class = DeletionLogSerializer
     ordering_fields = '__all__'
-    filterset_fields = ('model_type', )
+    filterset_class = DeletionLogFilterSet
 
 
 class ExerciseCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -504,15 +480,21 @@ class ExerciseImageViewSet(ModelViewSet):
         except ExerciseImage.DoesNotExist:
             return Response([])
 
+        # The thumbnails are read from the manifest. Until they are generated,
+        # the original image is returned instead (and not cached)
         thumbnails = {}
-        for alias in aliases.all():
-            t = get_thumbnailer(image.image)
+        for alias, options in aliases.all().items():
             thumbnails[alias] = {
-                'url': t.get_thumbnail(aliases.get(alias)).url,
-                'settings': aliases.get(alias)
+                'url': image.get_thumbnail_url(alias) or image.image.url,
+                'settings': options,
             }
         thumbnails['original'] = image.image.url
-        return Response(thumbnails)
+        response = Response(thumbnails)
+
+        if not image.has_current_thumbnails:
+            image.queue_thumbnails()
+            add_never_cache_headers(response)
+        return response
 
     def perform_create(self, serializer):
         """
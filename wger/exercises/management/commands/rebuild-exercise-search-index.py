@@ -0,0 +1,36 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.core.management.base import BaseCommand
+
+# wger
+from wger.exercises.models import ExerciseSearchTerm
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the search index used by the exercise autocompleter
+    """
+
+    help = 'Rebuilds the search index used by the exercise autocompleter'
+
+    def handle(self, **options):
+        self.stdout.write('Rebuilding the exercise search index...')
+        ExerciseSearchTerm.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Done, {ExerciseSearchTerm.objects.count()} entries indexed')
+        )
@@ -69,6 +69,15 @@ class Command(BaseCommand):
             help='Skips deleting any entries'
         )
 
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            dest='incremental',
+            default=False,
+            help='Only process exercises and deletion log entries that were modified on '
+            'the server since the last synchronization'
+        )
+
     def handle(self, **options):
 
         remote_url = options['remote_url']
@@ -86,6 +95,16 @@ class Command(BaseCommand):
         sync_muscles(self.stdout.write, self.remote_url, self.style.SUCCESS)
         sync_equipment(self.stdout.write, self.remote_url, self.style.SUCCESS)
         sync_licenses(self.stdout.write, self.remote_url, self.style.SUCCESS)
-        sync_exercises(self.stdout.write, self.remote_url, self.style.SUCCESS)
+        sync_exercises(
+            self.stdout.write,
+            self.remote_url,
+            self.style.SUCCESS,
+            incremental=options['incremental'],
+        )
         if not options['skip_delete']:
-            handle_deleted_entries(self.stdout.write, self.remote_url, self.style.SUCCESS)
+            handle_deleted_entries(
+                self.stdout.write,
+                self.remote_url,
+                self.style.SUCCESS,
+                incremental=options['incremental'],
+            )
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.6 on 2026-10-17 04:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from wger.utils.helpers import search_term_suffixes
+
+
+def build_search_index(apps, schema_editor):
+    """
+    Fill the search index for the existing exercises
+
+    Thumbnails are not generated here, run rebuild-exercise-search-index
+    afterwards to add them.
+    """
+    Exercise = apps.get_model('exercises', 'Exercise')
+    Alias = apps.get_model('exercises', 'Alias')
+    ExerciseImage = apps.get_model('exercises', 'ExerciseImage')
+    ExerciseSearchTerm = apps.get_model('exercises', 'ExerciseSearchTerm')
+
+    images = {}
+    for image in ExerciseImage.objects.filter(is_main=True):
+        images.setdefault(image.exercise_base_id, image.image.url)
+
+    aliases = {}
+    for translation_id, alias in Alias.objects.values_list('exercise_id', 'alias'):
+        aliases.setdefault(translation_id, []).append(alias)
+
+    entries = []
+    for translation in Exercise.objects.select_related('exercise_base__category'):
+        for rank, texts in ((0, [translation.name]), (2, aliases.get(translation.id, []))):
+            for text in texts:
+                for position, term in enumerate(search_term_suffixes(text)):
+                    entries.append(
+                        ExerciseSearchTerm(
+                            translation_id=translation.id,
+                            exercise_base_id=translation.exercise_base_id,
+                            language_id=translation.language_id,
+                            term=term[:200],
+                            rank=rank + 1 if position else rank,
+                            name=translation.name,
+                            category=translation.exercise_base.category.name,
+                            image=images.get(translation.exercise_base_id),
+                        )
+                    )
+    ExerciseSearchTerm.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0028_add_uuid_alias_and_comments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseSearchTerm',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('term', models.CharField(db_index=True, max_length=200)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('category', models.CharField(max_length=100)),
+                ('image', models.CharField(max_length=255, null=True)),
+                ('image_thumbnail', models.CharField(max_length=255, null=True)),
+                (
+                    'exercise_base',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='exercises.exercisebase'
+                    )
+                ),
+                (
+                    'language',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='core.language'
+                    )
+                ),
+                (
+                    'translation',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='search_terms',
+                        to='exercises.exercise'
+                    )
+                ),
+            ],
+            options={
+                'indexes':
+                [models.Index(fields=['language', 'term'], name='exercises_e_languag_012306_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.6 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0029_exercise_search_term'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exerciseimage',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='historicalexerciseimage',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
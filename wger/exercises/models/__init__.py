@@ -24,5 +24,6 @@ from .exercise import Exercise
 from .exercise_alias import Alias
 from .image import ExerciseImage
 from .muscle import Muscle
+from .search import ExerciseSearchTerm
 from .variation import Variation
 from .video import ExerciseVideo
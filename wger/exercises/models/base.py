@@ -42,7 +42,7 @@ from wger.exercises.managers import (
     ExerciseBaseManagerNoTranslations,
     ExerciseBaseManagerTranslations,
 )
-from wger.utils.cache import reset_exercise_api_cache
+from wger.utils.cache import reset_exercise_base_cache
 from wger.utils.constants import ENGLISH_SHORT_NAME
 from wger.utils.models import (
     AbstractHistoryMixin,
@@ -240,7 +240,7 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
 
-        reset_exercise_api_cache(self.uuid)
+        reset_exercise_base_cache(self.id)
 
     def delete(self, using=None, keep_parents=False, replace_by: str = None):
         """
@@ -263,6 +263,6 @@ class ExerciseBase(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
         )
         log.save()
 
-        reset_exercise_api_cache(self.uuid)
+        reset_exercise_base_cache(self.id)
 
         return super().delete(using, keep_parents)
@@ -25,10 +25,7 @@ from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
 # wger
-from wger.utils.cache import (
-    reset_exercise_api_cache,
-    reset_workout_canonical_form,
-)
+from wger.utils.cache import reset_exercise_base_cache
 
 # Local
 from .exercise import Exercise
@@ -70,8 +67,8 @@ class Alias(models.Model):
         """
         Reset cached workouts
         """
-        # Api cache
-        reset_exercise_api_cache(self.exercise.exercise_base.uuid)
+        # Api cache and cached workouts
+        reset_exercise_base_cache(self.exercise.exercise_base_id)
 
         super().save(*args, **kwargs)
 
@@ -79,11 +76,8 @@ class Alias(models.Model):
         """
         Reset cached workouts
         """
-        for setting in self.exercise.exercise_base.setting_set.all():
-            reset_workout_canonical_form(setting.set.exerciseday.training.pk)
-
-        # Api cache
-        reset_exercise_api_cache(self.exercise.exercise_base.uuid)
+        # Api cache and cached workouts
+        reset_exercise_base_cache(self.exercise.exercise_base_id)
 
         super().delete(*args, **kwargs)
 
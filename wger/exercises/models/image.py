@@ -27,11 +27,12 @@ from simple_history.models import HistoricalRecords
 
 # wger
 from wger.exercises.models import ExerciseBase
-from wger.utils.cache import reset_exercise_api_cache
+from wger.utils.cache import reset_exercise_base_cache
 from wger.utils.helpers import BaseImage
 from wger.utils.models import (
     AbstractHistoryMixin,
     AbstractLicenseModel,
+    AbstractThumbnailModel,
 )
 
 
@@ -43,7 +44,13 @@ def exercise_image_upload_dir(instance, filename):
     return f"exercise-images/{instance.exercise_base.id}/{instance.uuid}{ext}"
 
 
-class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, BaseImage):
+class ExerciseImage(
+    AbstractLicenseModel,
+    AbstractThumbnailModel,
+    AbstractHistoryMixin,
+    models.Model,
+    BaseImage,
+):
     """
     Model for an exercise image
     """
@@ -146,8 +153,8 @@ class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, Ba
                 .count():
                 self.is_main = True
 
-        # Api cache
-        reset_exercise_api_cache(self.exercise_base.uuid)
+        # Api cache and cached workouts
+        reset_exercise_base_cache(self.exercise_base_id)
 
         # And go on
         super().save(*args, **kwargs)
@@ -157,6 +164,7 @@ class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, Ba
         Reset all cached infos
         """
         super().delete(*args, **kwargs)
+        reset_exercise_base_cache(self.exercise_base_id)
 
         # Make sure there is always a main image
         if not ExerciseImage.objects.all().filter(exercise_base=self.exercise_base, is_main=True
@@ -174,17 +182,26 @@ class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, Ba
         """
         return False
 
+    def thumbnails_generated(self):
+        """
+        The search index contains the thumbnail of the main image
+        """
+        # wger
+        from wger.exercises.models import ExerciseSearchTerm
+
+        ExerciseSearchTerm.index_bases([self.exercise_base_id])
+
     @classmethod
     def from_json(
         cls,
         connect_to: ExerciseBase,
-        retrieved_image,
+        blob,
         json_data: dict,
         generate_uuid: bool = False,
     ):
         image: cls = super().from_json(
             connect_to,
-            retrieved_image,
+            blob,
             json_data,
             generate_uuid,
         )
@@ -198,7 +215,7 @@ class ExerciseImage(AbstractLicenseModel, AbstractHistoryMixin, models.Model, Ba
         image.license_author_url = json_data['license_author_url']
         image.license_derivative_source_url = json_data['license_derivative_source_url']
 
-        image.save_image(retrieved_image, json_data)
+        image.save_image(blob)
 
         image.save()
         return image
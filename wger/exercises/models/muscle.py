@@ -22,6 +22,9 @@ from django.db import models
 from django.templatetags.static import static
 from django.utils.translation import gettext_lazy as _
 
+# wger
+from wger.utils.cache import reset_muscle_cache
+
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +73,20 @@ class Muscle(models.Model):
         """
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Reset all cached infos
+        """
+        super().save(*args, **kwargs)
+        reset_muscle_cache(self.id)
+
+    def delete(self, *args, **kwargs):
+        """
+        Reset all cached infos
+        """
+        reset_muscle_cache(self.id)
+        super().delete(*args, **kwargs)
+
     def get_owner_object(self):
         """
         Muscle has no owner information
@@ -0,0 +1,224 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+from typing import (
+    Iterable,
+    List,
+)
+
+# Django
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    Case,
+    IntegerField,
+    Value,
+    When,
+)
+
+# wger
+from wger.core.models import Language
+from wger.utils.helpers import (
+    normalize_search_term,
+    search_term_suffixes,
+)
+
+# Local
+from .base import ExerciseBase
+from .exercise import Exercise
+from .exercise_alias import Alias
+from .image import ExerciseImage
+
+
+class ExerciseSearchTerm(models.Model):
+    """
+    Search index for the exercise translations and their aliases
+
+    Every name and alias is stored normalized (lower case, no accents) once
+    for each of its words, so that the autocompleter can match the start of
+    any word with an indexed prefix query. Everything needed for the results
+    (name, category, image and thumbnail) is denormalized, so a search is a
+    single query without joins.
+
+    The entries are kept up to date with signals, see wger.exercises.signals
+    """
+
+    RANK_NAME = 0
+    RANK_NAME_WORD = 1
+    RANK_ALIAS = 2
+    RANK_ALIAS_WORD = 3
+
+    translation = models.ForeignKey(
+        Exercise,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+    )
+
+    exercise_base = models.ForeignKey(
+        ExerciseBase,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+
+    language = models.ForeignKey(
+        Language,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+
+    term = models.CharField(max_length=200, db_index=True)
+    """Normalized name or alias, starting at one of its words"""
+
+    rank = models.PositiveSmallIntegerField()
+    """Lower is better, see the RANK_* constants"""
+
+    name = models.CharField(max_length=200)
+    category = models.CharField(max_length=100)
+    image = models.CharField(max_length=255, null=True)
+    image_thumbnail = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['language', 'term'])]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'{self.term} ({self.translation_id})'
+
+    @classmethod
+    def search(cls, query: str, languages: Iterable[Language]) -> List['ExerciseSearchTerm']:
+        """
+        Searches the index, returns one entry per translation, best matches first
+
+        Exact matches come first, then matches at the start of the name, of a
+        later word in the name and of an alias. If nothing starts with the query,
+        the index is searched for the query anywhere within the terms.
+
+        :param query: the search term as entered by the user
+        :param languages: the languages to search in
+        """
+        term = normalize_search_term(query)
+        if not term:
+            return []
+
+        entries = cls.objects.filter(language__in=languages)
+        results = cls.order_results(entries.filter(term__startswith=term), term)
+        if not results:
+            results = cls.order_results(entries.filter(term__contains=term), term)
+        return results
+
+    @staticmethod
+    def order_results(entries: models.QuerySet, term: str) -> List['ExerciseSearchTerm']:
+        entries = entries.annotate(
+            exact=Case(
+                When(term=term, then=Value(0)), default=Value(1), output_field=IntegerField()
+            )
+        ).order_by('exact', 'rank', 'category', 'name')
+
+        seen = set()
+        results = []
+        for entry in entries:
+            if entry.translation_id not in seen:
+                seen.add(entry.translation_id)
+                results.append(entry)
+        return results
+
+    @classmethod
+    def index_translations(cls, translations: models.QuerySet):
+        """
+        (Re)builds the index entries for the given translations
+
+        :param translations: queryset of the Exercise objects to index
+        """
+        translations = list(translations.select_related('exercise_base__category'))
+        if not translations:
+            return
+
+        translation_ids = [t.id for t in translations]
+        base_ids = {t.exercise_base_id for t in translations}
+
+        aliases_by_translation = {}
+        for translation_id, alias in Alias.objects.filter(exercise_id__in=translation_ids
+                                                          ).values_list('exercise_id', 'alias'):
+            aliases_by_translation.setdefault(translation_id, []).append(alias)
+
+        images = {}
+        for image in ExerciseImage.objects.filter(exercise_base_id__in=base_ids, is_main=True):
+            images.setdefault(image.exercise_base_id, cls.get_image_urls(image))
+
+        entries = []
+        for translation in translations:
+            image, thumbnail = images.get(translation.exercise_base_id, (None, None))
+            for rank_name, rank_word, texts in (
+                (cls.RANK_NAME, cls.RANK_NAME_WORD, [translation.name]),
+                (
+                    cls.RANK_ALIAS, cls.RANK_ALIAS_WORD,
+                    aliases_by_translation.get(translation.id, [])
+                ),
+            ):
+                for text in texts:
+                    for position, term in enumerate(search_term_suffixes(text)):
+                        entries.append(
+                            cls(
+                                translation_id=translation.id,
+                                exercise_base_id=translation.exercise_base_id,
+                                language_id=translation.language_id,
+                                term=term[:200],
+                                rank=rank_word if position else rank_name,
+                                name=translation.name,
+                                category=translation.exercise_base.category.name,
+                                image=image,
+                                image_thumbnail=thumbnail,
+                            )
+                        )
+
+        with transaction.atomic():
+            cls.objects.filter(translation_id__in=translation_ids).delete()
+            cls.objects.bulk_create(entries, batch_size=500)
+
+    @classmethod
+    def index_bases(cls, base_ids: Iterable[int]):
+        """
+        (Re)builds the index entries for all translations of the given bases
+        """
+        base_ids = list(base_ids)
+        if base_ids:
+            cls.index_translations(Exercise.objects.filter(exercise_base_id__in=base_ids))
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 500):
+        """
+        Rebuilds the whole index
+        """
+        cls.objects.all().delete()
+        base_ids = list(ExerciseBase.objects.order_by('id').values_list('id', flat=True))
+        for i in range(0, len(base_ids), batch_size):
+            cls.index_bases(base_ids[i:i + batch_size])
+
+    @staticmethod
+    def get_image_urls(image: ExerciseImage):
+        """
+        Returns the URLs of the image and its thumbnail
+
+        The thumbnail is read from the image's manifest, if it was not generated
+        yet (e.g. because the file is not there, as can happen when loading
+        fixtures) no thumbnail is set. The entries are indexed again once it is.
+        """
+        return image.image.url, image.get_thumbnail_url('micro_cropped')
@@ -27,7 +27,7 @@ from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
 # wger
-from wger.utils.cache import reset_exercise_api_cache
+from wger.utils.cache import reset_exercise_base_cache
 
 
 try:
@@ -213,7 +213,7 @@ class ExerciseVideo(AbstractLicenseModel, AbstractHistoryMixin, models.Model):
                 self.codec = stream['codec_name']
                 self.codec_long = stream['codec_long_name']
 
-        # Api cache
-        reset_exercise_api_cache(self.exercise_base.uuid)
+        # Api cache and cached workouts
+        reset_exercise_base_cache(self.exercise_base_id)
 
         super().save(*args, **kwargs)
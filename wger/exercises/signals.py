@@ -18,8 +18,10 @@
 import pathlib
 
 # Django
+from django.db import transaction
 from django.db.models.signals import (
     post_delete,
+    post_save,
     pre_delete,
     pre_save,
 )
@@ -27,23 +29,35 @@ from django.dispatch import receiver
 
 # Third Party
 from easy_thumbnails.files import get_thumbnailer
-from easy_thumbnails.signal_handlers import generate_aliases
-from easy_thumbnails.signals import saved_file
 
 # wger
+from wger.core.models import MediaBlob
 from wger.exercises.models import (
+    Alias,
     DeletionLog,
     Exercise,
+    ExerciseBase,
+    ExerciseCategory,
     ExerciseImage,
+    ExerciseSearchTerm,
     ExerciseVideo,
 )
+from wger.utils.models import (
+    delete_image_thumbnail_formats,
+    schedule_thumbnails,
+)
 
 
 @receiver(post_delete, sender=ExerciseImage)
 def delete_exercise_image_on_delete(sender, instance, **kwargs):
     """
     Delete the image, along with its thumbnails, from the disk
+
+    Files in the media store can be used by other images, unused ones are
+    removed by the delete-unused-blobs command
     """
+    if MediaBlob.is_blob(instance.image.name):
+        return
 
     thumbnailer = get_thumbnailer(instance.image)
     thumbnailer.delete_thumbnails()
@@ -65,14 +79,15 @@ def delete_exercise_image_on_update(sender, instance, **kwargs):
         return False
 
     new_file = instance.image
-    if not old_file == new_file:
+    if not old_file == new_file and not MediaBlob.is_blob(instance.image.name):
         thumbnailer = get_thumbnailer(instance.image)
         thumbnailer.delete_thumbnails()
         instance.image.delete(save=False)
 
 
 # Generate thumbnails when uploading a new image
-saved_file.connect(generate_aliases)
+post_save.connect(schedule_thumbnails, sender=ExerciseImage)
+post_delete.connect(delete_image_thumbnail_formats, sender=ExerciseImage)
 
 
 @receiver(post_delete, sender=ExerciseVideo)
@@ -139,3 +154,45 @@ def add_deletion_log_video(sender, instance: ExerciseVideo, **kwargs):
         uuid=instance.uuid,
     )
     log.save()
+
+
+# Keep the search index up to date. This is also done when loading fixtures,
+# since the entries only depend on data that was already loaded.
+@receiver(post_save, sender=Exercise)
+def update_search_index_translation(sender, instance: Exercise, **kwargs):
+    ExerciseSearchTerm.index_translations(Exercise.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Alias)
+def update_search_index_alias(sender, instance: Alias, **kwargs):
+    ExerciseSearchTerm.index_translations(Exercise.objects.filter(pk=instance.exercise_id))
+
+
+@receiver(post_delete, sender=Alias)
+def update_search_index_alias_delete(sender, instance: Alias, **kwargs):
+    # Wait till the end of the transaction, the translation might be deleted as well
+    translation_id = instance.exercise_id
+    transaction.on_commit(
+        lambda: ExerciseSearchTerm.index_translations(Exercise.objects.filter(pk=translation_id))
+    )
+
+
+@receiver(post_save, sender=ExerciseBase)
+def update_search_index_base(sender, instance: ExerciseBase, **kwargs):
+    ExerciseSearchTerm.index_bases([instance.pk])
+
+
+@receiver(post_save, sender=ExerciseImage)
+def update_search_index_image(sender, instance: ExerciseImage, **kwargs):
+    ExerciseSearchTerm.index_bases([instance.exercise_base_id])
+
+
+@receiver(post_delete, sender=ExerciseImage)
+def update_search_index_image_delete(sender, instance: ExerciseImage, **kwargs):
+    base_id = instance.exercise_base_id
+    transaction.on_commit(lambda: ExerciseSearchTerm.index_bases([base_id]))
+
+
+@receiver(post_save, sender=ExerciseCategory)
+def update_search_index_category(sender, instance: ExerciseCategory, **kwargs):
+    ExerciseSearchTerm.index_bases(instance.exercisebase_set.values_list('id', flat=True))
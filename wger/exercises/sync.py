@@ -14,14 +14,27 @@
 
 # Standard Library
 import os
+from collections import (
+    Counter,
+    defaultdict,
+)
+from urllib.parse import quote
+from uuid import UUID
 
 # Django
 from django.conf import settings
 from django.core.files import File
 from django.core.files.temp import NamedTemporaryFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 # Third Party
-import requests
+from simple_history.utils import (
+    bulk_create_with_history,
+    bulk_update_with_history,
+)
 
 # wger
 from wger.core.api.endpoints import (
@@ -31,6 +44,8 @@ from wger.core.api.endpoints import (
 from wger.core.models import (
     Language,
     License,
+    MediaBlob,
+    SyncCheckpoint,
 )
 from wger.exercises.api.endpoints import (
     CATEGORY_ENDPOINT,
@@ -50,6 +65,7 @@ from wger.exercises.models import (
     ExerciseCategory,
     ExerciseComment,
     ExerciseImage,
+    ExerciseSearchTerm,
     ExerciseVideo,
     Muscle,
 )
@@ -57,8 +73,14 @@ from wger.manager.models import (
     Setting,
     WorkoutLog,
 )
+from wger.utils.cache import reset_exercise_base_cache
+from wger.utils.constants import SYNC_BATCH_SIZE
 from wger.utils.requests import (
+    DOWNLOAD_WORKERS,
+    fetch_many,
     get_paginated,
+    get_paginated_generator,
+    max_timestamp,
     wger_headers,
 )
 from wger.utils.url import make_uri
@@ -68,93 +90,344 @@ def sync_exercises(
     print_fn,
     remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
     style_fn=lambda x: x,
+    batch_size=SYNC_BATCH_SIZE,
+    incremental=False,
 ):
-    """Synchronize the exercises from the remote server"""
+    """
+    Synchronize the exercises from the remote server
+
+    The data is processed one page at a time. For every page the local bases,
+    translations, comments and aliases are loaded with a fixed number of queries,
+    compared by UUID to the remote data and only the rows that actually changed
+    are written back with bulk operations.
+
+    If incremental is set, only the exercises that were modified on the server
+    since the last synchronization are requested. Note that edits to comments
+    and aliases alone don't change any timestamp, these are only picked up by
+    a full run.
+    """
     print_fn('*** Synchronizing exercises...')
 
-    url = make_uri(EXERCISE_ENDPOINT, server_url=remote_url, query={'limit': 100})
-    result = get_paginated(url, headers=wger_headers())
+    query = {'limit': 100}
+    since = SyncCheckpoint.get_mark(remote_url, EXERCISE_ENDPOINT) if incremental else None
+    if since:
+        print_fn(f'Only processing exercises modified after {since.isoformat()}')
+        query['last_update_global__gt'] = quote(since.isoformat())
+    url = make_uri(EXERCISE_ENDPOINT, server_url=remote_url, query=query)
+
+    # Lookup tables, these are only needed to skip unknown IDs
+    valid_ids = {
+        'equipment': set(Equipment.objects.values_list('id', flat=True)),
+        'muscles': set(Muscle.objects.values_list('id', flat=True)),
+    }
+    counter = Counter()
+    last_update = None
+
+    for result in get_paginated_generator(url, headers=wger_headers()):
+        with transaction.atomic():
+            sync_exercise_page(result, valid_ids, counter, batch_size)
+        last_update = max_timestamp(last_update, result, 'last_update_global')
+
+    SyncCheckpoint.set_mark(remote_url, EXERCISE_ENDPOINT, last_update)
+
+    for label in ('bases', 'translations', 'comments', 'aliases'):
+        out = f"- {label}: {counter[f'{label} created']} created, " \
+              f"{counter[f'{label} updated']} updated, " \
+              f"{counter[f'{label} unchanged']} unchanged"
+        if counter[f'{label} deleted']:
+            out += f", {counter[f'{label} deleted']} deleted"
+        print_fn(out)
 
-    for data in result:
+    print_fn(style_fn('done!\n'))
+    return counter
 
-        uuid = data['uuid']
-        created = data['created']
-        license_id = data['license']['id']
-        category_id = data['category']['id']
-        license_author = data['license_author']
-        equipment = [Equipment.objects.get(pk=i['id']) for i in data['equipment']]
-        muscles = [Muscle.objects.get(pk=i['id']) for i in data['muscles']]
-        muscles_sec = [Muscle.objects.get(pk=i['id']) for i in data['muscles_secondary']]
 
-        base, base_created = ExerciseBase.objects.update_or_create(
-            uuid=uuid,
-            defaults={
-                'category_id': category_id,
-                'created': created
-            },
+def sync_exercise_page(result: list, valid_ids: dict, counter: Counter, batch_size: int):
+    """
+    Synchronizes one page of the exercise base info endpoint
+
+    :param result: list with the data of the exercise bases
+    :param valid_ids: dictionary with the sets of known equipment and muscle IDs
+    :param counter: counter where the created, updated, etc. rows are recorded
+    :param batch_size: number of rows written per query
+    """
+    now = timezone.now()
+    remote_bases = {UUID(data['uuid']): data for data in result}
+    changed_base_ids = set()
+    changed_translation_ids = set()
+
+    #
+    # Exercise bases
+    #
+    local_bases = {b.uuid: b for b in ExerciseBase.objects.filter(uuid__in=remote_bases.keys())}
+    new_bases = []
+    updated_bases = []
+    for base_uuid, data in remote_bases.items():
+        category_id = data['category']['id']
+        created = parse_datetime(data['created'])
+
+        base = local_bases.get(base_uuid)
+        if base is None:
+            base = ExerciseBase(uuid=base_uuid, category_id=category_id, created=created)
+            new_bases.append(base)
+        elif base.category_id != category_id or base.created != created:
+            base.category_id = category_id
+            base.created = created
+            base.last_update = now
+            updated_bases.append(base)
+        else:
+            counter['bases unchanged'] += 1
+
+    if new_bases:
+        # The creation date is overwritten by auto_now_add, so set it afterwards
+        created_dates = [b.created for b in new_bases]
+        bulk_create_with_history(new_bases, ExerciseBase, batch_size=batch_size)
+        for base, created in zip(new_bases, created_dates):
+            base.created = created
+        base_ids = dict(
+            ExerciseBase.objects.filter(uuid__in=[b.uuid
+                                                  for b in new_bases]).values_list('uuid', 'id')
         )
-        print_fn(f"{'created' if base_created else 'updated'} exercise {uuid}")
+        for base in new_bases:
+            base.pk = base_ids[base.uuid]
+            local_bases[base.uuid] = base
+        ExerciseBase.objects.bulk_update(new_bases, ['created'], batch_size=batch_size)
+
+    bulk_update_with_history(
+        updated_bases,
+        ExerciseBase,
+        ['category', 'created', 'last_update'],
+        batch_size=batch_size,
+    )
+    counter['bases created'] += len(new_bases)
+    counter['bases updated'] += len(updated_bases)
+    changed_base_ids.update(b.pk for b in new_bases + updated_bases)
 
-        base.muscles.set(muscles)
-        base.muscles_secondary.set(muscles_sec)
-        base.equipment.set(equipment)
-        base.save()
+    #
+    # Muscles and equipment
+    #
+    for field_name, known_ids in (
+        ('muscles', valid_ids['muscles']),
+        ('muscles_secondary', valid_ids['muscles']),
+        ('equipment', valid_ids['equipment']),
+    ):
+        desired = {
+            local_bases[base_uuid].pk: {i['id']
+                                        for i in data[field_name] if i['id'] in known_ids}
+            for base_uuid, data in remote_bases.items()
+        }
+        changed_base_ids |= sync_base_m2m(field_name, desired, batch_size)
 
+    #
+    # Translations
+    #
+    remote_translations = {}
+    for base_uuid, data in remote_bases.items():
         for translation_data in data['exercises']:
-            trans_uuid = translation_data['uuid']
-            name = translation_data['name']
-            description = translation_data['description']
-            language_id = translation_data['language']
-
-            translation, translation_created = Exercise.objects.update_or_create(
-                uuid=trans_uuid,
-                defaults={
-                    'exercise_base': base,
-                    'name': name,
-                    'description': description,
-                    'license_id': license_id,
-                    'license_author': license_author,
-                    'language_id': language_id,
-                },
-            )
-            out = f"- {'created' if translation_created else 'updated'} translation " \
-                  f"{translation.language.short_name} {trans_uuid} - {name}"
-            print_fn(out)
-
-            # TODO: currently (2024-01-06) we always delete all the comments and the aliases
-            #       when synchronizing the data, even though we could identify them via the
-            #       UUID. However, the UUID created when running the database migrations will
-            #       be unique as well, so we will never update. We need to wait a while till
-            #       most local instances have run the sync script so that the UUID is the same
-            #       locally as well.
-            #
-            #       -> remove the `.delete()` after the 2024-06-01
-
-            ExerciseComment.objects.filter(exercise=translation).delete()
+            remote_translations[UUID(translation_data['uuid'])] = {
+                'exercise_base_id': local_bases[base_uuid].pk,
+                'name': translation_data['name'],
+                'description': translation_data['description'],
+                'license_id': data['license']['id'],
+                'license_author': data['license_author'],
+                'language_id': translation_data['language'],
+            }
+
+    local_translations = {
+        t.uuid: t
+        for t in Exercise.objects.filter(uuid__in=remote_translations.keys())
+    }
+    new_translations = []
+    updated_translations = []
+    for translation_uuid, values in remote_translations.items():
+        translation = local_translations.get(translation_uuid)
+        if translation is None:
+            new_translations.append(Exercise(uuid=translation_uuid, **values))
+            continue
+
+        if all(getattr(translation, k) == v for k, v in values.items()):
+            counter['translations unchanged'] += 1
+            continue
+
+        for key, value in values.items():
+            setattr(translation, key, value)
+        translation.last_update = now
+        updated_translations.append(translation)
+
+    bulk_create_with_history(new_translations, Exercise, batch_size=batch_size)
+    bulk_update_with_history(
+        updated_translations,
+        Exercise,
+        [
+            'exercise_base',
+            'name',
+            'description',
+            'license',
+            'license_author',
+            'language',
+            'last_update',
+        ],
+        batch_size=batch_size,
+    )
+    counter['translations created'] += len(new_translations)
+    counter['translations updated'] += len(updated_translations)
+
+    translation_ids = dict(
+        Exercise.objects.filter(uuid__in=remote_translations.keys()).values_list('uuid', 'id')
+    )
+    translation_bases = {
+        translation_ids[k]: v['exercise_base_id']
+        for k, v in remote_translations.items()
+    }
+    changed_translation_ids.update(
+        translation_ids[t.uuid] for t in new_translations + updated_translations
+    )
+
+    #
+    # Comments and aliases
+    #
+    remote_comments = {}
+    remote_aliases = {}
+    for base_uuid, data in remote_bases.items():
+        for translation_data in data['exercises']:
+            translation_id = translation_ids[UUID(translation_data['uuid'])]
             for note in translation_data['notes']:
-                ExerciseComment.objects.update_or_create(
-                    uuid=note['uuid'],
-                    defaults={
-                        'uuid': note['uuid'],
-                        'exercise': translation,
-                        'comment': note['comment'],
-                    }
-                )
-
-            Alias.objects.filter(exercise=translation).delete()
+                remote_comments[UUID(note['uuid'])] = (translation_id, note['comment'])
             for alias in translation_data['aliases']:
-                Alias.objects.update_or_create(
-                    uuid=alias['uuid'],
-                    defaults={
-                        'uuid': alias['uuid'],
-                        'exercise': translation,
-                        'alias': alias['alias'],
-                    }
-                )
+                remote_aliases[UUID(alias['uuid'])] = (translation_id, alias['alias'])
+
+    for model, field_name, remote, label in (
+        (ExerciseComment, 'comment', remote_comments, 'comments'),
+        (Alias, 'alias', remote_aliases, 'aliases'),
+    ):
+        changed_translation_ids |= sync_translation_children(
+            model,
+            field_name,
+            remote,
+            translation_bases.keys(),
+            counter,
+            label,
+            batch_size,
+        )
 
-        print_fn('')
+    #
+    # Reset the caches of everything that changed
+    #
+    changed_base_ids.update(
+        translation_bases[i] for i in changed_translation_ids if i in translation_bases
+    )
+    for base_id in changed_base_ids:
+        reset_exercise_base_cache(base_id)
+    ExerciseSearchTerm.index_bases(changed_base_ids)
+
+
+def sync_base_m2m(field_name: str, desired: dict, batch_size: int) -> set:
+    """
+    Brings a many-to-many relation of the exercise bases to the desired state
+
+    Only the rows in the intermediate table that are missing are inserted and
+    only the ones that are not wanted anymore are deleted.
+
+    :param field_name: name of the many-to-many field on ExerciseBase
+    :param desired: dictionary with a set of the wanted target IDs per base ID
+    :param batch_size: number of rows written per query
+    :return: set of base IDs where the relation changed
+    """
+    field = ExerciseBase._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = f'{field.m2m_field_name()}_id'
+    target = f'{field.m2m_reverse_field_name()}_id'
+
+    current = defaultdict(set)
+    stale = []
+    changed = set()
+    rows = through.objects.filter(**{
+        f'{source}__in': desired.keys()
+    }).values_list(
+        'pk',
+        source,
+        target,
+    )
+    for pk, base_id, target_id in rows:
+        if target_id in desired[base_id]:
+            current[base_id].add(target_id)
+        else:
+            stale.append(pk)
+            changed.add(base_id)
+
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+
+    new_rows = []
+    for base_id, target_ids in desired.items():
+        for target_id in target_ids - current[base_id]:
+            new_rows.append(through(**{source: base_id, target: target_id}))
+            changed.add(base_id)
+    through.objects.bulk_create(new_rows, batch_size=batch_size)
+
+    return changed
+
+
+def sync_translation_children(
+    model,
+    field_name: str,
+    remote: dict,
+    translation_ids,
+    counter: Counter,
+    label: str,
+    batch_size: int,
+) -> set:
+    """
+    Synchronizes the comments or aliases of a group of translations
+
+    Entries that are not present anymore on the remote server are deleted.
+
+    :param model: the model class, ExerciseComment or Alias
+    :param field_name: name of the field with the text
+    :param remote: dictionary UUID -> (translation ID, text) with the remote data
+    :param translation_ids: IDs of the translations that are being synchronized
+    :param counter: counter where the created, updated, etc. rows are recorded
+    :param label: prefix used for the counter keys
+    :param batch_size: number of rows written per query
+    :return: set of translation IDs where something changed
+    """
+    local = {
+        obj.uuid: obj
+        for obj in
+        model.objects.filter(Q(exercise_id__in=translation_ids) | Q(uuid__in=remote.keys()))
+    }
+    changed = set()
+    new_objects = []
+    updated_objects = []
+    for obj_uuid, (translation_id, text) in remote.items():
+        obj = local.pop(obj_uuid, None)
+        if obj is None:
+            new_objects.append(
+                model(uuid=obj_uuid, exercise_id=translation_id, **{field_name: text})
+            )
+        elif obj.exercise_id != translation_id or getattr(obj, field_name) != text:
+            changed.add(obj.exercise_id)
+            obj.exercise_id = translation_id
+            setattr(obj, field_name, text)
+            updated_objects.append(obj)
+        else:
+            counter[f'{label} unchanged'] += 1
 
-    print_fn(style_fn('done!\n'))
+    bulk_create_with_history(new_objects, model, batch_size=batch_size)
+    bulk_update_with_history(
+        updated_objects, model, ['exercise', field_name], batch_size=batch_size
+    )
+
+    # Whatever is left was removed on the server
+    if local:
+        model.objects.filter(pk__in=[obj.pk for obj in local.values()]).delete()
+
+    counter[f'{label} created'] += len(new_objects)
+    counter[f'{label} updated'] += len(updated_objects)
+    counter[f'{label} deleted'] += len(local)
+    changed.update(obj.exercise_id for obj in new_objects + updated_objects)
+    changed.update(obj.exercise_id for obj in local.values())
+    return changed
 
 
 def sync_languages(
@@ -301,16 +574,26 @@ def handle_deleted_entries(
     print_fn=None,
     remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
     style_fn=lambda x: x,
+    incremental=False,
 ):
+    """
+    Delete exercises that were removed on the server
+
+    If incremental is set, only the deletion log entries that were added since
+    the last run are processed.
+    """
     if not print_fn:
 
         def print_fn(_):
             return None
 
-    """Delete exercises that were removed on the server"""
     print_fn('*** Deleting exercise data that was removed on the server...')
 
-    url = make_uri(DELETION_LOG_ENDPOINT, server_url=remote_url, query={'limit': 100})
+    query = {'limit': 100}
+    since = SyncCheckpoint.get_mark(remote_url, DELETION_LOG_ENDPOINT) if incremental else None
+    if since:
+        query['timestamp__gt'] = quote(since.isoformat())
+    url = make_uri(DELETION_LOG_ENDPOINT, server_url=remote_url, query=query)
     result = get_paginated(url, headers=wger_headers())
 
     for data in result:
@@ -374,11 +657,18 @@ def handle_deleted_entries(
             except ExerciseVideo.DoesNotExist:
                 pass
 
+    SyncCheckpoint.set_mark(
+        remote_url,
+        DELETION_LOG_ENDPOINT,
+        max_timestamp(None, result, 'timestamp'),
+    )
+
 
 def download_exercise_images(
     print_fn,
     remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
     style_fn=lambda x: x,
+    max_workers=DOWNLOAD_WORKERS,
 ):
     headers = wger_headers()
     url = make_uri(IMAGE_ENDPOINT, server_url=remote_url)
@@ -396,6 +686,7 @@ def download_exercise_images(
     if deleted:
         print_fn(f'Deleted {deleted} images without associated image files')
 
+    pending = []
     for image_data in result:
         image_uuid = image_data['uuid']
 
@@ -407,22 +698,30 @@ def download_exercise_images(
             print_fn('    Remote exercise base not found in local DB, skipping...')
             continue
 
-        try:
-            ExerciseImage.objects.get(uuid=image_uuid)
+        if ExerciseImage.objects.filter(uuid=image_uuid).exists():
             print_fn('    Image already present locally, skipping...')
             continue
-        except ExerciseImage.DoesNotExist:
-            print_fn('    Image not found in local DB, creating now...')
-            retrieved_image = requests.get(image_data['image'], headers=headers)
-            image = ExerciseImage.from_json(exercise_base, retrieved_image, image_data)
 
-        print_fn(style_fn('    successfully saved'))
+        print_fn('    Image not found in local DB, queued for download...')
+        pending.append((exercise_base, image_data))
+
+    # The files are downloaded in parallel, the database is only written here.
+    # Files that are already in the media store are not downloaded again
+    blobs = MediaBlob.fetch_many(
+        [(image_data['image'], image_data.get('sha256')) for _, image_data in pending],
+        headers=headers,
+        max_workers=max_workers,
+    )
+    for (exercise_base, image_data), blob in zip(pending, blobs):
+        ExerciseImage.from_json(exercise_base, blob, image_data)
+        print_fn(style_fn(f"Image {image_data['uuid']} successfully saved"))
 
 
 def download_exercise_videos(
     print_fn,
     remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
     style_fn=lambda x: x,
+    max_workers=DOWNLOAD_WORKERS,
 ):
     headers = wger_headers()
     url = make_uri(VIDEO_ENDPOINT, server_url=remote_url)
@@ -430,6 +729,7 @@ def download_exercise_videos(
 
     print_fn('*** Processing videos ***')
 
+    pending = []
     for video_data in result:
         video_uuid = video_data['uuid']
         print_fn(f'Processing video {video_uuid}')
@@ -440,28 +740,34 @@ def download_exercise_videos(
             print_fn('    Remote exercise base not found in local DB, skipping...')
             continue
 
-        try:
-            ExerciseVideo.objects.get(uuid=video_uuid)
+        if ExerciseVideo.objects.filter(uuid=video_uuid).exists():
             print_fn('    Video already present locally, skipping...')
             continue
-        except ExerciseVideo.DoesNotExist:
-            print_fn('    Video not found in local DB, creating now...')
-            video = ExerciseVideo()
-            video.exercise_base = exercise_base
-            video.uuid = video_uuid
-            video.is_main = video_data['is_main']
-            video.license_id = video_data['license']
-            video.license_author = video_data['license_author']
-            video.size = video_data['size']
-            video.width = video_data['width']
-            video.height = video_data['height']
-            video.codec = video_data['codec']
-            video.codec_long = video_data['codec_long']
-            video.duration = video_data['duration']
 
+        print_fn('    Video not found in local DB, queued for download...')
+        video = ExerciseVideo()
+        video.exercise_base = exercise_base
+        video.uuid = video_uuid
+        video.is_main = video_data['is_main']
+        video.license_id = video_data['license']
+        video.license_author = video_data['license_author']
+        video.size = video_data['size']
+        video.width = video_data['width']
+        video.height = video_data['height']
+        video.codec = video_data['codec']
+        video.codec_long = video_data['codec_long']
+        video.duration = video_data['duration']
+        pending.append((video, video_data))
+
+    # The files are downloaded in parallel, the database is only written here
+    responses = fetch_many(
+        [video_data['video'] for _, video_data in pending],
+        headers=headers,
+        max_workers=max_workers,
+    )
+    for (video, video_data), retrieved_video in zip(pending, responses):
         # Save the downloaded video
         # http://stackoverflow.com/questions/1308386/programmatically-saving-image-to-
-        retrieved_video = requests.get(video_data['video'], headers=headers)
 
         # Temporary files on Windows don't support the delete attribute
         if os.name == 'nt':
@@ -476,4 +782,4 @@ def download_exercise_videos(
             File(img_temp),
         )
         video.save()
-        print_fn(style_fn('    saved successfully'))
+        print_fn(style_fn(f"Video {video_data['uuid']} saved successfully"))
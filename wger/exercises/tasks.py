@@ -44,14 +44,17 @@ logger = logging.getLogger(__name__)
 def sync_exercises_task():
     """
     Fetches the current exercises from the default wger instance
+
+    Only the exercises and deletion log entries that changed since the last
+    run are requested
     """
     sync_languages(logger.info)
     sync_licenses(logger.info)
     sync_categories(logger.info)
     sync_muscles(logger.info)
     sync_equipment(logger.info)
-    sync_exercises(logger.info)
-    handle_deleted_entries(logger.info)
+    sync_exercises(logger.info, incremental=True)
+    handle_deleted_entries(logger.info, incremental=True)
 
 
 @app.task
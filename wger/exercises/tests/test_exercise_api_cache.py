@@ -13,7 +13,6 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.core.cache import cache
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
@@ -23,7 +22,10 @@ from wger.exercises.models import (
     ExerciseBase,
     ExerciseComment,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 class ExerciseApiCacheTestCase(WgerTestCase):
@@ -41,106 +43,106 @@ class ExerciseApiCacheTestCase(WgerTestCase):
         """
         Tests editing an exercise
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         exercise = ExerciseBase.objects.get(pk=1)
         exercise.category_id = 1
         exercise.save()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_delete_exercise(self):
         """
         Tests deleting an exercise
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         exercise = ExerciseBase.objects.get(pk=1)
         exercise.delete()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_edit_translation(self):
         """
         Tests editing a translation
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         translation = Exercise.objects.get(pk=1)
         translation.name = "something else"
         translation.save()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_delete_translation(self):
         """
         Tests deleting a translation
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         translation = Exercise.objects.get(pk=1)
         translation.delete()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_edit_comment(self):
         """
         Tests editing a comment
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         comment = ExerciseComment.objects.get(pk=1)
         comment.name = "The Shiba Inu (柴犬) is a breed of hunting dog from Japan"
         comment.save()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_delete_comment(self):
         """
         Tests deleting a comment
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         comment = ExerciseComment.objects.get(pk=1)
         comment.delete()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_edit_alias(self):
         """
         Tests editing an alias
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         alias = Alias.objects.get(pk=1)
         alias.name = "Hachikō"
         alias.save()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
 
     def test_delete_alias(self):
         """
         Tests deleting an alias
         """
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
         self.client.get(self.url)
-        self.assertTrue(cache.get(self.cache_key))
+        self.assertTrue(tagged_cache.get(self.cache_key))
 
         alias = Alias.objects.get(pk=1)
         alias.delete()
 
-        self.assertFalse(cache.get(self.cache_key))
+        self.assertFalse(tagged_cache.get(self.cache_key))
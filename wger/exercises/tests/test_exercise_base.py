@@ -13,8 +13,12 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import datetime
 from uuid import UUID
 
+# Django
+from django.urls import reverse
+
 # Third Party
 from rest_framework import status
 
@@ -25,6 +29,8 @@ from wger.exercises.models import (
     DeletionLog,
     Exercise,
     ExerciseBase,
+    ExerciseImage,
+    ExerciseVideo,
 )
 from wger.utils.constants import CC_BY_SA_4_ID
 
@@ -152,3 +158,34 @@ class ExerciseCustomApiTestCase(ExerciseCrudApiTestCase):
 
         exercise = ExerciseBase.objects.get(pk=self.pk)
         self.assertEqual(exercise.license_id, CC_BY_SA_4_ID)
+
+
+class ExerciseBaseInfoFilterTestCase(WgerTestCase):
+    """
+    Test the filters used by the incremental synchronization
+    """
+
+    def test_filter_last_update_global(self):
+        ExerciseBase.objects.update(
+            last_update=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        Exercise.objects.update(
+            last_update=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        ExerciseImage.objects.update(
+            last_update=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        ExerciseVideo.objects.update(
+            last_update=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        Exercise.objects.filter(pk=1).update(
+            last_update=datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+
+        response = self.client.get(
+            reverse('exercisebaseinfo-list'),
+            {'last_update_global__gt': '2022-01-01T00:00:00Z'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], 1)
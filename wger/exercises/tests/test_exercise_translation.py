@@ -16,7 +16,6 @@
 import json
 
 # Django
-from django.core.cache import cache
 from django.template import (
     Context,
     Template,
@@ -37,7 +36,10 @@ from wger.exercises.models import (
     Exercise,
     Muscle,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 from wger.utils.constants import CC_BY_SA_4_ID
 
 
@@ -238,10 +240,10 @@ class WorkoutCacheTestCase(WgerTestCase):
         for setting in exercise.exercise_base.setting_set.all():
             setting.set.exerciseday.training.canonical_representation
             workout_id = setting.set.exerciseday.training_id
-            self.assertTrue(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+            self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
             exercise.save()
-            self.assertFalse(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+            self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
     def test_canonical_form_cache_delete(self):
         """
@@ -254,11 +256,11 @@ class WorkoutCacheTestCase(WgerTestCase):
             workout_id = setting.set.exerciseday.training_id
             workout_ids.append(workout_id)
             setting.set.exerciseday.training.canonical_representation
-            self.assertTrue(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+            self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
         exercise.delete()
         for workout_id in workout_ids:
-            self.assertFalse(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+            self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
 
 # TODO: fix test, all registered users can upload exercises
@@ -13,12 +13,24 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
+# Standard Library
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+
 # Third Party
 from rest_framework import status
 
 # wger
+from wger.core.models import Language
 from wger.core.tests.api_base_test import ApiBaseTestCase
 from wger.core.tests.base_testcase import BaseTestCase
+from wger.exercises.models import (
+    Alias,
+    Exercise,
+    ExerciseSearchTerm,
+)
 
 
 class SearchExerciseApiTestCase(BaseTestCase, ApiBaseTestCase):
@@ -94,3 +106,58 @@ class SearchExerciseApiTestCase(BaseTestCase, ApiBaseTestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['suggestions']), 4)
+
+    def test_search_prefix_of_word(self):
+        """
+        The start of any word matches, names starting with the term come first
+        """
+        Exercise.objects.filter(pk=3).update(name='Exercise boring')
+        call_command('rebuild-exercise-search-index', stdout=StringIO())
+
+        response = self.client.get(self.url + '?term=exerc')
+        names = [r['value'] for r in response.data['suggestions']]
+        self.assertEqual(names[0], 'Exercise boring')
+        self.assertEqual(len(names), 4)
+
+        response = self.client.get(self.url + '?term=xercise')
+        self.assertEqual(len(response.data['suggestions']), 4)
+
+    def test_search_alias(self):
+        """
+        Aliases are found as well, the result is the translation
+        """
+        response = self.client.get(self.url + '?term=another')
+
+        self.assertEqual(len(response.data['suggestions']), 1)
+        self.assertEqual(response.data['suggestions'][0]['value'], 'Very cool exercise')
+        self.assertEqual(response.data['suggestions'][0]['data']['base_id'], 2)
+
+    def test_search_case_and_accents(self):
+        response = self.client.get(self.url + '?term=TESTUBUNG&language=de')
+
+        self.assertEqual(len(response.data['suggestions']), 1)
+        self.assertEqual(response.data['suggestions'][0]['data']['id'], 7)
+
+    def test_search_single_query(self):
+        """
+        The search itself is one query, regardless of the number of results
+        """
+        languages = Language.objects.filter(short_name__in=['en', 'de'])
+        with self.assertNumQueries(1):
+            results = ExerciseSearchTerm.search('exercise', languages)
+        self.assertEqual(len(results), 4)
+
+    def test_index_updated(self):
+        """
+        The index is updated when exercises or aliases are saved
+        """
+        exercise = Exercise.objects.get(pk=1)
+        exercise.name = 'Zottel press'
+        exercise.save()
+        Alias(exercise=exercise, alias='Wobble').save()
+
+        response = self.client.get(self.url + '?term=zottel')
+        self.assertEqual(len(response.data['suggestions']), 1)
+        response = self.client.get(self.url + '?term=wobb')
+        self.assertEqual(response.data['suggestions'][0]['value'], 'Zottel press')
+        self.assertFalse(ExerciseSearchTerm.objects.filter(term='an exercise').exists())
@@ -13,19 +13,23 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import datetime
 from unittest.mock import patch
 
 # wger
 from wger.core.models import (
     Language,
     License,
+    SyncCheckpoint,
 )
 from wger.core.tests.base_testcase import WgerTestCase
 from wger.exercises.models import (
+    Alias,
     Equipment,
     Exercise,
     ExerciseBase,
     ExerciseCategory,
+    ExerciseComment,
     Muscle,
 )
 from wger.exercises.sync import (
@@ -41,7 +45,10 @@ from wger.manager.models import (
     Setting,
     WorkoutLog,
 )
-from wger.utils.requests import wger_headers
+from wger.utils.requests import (
+    REQUEST_TIMEOUT,
+    wger_headers,
+)
 
 
 class MockLanguageResponse:
@@ -563,7 +570,7 @@ class MockExerciseResponse:
 
 class TestSyncMethods(WgerTestCase):
 
-    @patch('requests.get', return_value=MockLanguageResponse())
+    @patch('requests.Session.get', return_value=MockLanguageResponse())
     def test_language_sync(self, mock_request):
         self.assertEqual(Language.objects.count(), 3)
         self.assertEqual(Language.objects.get(pk=1).full_name, 'Deutsch')
@@ -572,12 +579,13 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/language/',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(Language.objects.get(pk=1).full_name, 'Daitsch')
         self.assertEqual(Language.objects.get(pk=5).full_name, 'Esperanto')
         self.assertEqual(Language.objects.count(), 5)
 
-    @patch('requests.get', return_value=MockLicenseResponse())
+    @patch('requests.Session.get', return_value=MockLicenseResponse())
     def test_license_sync(self, mock_request):
         self.assertEqual(License.objects.count(), 3)
         self.assertEqual(License.objects.get(pk=1).url, '')
@@ -586,6 +594,7 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/license/',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(
             License.objects.get(pk=1).url,
@@ -597,7 +606,7 @@ class TestSyncMethods(WgerTestCase):
         )
         self.assertEqual(License.objects.count(), 4)
 
-    @patch('requests.get', return_value=MockCategoryResponse())
+    @patch('requests.Session.get', return_value=MockCategoryResponse())
     def test_categories_sync(self, mock_request):
         self.assertEqual(ExerciseCategory.objects.count(), 4)
         self.assertEqual(ExerciseCategory.objects.get(pk=1).name, 'Category')
@@ -606,12 +615,13 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/exercisecategory/',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(ExerciseCategory.objects.count(), 6)
         self.assertEqual(ExerciseCategory.objects.get(pk=1).name, 'A cooler, swaggier category')
         self.assertEqual(ExerciseCategory.objects.get(pk=16).name, 'Chest')
 
-    @patch('requests.get', return_value=MockMuscleResponse())
+    @patch('requests.Session.get', return_value=MockMuscleResponse())
     def test_muscle_sync(self, mock_request):
         self.assertEqual(Muscle.objects.count(), 6)
         self.assertEqual(Muscle.objects.get(pk=2).name, 'Biceps testii')
@@ -621,13 +631,14 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/muscle/',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(Muscle.objects.count(), 7)
         self.assertTrue(Muscle.objects.get(pk=2).is_front)
         self.assertEqual(Muscle.objects.get(pk=2).name, 'Novum musculus nomen eius')
         self.assertEqual(Muscle.objects.get(pk=10).name, 'Pectoralis major')
 
-    @patch('requests.get', return_value=MockEquipmentResponse())
+    @patch('requests.Session.get', return_value=MockEquipmentResponse())
     def test_equipment_sync(self, mock_request):
         self.assertEqual(Equipment.objects.count(), 3)
         self.assertEqual(Equipment.objects.get(pk=3).name, 'Something else')
@@ -636,12 +647,13 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/equipment/',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(Equipment.objects.count(), 4)
         self.assertEqual(Equipment.objects.get(pk=3).name, 'A big rock')
         self.assertEqual(Equipment.objects.get(pk=42).name, 'Gym mat')
 
-    @patch('requests.get', return_value=MockDeletionLogResponse())
+    @patch('requests.Session.get', return_value=MockDeletionLogResponse())
     def test_deletion_log(self, mock_request):
         self.assertEqual(ExerciseBase.objects.count(), 8)
         self.assertEqual(Exercise.objects.count(), 11)
@@ -659,6 +671,7 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/deletion-log/?limit=100',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(ExerciseBase.objects.count(), 7)
         self.assertEqual(Exercise.objects.count(), 8)
@@ -671,7 +684,7 @@ class TestSyncMethods(WgerTestCase):
         for setting_pk in logs:
             self.assertEqual(WorkoutLog.objects.get(pk=setting_pk).exercise_base_id, 2)
 
-    @patch('requests.get', return_value=MockExerciseResponse())
+    @patch('requests.Session.get', return_value=MockExerciseResponse())
     def test_exercise_sync(self, mock_request):
         self.assertEqual(ExerciseBase.objects.count(), 8)
         self.assertEqual(Exercise.objects.count(), 11)
@@ -683,6 +696,7 @@ class TestSyncMethods(WgerTestCase):
         mock_request.assert_called_with(
             'https://wger.de/api/v2/exercisebaseinfo/?limit=100',
             headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
         )
         self.assertEqual(ExerciseBase.objects.count(), 9)
         self.assertEqual(Exercise.objects.count(), 14)
@@ -725,3 +739,80 @@ class TestSyncMethods(WgerTestCase):
 
         translation_fr = base.get_translation('fr')
         self.assertEqual(str(translation_fr.uuid), '581338a1-8e52-405b-99eb-f0724c528bc8')
+
+    @patch('requests.Session.get', return_value=MockExerciseResponse())
+    def test_exercise_sync_counts(self, mock_request):
+        """
+        Test that the sync reports the changes and doesn't write unchanged rows
+        """
+        counter = sync_exercises(lambda x: x)
+        self.assertEqual(counter['bases created'], 1)
+        self.assertEqual(counter['bases updated'], 1)
+        self.assertEqual(counter['translations created'], 3)
+        self.assertEqual(counter['translations updated'], 1)
+        self.assertEqual(counter['aliases created'], 3)
+        self.assertEqual(counter['comments created'], 2)
+
+        # Running the sync again doesn't change anything
+        with self.assertNumQueries(13):
+            counter = sync_exercises(lambda x: x)
+        self.assertEqual(counter['bases created'], 0)
+        self.assertEqual(counter['bases updated'], 0)
+        self.assertEqual(counter['bases unchanged'], 2)
+        self.assertEqual(counter['translations updated'], 0)
+        self.assertEqual(counter['translations unchanged'], 4)
+        self.assertEqual(counter['aliases unchanged'], 3)
+        self.assertEqual(counter['comments unchanged'], 2)
+
+    @patch('requests.Session.get', return_value=MockExerciseResponse())
+    def test_exercise_sync_removed_entries(self, mock_request):
+        """
+        Test that comments and aliases removed on the server are deleted
+        """
+        translation = Exercise.objects.get(uuid='7524ca8d-032e-482d-ab18-40e8a97851f6')
+        ExerciseComment.objects.create(exercise=translation, comment='Only local')
+        Alias.objects.create(exercise=translation, alias='Only local')
+
+        counter = sync_exercises(lambda x: x)
+        self.assertFalse(ExerciseComment.objects.filter(comment='Only local').exists())
+        self.assertFalse(Alias.objects.filter(alias='Only local').exists())
+        self.assertTrue(counter['comments deleted'])
+        self.assertTrue(counter['aliases deleted'])
+
+    @patch('requests.Session.get', return_value=MockExerciseResponse())
+    def test_exercise_sync_incremental(self, mock_request):
+        """
+        Test that the incremental sync only requests the modified exercises
+        """
+        sync_exercises(lambda x: x, incremental=True)
+        mock_request.assert_called_with(
+            'https://wger.de/api/v2/exercisebaseinfo/?limit=100',
+            headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
+        )
+        self.assertEqual(
+            SyncCheckpoint.get_mark('https://wger.de', 'exercisebaseinfo'),
+            datetime.datetime(2023, 8, 15, 22, 33, 11, 779000, tzinfo=datetime.timezone.utc),
+        )
+
+        sync_exercises(lambda x: x, incremental=True)
+        mock_request.assert_called_with(
+            'https://wger.de/api/v2/exercisebaseinfo/?limit=100'
+            '&last_update_global__gt=2023-08-15T22%3A33%3A11.779000%2B00%3A00',
+            headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    @patch('requests.Session.get', return_value=MockDeletionLogResponse())
+    def test_deletion_log_incremental(self, mock_request):
+        """
+        Test that the incremental sync only requests new deletion log entries
+        """
+        handle_deleted_entries(incremental=True)
+        handle_deleted_entries(incremental=True)
+        mock_request.assert_called_with(
+            'https://wger.de/api/v2/deletion-log/?limit=100'
+            '&timestamp__gt=2023-01-30T18%3A32%3A56.765350%2B00%3A00',
+            headers=wger_headers(),
+            timeout=REQUEST_TIMEOUT,
+        )
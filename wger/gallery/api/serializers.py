@@ -9,7 +9,8 @@ class ImageSerializer(serializers.ModelSerializer):
     """
     Exercise serializer
     """
+    srcset = serializers.ReadOnlyField(source='thumbnail_srcset')
 
     class Meta:
         model = Image
-        fields = ['id', 'date', 'image', 'description', 'height', 'width']
+        fields = ['id', 'date', 'image', 'srcset', 'description', 'height', 'width']
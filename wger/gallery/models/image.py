@@ -25,6 +25,16 @@ from django.db import models
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
+# Third Party
+from easy_thumbnails.files import get_thumbnailer
+
+# wger
+from wger.utils.models import (
+    AbstractThumbnailModel,
+    delete_image_thumbnail_formats,
+    schedule_thumbnails,
+)
+
 
 def gallery_upload_dir(instance, filename):
     """
@@ -37,7 +47,7 @@ def gallery_upload_dir(instance, filename):
     )
 
 
-class Image(models.Model):
+class Image(AbstractThumbnailModel, models.Model):
 
     class Meta:
         ordering = [
@@ -90,6 +100,7 @@ def auto_delete_file_on_delete(sender, instance: Image, **kwargs):
     when corresponding `MediaFile` object is deleted.
     """
     if instance.image:
+        get_thumbnailer(instance.image).delete_thumbnails()
 
         path = pathlib.Path(instance.image.path)
         if path.exists():
@@ -116,3 +127,7 @@ def auto_delete_file_on_change(sender, instance: Image, **kwargs):
         path = pathlib.Path(old_file.path)
         if path.is_file():
             path.unlink()
+
+
+models.signals.post_save.connect(schedule_thumbnails, sender=Image)
+models.signals.post_delete.connect(delete_image_thumbnail_formats, sender=Image)
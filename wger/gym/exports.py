@@ -0,0 +1,81 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import csv
+import datetime
+
+# Django
+from django.utils.translation import gettext as _
+
+# wger
+from wger.gym.models import Gym
+from wger.utils.export import CsvExport
+
+
+class MemberExport(CsvExport):
+    """
+    Exports all members of a gym
+    """
+
+    delimiter = '\t'
+    quoting = csv.QUOTE_ALL
+
+    def __init__(self, user, gym_pk):
+        super().__init__(user, gym_pk=gym_pk)
+        self.gym = Gym.objects.get(pk=gym_pk)
+
+    def get_filename(self):
+        today = datetime.date.today()
+        return 'User-data-gym-{gym}-{t.year}-{t.month:02d}-{t.day:02d}.csv'.format(
+            t=today, gym=self.gym.id
+        )
+
+    def get_header(self):
+        return [
+            _('Nr.'),
+            _('Gym'),
+            _('Username'),
+            _('Email'),
+            _('First name'),
+            _('Last name'),
+            _('Gender'),
+            _('Age'),
+            _('ZIP code'),
+            _('City'),
+            _('Street'),
+            _('Phone'),
+        ]
+
+    def get_queryset(self):
+        return Gym.objects.get_members(self.gym.pk).prefetch_related('contract_member')
+
+    def get_row(self, user):
+        address = user.userprofile.address
+        return [
+            user.id,
+            self.gym.name,
+            user.username,
+            user.email,
+            user.first_name,
+            user.last_name,
+            user.userprofile.get_gender_display(),
+            user.userprofile.age,
+            address['zip_code'],
+            address['city'],
+            address['street'],
+            address['phone'],
+        ]
@@ -14,6 +14,18 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Django
+from django.db import transaction
+from django.db.models import (
+    OuterRef,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+)
+
 
 def get_user_last_activity(user):
     """
@@ -52,6 +64,69 @@ def get_user_last_activity(user):
     return last_activity
 
 
+def register_user_activity(user_id, date):
+    """
+    Moves the cached last activity of the user forward to the given date
+
+    This is a single conditional update, the other logs and sessions of the
+    user don't need to be looked at, since the last activity can only move
+    forward when saving an entry.
+    """
+    # wger
+    from wger.core.models import UserCache
+
+    UserCache.objects.filter(
+        Q(last_activity__isnull=True) | Q(last_activity__lt=date),
+        user_id=user_id,
+    ).update(last_activity=date)
+
+
+def update_user_last_activity(user_ids=None, since=None):
+    """
+    Recalculates the cached last activity of the users, with one update query
+
+    :param user_ids: list of user IDs, defaults to all users
+    :param since: only recalculate the users whose cached last activity is
+                  not later than this date, e.g. the date of a deleted entry
+    """
+    # wger
+    from wger.core.models import UserCache
+    from wger.manager.models import (
+        WorkoutLog,
+        WorkoutSession,
+    )
+
+    last_log = WorkoutLog.objects.filter(user_id=OuterRef('user_id')).order_by('-date')
+    last_session = WorkoutSession.objects.filter(user_id=OuterRef('user_id')).order_by('-date')
+    last_log = Subquery(last_log.values('date')[:1])
+    last_session = Subquery(last_session.values('date')[:1])
+
+    caches = UserCache.objects.all()
+    if user_ids is not None:
+        caches = caches.filter(user_id__in=user_ids)
+    if since is not None:
+        caches = caches.filter(last_activity__lte=since)
+
+    # Greatest returns NULL on some databases if one of the values is NULL
+    caches.update(
+        last_activity=Greatest(
+            Coalesce(last_log, last_session),
+            Coalesce(last_session, last_log),
+        )
+    )
+
+
+def schedule_user_last_activity_update(user_id, since):
+    """
+    Recalculates the cached last activity of the user after the current
+    transaction is committed, e.g. after deleting an entry
+
+    Only needed if the entry could have been the last one, see
+    update_user_last_activity.
+    """
+    transaction.on_commit(lambda: update_user_last_activity([user_id], since=since))
+
+
 def is_any_gym_admin(user):
     """
     Small utility that checks that the user object has any administrator
@@ -24,7 +24,6 @@ from django.utils import translation
 from django.utils.translation import gettext as _
 
 # wger
-from wger.gym.helpers import is_any_gym_admin
 from wger.gym.models import Gym
 
 
@@ -41,7 +40,7 @@ class Command(BaseCommand):
 
         today = datetime.date.today()
 
-        for gym in Gym.objects.all():
+        for gym in Gym.objects.select_related('config'):
             if int(options['verbosity']) >= 2:
                 self.stdout.write("* Processing gym '{}' ".format(gym))
 
@@ -55,26 +54,27 @@ class Command(BaseCommand):
                     self.stdout.write("  Reminders deactivatd, skipping")
                 continue
 
-            for profile in gym.userprofile_set.all():
-                user = profile.user
+            users = Gym.objects.get_users(gym.pk
+                                          ).select_related('userprofile__notification_language', )
+            for user in users:
 
                 # check if the account was deactivated (user can't login)
                 if not user.is_active:
                     continue
 
                 # add to trainer list that will be notified
-                if user.has_perm('gym.gym_trainer'):
+                if user.gym_trainer:
                     trainer_list.append(user)
 
                 # Check appropriate permissions
-                if is_any_gym_admin(user):
+                if user.is_gym_admin:
                     continue
 
                 # Check user preferences
-                if not user.gymuserconfig.include_inactive:
+                if not user.include_inactive:
                     continue
 
-                last_activity = user.usercache.last_activity
+                last_activity = user.last_activity
                 if not last_activity:
                     user_list_no_activity.append({'user': user, 'last_activity': last_activity})
                 elif today - last_activity > datetime.timedelta(weeks=weeks):
@@ -88,7 +88,7 @@ class Command(BaseCommand):
                         continue
 
                     # Check trainer preferences
-                    if not trainer.gymadminconfig.overview_inactive:
+                    if not trainer.overview_inactive:
                         continue
 
                     translation.activate(trainer.userprofile.notification_language.short_name)
@@ -20,7 +20,48 @@ from django.contrib.auth.models import (
     User,
 )
 from django.db import models
-from django.db.models import Q
+from django.db.models import (
+    BooleanField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+)
+
+
+def has_gym_perm(*codenames):
+    """
+    Returns an expression for User querysets, whether the user has any of the
+    given gym permissions, directly or through a group
+
+    Unlike User.has_perm, this is also true for deactivated users.
+    """
+    permissions = Permission.objects.filter(
+        Q(group__user=OuterRef('pk')) | Q(user=OuterRef('pk')),
+        content_type__app_label='gym',
+        codename__in=codenames,
+    )
+    return ExpressionWrapper(
+        Q(is_superuser=True) | Exists(permissions),
+        output_field=BooleanField(),
+    )
+
+
+def has_gym_group_perm(*codenames):
+    """
+    Returns an expression for User querysets, whether any of the user's groups
+    has one of the given gym permissions
+
+    This is what separates a gym's admins from its members. Superusers and
+    permissions assigned directly to the user are not taken into account.
+    """
+    permissions = Permission.objects.filter(
+        group__user=OuterRef('pk'),
+        content_type__app_label='gym',
+        codename__in=codenames,
+    )
+    return Exists(permissions)
 
 
 class GymManager(models.Manager):
@@ -28,32 +69,42 @@ class GymManager(models.Manager):
     Custom query manager for Gyms
     """
 
+    def get_users(self, gym_pk):
+        """
+        Returns all users for this gym, with their roles and the information
+        needed for the member lists and reports, in one query
+
+        The users are annotated with:
+
+        * manage_gym, manage_gyms, gym_trainer: the user's gym permissions
+        * is_gym_admin: whether the user has any of them
+        * in_admin_group: whether the user is in a group with any of them,
+          i.e. if the user is listed as admin and not as member
+        * include_inactive: the member's preference for the inactive overview
+        * overview_inactive: the trainer's preference for the inactive overview
+        * last_activity: the cached last activity
+        """
+        return User.objects.filter(
+            userprofile__gym_id=gym_pk
+        ).select_related('userprofile__gym', ).annotate(
+            manage_gym=has_gym_perm('manage_gym'),
+            manage_gyms=has_gym_perm('manage_gyms'),
+            gym_trainer=has_gym_perm('gym_trainer'),
+            include_inactive=F('gymuserconfig__include_inactive'),
+            overview_inactive=F('gymadminconfig__overview_inactive'),
+            last_activity=F('usercache__last_activity'),
+            is_gym_admin=has_gym_perm('manage_gym', 'manage_gyms', 'gym_trainer'),
+            in_admin_group=has_gym_group_perm('manage_gym', 'manage_gyms', 'gym_trainer'),
+        )
+
     def get_members(self, gym_pk):
         """
         Returns all members for this gym (i.e non-admin ones)
         """
-        perm_gym = Permission.objects.get(codename='manage_gym')
-        perm_gyms = Permission.objects.get(codename='manage_gyms')
-        perm_trainer = Permission.objects.get(codename='gym_trainer')
-
-        users = User.objects.filter(userprofile__gym_id=gym_pk)
-        return users.exclude(
-            Q(groups__permissions=perm_gym)
-            | Q(groups__permissions=perm_gyms)
-            | Q(groups__permissions=perm_trainer)
-        ).distinct()
+        return self.get_users(gym_pk).filter(in_admin_group=False)
 
     def get_admins(self, gym_pk):
         """
         Returns all admins for this gym (i.e trainers, managers, etc.)
         """
-        perm_gym = Permission.objects.get(codename='manage_gym')
-        perm_gyms = Permission.objects.get(codename='manage_gyms')
-        perm_trainer = Permission.objects.get(codename='gym_trainer')
-
-        users = User.objects.filter(userprofile__gym_id=gym_pk)
-        return users.filter(
-            Q(groups__permissions=perm_gym)
-            | Q(groups__permissions=perm_gyms)
-            | Q(groups__permissions=perm_trainer)
-        ).distinct()
+        return self.get_users(gym_pk).filter(in_admin_group=True)
@@ -16,9 +16,12 @@
 import datetime
 
 # Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 # wger
+from wger.core.models import UserProfile
 from wger.core.tests.base_testcase import WgerTestCase
 from wger.gym.models import Gym
 
@@ -47,8 +50,9 @@ class GymMembersCsvExportTestCase(WgerTestCase):
             self.assertEqual(
                 response['Content-Disposition'], 'attachment; filename={0}'.format(filename)
             )
-            self.assertGreaterEqual(len(response.content), 1000)
-            self.assertLessEqual(len(response.content), 1300)
+            content = b''.join(response.streaming_content)
+            self.assertGreaterEqual(len(content), 1000)
+            self.assertLessEqual(len(content), 1300)
 
     def test_export_csv_authorized(self):
         """
@@ -83,3 +87,21 @@ class GymMembersCsvExportTestCase(WgerTestCase):
         """
         self.user_logout()
         self.export_csv(fail=True)
+
+    def test_export_csv_queries(self):
+        """
+        Test that the number of queries does not depend on the number of members
+        """
+        self.user_login('general_manager1')
+        url = reverse('gym:export:users', kwargs={'gym_pk': 1})
+        b''.join(self.client.get(url).streaming_content)
+
+        with CaptureQueriesContext(connection) as context:
+            b''.join(self.client.get(url).streaming_content)
+        queries = len(context.captured_queries)
+
+        UserProfile.objects.filter(gym_id=2).update(gym_id=1)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+            content = b''.join(response.streaming_content)
+        self.assertEqual(content.decode().count('\n'), 14)
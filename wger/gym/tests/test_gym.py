@@ -14,7 +14,16 @@
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
 # Django
-from django.urls import reverse_lazy
+from django.contrib.auth.models import (
+    Permission,
+    User,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import (
+    reverse,
+    reverse_lazy,
+)
 
 # wger
 from wger.core.models import UserProfile
@@ -26,6 +35,7 @@ from wger.core.tests.base_testcase import (
     WgerTestCase,
     delete_testcase_add_methods,
 )
+from wger.gym.helpers import is_any_gym_admin
 from wger.gym.models import Gym
 
 
@@ -169,3 +179,71 @@ class GymTestCase(WgerTestCase):
 
         gym.delete()
         self.assertEqual(UserProfile.objects.filter(gym_id=1).count(), 0)
+
+    def test_get_users(self):
+        """
+        Tests that the users are annotated with the same roles as their
+        permissions, with one query
+        """
+        with self.assertNumQueries(1):
+            users = list(Gym.objects.get_users(1))
+        self.assertEqual(len(users), 17)
+
+        for user in users:
+            self.assertEqual(user.manage_gym, user.has_perm('gym.manage_gym'))
+            self.assertEqual(user.manage_gyms, user.has_perm('gym.manage_gyms'))
+            self.assertEqual(user.gym_trainer, user.has_perm('gym.gym_trainer'))
+            self.assertEqual(user.is_gym_admin, is_any_gym_admin(user))
+            self.assertEqual(user.last_activity, user.usercache.last_activity)
+
+        self.assertEqual(
+            sorted(user.pk for user in Gym.objects.get_members(1)),
+            [2, 14, 15, 16, 17, 18, 21, 22, 23, 24],
+        )
+        self.assertEqual(
+            sorted(user.pk for user in Gym.objects.get_admins(1)),
+            [1, 4, 5, 6, 9, 10, 12],
+        )
+
+    def test_get_members_superuser_direct_permission(self):
+        """
+        Tests that only the permissions of the groups make a user an admin,
+        not being a superuser or having a permission assigned directly
+        """
+        superuser = User.objects.get(pk=2)
+        superuser.is_superuser = True
+        superuser.save()
+        trainer = User.objects.get(pk=14)
+        trainer.user_permissions.add(Permission.objects.get(codename='gym_trainer'))
+
+        members = {user.pk: user for user in Gym.objects.get_members(1)}
+        self.assertIn(2, members)
+        self.assertIn(14, members)
+        self.assertTrue(members[2].is_gym_admin)
+        self.assertTrue(members[14].gym_trainer)
+        self.assertNotIn(2, [user.pk for user in Gym.objects.get_admins(1)])
+        self.assertNotIn(14, [user.pk for user in Gym.objects.get_admins(1)])
+
+        self.user_login('admin')
+        response = self.client.get(reverse('gym:gym:user-list', kwargs={'pk': 1}))
+        member_ids = [member['obj'].pk for member in response.context['object_list']['members']]
+        self.assertIn(2, member_ids)
+        self.assertIn(14, member_ids)
+
+    def test_member_list_queries(self):
+        """
+        Tests that the number of queries of the member list does not depend
+        on the number of members
+        """
+        self.user_login('admin')
+        url = reverse('gym:gym:user-list', kwargs={'pk': 1})
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        queries = len(context.captured_queries)
+
+        UserProfile.objects.filter(gym_id=2).update(gym_id=1)
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.context['user_count'], 13)
@@ -12,11 +12,20 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import datetime
+
 # Django
 from django.core import mail
 from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 # wger
+from wger.core.models import (
+    UserCache,
+    UserProfile,
+)
 from wger.core.tests.base_testcase import WgerTestCase
 
 
@@ -45,3 +54,31 @@ class EmailInactiveUserTestCase(WgerTestCase):
         trainer_list.sort()
 
         self.assertEqual(recipment_list.sort(), trainer_list.sort())
+
+    def test_inactive_members(self):
+        """
+        Test the members listed in the reminder
+        """
+        UserCache.objects.filter(user__username='member1'
+                                 ).update(last_activity=datetime.date.today())
+        UserCache.objects.filter(user__username='test').update(last_activity=None)
+
+        call_command('inactive-members')
+        message = [m for m in mail.outbox if m.to == ['trainer1@example.com']][0]
+        self.assertIn('test@example.com', message.body)
+        self.assertIn('member2@example.com', message.body)
+        self.assertNotIn('member1@example.com', message.body)
+        self.assertNotIn('trainer2@example.com', message.body)
+
+    def test_number_of_queries(self):
+        """
+        Test that the number of queries does not depend on the number of members
+        """
+        with CaptureQueriesContext(connection) as context:
+            call_command('inactive-members')
+        queries = len(context.captured_queries)
+
+        UserProfile.objects.filter(gym_id=2).update(gym_id=1)
+        mail.outbox = []
+        with self.assertNumQueries(queries):
+            call_command('inactive-members')
@@ -17,10 +17,17 @@ import datetime
 
 # Django
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 # wger
+from wger.core.models import UserCache
 from wger.core.tests.base_testcase import WgerTestCase
-from wger.gym.helpers import get_user_last_activity
+from wger.gym.helpers import (
+    get_user_last_activity,
+    update_user_last_activity,
+)
 from wger.manager.models import (
     WorkoutLog,
     WorkoutSession,
@@ -67,3 +74,76 @@ class UserLastActivityTestCase(WgerTestCase):
         user = User.objects.get(username='admin')
         self.assertEqual(get_user_last_activity(user), datetime.date(2014, 10, 5))
         self.assertEqual(user.usercache.last_activity, datetime.date(2014, 10, 5))
+
+    def get_last_activity(self, username='admin'):
+        return UserCache.objects.get(user__username=username).last_activity
+
+    def test_save_queries(self):
+        """
+        Test that saving an entry only updates the cache, without looking at
+        the other entries of the user
+        """
+        log = WorkoutLog.objects.get(pk=1)
+        log.date = datetime.date(2015, 1, 1)
+        with CaptureQueriesContext(connection) as context:
+            log.save()
+
+        self.assertEqual(self.get_last_activity(), datetime.date(2015, 1, 1))
+        self.assertEqual(
+            [q['sql'].split()[0] for q in context.captured_queries if 'core_usercache' in q['sql']],
+            ['UPDATE'],
+        )
+
+    def test_save_older_entry(self):
+        """
+        Test that saving an entry older than the last activity changes nothing
+        """
+        WorkoutLog.objects.get(pk=1).save()
+        self.assertEqual(self.get_last_activity(), datetime.date(2014, 1, 30))
+
+    def test_delete_last_entry(self):
+        """
+        Test that the last activity is recalculated after deleting the last entry
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkoutSession.objects.get(pk=3).delete()
+        self.assertEqual(self.get_last_activity(), datetime.date(2014, 1, 20))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkoutSession.objects.filter(user_id=1).delete()
+        self.assertEqual(self.get_last_activity(), datetime.date(2013, 10, 30))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkoutLog.objects.filter(user_id=1).delete()
+        self.assertIsNone(self.get_last_activity())
+
+    def test_move_last_entry(self):
+        """
+        Test that the last activity is recalculated after moving the last entry
+        to an earlier day
+        """
+        session = WorkoutSession.objects.get(pk=3)
+        session.date = datetime.date(2013, 1, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            session.save()
+        self.assertEqual(self.get_last_activity(), datetime.date(2014, 1, 20))
+
+    def test_update_all(self):
+        """
+        Test recalculating the last activity of all users with one query
+        """
+        UserCache.objects.update(last_activity=None)
+        with self.assertNumQueries(1):
+            update_user_last_activity()
+
+        self.assertEqual(self.get_last_activity('admin'), datetime.date(2014, 1, 30))
+        self.assertEqual(self.get_last_activity('test'), datetime.date(2014, 1, 30))
+        self.assertIsNone(self.get_last_activity('demo'))
+
+    def test_command(self):
+        """
+        Test the management command updating the user cache
+        """
+        UserCache.objects.update(last_activity=None)
+        call_command('update-user-cache', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.get_last_activity('admin'), datetime.date(2014, 1, 30))
@@ -126,22 +126,21 @@ class GymUserListView(LoginRequiredMixin, WgerMultiplePermissionRequiredMixin, L
         """
         out = {'admins': [], 'members': []}
 
-        for u in Gym.objects.get_members(self.kwargs['pk']).select_related('usercache'):
-            out['members'].append({'obj': u, 'last_log': u.usercache.last_activity})
-
-        # admins list
-        for u in Gym.objects.get_admins(self.kwargs['pk']):
-            out['admins'].append(
-                {
-                    'obj': u,
-                    'perms': {
-                        'manage_gym': u.has_perm('gym.manage_gym'),
-                        'manage_gyms': u.has_perm('gym.manage_gyms'),
-                        'gym_trainer': u.has_perm('gym.gym_trainer'),
-                        'any_admin': is_any_gym_admin(u)
+        for u in Gym.objects.get_users(self.kwargs['pk']):
+            if not u.in_admin_group:
+                out['members'].append({'obj': u, 'last_log': u.last_activity})
+            else:
+                out['admins'].append(
+                    {
+                        'obj': u,
+                        'perms': {
+                            'manage_gym': u.manage_gym,
+                            'manage_gyms': u.manage_gyms,
+                            'gym_trainer': u.gym_trainer,
+                            'any_admin': u.is_gym_admin,
+                        }
                     }
-                }
-            )
+                )
         return out
 
     def get_context_data(self, **kwargs):
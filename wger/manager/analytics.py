@@ -0,0 +1,107 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Strength and training volume analytics of the workout logs
+
+All metrics are calculated by the database as grouped aggregations, so that
+the (potentially many thousands) logs of a user never need to be loaded and
+looped over in python. The aggregations are used to keep the weekly summaries
+up to date, see WorkoutLogWeeklySummary.
+"""
+
+# Standard Library
+import datetime
+
+# Django
+from django.db.models import (
+    Case,
+    Count,
+    FloatField,
+    Max,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+)
+
+# wger
+from wger.manager.consts import (
+    PROGRESSION_REPETITION_UNIT,
+    PROGRESSION_WEIGHT_UNITS,
+    WEIGHT_UNIT_LB,
+)
+from wger.utils.units import AbstractWeight
+
+
+BRZYCKI_MAX_REPS = 36
+"""The Brzycki formula is not defined for higher number of repetitions"""
+
+
+def week_start(date: datetime.date) -> datetime.date:
+    """
+    Returns the monday of the ISO week of the given date
+    """
+    return date - datetime.timedelta(days=date.weekday())
+
+
+def weekly_aggregates() -> dict:
+    """
+    Returns the aggregations of the weekly summaries, to be used with
+    annotate() on a queryset of workout logs grouped by week
+
+    The one repetition maximum is estimated according to Epley, w * (1 + r / 30),
+    where a single repetition already is the maximum, and Brzycki,
+    w * 36 / (37 - r), which is only defined up to BRZYCKI_MAX_REPS.
+
+    Only logs in repetitions and kg or lb are used for the tonnage and the
+    estimated maximums, the weights in lb are converted to kg. The sets are
+    counted regardless of the units.
+    """
+    weight = Case(
+        When(
+            weight_unit_id=WEIGHT_UNIT_LB,
+            then=Cast('weight', FloatField()) * Value(float(AbstractWeight.LB_IN_KG)),
+        ),
+        default=Cast('weight', FloatField()),
+        output_field=FloatField(),
+    )
+    reps = Cast('reps', FloatField())
+    in_reps = Q(repetition_unit_id=PROGRESSION_REPETITION_UNIT)
+    weighted = in_reps & Q(weight_unit_id__in=PROGRESSION_WEIGHT_UNITS, reps__gt=0)
+
+    # The total of repetitions comes last, the annotation would otherwise
+    # shadow the 'reps' field of the logs in the other expressions
+    return dict(
+        tonnage=Coalesce(Sum(weight * reps, filter=weighted), Value(0.0)),
+        e1rm_epley=Max(
+            Case(
+                When(reps=1, then=weight),
+                default=weight * (Value(1.0) + reps / Value(30.0)),
+                output_field=FloatField(),
+            ),
+            filter=weighted,
+        ),
+        e1rm_brzycki=Max(
+            weight * Value(36.0) / (Value(37.0) - reps),
+            filter=weighted & Q(reps__lte=BRZYCKI_MAX_REPS),
+        ),
+        sets=Count('id'),
+        reps=Coalesce(Sum('reps', filter=in_reps), 0),
+    )
@@ -15,17 +15,28 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
+# Django
+from django.db import transaction
+
 # Third Party
 from rest_framework import serializers
 
 # wger
 from wger.core.api.serializers import DaysOfWeekSerializer
-from wger.core.models import DaysOfWeek
+from wger.core.models import (
+    DaysOfWeek,
+    RepetitionUnit,
+    WeightUnit,
+)
 from wger.exercises.api.serializers import (
     ExerciseBaseInfoSerializer,
     ExerciseSerializer,
     MuscleSerializer,
 )
+from wger.exercises.models import ExerciseBase
+from wger.gym.helpers import register_user_activity
+from wger.manager.analytics import week_start
+from wger.manager.consts import WORKOUT_BATCH_MAX_ENTRIES
 from wger.manager.models import (
     Day,
     Schedule,
@@ -34,8 +45,11 @@ from wger.manager.models import (
     Setting,
     Workout,
     WorkoutLog,
+    WorkoutLogProgression,
+    WorkoutLogWeeklySummary,
     WorkoutSession,
 )
+from wger.utils.cache import reset_workout_log
 
 
 class WorkoutSerializer(serializers.ModelSerializer):
@@ -68,7 +82,17 @@ class WorkoutSessionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = WorkoutSession
-        fields = ['id', 'user', 'workout', 'date', 'notes', 'impression', 'time_start', 'time_end']
+        fields = [
+            'id',
+            'user',
+            'workout',
+            'date',
+            'notes',
+            'impression',
+            'time_start',
+            'time_end',
+            'idempotency_key',
+        ]
 
 
 class WorkoutLogSerializer(serializers.ModelSerializer):
@@ -81,6 +105,212 @@ class WorkoutLogSerializer(serializers.ModelSerializer):
         exclude = ('user', )
 
 
+class WorkoutSessionBatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a workout session uploaded in bulk
+
+    The workout is only validated as a number here, the workouts of all the
+    entries are checked at once by WorkoutBatchSerializer
+    """
+    workout = serializers.IntegerField(source='workout_id')
+    idempotency_key = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = WorkoutSession
+        fields = [
+            'idempotency_key',
+            'workout',
+            'date',
+            'notes',
+            'impression',
+            'time_start',
+            'time_end',
+        ]
+
+
+class WorkoutLogBatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a workout log uploaded in bulk
+
+    The related objects are only validated as numbers here, they are checked
+    for all the entries at once by WorkoutBatchSerializer
+    """
+    exercise_base = serializers.IntegerField(source='exercise_base_id')
+    workout = serializers.IntegerField(source='workout_id')
+    repetition_unit = serializers.IntegerField(source='repetition_unit_id', default=1)
+    weight_unit = serializers.IntegerField(source='weight_unit_id', default=1)
+    idempotency_key = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = WorkoutLog
+        fields = [
+            'idempotency_key',
+            'exercise_base',
+            'workout',
+            'repetition_unit',
+            'reps',
+            'weight_unit',
+            'weight',
+            'date',
+            'rir',
+        ]
+
+
+class WorkoutBatchSerializer(serializers.Serializer):
+    """
+    Serializer for uploading workout sessions and logs in bulk, e.g. by
+    clients that were offline
+
+    All entries are validated together, with one query per related model,
+    and are saved in one transaction. Entries with an idempotency key that
+    was already uploaded are not saved again, the existing objects are
+    returned instead.
+    """
+    sessions = WorkoutSessionBatchSerializer(
+        many=True,
+        required=False,
+        max_length=WORKOUT_BATCH_MAX_ENTRIES,
+    )
+    logs = WorkoutLogBatchSerializer(
+        many=True,
+        required=False,
+        max_length=WORKOUT_BATCH_MAX_ENTRIES,
+    )
+
+    @staticmethod
+    def check_ids(queryset, entries, field, label):
+        """
+        Checks with one query that the objects referenced by the entries exist
+        """
+        ids = {entry[field] for entry in entries}
+        missing = ids - set(queryset.filter(pk__in=ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(
+                {label: [f'Invalid pk "{pk}" - object does not exist.' for pk in sorted(missing)]}
+            )
+
+    @staticmethod
+    def find_existing(model, user, entries, label):
+        """
+        Returns the objects that were already uploaded, by idempotency key
+        """
+        keys = [entry['idempotency_key'] for entry in entries if entry.get('idempotency_key')]
+        if len(keys) != len(set(keys)):
+            raise serializers.ValidationError({label: 'The idempotency keys must be unique'})
+        if not keys:
+            return {}
+        return {
+            obj.idempotency_key: obj
+            for obj in model.objects.filter(user=user, idempotency_key__in=keys)
+        }
+
+    def validate(self, data):
+        user = self.context['request'].user
+        sessions = data.setdefault('sessions', [])
+        logs = data.setdefault('logs', [])
+        if not sessions and not logs:
+            raise serializers.ValidationError('Please provide some "sessions" or "logs"')
+
+        self.check_ids(Workout.objects.filter(user=user), sessions + logs, 'workout_id', 'workout')
+        self.check_ids(ExerciseBase.objects.all(), logs, 'exercise_base_id', 'exercise_base')
+        self.check_ids(RepetitionUnit.objects.all(), logs, 'repetition_unit_id', 'repetition_unit')
+        self.check_ids(WeightUnit.objects.all(), logs, 'weight_unit_id', 'weight_unit')
+
+        self.existing_sessions = self.find_existing(WorkoutSession, user, sessions, 'sessions')
+        self.existing_logs = self.find_existing(WorkoutLog, user, logs, 'logs')
+
+        # There can only be one session per day
+        dates = [
+            entry['date'] for entry in sessions
+            if entry.get('idempotency_key') not in self.existing_sessions
+        ]
+        taken = set(
+            WorkoutSession.objects.filter(user=user, date__in=dates).values_list('date', flat=True)
+        )
+        if len(dates) != len(set(dates)) or taken:
+            raise serializers.ValidationError(
+                {'sessions': 'There can only be one workout session per day'}
+            )
+
+        return data
+
+    def create(self, validated_data):
+        """
+        Saves the new entries and updates the caches and the aggregations of
+        the logs once per user, day and exercise
+        """
+        user = self.context['request'].user
+
+        sessions = []
+        new_sessions = []
+        for entry in validated_data['sessions']:
+            session = self.existing_sessions.get(entry.get('idempotency_key'))
+            if not session:
+                session = WorkoutSession(user=user, **entry)
+                new_sessions.append(session)
+            sessions.append(session)
+
+        logs = []
+        new_logs = []
+        for entry in validated_data['logs']:
+            log = self.existing_logs.get(entry.get('idempotency_key'))
+            if not log:
+                log = WorkoutLog(user=user, **entry)
+                new_logs.append(log)
+            logs.append(log)
+
+        with transaction.atomic():
+            WorkoutSession.objects.bulk_create(new_sessions)
+            WorkoutLog.objects.bulk_create(new_logs)
+
+            base_dates = {}
+            for log in new_logs:
+                base_dates.setdefault(log.exercise_base_id, set()).add(log.date)
+            for base_id, dates in base_dates.items():
+                WorkoutLogProgression.refresh(user.id, base_id, dates)
+            WorkoutLogWeeklySummary.refresh(user.id, {week_start(log.date) for log in new_logs})
+
+            if new_sessions or new_logs:
+                register_user_activity(
+                    user.id, max(entry.date for entry in new_sessions + new_logs)
+                )
+
+        for date in {entry.date for entry in new_sessions + new_logs}:
+            reset_workout_log(user.id, date.year, date.month, date.day)
+
+        return {'sessions': sessions, 'logs': logs}
+
+
+class WorkoutLogProgressionSerializer(serializers.ModelSerializer):
+    """
+    Workout log progression serializer
+    """
+
+    class Meta:
+        model = WorkoutLogProgression
+        fields = ['id', 'exercise_base', 'reps', 'weight_unit', 'date', 'weight', 'log_count']
+
+
+class WorkoutLogWeeklySummarySerializer(serializers.ModelSerializer):
+    """
+    Workout log weekly summary serializer
+    """
+
+    class Meta:
+        model = WorkoutLogWeeklySummary
+        fields = [
+            'id',
+            'user',
+            'exercise_base',
+            'week',
+            'sets',
+            'reps',
+            'tonnage',
+            'e1rm_epley',
+            'e1rm_brzycki',
+        ]
+
+
 class ScheduleStepSerializer(serializers.ModelSerializer):
     """
     ScheduleStep serializer
@@ -148,6 +378,9 @@ class SettingSerializer(serializers.ModelSerializer):
 #
 # Custom helper serializers for the canonical form of a workout
 #
+# The canonical form only contains plain data (see wger.manager.canonical), the
+# serializers for the "obj" fields return the same fields as the model serializers.
+#
 class MusclesCanonicalFormSerializer(serializers.Serializer):
     """
     Serializer for the muscles in the canonical form of a day/workout
@@ -158,6 +391,22 @@ class MusclesCanonicalFormSerializer(serializers.Serializer):
     backsecondary = serializers.ListField(child=MuscleSerializer())
 
 
+class SettingCanonicalFormSerializer(serializers.Serializer):
+    """
+    Serializer for a setting in the canonical form of a workout
+    """
+    id = serializers.IntegerField()
+    set = serializers.IntegerField(source='set_id')
+    exercise_base = serializers.IntegerField(source='exercise_base_id')
+    repetition_unit = serializers.IntegerField(source='repetition_unit_id')
+    reps = serializers.IntegerField()
+    weight = serializers.DecimalField(max_digits=6, decimal_places=2, allow_null=True)
+    weight_unit = serializers.IntegerField(source='weight_unit_id')
+    rir = serializers.CharField(allow_null=True)
+    order = serializers.IntegerField()
+    comment = serializers.CharField()
+
+
 class WorkoutCanonicalFormExerciseImagesListSerializer(serializers.Serializer):
     """
     Serializer for settings in the canonical form of a workout
@@ -169,26 +418,44 @@ class WorkoutCanonicalFormExerciseImagesListSerializer(serializers.Serializer):
 class WorkoutCanonicalFormExerciseListSerializer(serializers.Serializer):
     """
     Serializer for settings in the canonical form of a workout
+
+    The exercise's details are not part of the canonical form, they are read
+    from the exercise bases passed in the context (see WorkoutViewSet)
     """
-    setting_obj_list = SettingSerializer(many=True)
-    setting_list = serializers.ReadOnlyField()
+    setting_obj_list = SettingCanonicalFormSerializer(source='setting_list', many=True)
     setting_text = serializers.ReadOnlyField()
-    reps_list = serializers.ReadOnlyField()
     has_weight = serializers.ReadOnlyField()
-    weight_list = serializers.ReadOnlyField()
     comment_list = serializers.ReadOnlyField()
     image_list = WorkoutCanonicalFormExerciseImagesListSerializer(many=True)
-    obj = ExerciseBaseInfoSerializer()
+    obj = serializers.SerializerMethodField()
+
+    def get_obj(self, exercise):
+        # The cached canonical form can reference bases that were deleted since
+        base = self.context['exercise_bases'].get(exercise.id)
+        if base is None:
+            return None
+        return ExerciseBaseInfoSerializer(base, context=self.context).data
+
+
+class SetCanonicalFormSerializer(serializers.Serializer):
+    """
+    Serializer for the set in the canonical form of a workout
+    """
+    id = serializers.IntegerField()
+    exerciseday = serializers.IntegerField(source='day_id')
+    sets = serializers.IntegerField()
+    order = serializers.IntegerField()
+    comment = serializers.CharField()
 
 
 class WorkoutCanonicalFormExerciseSerializer(serializers.Serializer):
     """
     Serializer for an exercise in the canonical form of a workout
     """
-    obj = SetSerializer()
+    obj = SetCanonicalFormSerializer(source='*')
     exercise_list = WorkoutCanonicalFormExerciseListSerializer(many=True)
     is_superset = serializers.BooleanField()
-    settings_computed = SettingSerializer(many=True)
+    settings_computed = SettingCanonicalFormSerializer(many=True)
     muscles = MusclesCanonicalFormSerializer()
 
 
@@ -196,24 +463,47 @@ class DaysOfWeekCanonicalFormSerializer(serializers.Serializer):
     """
     Serializer for a days of week in the canonical form of a workout
     """
-    text = serializers.ReadOnlyField()
-    day_list = serializers.ListField(child=DaysOfWeekSerializer())
+    text = serializers.ReadOnlyField(source='days_of_week_text')
+    day_list = serializers.ListField(child=DaysOfWeekSerializer(), source='days_of_week')
+
+
+class DayObjCanonicalFormSerializer(serializers.Serializer):
+    """
+    Serializer for the day in the canonical form of a workout
+    """
+    id = serializers.IntegerField()
+    training = serializers.IntegerField(source='workout_id')
+    description = serializers.CharField()
+    day = serializers.SerializerMethodField()
+
+    def get_day(self, day) -> list:
+        return [day_of_week.id for day_of_week in day.days_of_week]
 
 
 class DayCanonicalFormSerializer(serializers.Serializer):
     """
     Serializer for a day in the canonical form of a workout
     """
-    obj = DaySerializer()
+    obj = DayObjCanonicalFormSerializer(source='*')
     set_list = WorkoutCanonicalFormExerciseSerializer(many=True)
-    days_of_week = DaysOfWeekCanonicalFormSerializer()
+    days_of_week = DaysOfWeekCanonicalFormSerializer(source='*')
     muscles = MusclesCanonicalFormSerializer()
 
 
+class WorkoutObjCanonicalFormSerializer(serializers.Serializer):
+    """
+    Serializer for the workout in the canonical form of a workout
+    """
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    creation_date = serializers.DateField()
+    description = serializers.CharField()
+
+
 class WorkoutCanonicalFormSerializer(serializers.Serializer):
     """
     Serializer for the canonical form of a workout
     """
-    obj = WorkoutSerializer()
+    obj = WorkoutObjCanonicalFormSerializer(source='*')
     day_list = DayCanonicalFormSerializer(many=True)
     muscles = MusclesCanonicalFormSerializer()
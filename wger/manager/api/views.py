@@ -17,14 +17,24 @@
 
 # Standard Library
 import json
+from itertools import groupby
 
 # Django
+from django.db import IntegrityError
+from django.db.models import Sum
 from django.http import HttpResponseNotFound
 from django.shortcuts import get_object_or_404
 
 # Third Party
-from rest_framework import viewsets
+from rest_framework import (
+    status,
+    viewsets,
+)
 from rest_framework.decorators import action
+from rest_framework.exceptions import (
+    PermissionDenied,
+    ValidationError,
+)
 from rest_framework.response import Response
 
 # wger
@@ -32,14 +42,18 @@ from wger.exercises.models import (
     Exercise,
     ExerciseBase,
 )
+from wger.gym.models import Gym
 from wger.manager.api.serializers import (
     DaySerializer,
     ScheduleSerializer,
     ScheduleStepSerializer,
     SetSerializer,
     SettingSerializer,
+    WorkoutBatchSerializer,
     WorkoutCanonicalFormSerializer,
+    WorkoutLogProgressionSerializer,
     WorkoutLogSerializer,
+    WorkoutLogWeeklySummarySerializer,
     WorkoutSerializer,
     WorkoutSessionSerializer,
     WorkoutTemplateSerializer,
@@ -52,6 +66,8 @@ from wger.manager.models import (
     Setting,
     Workout,
     WorkoutLog,
+    WorkoutLogProgression,
+    WorkoutLogWeeklySummary,
     WorkoutSession,
 )
 from wger.utils.viewsets import WgerOwnerObjectModelViewSet
@@ -91,7 +107,31 @@ class WorkoutViewSet(viewsets.ModelViewSet):
         This is basically the same form as used in the application
         """
 
-        out = WorkoutCanonicalFormSerializer(self.get_object().canonical_representation).data
+        canonical_form = self.get_object().canonical_representation
+        exercise_bases = ExerciseBase.objects.filter(
+            pk__in=canonical_form.exercise_base_ids
+        ).select_related(
+            'category',
+            'license',
+        ).prefetch_related(
+            'muscles',
+            'muscles_secondary',
+            'equipment',
+            'exerciseimage_set',
+            'exercisevideo_set',
+            'exercises__alias_set',
+            'exercises__exercisecomment_set',
+        )
+
+        out = WorkoutCanonicalFormSerializer(
+            canonical_form,
+            context={
+                'exercise_bases': {
+                    base.pk: base
+                    for base in exercise_bases
+                }
+            },
+        ).data
         return Response(out)
 
     @action(detail=True)
@@ -118,7 +158,7 @@ class WorkoutViewSet(viewsets.ModelViewSet):
         entry_logs, chart_data = process_log_entries(logs)
         serialized_logs = {}
         for key, values in entry_logs.items():
-            serialized_logs[str(key)] = [WorkoutLogSerializer(entry).data for entry in values]
+            serialized_logs[str(key)] = WorkoutLogSerializer(values, many=True).data
         return Response({'chart_data': json.loads(chart_data), 'logs': serialized_logs})
 
 
@@ -411,3 +451,171 @@ class WorkoutLogViewSet(WgerOwnerObjectModelViewSet):
         Return objects to check for ownership permission
         """
         return [(Workout, 'workout')]
+
+    @action(detail=False, methods=['post'], serializer_class=WorkoutBatchSerializer)
+    def batch(self, request):
+        """
+        Uploads workout sessions and logs in bulk, e.g. after training offline
+
+        The entries are passed in the 'sessions' and 'logs' lists and are all
+        saved or rejected together. Each entry can have an 'idempotency_key'
+        (UUID), entries whose key was already uploaded are not saved again, so
+        that failed uploads can be safely retried.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = serializer.save()
+        except IntegrityError:
+            return Response(
+                'Some of the entries were uploaded at the same time, please retry',
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        context = self.get_serializer_context()
+        return Response(
+            {
+                'sessions': WorkoutSessionSerializer(
+                    result['sessions'],
+                    many=True,
+                    context=context,
+                ).data,
+                'logs': WorkoutLogSerializer(result['logs'], many=True, context=context).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class WorkoutLogProgressionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the progression of the exercises: the maximum weight per
+    number of repetitions and day, see the chart action for the complete
+    series of an exercise
+    """
+    serializer_class = WorkoutLogProgressionSerializer
+    is_private = True
+    ordering_fields = '__all__'
+    filterset_fields = {
+        'exercise_base': ['exact'],
+        'reps': ['exact'],
+        'weight_unit': ['exact'],
+        'date': ['exact', 'gte', 'lte'],
+    }
+
+    def get_queryset(self):
+        """
+        Only allow access to appropriate objects
+        """
+        # REST API generation
+        if getattr(self, "swagger_fake_view", False):
+            return WorkoutLogProgression.objects.none()
+
+        return WorkoutLogProgression.objects.filter(user=self.request.user)
+
+    @action(detail=False)
+    def chart(self, request):
+        """
+        Returns the progression of an exercise as one series per number of
+        repetitions and weight unit, with the dates and weights as arrays
+
+        The exercise base is passed in the 'exercise_base' GET parameter, the
+        other filters of this endpoint can be used as well.
+        """
+        base_id = request.GET.get('exercise_base')
+        if not base_id:
+            return Response("Please provide an base ID in the 'exercise_base' GET parameter")
+
+        rows = self.filter_queryset(self.get_queryset()).order_by(
+            'reps',
+            'weight_unit',
+            'date',
+        ).values_list('reps', 'weight_unit_id', 'date', 'weight', 'log_count')
+
+        series = []
+        for (reps, weight_unit), entries in groupby(rows, key=lambda row: row[:2]):
+            entries = list(entries)
+            series.append(
+                {
+                    'reps': reps,
+                    'weight_unit': weight_unit,
+                    'date': [entry[2] for entry in entries],
+                    'weight': [entry[3] for entry in entries],
+                    'log_count': [entry[4] for entry in entries],
+                }
+            )
+        return Response({'exercise_base': int(base_id), 'series': series})
+
+
+class WorkoutLogWeeklySummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the training analytics: sets, repetitions, tonnage (kg)
+    and estimated one repetition maximum (kg) per exercise and ISO week
+
+    Gym managers and trainers can read the summaries of all the members of
+    their gym by passing its ID in the 'gym' GET parameter.
+    """
+    serializer_class = WorkoutLogWeeklySummarySerializer
+    is_private = True
+    ordering_fields = '__all__'
+    filterset_fields = {
+        'user': ['exact'],
+        'exercise_base': ['exact', 'in'],
+        'week': ['exact', 'gte', 'lte'],
+    }
+
+    def get_queryset(self):
+        """
+        Only allow access to appropriate objects
+        """
+        # REST API generation
+        if getattr(self, "swagger_fake_view", False):
+            return WorkoutLogWeeklySummary.objects.none()
+
+        gym_id = self.request.GET.get('gym')
+        if not gym_id:
+            return WorkoutLogWeeklySummary.objects.filter(user=self.request.user)
+
+        try:
+            gym_id = int(gym_id)
+        except ValueError:
+            raise ValidationError({'gym': 'Please provide a valid gym ID'})
+
+        user = self.request.user
+        if not (
+            user.has_perm('gym.manage_gyms') or (
+                (user.has_perm('gym.manage_gym') or user.has_perm('gym.gym_trainer'))
+                and user.userprofile.gym_id == gym_id
+            )
+        ):
+            raise PermissionDenied()
+
+        return WorkoutLogWeeklySummary.objects.filter(user__in=Gym.objects.get_members(gym_id))
+
+    @action(detail=False)
+    def muscles(self, request):
+        """
+        Returns the number of sets and the tonnage per user, week and muscle
+
+        The sets of an exercise are counted for each of its primary muscles,
+        the filters of this endpoint can be used as well.
+        """
+        rows = self.filter_queryset(self.get_queryset()).order_by(
+            'user',
+            'week',
+            'exercise_base__muscles',
+        ).values('user', 'week', 'exercise_base__muscles').annotate(
+            sets=Sum('sets'),
+            tonnage=Sum('tonnage'),
+        )
+
+        return Response(
+            [
+                {
+                    'user': row['user'],
+                    'week': row['week'],
+                    'muscle': row['exercise_base__muscles'],
+                    'sets': row['sets'],
+                    'tonnage': row['tonnage'],
+                } for row in rows if row['exercise_base__muscles'] is not None
+            ]
+        )
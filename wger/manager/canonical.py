@@ -0,0 +1,425 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from dataclasses import (
+    dataclass,
+    field,
+)
+from decimal import Decimal
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+# Django
+from django.db.models import (
+    Prefetch,
+    prefetch_related_objects,
+)
+from django.templatetags.static import static
+from django.utils.translation import (
+    get_language,
+    gettext as _,
+)
+
+# wger
+from wger.exercises.models import Exercise
+from wger.manager.models import (
+    Day,
+    Setting,
+    Workout,
+)
+from wger.utils.constants import ENGLISH_SHORT_NAME
+
+
+#
+# The canonical form of a workout only contains plain data (ids, names, precomputed
+# texts and image URLs), so that it is small, cheap to cache and doesn't depend on
+# the models. Whenever these records change, increase the canonical form version in
+# CacheKeyMapper, so that cache entries in the old format are not read anymore.
+#
+
+
+@dataclass
+class CanonicalMuscle:
+    id: int
+    name: str
+    name_en: str
+    is_front: bool
+
+    @property
+    def image_url_main(self):
+        return static(f"images/muscles/main/muscle-{self.id}.svg")
+
+    @property
+    def image_url_secondary(self):
+        return static(f"images/muscles/secondary/muscle-{self.id}.svg")
+
+
+@dataclass
+class CanonicalMuscles:
+    front: List[CanonicalMuscle] = field(default_factory=list)
+    back: List[CanonicalMuscle] = field(default_factory=list)
+    frontsecondary: List[CanonicalMuscle] = field(default_factory=list)
+    backsecondary: List[CanonicalMuscle] = field(default_factory=list)
+
+
+@dataclass
+class CanonicalSetting:
+    id: int
+    set_id: int
+    exercise_base_id: int
+    repetition_unit_id: int
+    reps: int
+    weight: Optional[Decimal]
+    weight_unit_id: int
+    rir: Optional[str]
+    order: int
+    comment: str
+
+
+@dataclass
+class CanonicalImage:
+    image: str
+    """URL of the image"""
+
+    name: str
+    """Name of the image file in the storage"""
+
+    is_main: bool
+
+
+@dataclass
+class CanonicalExercise:
+    id: int
+    uuid: str
+    translations: Dict[str, str]
+    """The exercise's name, by language short name"""
+
+    comments: Dict[str, List[str]]
+    """The exercise's comments, by language short name"""
+
+    setting_list: List[CanonicalSetting]
+    setting_text: str
+    has_weight: bool
+    image_list: List[CanonicalImage]
+
+    def get_language_key(self, language: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the language to use, like ExerciseBase.get_translation: the
+        requested one, English or, as a last resort, any available one
+        """
+        language = language or get_language()
+        if language in self.translations:
+            return language
+        if ENGLISH_SHORT_NAME in self.translations:
+            return ENGLISH_SHORT_NAME
+        return next(iter(self.translations), None)
+
+    def get_name(self, language: Optional[str] = None) -> str:
+        return self.translations.get(self.get_language_key(language), '')
+
+    def get_comments(self, language: Optional[str] = None) -> List[str]:
+        return self.comments.get(self.get_language_key(language), [])
+
+    @property
+    def name(self):
+        return self.get_name()
+
+    @property
+    def comment_list(self):
+        return self.get_comments()
+
+    @property
+    def main_image(self) -> Optional[CanonicalImage]:
+        return next((image for image in self.image_list if image.is_main), None)
+
+
+@dataclass
+class CanonicalSet:
+    id: int
+    day_id: int
+    sets: int
+    order: int
+    comment: str
+    exercise_list: List[CanonicalExercise]
+    settings_computed: List[CanonicalSetting]
+    muscles: CanonicalMuscles
+
+    @property
+    def is_superset(self):
+        return len(self.exercise_list) > 1
+
+
+@dataclass
+class CanonicalDayOfWeek:
+    id: int
+    day_of_week: str
+
+
+@dataclass
+class CanonicalDay:
+    id: int
+    workout_id: int
+    description: str
+    days_of_week: List[CanonicalDayOfWeek]
+    set_list: List[CanonicalSet]
+    muscles: CanonicalMuscles
+
+    @property
+    def days_of_week_text(self):
+        return ', '.join([str(_(i.day_of_week)) for i in self.days_of_week])
+
+
+@dataclass
+class CanonicalWorkout:
+    id: int
+    name: str
+    creation_date: datetime.date
+    description: str
+    day_list: List[CanonicalDay]
+    muscles: CanonicalMuscles
+
+    def get_day(self, day_id: int) -> Optional[CanonicalDay]:
+        return next((day for day in self.day_list if day.id == int(day_id)), None)
+
+    @property
+    def exercise_base_ids(self) -> List[int]:
+        """
+        Returns the IDs of all the exercises of the workout, without duplicates
+        """
+        ids = {}
+        for day in self.day_list:
+            for set_obj in day.set_list:
+                for exercise in set_obj.exercise_list:
+                    ids[exercise.id] = True
+        return list(ids)
+
+    @property
+    def muscle_ids(self) -> List[int]:
+        """
+        Returns the IDs of all the muscles shown in the workout, without duplicates
+        """
+        ids = {}
+        for muscle_list in (
+            self.muscles.front,
+            self.muscles.back,
+            self.muscles.frontsecondary,
+            self.muscles.backsecondary,
+        ):
+            for muscle in muscle_list:
+                ids[muscle.id] = True
+        return list(ids)
+
+
+class CanonicalFormBuilder:
+    """
+    Builds the canonical representation of workout days
+
+    Everything that is needed (days of the week, sets, settings with their
+    exercises and units, translations, comments, muscles and images) is loaded
+    upfront with a fixed number of queries, independently of the size of the
+    workout. The structure is then put together from the objects in memory.
+    """
+
+    def __init__(self, days: Iterable[Day]):
+        self.days = list(days)
+
+        settings = Setting.objects.select_related(
+            'exercise_base',
+            'repetition_unit',
+            'weight_unit',
+        ).prefetch_related(
+            'exercise_base__muscles',
+            'exercise_base__muscles_secondary',
+            'exercise_base__exerciseimage_set',
+            Prefetch(
+                'exercise_base__exercises',
+                queryset=Exercise.objects.select_related('language'),
+            ),
+            'exercise_base__exercises__exercisecomment_set',
+        )
+        prefetch_related_objects(
+            self.days,
+            'day',
+            Prefetch('set_set__setting_set', queryset=settings),
+        )
+
+    @classmethod
+    def for_workout(cls, workout: Workout) -> CanonicalWorkout:
+        """
+        Returns the canonical representation of a complete workout
+        """
+        return cls(workout.day_set.all()).build_workout(workout)
+
+    def build_workout(self, workout: Workout) -> CanonicalWorkout:
+        """
+        Returns the canonical representation of the workout the days belong to
+        """
+        muscles = CanonicalMuscles()
+
+        # Sort list by weekday
+        day_list = [
+            self.build_day(day) for day in sorted(self.days, key=lambda d: d.get_first_day_id)
+        ]
+
+        # Collect all muscles
+        for day in day_list:
+            for key in ('front', 'back', 'frontsecondary', 'backsecondary'):
+                muscle_list = getattr(muscles, key)
+                for muscle in getattr(day.muscles, key):
+                    if muscle not in muscle_list:
+                        muscle_list.append(muscle)
+
+        return CanonicalWorkout(
+            id=workout.id,
+            name=workout.name,
+            creation_date=workout.creation_date,
+            description=workout.description,
+            day_list=day_list,
+            muscles=muscles,
+        )
+
+    def build_day(self, day: Day) -> CanonicalDay:
+        """
+        Returns the canonical representation of one of the days
+        """
+        muscles_front = []
+        muscles_back = []
+        muscles_front_secondary = []
+
+        # Note that the sets share the lists with the day, so they all contain
+        # the muscles of the whole day
+        muscles = CanonicalMuscles(
+            front=muscles_front,
+            back=muscles_back,
+            frontsecondary=muscles_front_secondary,
+            backsecondary=muscles_front_secondary,
+        )
+
+        set_list = []
+        for set_obj in day.set_set.all():
+            # The settings of each exercise, in the order the exercises appear
+            exercise_settings = {}
+            for setting in set_obj.setting_set.all():
+                exercise_settings.setdefault(setting.exercise_base_id, []).append(setting)
+
+            exercise_list = []
+            computed_settings = []
+            for settings in exercise_settings.values():
+                base = settings[0].exercise_base
+
+                # Muscles for this set
+                for muscle in base.muscles.all():
+                    muscle = self.get_muscle(muscle)
+                    if muscle.is_front and muscle not in muscles_front:
+                        muscles_front.append(muscle)
+                    elif not muscle.is_front and muscle not in muscles_back:
+                        muscles_back.append(muscle)
+
+                for muscle in base.muscles_secondary.all():
+                    muscle = self.get_muscle(muscle)
+                    if muscle.is_front and muscle not in muscles_front:
+                        muscles_front_secondary.append(muscle)
+
+                setting_list = [self.get_setting(setting) for setting in settings]
+                setting_ids = {setting.id: setting for setting in setting_list}
+                computed_settings.append(
+                    [
+                        setting_ids[setting.id]
+                        for setting in set_obj.computed_settings_exercise(base, settings)
+                    ]
+                )
+
+                exercise_list.append(
+                    CanonicalExercise(
+                        id=base.id,
+                        uuid=str(base.uuid),
+                        translations={
+                            translation.language.short_name: translation.name
+                            for translation in base.exercises.all()
+                        },
+                        comments={
+                            translation.language.short_name:
+                            [comment.comment for comment in translation.exercisecomment_set.all()]
+                            for translation in base.exercises.all()
+                        },
+                        setting_list=setting_list,
+                        setting_text=set_obj.reps_smart_text(base, settings),
+                        has_weight=any(setting.weight for setting in settings),
+                        image_list=[
+                            CanonicalImage(
+                                image=image.image.url,
+                                name=image.image.name,
+                                is_main=image.is_main,
+                            ) for image in base.exerciseimage_set.all()
+                        ],
+                    )
+                )
+
+            set_list.append(
+                CanonicalSet(
+                    id=set_obj.id,
+                    day_id=day.id,
+                    sets=set_obj.sets,
+                    order=set_obj.order,
+                    comment=set_obj.comment,
+                    exercise_list=exercise_list,
+                    # Interleave the settings of all exercises, see Set.compute_settings
+                    settings_computed=[val for tup in zip(*computed_settings) for val in tup],
+                    muscles=muscles,
+                )
+            )
+
+        return CanonicalDay(
+            id=day.id,
+            workout_id=day.training_id,
+            description=day.description,
+            days_of_week=[
+                CanonicalDayOfWeek(id=day_of_week.id, day_of_week=day_of_week.day_of_week)
+                for day_of_week in day.day.all()
+            ],
+            set_list=set_list,
+            muscles=muscles,
+        )
+
+    @staticmethod
+    def get_muscle(muscle) -> CanonicalMuscle:
+        return CanonicalMuscle(
+            id=muscle.id,
+            name=muscle.name,
+            name_en=muscle.name_en,
+            is_front=muscle.is_front,
+        )
+
+    @staticmethod
+    def get_setting(setting: Setting) -> CanonicalSetting:
+        return CanonicalSetting(
+            id=setting.id,
+            set_id=setting.set_id,
+            exercise_base_id=setting.exercise_base_id,
+            repetition_unit_id=setting.repetition_unit_id,
+            reps=setting.reps,
+            weight=setting.weight,
+            weight_unit_id=setting.weight_unit_id,
+            rir=setting.rir,
+            order=setting.order,
+            comment=setting.comment,
+        )
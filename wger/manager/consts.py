@@ -26,3 +26,15 @@ RIR_OPTIONS = [
     ('3.5', 3.5),
     ('4', 4),
 ]
+
+PROGRESSION_REPETITION_UNIT = 1
+"""Only logs in repetitions are used for the progression series"""
+
+PROGRESSION_WEIGHT_UNITS = (1, 2)
+"""Weight units (kg and lb) of the logs used for the progression series"""
+
+WEIGHT_UNIT_LB = 2
+"""The weight unit for pounds, converted to kg in the training analytics"""
+
+WORKOUT_BATCH_MAX_ENTRIES = 1000
+"""Maximum number of sessions, and of logs, that can be uploaded in one batch"""
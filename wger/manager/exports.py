@@ -0,0 +1,85 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.db.models import (
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext as _
+
+# wger
+from wger.exercises.models import Exercise
+from wger.manager.models import WorkoutLog
+from wger.utils.constants import ENGLISH_SHORT_NAME
+from wger.utils.export import CsvExport
+
+
+class WorkoutLogExport(CsvExport):
+    """
+    Exports the workout logs of a user
+
+    The exercise name is looked up in the same query, in the user's language
+    if available, otherwise in English or any other existing translation.
+    """
+
+    filename = 'Workoutlogs.csv'
+
+    def __init__(self, user, language):
+        super().__init__(user, language=language)
+
+    def get_header(self):
+        return [
+            _('Date'),
+            _('Workout'),
+            _('Exercise'),
+            _('Repetitions'),
+            _('Unit'),
+            _('Weight'),
+            _('Unit'),
+            _('RiR'),
+        ]
+
+    def get_queryset(self):
+        translations = Exercise.objects.filter(exercise_base=OuterRef('exercise_base_id'))
+
+        def name(qs):
+            return Subquery(qs.values('name')[:1])
+
+        return WorkoutLog.objects \
+            .filter(user=self.user) \
+            .select_related('workout', 'repetition_unit', 'weight_unit') \
+            .annotate(
+                exercise_name=Coalesce(
+                    name(translations.filter(language__short_name=self.kwargs['language'])),
+                    name(translations.filter(language__short_name=ENGLISH_SHORT_NAME)),
+                    name(translations.order_by('id')),
+                )
+            ) \
+            .order_by('date', 'id')
+
+    def get_row(self, log):
+        return [
+            log.date,
+            log.workout.name if log.workout else '',
+            log.exercise_name,
+            log.reps,
+            log.repetition_unit.name,
+            log.weight,
+            log.weight_unit.name,
+            log.rir or '',
+        ]
@@ -24,10 +24,8 @@ from django.urls import reverse
 from django.utils.translation import gettext as _
 
 # Third Party
-from reportlab.lib import colors
 from reportlab.lib.units import cm
 from reportlab.platypus import (
-    Image,
     KeepTogether,
     ListFlowable,
     ListItem,
@@ -37,9 +35,10 @@ from reportlab.platypus import (
 
 # wger
 from wger.utils.pdf import (
-    header_colour,
+    get_image,
     row_color,
     styleSheet,
+    workout_day_table_style,
 )
 
 
@@ -47,7 +46,7 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
     """
     Render a table with reportlab with the contents of the training day
 
-    :param day: a workout day object
+    :param day: the canonical representation of a workout day
     :param nr_of_weeks: the numbrer of weeks to render, default is 7
     :param images: boolean indicating whether to also draw exercise images
            in the PDF (actually only the main image)
@@ -74,7 +73,7 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
 
     p = Paragraph(
         '<para align="center">%(days)s: %(description)s</para>' % {
-            'days': day.days_txt,
+            'days': day.days_of_week_text,
             'description': day.description
         }, styleSheet["SubHeader"]
     )
@@ -88,31 +87,30 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
 
     # Sets
     exercise_start = len(data)
-    for set_obj in day.set_set.all():
+    for set_obj in day.set_list:
         group_exercise_marker[set_obj.id] = {'start': len(data), 'end': len(data)}
 
         # Exercises
-        for base in set_obj.exercise_bases:
-            exercise = base.get_translation()
+        for exercise in set_obj.exercise_list:
             group_exercise_marker[set_obj.id]['end'] = len(data)
 
             # Process the settings
             setting_out = []
-            for i in set_obj.reps_smart_text(base).split('–'):
+            for i in exercise.setting_text.split('–'):
                 setting_out.append(Paragraph(i, styleSheet["Small"], bulletText=''))
 
             # Collect a list of the exercise comments
             item_list = [Paragraph('', styleSheet["Small"])]
             if comments:
                 item_list = [
-                    ListItem(Paragraph(i.comment, style=styleSheet["ExerciseComments"]))
-                    for i in exercise.exercisecomment_set.all()
+                    ListItem(Paragraph(i, style=styleSheet["ExerciseComments"]))
+                    for i in exercise.get_comments()
                 ]
 
             # Add the exercise's main image
             image = Paragraph('', styleSheet["Small"])
             if images:
-                if base.main_image:
+                if exercise.main_image:
 
                     # Make the images somewhat larger when printing only the workout and not
                     # also the columns for weight logs
@@ -121,9 +119,7 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
                     else:
                         image_size = 1.5
 
-                    image = Image(base.main_image.image)
-                    image.drawHeight = image_size * cm * image.drawHeight / image.drawWidth
-                    image.drawWidth = image_size * cm
+                    image = get_image(exercise.main_image.name, image_size)
 
             # Put the name and images and comments together
             exercise_content = [
@@ -142,26 +138,7 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
             data.append([f"#{set_count}", exercise_content, setting_out] + [''] * nr_of_weeks)
         set_count += 1
 
-    table_style = [
-        ('FONT', (0, 0), (-1, -1), 'OpenSans'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 2),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 3),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
-
-        # Header
-        ('BACKGROUND', (0, 0), (-1, 0), header_colour),
-        ('BOX', (0, 0), (-1, -1), 1.25, colors.black),
-        ('BOX', (0, 1), (-1, -1), 1.25, colors.black),
-        ('SPAN', (0, 0), (-1, 0)),
-
-        # Cell with 'date'
-        ('SPAN', (0, 1), (2, 1)),
-        ('ALIGN', (0, 1), (2, 1), 'RIGHT')
-    ]
+    table_style = []
 
     # Combine the cells for exercises on the same superset
     for marker in group_exercise_marker:
@@ -179,7 +156,8 @@ def render_workout_day(day, nr_of_weeks=7, images=False, comments=False, only_ta
             table_style.append(('BACKGROUND', (0, i - 1), (-1, i - 1), row_color))
 
     # Put everything together and manually set some of the widths
-    t = Table(data, style=table_style)
+    t = Table(data, style=workout_day_table_style)
+    t.setStyle(table_style)
     if len(t._argW) > 1:
         if only_table:
             t._argW[0] = 0.6 * cm  # Numbering
@@ -224,12 +202,12 @@ class WorkoutCalendar(HTMLCalendar):
         # Note: due to circular imports we use can't import the workout session
         # model to access the impression values directly, so they are hard coded
         # here.
-        if entry['session']:
+        if entry.session:
             # Bad
-            if entry['session'].impression == '1':
+            if entry.session.impression == '1':
                 background_css = 'btn-danger'
             # Good
-            elif entry['session'].impression == '3':
+            elif entry.session.impression == '3':
                 background_css = 'btn-success'
             # Neutral
             else:
@@ -238,7 +216,7 @@ class WorkoutCalendar(HTMLCalendar):
         else:
             background_css = 'btn-warning'
 
-        url = reverse('manager:log:log', kwargs={'pk': entry['workout'].id})
+        url = reverse('manager:log:log', kwargs={'pk': entry.workout.id})
         formatted_date = date_obj.strftime('%Y-%m-%d')
         body = []
         body.append(
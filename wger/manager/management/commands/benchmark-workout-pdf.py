@@ -0,0 +1,167 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import io
+import re
+import time
+
+# Django
+from django.contrib.auth.models import User
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import transaction
+
+# wger
+from wger.core.models import DaysOfWeek
+from wger.exercises.models import ExerciseBase
+from wger.manager.models import (
+    Day,
+    Set,
+    Setting,
+    Workout,
+)
+from wger.manager.pdf import WorkoutPdf
+from wger.utils.cache import reset_workout_canonical_form
+from wger.utils.pdf import (
+    read_image,
+    read_static_file,
+)
+
+
+class BenchmarkRollback(Exception):
+    """
+    Raised to discard the workout created for the benchmark
+    """
+
+
+class Command(BaseCommand):
+    """
+    Measures how long it takes to render the PDF of a workout
+    """
+
+    help = (
+        'Measures the time per page needed to render the PDF of a workout with images and '
+        'comments. "Cold" renders start without the cached canonical form, images and logo, '
+        'like every request did before they were kept, "warm" renders reuse them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workout',
+            action='store',
+            dest='workout_id',
+            type=int,
+            help='The workout to render (default: a temporary workout with an exercise on '
+            'every day of the week, using exercises with images)',
+        )
+        parser.add_argument(
+            '--exercises',
+            action='store',
+            default=6,
+            dest='nr_exercises',
+            type=int,
+            help='The number of exercises per day of the temporary workout (default: 6)',
+        )
+        parser.add_argument(
+            '--repeat',
+            action='store',
+            default=5,
+            dest='repeat',
+            type=int,
+            help='How often to render the workout for each measurement (default: 5)',
+        )
+
+    def handle(self, **options):
+        if options['workout_id']:
+            try:
+                workout = Workout.objects.get(pk=options['workout_id'])
+            except Workout.DoesNotExist:
+                raise CommandError(f"Workout {options['workout_id']} does not exist")
+            self.benchmark(workout, options['repeat'])
+            return
+
+        try:
+            with transaction.atomic():
+                workout = self.create_workout(options['nr_exercises'])
+                self.benchmark(workout, options['repeat'])
+                raise BenchmarkRollback()
+        except BenchmarkRollback:
+            pass
+        reset_workout_canonical_form(workout.pk)
+
+    def create_workout(self, nr_exercises):
+        """
+        Creates a workout with a day for every day of the week
+        """
+        user = User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError('There are no users to create the workout for')
+
+        bases = list(
+            ExerciseBase.objects.filter(exerciseimage__is_main=True).distinct()[:nr_exercises]
+        )
+        if len(bases) < nr_exercises:
+            self.stdout.write('Not enough exercises with images, using ones without')
+            bases = list(ExerciseBase.objects.all()[:nr_exercises])
+        if not bases:
+            raise CommandError('There are no exercises to add to the workout')
+
+        workout = Workout.objects.create(user=user, name='PDF benchmark')
+        for day_of_week in DaysOfWeek.objects.all():
+            day = Day.objects.create(training=workout, description=f'{day_of_week} workout')
+            day.day.add(day_of_week)
+
+            for order, base in enumerate(bases, 1):
+                workout_set = Set.objects.create(exerciseday=day, sets=4, order=order)
+                Setting.objects.create(set=workout_set, exercise_base=base, reps=10, order=1)
+        return workout
+
+    def render(self, workout, cold):
+        """
+        Renders the workout and returns the time it took and the number of pages
+        """
+        if cold:
+            reset_workout_canonical_form(workout.pk)
+            read_image.cache_clear()
+            read_static_file.cache_clear()
+
+        document = WorkoutPdf(workout.pk, 'http://localhost/', images=True, comments=True)
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        document.build(buffer)
+        duration = time.perf_counter() - start
+        return duration, len(re.findall(rb'/Type /Page\b', buffer.getvalue()))
+
+    def benchmark(self, workout, repeat):
+        self.stdout.write(f'Rendering workout {workout.pk} ({workout.name}) {repeat} times')
+
+        results = {}
+        for label, cold in (('cold', True), ('warm', False)):
+            total = 0
+            pages = 0
+            for _ in range(repeat):
+                duration, pages = self.render(workout, cold)
+                total += duration
+            results[label] = total / repeat / max(pages, 1)
+            self.stdout.write(
+                f'{label}: {pages} page(s), {results[label] * 1000:.1f} ms per page',
+            )
+
+        if results['warm']:
+            self.stdout.write(f"Speedup: {results['cold'] / results['warm']:.2f}x")
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.6 on 2026-10-17 05:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import (
+    Count,
+    Max,
+)
+
+from wger.manager.consts import (
+    PROGRESSION_REPETITION_UNIT,
+    PROGRESSION_WEIGHT_UNITS,
+)
+
+
+def calculate_progression(apps, schema_editor):
+    """
+    Calculate the progression series for the existing logs
+    """
+    WorkoutLog = apps.get_model('manager', 'WorkoutLog')
+    WorkoutLogProgression = apps.get_model('manager', 'WorkoutLogProgression')
+
+    rows = WorkoutLog.objects.filter(
+        repetition_unit_id=PROGRESSION_REPETITION_UNIT,
+        weight_unit_id__in=PROGRESSION_WEIGHT_UNITS,
+    ).order_by().values('user_id', 'exercise_base_id', 'date', 'reps', 'weight_unit_id').annotate(
+        weight=Max('weight'),
+        log_count=Count('id'),
+    )
+
+    entries = []
+    for row in rows.iterator(chunk_size=2000):
+        entries.append(WorkoutLogProgression(**row))
+        if len(entries) >= 2000:
+            WorkoutLogProgression.objects.bulk_create(entries)
+            entries = []
+    WorkoutLogProgression.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0029_exercise_search_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('manager', '0017_alter_workoutlog_exercise_base'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkoutLogProgression',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('reps', models.IntegerField(verbose_name='Repetitions')),
+                ('date', models.DateField(verbose_name='Date')),
+                (
+                    'weight',
+                    models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Weight')
+                ),
+                ('log_count', models.IntegerField(verbose_name='Sets')),
+                (
+                    'exercise_base',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='exercises.exercisebase',
+                        verbose_name='Exercise'
+                    )
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='User'
+                    )
+                ),
+                (
+                    'weight_unit',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='core.weightunit',
+                        verbose_name='Unit'
+                    )
+                ),
+            ],
+            options={
+                'ordering': ['reps', 'weight_unit', 'date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='workoutlogprogression',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'exercise_base', 'reps', 'weight_unit', 'date'),
+                name='unique_workout_log_progression'
+            ),
+        ),
+        migrations.RunPython(calculate_progression, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.6 on 2026-10-17 06:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import TruncWeek
+
+from wger.manager.analytics import weekly_aggregates
+
+
+def calculate_weekly_summaries(apps, schema_editor):
+    """
+    Calculate the weekly summaries for the existing logs
+    """
+    WorkoutLog = apps.get_model('manager', 'WorkoutLog')
+    WorkoutLogWeeklySummary = apps.get_model('manager', 'WorkoutLogWeeklySummary')
+
+    rows = WorkoutLog.objects.annotate(week=TruncWeek('date')).order_by().values(
+        'user_id',
+        'exercise_base_id',
+        'week',
+    ).annotate(**weekly_aggregates())
+
+    entries = []
+    for row in rows.iterator(chunk_size=2000):
+        entries.append(WorkoutLogWeeklySummary(**row))
+        if len(entries) >= 2000:
+            WorkoutLogWeeklySummary.objects.bulk_create(entries)
+            entries = []
+    WorkoutLogWeeklySummary.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('exercises', '0029_exercise_search_term'),
+        ('manager', '0018_workout_log_progression'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkoutLogWeeklySummary',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('week', models.DateField(verbose_name='Week')),
+                ('sets', models.IntegerField(verbose_name='Sets')),
+                ('reps', models.IntegerField(verbose_name='Repetitions')),
+                (
+                    'tonnage',
+                    models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Tonnage')
+                ),
+                (
+                    'e1rm_epley',
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=7,
+                        null=True,
+                        verbose_name='Estimated one repetition maximum (Epley)'
+                    )
+                ),
+                (
+                    'e1rm_brzycki',
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=7,
+                        null=True,
+                        verbose_name='Estimated one repetition maximum (Brzycki)'
+                    )
+                ),
+                (
+                    'exercise_base',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='exercises.exercisebase',
+                        verbose_name='Exercise'
+                    )
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='User'
+                    )
+                ),
+            ],
+            options={
+                'ordering': ['week', 'exercise_base'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='workoutlogweeklysummary',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'exercise_base', 'week'), name='unique_workout_log_weekly_summary'
+            ),
+        ),
+        migrations.RunPython(calculate_weekly_summaries, reverse_code=migrations.RunPython.noop),
+    ]
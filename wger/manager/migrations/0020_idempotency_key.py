@@ -0,0 +1,39 @@
+# Generated by Django 4.2.6 on 2026-10-17 06:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0019_workout_log_weekly_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workoutlog',
+            name='idempotency_key',
+            field=models.UUIDField(
+                blank=True, editable=False, null=True, verbose_name='Idempotency key'
+            ),
+        ),
+        migrations.AddField(
+            model_name='workoutsession',
+            name='idempotency_key',
+            field=models.UUIDField(
+                blank=True, editable=False, null=True, verbose_name='Idempotency key'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='workoutlog',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'idempotency_key'), name='unique_workout_log_idempotency_key'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='workoutsession',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'idempotency_key'), name='unique_workout_session_idempotency_key'
+            ),
+        ),
+    ]
@@ -17,9 +17,11 @@
 # Local
 from .day import Day
 from .log import WorkoutLog
+from .progression import WorkoutLogProgression
 from .schedule import Schedule
 from .schedule_step import ScheduleStep
 from .session import WorkoutSession
 from .set import Set
 from .setting import Setting
+from .weekly_summary import WorkoutLogWeeklySummary
 from .workout import Workout
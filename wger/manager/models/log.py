@@ -111,9 +111,26 @@ class WorkoutLog(models.Model):
     done in the set.
     """
 
+    idempotency_key = models.UUIDField(
+        verbose_name=_('Idempotency key'),
+        editable=False,
+        blank=True,
+        null=True,
+    )
+    """
+    Key set by the client when uploading logs in bulk, so that retrying an
+    upload does not create the same entries again
+    """
+
     # Metaclass to set some other properties
     class Meta:
         ordering = ["date", "reps"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'idempotency_key'],
+                name='unique_workout_log_idempotency_key',
+            ),
+        ]
 
     def __str__(self):
         """
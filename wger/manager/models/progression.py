@@ -0,0 +1,161 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from typing import Iterable
+
+# Django
+from django.contrib.auth.models import User
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    Count,
+    Max,
+)
+from django.utils.translation import gettext_lazy as _
+
+# wger
+from wger.core.models import WeightUnit
+from wger.exercises.models import ExerciseBase
+from wger.manager.consts import (
+    PROGRESSION_REPETITION_UNIT,
+    PROGRESSION_WEIGHT_UNITS,
+)
+
+# Local
+from .log import WorkoutLog
+
+
+class WorkoutLogProgression(models.Model):
+    """
+    The maximum weight a user lifted for each number of repetitions of an
+    exercise, per day
+
+    This is kept in sync with the workout logs, so that the progression of an
+    exercise can be charted with one indexed query, regardless of how many
+    logs there are.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_('User'),
+        editable=False,
+        on_delete=models.CASCADE,
+    )
+
+    exercise_base = models.ForeignKey(
+        ExerciseBase,
+        verbose_name=_('Exercise'),
+        on_delete=models.CASCADE,
+    )
+
+    reps = models.IntegerField(verbose_name=_('Repetitions'))
+
+    weight_unit = models.ForeignKey(
+        WeightUnit,
+        verbose_name=_('Unit'),
+        on_delete=models.CASCADE,
+    )
+
+    date = models.DateField(verbose_name=_('Date'))
+
+    weight = models.DecimalField(
+        decimal_places=2,
+        max_digits=5,
+        verbose_name=_('Weight'),
+    )
+    """
+    The highest weight logged on this day for this number of repetitions
+    """
+
+    log_count = models.IntegerField(verbose_name=_('Sets'))
+    """
+    Number of logs on this day for this number of repetitions
+    """
+
+    class Meta:
+        ordering = ['reps', 'weight_unit', 'date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'exercise_base', 'reps', 'weight_unit', 'date'],
+                name='unique_workout_log_progression',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Progression: {self.reps} × {self.weight} on {self.date}'
+
+    def get_owner_object(self):
+        """
+        Returns the object that has owner information
+        """
+        return self
+
+    @classmethod
+    def refresh(cls, user_id: int, exercise_base_id: int, dates: Iterable[datetime.date]):
+        """
+        Recalculates the entries of the given days of a user and exercise, with
+        one aggregation query
+        """
+        dates = set(dates)
+        if not dates:
+            return
+
+        rows = WorkoutLog.objects.filter(
+            user_id=user_id,
+            exercise_base_id=exercise_base_id,
+            date__in=dates,
+            repetition_unit_id=PROGRESSION_REPETITION_UNIT,
+            weight_unit_id__in=PROGRESSION_WEIGHT_UNITS,
+        ).order_by().values('date', 'reps', 'weight_unit_id').annotate(
+            weight=Max('weight'),
+            log_count=Count('id'),
+        )
+
+        with transaction.atomic():
+            cls.objects.filter(
+                user_id=user_id,
+                exercise_base_id=exercise_base_id,
+                date__in=dates,
+            ).delete()
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, exercise_base_id=exercise_base_id, **row) for row in rows]
+            )
+
+    @classmethod
+    def rebuild(cls, logs=None):
+        """
+        Recalculates all entries of the given workout logs, e.g. after an import
+
+        :param logs: queryset of workout logs, defaults to all of them
+        """
+        logs = WorkoutLog.objects.all() if logs is None else logs
+        groups = {}
+        for user_id, base_id, date in logs.order_by().values_list(
+            'user_id',
+            'exercise_base_id',
+            'date',
+        ).distinct():
+            groups.setdefault((user_id, base_id), set()).add(date)
+
+        for (user_id, base_id), dates in groups.items():
+            cls.refresh(user_id, base_id, dates)
@@ -104,6 +104,17 @@ class WorkoutSession(models.Model):
     Time the workout session ended
     """
 
+    idempotency_key = models.UUIDField(
+        verbose_name=_('Idempotency key'),
+        editable=False,
+        blank=True,
+        null=True,
+    )
+    """
+    Key set by the client when uploading sessions in bulk, so that retrying an
+    upload does not create the same entries again
+    """
+
     def __str__(self):
         """
         Return a more human-readable representation
@@ -118,6 +129,12 @@ class WorkoutSession(models.Model):
             "date",
         ]
         unique_together = ("date", "user")
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'idempotency_key'],
+                name='unique_workout_session_idempotency_key',
+            ),
+        ]
 
     def clean(self):
         """
@@ -140,12 +157,12 @@ class WorkoutSession(models.Model):
         """
         Reset cache
         """
-        reset_workout_log(self.user_id, self.date.year, self.date.month)
+        reset_workout_log(self.user_id, self.date.year, self.date.month, self.date.day)
         super(WorkoutSession, self).save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
         Reset cache
         """
-        reset_workout_log(self.user_id, self.date.year, self.date.month)
+        reset_workout_log(self.user_id, self.date.year, self.date.month, self.date.day)
         super(WorkoutSession, self).delete(*args, **kwargs)
@@ -125,23 +125,29 @@ class Set(models.Model):
         # Interleave all lists
         return [val for tup in zip(*setting_lists) for val in tup]
 
-    def computed_settings_exercise(self, exercise_base: ExerciseBase):  # -> typing.List[Setting]
+    def computed_settings_exercise(
+        self,
+        exercise_base: ExerciseBase,
+        settings: typing.Optional[list] = None,
+    ):  # -> typing.List[Setting]
         """
         Returns a computed list of settings
 
         If a set has only one set
+
+        :param settings: the settings of the exercise in this set, if already loaded
         """
-        settings = self.setting_set.filter(exercise_base=exercise_base)
+        if settings is None:
+            settings = list(self.setting_set.filter(exercise_base=exercise_base))
 
-        if settings.count() == 0:
+        if len(settings) == 0:
             return []
-        elif settings.count() == 1:
-            setting = settings.first()
-            return [setting] * self.sets
+        elif len(settings) == 1:
+            return [settings[0]] * self.sets
         else:
-            return list(settings.all())
+            return list(settings)
 
-    def reps_smart_text(self, exercise_base: ExerciseBase):
+    def reps_smart_text(self, exercise_base: ExerciseBase, settings: typing.Optional[list] = None):
         """
         "Smart" textual representation
 
@@ -151,6 +157,7 @@ class Set(models.Model):
         and weight units as appropriate, e.g. "8 x 2 Plates", "10, 20, 30, ∞"
 
         :param exercise_base:
+        :param settings: the settings of the exercise in this set, if already loaded
         :return setting_text, setting_list:
         """
 
@@ -219,7 +226,8 @@ class Set(models.Model):
 
             return out
 
-        settings = self.setting_set.select_related().filter(exercise_base=exercise_base)
+        if settings is None:
+            settings = self.setting_set.select_related().filter(exercise_base=exercise_base)
         setting_text = ''
 
         # Only one setting entry, this is a "compact" representation such as e.g.
@@ -0,0 +1,160 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from typing import Iterable
+
+# Django
+from django.contrib.auth.models import User
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models.functions import TruncWeek
+from django.utils.translation import gettext_lazy as _
+
+# wger
+from wger.exercises.models import ExerciseBase
+from wger.manager.analytics import weekly_aggregates
+
+# Local
+from .log import WorkoutLog
+
+
+class WorkoutLogWeeklySummary(models.Model):
+    """
+    The training volume and estimated one repetition maximum of an exercise,
+    per user and ISO week
+
+    This is kept in sync with the workout logs, so that the analytics of a
+    user, or of all the members of a gym, can be read with one query.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_('User'),
+        editable=False,
+        on_delete=models.CASCADE,
+    )
+
+    exercise_base = models.ForeignKey(
+        ExerciseBase,
+        verbose_name=_('Exercise'),
+        on_delete=models.CASCADE,
+    )
+
+    week = models.DateField(verbose_name=_('Week'))
+    """
+    The monday of the ISO week
+    """
+
+    sets = models.IntegerField(verbose_name=_('Sets'))
+
+    reps = models.IntegerField(verbose_name=_('Repetitions'))
+
+    tonnage = models.DecimalField(
+        decimal_places=2,
+        max_digits=12,
+        verbose_name=_('Tonnage'),
+    )
+    """
+    Sum of weight × repetitions, in kg
+    """
+
+    e1rm_epley = models.DecimalField(
+        decimal_places=2,
+        max_digits=7,
+        null=True,
+        verbose_name=_('Estimated one repetition maximum (Epley)'),
+    )
+
+    e1rm_brzycki = models.DecimalField(
+        decimal_places=2,
+        max_digits=7,
+        null=True,
+        verbose_name=_('Estimated one repetition maximum (Brzycki)'),
+    )
+
+    class Meta:
+        ordering = ['week', 'exercise_base']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'exercise_base', 'week'],
+                name='unique_workout_log_weekly_summary',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Summary: {self.sets} sets in week of {self.week}'
+
+    def get_owner_object(self):
+        """
+        Returns the object that has owner information
+        """
+        return self
+
+    @classmethod
+    def refresh(cls, user_id: int, weeks: Iterable[datetime.date]):
+        """
+        Recalculates the entries of the given weeks of a user, with one
+        aggregation query
+
+        :param weeks: the mondays of the weeks
+        """
+        weeks = set(weeks)
+        if not weeks:
+            return
+
+        rows = WorkoutLog.objects.filter(
+            user_id=user_id,
+            date__gte=min(weeks),
+            date__lt=max(weeks) + datetime.timedelta(days=7),
+        ).annotate(week=TruncWeek('date')).filter(week__in=weeks).order_by().values(
+            'exercise_base_id',
+            'week',
+        ).annotate(**weekly_aggregates())
+
+        with transaction.atomic():
+            cls.objects.filter(user_id=user_id, week__in=weeks).delete()
+            cls.objects.bulk_create([cls(user_id=user_id, **row) for row in rows])
+
+    @classmethod
+    def rebuild(cls, user_ids: Iterable[int] = None, batch_size=200):
+        """
+        Recalculates all entries of the given users, e.g. after an import
+
+        Each batch of users is calculated with one aggregation query.
+
+        :param user_ids: defaults to all users with workout logs
+        """
+        if user_ids is None:
+            user_ids = WorkoutLog.objects.order_by().values_list('user_id', flat=True).distinct()
+        user_ids = sorted(set(user_ids))
+
+        for i in range(0, len(user_ids), batch_size):
+            batch = user_ids[i:i + batch_size]
+            rows = WorkoutLog.objects.filter(user_id__in=batch).annotate(
+                week=TruncWeek('date'),
+            ).order_by().values('user_id', 'exercise_base_id',
+                                'week').annotate(**weekly_aggregates())
+
+            with transaction.atomic():
+                cls.objects.filter(user_id__in=batch).delete()
+                cls.objects.bulk_create([cls(**row) for row in rows])
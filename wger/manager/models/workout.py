@@ -16,7 +16,6 @@
 
 # Django
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.urls import reverse
@@ -31,6 +30,7 @@ from wger.manager.managers import (
 from wger.utils.cache import (
     cache_mapper,
     reset_workout_canonical_form,
+    tagged_cache,
 )
 
 
@@ -134,6 +134,13 @@ class Workout(models.Model):
         """
         return self
 
+    @property
+    def days_by_weekday(self):
+        """
+        Returns the days of the workout, sorted by the first day of the week they are on
+        """
+        return sorted(self.day_set.prefetch_related('day'), key=lambda day: day.get_first_day_id)
+
     @property
     def canonical_representation(self):
         """
@@ -143,48 +150,15 @@ class Workout(models.Model):
         of a workout structure is needed. As an additional benefit, the template
         caches are not needed anymore.
         """
-        workout_canonical_form = cache.get(cache_mapper.get_workout_canonical(self.pk))
-        if not workout_canonical_form:
-            day_canonical_repr = []
-            muscles_front = []
-            muscles_back = []
-            muscles_front_secondary = []
-            muscles_back_secondary = []
-
-            # Sort list by weekday
-            day_list = [i for i in self.day_set.select_related()]
-            day_list.sort(key=lambda day: day.get_first_day_id)
-
-            for day in day_list:
-                canonical_repr_day = day.get_canonical_representation()
-
-                # Collect all muscles
-                for i in canonical_repr_day['muscles']['front']:
-                    if i not in muscles_front:
-                        muscles_front.append(i)
-                for i in canonical_repr_day['muscles']['back']:
-                    if i not in muscles_back:
-                        muscles_back.append(i)
-                for i in canonical_repr_day['muscles']['frontsecondary']:
-                    if i not in muscles_front_secondary:
-                        muscles_front_secondary.append(i)
-                for i in canonical_repr_day['muscles']['backsecondary']:
-                    if i not in muscles_back_secondary:
-                        muscles_back_secondary.append(i)
-
-                day_canonical_repr.append(canonical_repr_day)
-
-            workout_canonical_form = {
-                'obj': self,
-                'muscles': {
-                    'front': muscles_front,
-                    'back': muscles_back,
-                    'frontsecondary': muscles_front_secondary,
-                    'backsecondary': muscles_back_secondary
-                },
-                'day_list': day_canonical_repr
-            }
-            # Save to cache
-            cache.set(cache_mapper.get_workout_canonical(self.pk), workout_canonical_form)
-
-        return workout_canonical_form
+        # wger
+        from wger.manager.canonical import CanonicalFormBuilder
+
+        return tagged_cache.get_or_set(
+            cache_mapper.get_workout_canonical(self.pk),
+            lambda: CanonicalFormBuilder.for_workout(self),
+            tags=[cache_mapper.get_workout_tag(self.pk)],
+            value_tags=lambda workout_canonical_form: [
+                *map(cache_mapper.get_exercise_base_tag, workout_canonical_form.exercise_base_ids),
+                *map(cache_mapper.get_muscle_tag, workout_canonical_form.muscle_ids),
+            ],
+        )
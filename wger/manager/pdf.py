@@ -0,0 +1,227 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+from typing import List
+
+# Django
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+
+# Third Party
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+)
+
+# wger
+from wger.manager.helpers import render_workout_day
+from wger.manager.models import (
+    Schedule,
+    Workout,
+)
+from wger.utils.cache import cache_mapper
+from wger.utils.pdf import (
+    get_logo,
+    render_footer,
+    styleSheet,
+)
+from wger.utils.pdf_render import PdfDocument
+
+
+def get_workout_tags(workout: Workout) -> List[str]:
+    """
+    Returns the cache tags of the workout and of the exercises and muscles in it
+    """
+    canonical = workout.canonical_representation
+    return [
+        cache_mapper.get_workout_tag(workout.pk),
+        *map(cache_mapper.get_exercise_base_tag, canonical.exercise_base_ids),
+        *map(cache_mapper.get_muscle_tag, canonical.muscle_ids),
+    ]
+
+
+class WorkoutPdf(PdfDocument):
+    """
+    PDF with the contents of a workout
+
+    Unless only_table is set, the days have space to write down the logs.
+    """
+
+    def __init__(self, pk, url, images=False, comments=False, only_table=False):
+        super().__init__(
+            pk=pk,
+            url=url,
+            images=images,
+            comments=comments,
+            only_table=only_table,
+        )
+
+    @cached_property
+    def workout(self):
+        return Workout.objects.select_related('user').get(pk=self.kwargs['pk'])
+
+    def get_filename(self):
+        kind = 'table' if self.kwargs['only_table'] else 'log'
+        return f'Workout-{self.workout.pk}-{kind}.pdf'
+
+    def get_tags(self):
+        return get_workout_tags(self.workout)
+
+    def build(self, buffer):
+        workout = self.workout
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            leftMargin=cm,
+            rightMargin=cm,
+            topMargin=0.5 * cm,
+            bottomMargin=0.5 * cm,
+            title=_('Workout'),
+            author='wger Workout Manager',
+            subject=_('Workout for %s') % workout.user.username
+        )
+
+        # container for the 'Flowable' objects
+        elements = []
+
+        # Add site logo
+        elements.append(get_logo())
+        elements.append(Spacer(10 * cm, 0.5 * cm))
+
+        # Set the title
+        if self.kwargs['only_table']:
+            p = Paragraph(
+                '<para align="center"><strong>%(description)s</strong></para>' %
+                {'description': workout}, styleSheet["HeaderBold"]
+            )
+            elements.append(p)
+            elements.append(Spacer(10 * cm, 1.5 * cm))
+        else:
+            p = Paragraph(
+                f'<para align="center"><strong>{workout.name}</strong></para>',
+                styleSheet["HeaderBold"]
+            )
+            elements.append(p)
+            elements.append(Spacer(10 * cm, 0.5 * cm))
+            if workout.description:
+                p = Paragraph(f'<para align="center">{workout.description}</para>')
+                elements.append(p)
+                elements.append(Spacer(10 * cm, 1.5 * cm))
+
+        # Iterate through the Workout and render the training days
+        for day in workout.canonical_representation.day_list:
+            elements.append(
+                render_workout_day(
+                    day,
+                    images=self.kwargs['images'],
+                    comments=self.kwargs['comments'],
+                    only_table=self.kwargs['only_table'],
+                )
+            )
+            elements.append(Spacer(10 * cm, 0.5 * cm))
+
+        # Footer, date and info
+        elements.append(Spacer(10 * cm, 0.5 * cm))
+        elements.append(render_footer(self.kwargs['url']))
+
+        doc.build(elements)
+
+
+class SchedulePdf(PdfDocument):
+    """
+    PDF with the workouts of a schedule
+    """
+
+    def __init__(self, pk, url, images=False, comments=False, only_table=False):
+        super().__init__(
+            pk=pk,
+            url=url,
+            images=images,
+            comments=comments,
+            only_table=only_table,
+        )
+
+    @cached_property
+    def schedule(self):
+        return Schedule.objects.select_related('user').get(pk=self.kwargs['pk'])
+
+    @cached_property
+    def steps(self):
+        return list(self.schedule.schedulestep_set.select_related('workout'))
+
+    def get_filename(self):
+        kind = 'table' if self.kwargs['only_table'] else 'log'
+        return f'Schedule-{self.schedule.pk}-{kind}.pdf'
+
+    def get_tags(self):
+        tags = [cache_mapper.get_schedule_tag(self.schedule.pk)]
+        for step in self.steps:
+            tags += get_workout_tags(step.workout)
+        return tags
+
+    def build(self, buffer):
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=A4,
+            leftMargin=cm,
+            rightMargin=cm,
+            topMargin=0.5 * cm,
+            bottomMargin=0.5 * cm,
+            title=_('Workout'),
+            author='wger Workout Manager',
+            subject='Schedule for {0}'.format(self.schedule.user.username)
+        )
+
+        # container for the 'Flowable' objects
+        elements = []
+
+        # Set the title
+        p = Paragraph(
+            '<para align="center">{0}</para>'.format(self.schedule), styleSheet["HeaderBold"]
+        )
+        elements.append(p)
+        elements.append(Spacer(10 * cm, 0.5 * cm))
+
+        # Iterate through the Workout and render the training days
+        for step in self.steps:
+            p = Paragraph(
+                '<para>{0} {1}</para>'.format(step.duration, _('Weeks')),
+                styleSheet["HeaderBold"],
+            )
+            elements.append(p)
+            elements.append(Spacer(10 * cm, 0.5 * cm))
+
+            for day in step.workout.canonical_representation.day_list:
+                elements.append(
+                    render_workout_day(
+                        day,
+                        images=self.kwargs['images'],
+                        comments=self.kwargs['comments'],
+                        nr_of_weeks=7,
+                        only_table=self.kwargs['only_table'],
+                    )
+                )
+                elements.append(Spacer(10 * cm, 0.5 * cm))
+
+        # Footer, date and info
+        elements.append(Spacer(10 * cm, 0.5 * cm))
+        elements.append(render_footer(self.kwargs['url']))
+
+        doc.build(elements)
@@ -15,25 +15,132 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_save,
+)
 
 # wger
-from wger.gym.helpers import get_user_last_activity
+from wger.gym.helpers import (
+    register_user_activity,
+    schedule_user_last_activity_update,
+)
+from wger.manager.analytics import week_start
 from wger.manager.models import (
+    Schedule,
+    ScheduleStep,
     WorkoutLog,
+    WorkoutLogProgression,
+    WorkoutLogWeeklySummary,
     WorkoutSession,
 )
+from wger.utils.cache import reset_schedule_cache
+
+
+def store_previous_session_date(sender, instance: WorkoutSession, **kwargs):
+    """
+    Remember the day the session was on, in case it is moved
+    """
+    instance._previous_session_date = None
+    if instance.pk:
+        instance._previous_session_date = WorkoutSession.objects.filter(
+            pk=instance.pk,
+        ).values_list('date', flat=True).first()
 
 
 def update_activity_cache(sender, instance, **kwargs):
     """
     Update the user's cached last activity date
+
+    Saving an entry can only move the last activity forward. Only if an entry
+    is moved to an earlier day the last activity is recalculated, same as when
+    deleting one.
     """
+    register_user_activity(instance.user_id, instance.date)
+
+    if isinstance(instance, WorkoutLog):
+        previous = getattr(instance, '_previous_log_day', None)
+        previous = previous[1] if previous else None
+    else:
+        previous = getattr(instance, '_previous_session_date', None)
+
+    if previous and previous > instance.date:
+        schedule_user_last_activity_update(instance.user_id, previous)
 
-    user = instance.user
-    user.usercache.last_activity = get_user_last_activity(user)
-    user.usercache.save()
+
+def recalculate_activity_cache(sender, instance, **kwargs):
+    """
+    Recalculate the user's cached last activity date, if the deleted entry
+    could have been the last one
+    """
+    schedule_user_last_activity_update(instance.user_id, instance.date)
 
 
+pre_save.connect(store_previous_session_date, sender=WorkoutSession)
 post_save.connect(update_activity_cache, sender=WorkoutSession)
 post_save.connect(update_activity_cache, sender=WorkoutLog)
+post_delete.connect(recalculate_activity_cache, sender=WorkoutSession)
+post_delete.connect(recalculate_activity_cache, sender=WorkoutLog)
+
+
+def store_previous_log_day(sender, instance: WorkoutLog, **kwargs):
+    """
+    Remember the exercise and day the log was on, in case it is moved
+    """
+    instance._previous_log_day = None
+    if instance.pk:
+        instance._previous_log_day = WorkoutLog.objects.filter(pk=instance.pk).values_list(
+            'exercise_base_id',
+            'date',
+        ).first()
+
+
+def update_progression(sender, instance: WorkoutLog, **kwargs):
+    """
+    Update the progression series of the log's exercise and day
+    """
+    base_days = {instance.exercise_base_id: {instance.date}}
+
+    previous = getattr(instance, '_previous_log_day', None)
+    if previous:
+        base_days.setdefault(previous[0], set()).add(previous[1])
+
+    for base_id, dates in base_days.items():
+        WorkoutLogProgression.refresh(instance.user_id, base_id, dates)
+
+
+def update_weekly_summary(sender, instance: WorkoutLog, **kwargs):
+    """
+    Update the weekly summaries of the log's week
+    """
+    weeks = {week_start(instance.date)}
+
+    previous = getattr(instance, '_previous_log_day', None)
+    if previous:
+        weeks.add(week_start(previous[1]))
+
+    WorkoutLogWeeklySummary.refresh(instance.user_id, weeks)
+
+
+pre_save.connect(store_previous_log_day, sender=WorkoutLog)
+post_save.connect(update_progression, sender=WorkoutLog)
+post_save.connect(update_weekly_summary, sender=WorkoutLog)
+post_delete.connect(update_progression, sender=WorkoutLog)
+post_delete.connect(update_weekly_summary, sender=WorkoutLog)
+
+
+def reset_schedule(sender, instance, **kwargs):
+    """
+    Reset the cached entries of the schedule, e.g. its PDFs
+    """
+    if isinstance(instance, ScheduleStep):
+        reset_schedule_cache(instance.schedule_id)
+    else:
+        reset_schedule_cache(instance.pk)
+
+
+post_save.connect(reset_schedule, sender=Schedule)
+post_delete.connect(reset_schedule, sender=Schedule)
+post_save.connect(reset_schedule, sender=ScheduleStep)
+post_delete.connect(reset_schedule, sender=ScheduleStep)
@@ -13,7 +13,6 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.core.cache import cache
 from django.urls import reverse
 
 # wger
@@ -23,7 +22,10 @@ from wger.core.tests.base_testcase import (
     WgerTestCase,
 )
 from wger.manager.models import Day
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 class DayRepresentationTestCase(WgerTestCase):
@@ -168,10 +170,10 @@ class WorkoutCacheTestCase(WgerTestCase):
         """
         day = Day.objects.get(pk=1)
         day.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(day.training_id)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(day.training_id)))
 
         day.save()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(day.training_id)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(day.training_id)))
 
     def test_canonical_form_cache_delete(self):
         """
@@ -179,10 +181,10 @@ class WorkoutCacheTestCase(WgerTestCase):
         """
         day = Day.objects.get(pk=1)
         day.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(day.training_id)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(day.training_id)))
 
         day.delete()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(day.training_id)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(day.training_id)))
 
 
 class DayTestCase(WgerTestCase):
@@ -12,12 +12,18 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+from io import StringIO
+
 # Django
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 
 # wger
 from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import Workout
 from wger.utils.helpers import make_token
 
 
@@ -293,3 +299,38 @@ class WorkoutPdfTableExportTestCase(WgerTestCase):
         self.export_pdf(fail=True)
         self.export_pdf_token()
         self.export_pdf_token_wrong()
+
+
+class WorkoutPdfBenchmarkTestCase(WgerTestCase):
+    """
+    Test the command measuring the rendering time of the workout PDFs
+    """
+
+    def call_benchmark(self, *args):
+        out = StringIO()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('benchmark-workout-pdf', *args, '--repeat', '1', stdout=out)
+        return out.getvalue()
+
+    def setUp(self):
+        super().setUp()
+        self.init_media_root()
+
+    def test_temporary_workout(self):
+        """
+        Test that the temporary 7-day workout is removed again
+        """
+        workouts = Workout.objects.count()
+        output = self.call_benchmark('--exercises', '2')
+        self.assertIn('cold: ', output)
+        self.assertIn('warm: ', output)
+        self.assertIn('Speedup', output)
+        self.assertEqual(Workout.objects.count(), workouts)
+
+    def test_workout(self):
+        """
+        Test benchmarking an existing workout
+        """
+        output = self.call_benchmark('--workout', '3')
+        self.assertIn('Rendering workout 3', output)
+        self.assertIn('1 page(s)', output)
@@ -19,7 +19,6 @@ from typing import List
 from unittest import skip
 
 # Django
-from django.core.cache import cache
 from django.urls import (
     reverse,
     reverse_lazy,
@@ -38,7 +37,10 @@ from wger.manager.models import (
     Set,
     Setting,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -372,10 +374,14 @@ class SetWorkoutCacheTestCase(WgerTestCase):
         """
         set = Set.objects.get(pk=1)
         set.exerciseday.training.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id)))
+        self.assertTrue(
+            tagged_cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id))
+        )
 
         set.save()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id)))
+        self.assertFalse(
+            tagged_cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id))
+        )
 
     def test_canonical_form_cache_delete(self):
         """
@@ -383,10 +389,14 @@ class SetWorkoutCacheTestCase(WgerTestCase):
         """
         set = Set.objects.get(pk=1)
         set.exerciseday.training.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id)))
+        self.assertTrue(
+            tagged_cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id))
+        )
 
         set.delete()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id)))
+        self.assertFalse(
+            tagged_cache.get(cache_mapper.get_workout_canonical(set.exerciseday.training_id))
+        )
 
 
 class SettingWorkoutCacheTestCase(WgerTestCase):
@@ -401,10 +411,10 @@ class SettingWorkoutCacheTestCase(WgerTestCase):
         setting = Setting.objects.get(pk=1)
         workout_id = setting.set.exerciseday.training_id
         setting.set.exerciseday.training.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
         setting.save()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
     def test_canonical_form_cache_delete(self):
         """
@@ -413,10 +423,10 @@ class SettingWorkoutCacheTestCase(WgerTestCase):
         setting = Setting.objects.get(pk=1)
         workout_id = setting.set.exerciseday.training_id
         setting.set.exerciseday.training.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
         setting.delete()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(workout_id)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(workout_id)))
 
 
 class SetSmartReprTestCase(WgerTestCase):
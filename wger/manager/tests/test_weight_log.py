@@ -18,7 +18,6 @@ import logging
 
 # Django
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.urls import (
     reverse,
     reverse_lazy,
@@ -36,8 +35,13 @@ from wger.manager.models import (
     WorkoutLog,
     WorkoutSession,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    reset_workout_log,
+    tagged_cache,
+)
 from wger.utils.constants import WORKOUT_TAB
+from wger.weight.helpers import group_log_entries
 
 
 logger = logging.getLogger(__name__)
@@ -338,20 +342,20 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         """
         Test the log cache is correctly generated on visit
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_login('admin')
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
     def test_calendar_day(self):
         """
         Test the log cache on the calendar day view is correctly generated on visit
         """
-        log_hash = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_login('admin')
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
         self.client.get(
             reverse(
@@ -364,15 +368,15 @@ class WorkoutLogCacheTestCase(WgerTestCase):
                 }
             )
         )
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
     def test_calendar_anonymous(self):
         """
         Test the log cache is correctly generated on visit by anonymous users
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_logout()
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
         self.client.get(
             reverse(
@@ -383,15 +387,15 @@ class WorkoutLogCacheTestCase(WgerTestCase):
                 }
             )
         )
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
     def test_calendar_day_anonymous(self):
         """
         Test the log cache is correctly generated on visit by anonymous users
         """
-        log_hash = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_logout()
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
         self.client.get(
             reverse(
@@ -404,14 +408,14 @@ class WorkoutLogCacheTestCase(WgerTestCase):
                 }
             )
         )
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
     def test_cache_update_log(self):
         """
         Test that the caches are cleared when saving a log
         """
-        log_hash = hash((1, 2012, 10))
-        log_hash_day = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
         self.client.get(
@@ -430,15 +434,15 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         log.weight = 35
         log.save()
 
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash_day)))
+        self.assertFalse(tagged_cache.get(log_key))
+        self.assertFalse(tagged_cache.get(log_key_day))
 
     def test_cache_update_log_2(self):
         """
         Test that the caches are only cleared for a the log's month
         """
-        log_hash = hash((1, 2012, 10))
-        log_hash_day = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
         self.client.get(
@@ -457,15 +461,15 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         log.weight = 35
         log.save()
 
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash_day)))
+        self.assertTrue(tagged_cache.get(log_key))
+        self.assertTrue(tagged_cache.get(log_key_day))
 
     def test_cache_delete_log(self):
         """
         Test that the caches are cleared when deleting a log
         """
-        log_hash = hash((1, 2012, 10))
-        log_hash_day = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
         self.client.get(
@@ -483,15 +487,15 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         log = WorkoutLog.objects.get(pk=1)
         log.delete()
 
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash_day)))
+        self.assertFalse(tagged_cache.get(log_key))
+        self.assertFalse(tagged_cache.get(log_key_day))
 
     def test_cache_delete_log_2(self):
         """
         Test that the caches are only cleared for a the log's month
         """
-        log_hash = hash((1, 2012, 10))
-        log_hash_day = hash((1, 2012, 10, 1))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
         self.client.get(
@@ -509,8 +513,74 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         log = WorkoutLog.objects.get(pk=3)
         log.delete()
 
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash_day)))
+        self.assertTrue(tagged_cache.get(log_key))
+        self.assertTrue(tagged_cache.get(log_key_day))
+
+    def test_cache_update_log_other_day(self):
+        """
+        Test that saving a log resets its month, but not the other days
+        """
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
+        group_log_entries(User.objects.get(pk=1), 2012, 10)
+        group_log_entries(User.objects.get(pk=1), 2012, 10, 1)
+
+        log = WorkoutLog.objects.get(pk=2)
+        log.weight = 35
+        log.save()
+
+        self.assertFalse(tagged_cache.get(log_key))
+        self.assertTrue(tagged_cache.get(log_key_day))
+
+    def test_cache_reset_user(self):
+        """
+        Test that all the cached logs of a user can be reset at once
+        """
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
+        log_key_day = cache_mapper.get_workout_log_list(1, 2012, 10, 1)
+        group_log_entries(User.objects.get(pk=1), 2012, 10)
+        group_log_entries(User.objects.get(pk=1), 2012, 10, 1)
+
+        reset_workout_log(2)
+        self.assertTrue(tagged_cache.get(log_key))
+
+        reset_workout_log(1)
+        self.assertFalse(tagged_cache.get(log_key))
+        self.assertFalse(tagged_cache.get(log_key_day))
+
+    def test_cache_edit_workout(self):
+        """
+        Test that the cached logs are reset when the workout is renamed
+        """
+        group_log_entries(User.objects.get(pk=1), 2012, 10)
+
+        workout = Workout.objects.get(pk=1)
+        workout.name = 'Renamed workout'
+        workout.save()
+
+        logs = group_log_entries(User.objects.get(pk=1), 2012, 10)
+        self.assertEqual(str(logs[datetime.date(2012, 10, 1)].workout), 'Renamed workout')
+
+    def test_summary(self):
+        """
+        Test the summaries of the days
+        """
+        user = User.objects.get(pk=1)
+        with self.assertNumQueries(3):
+            logs = group_log_entries(user, 2012, 10)
+        self.assertEqual(list(logs), [datetime.date(2012, 10, 1), datetime.date(2012, 10, 10)])
+
+        with self.assertNumQueries(0):
+            logs = group_log_entries(user, 2012, 10)
+
+        summary = logs[datetime.date(2012, 10, 1)]
+        self.assertEqual(summary.workout.id, 1)
+        self.assertEqual(summary.session.id, 1)
+        self.assertEqual(summary.session.get_impression_display(), 'Neutral')
+        self.assertEqual([exercise.id for exercise in summary.exercises], [1])
+        self.assertEqual(summary.set_count, 1)
+        self.assertEqual(summary.exercises[0].sets[0].id, 1)
+        self.assertEqual(summary.exercises[0].name, 'An exercise')
 
 
 class WorkoutLogApiTestCase(api_base_test.ApiBaseResourceTestCase):
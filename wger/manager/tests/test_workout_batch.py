@@ -0,0 +1,191 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+import json
+import uuid
+
+# Django
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    WorkoutLog,
+    WorkoutLogProgression,
+    WorkoutLogWeeklySummary,
+    WorkoutSession,
+)
+
+
+class WorkoutBatchTestCase(WgerTestCase):
+    """
+    Tests uploading workout sessions and logs in bulk
+    """
+
+    url = '/api/v2/workoutlog/batch/'
+
+    def post(self, data):
+        return self.client.post(self.url, json.dumps(data), content_type='application/json')
+
+    def get_log(self, **kwargs):
+        data = {
+            'idempotency_key': str(uuid.uuid4()),
+            'exercise_base': 1,
+            'workout': 1,
+            'reps': 8,
+            'weight': '40.00',
+            'date': '2015-03-02',
+        }
+        data.update(kwargs)
+        return data
+
+    def get_session(self, **kwargs):
+        data = {
+            'idempotency_key': str(uuid.uuid4()),
+            'workout': 1,
+            'date': '2015-03-02',
+            'impression': '2',
+            'notes': 'Offline training',
+        }
+        data.update(kwargs)
+        return data
+
+    def test_batch(self):
+        """
+        Test uploading sessions and logs, the aggregations are updated
+        """
+        self.user_login('admin')
+        response = self.post(
+            {
+                'sessions': [self.get_session()],
+                'logs': [self.get_log(), self.get_log(reps=5, weight='45.00')],
+            },
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['sessions']), 1)
+        self.assertEqual([log['reps'] for log in response.data['logs']], [8, 5])
+        self.assertTrue(
+            WorkoutSession.objects.filter(user_id=1, date=datetime.date(2015, 3, 2)).exists()
+        )
+        self.assertEqual(
+            WorkoutLog.objects.filter(user_id=1, date=datetime.date(2015, 3, 2)).count(),
+            2,
+        )
+        self.assertEqual(
+            WorkoutLogProgression.objects.filter(user_id=1, date=datetime.date(2015, 3, 2)).count(),
+            2,
+        )
+        self.assertEqual(
+            WorkoutLogWeeklySummary.objects.get(user_id=1, week=datetime.date(2015, 3, 2)).sets,
+            2,
+        )
+        self.assertEqual(
+            User.objects.get(pk=1).usercache.last_activity,
+            datetime.date(2015, 3, 2),
+        )
+
+    def test_retry(self):
+        """
+        Test that entries with an already uploaded idempotency key are not
+        saved again
+        """
+        self.user_login('admin')
+        data = {
+            'sessions': [self.get_session()],
+            'logs': [self.get_log(), self.get_log()],
+        }
+        first = self.post(data)
+        data['logs'].append(self.get_log(date='2015-03-03'))
+        second = self.post(data)
+
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(first.data['sessions'][0]['id'], second.data['sessions'][0]['id'])
+        self.assertEqual(
+            [log['id'] for log in first.data['logs']],
+            [log['id'] for log in second.data['logs'][:2]],
+        )
+        self.assertEqual(
+            WorkoutLog.objects.filter(user_id=1, date__gte=datetime.date(2015, 3, 2)).count(),
+            3,
+        )
+
+    def test_number_of_queries(self):
+        """
+        Test that the number of queries does not depend on the number of entries
+        """
+        self.user_login('admin')
+        self.client.get('/api/v2/workoutlog/')
+
+        with CaptureQueriesContext(connection) as context:
+            self.post({'logs': [self.get_log()]})
+
+        logs = [
+            self.get_log(date=f'2015-04-{day:02d}', reps=reps) for day in range(1, 29)
+            for reps in (5, 8)
+        ]
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.post({'logs': logs})
+        self.assertEqual(response.status_code, 201)
+
+    def test_validation(self):
+        """
+        Test that the entries are validated together and nothing is saved if
+        one of them is invalid
+        """
+        self.user_login('admin')
+        count = WorkoutLog.objects.count()
+
+        # Workout of another user
+        response = self.post({'logs': [self.get_log(), self.get_log(workout=3)]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('workout', response.data)
+
+        # Unknown exercise
+        response = self.post({'logs': [self.get_log(exercise_base=999)]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('exercise_base', response.data)
+
+        # Repeated idempotency key
+        log = self.get_log()
+        response = self.post({'logs': [log, log]})
+        self.assertEqual(response.status_code, 400)
+
+        # There is already a session on that day
+        response = self.post(
+            {
+                'sessions': [self.get_session(date='2012-10-01')],
+                'logs': [self.get_log()],
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sessions', response.data)
+
+        # Nothing to save
+        self.assertEqual(self.post({}).status_code, 400)
+
+        self.assertEqual(WorkoutLog.objects.count(), count)
+
+    def test_anonymous(self):
+        """
+        Test that anonymous users can't upload anything
+        """
+        response = self.post({'logs': [self.get_log()]})
+        self.assertEqual(response.status_code, 403)
@@ -12,8 +12,8 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
-# Django
-from django.core.cache import cache
+# Standard Library
+import pickle
 
 # wger
 from wger.core.models import DaysOfWeek
@@ -22,13 +22,24 @@ from wger.exercises.models import (
     ExerciseBase,
     Muscle,
 )
+from wger.manager.api.serializers import WorkoutCanonicalFormSerializer
+from wger.manager.canonical import (
+    CanonicalDay,
+    CanonicalDayOfWeek,
+    CanonicalFormBuilder,
+    CanonicalMuscles,
+    CanonicalWorkout,
+)
 from wger.manager.models import (
     Day,
     Set,
     Setting,
     Workout,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 class WorkoutCanonicalFormTestCase(WgerTestCase):
@@ -37,156 +48,91 @@ class WorkoutCanonicalFormTestCase(WgerTestCase):
     """
     maxDiff = None
 
+    def get_muscle(self, pk):
+        return CanonicalFormBuilder.get_muscle(Muscle.objects.get(pk=pk))
+
+    def get_setting(self, pk):
+        return CanonicalFormBuilder.get_setting(Setting.objects.get(pk=pk))
+
     def test_canonical_form(self):
         """
         Tests the canonical form for a workout
         """
 
         workout = Workout.objects.get(pk=1)
-        setting_1 = Setting.objects.get(pk=1)
-        setting_2 = Setting.objects.get(pk=2)
-        muscle1 = Muscle.objects.get(pk=1)
-        muscle2 = Muscle.objects.get(pk=2)
-        setting1 = Setting.objects.get(pk=1)
-        setting2 = Setting.objects.get(pk=2)
+        muscle1 = self.get_muscle(1)
+        muscle2 = self.get_muscle(2)
+        setting1 = self.get_setting(1)
+        setting2 = self.get_setting(2)
         image1 = '/media/exercise-images/1/protestschwein.jpg'
         image2 = '/media/exercise-images/1/wildschwein.jpg'
+
+        canonical_form = workout.canonical_representation
+        self.assertIsInstance(canonical_form, CanonicalWorkout)
         self.assertEqual(
-            workout.canonical_representation['muscles'], {
-                'back': [muscle2],
-                'frontsecondary': [muscle1],
-                'backsecondary': [muscle1],
-                'front': [muscle1]
-            }
+            canonical_form.muscles,
+            CanonicalMuscles(
+                back=[muscle2],
+                frontsecondary=[muscle1],
+                backsecondary=[muscle1],
+                front=[muscle1],
+            ),
+        )
+        self.assertEqual(canonical_form.id, workout.id)
+        self.assertEqual(canonical_form.name, workout.name)
+
+        day = canonical_form.day_list[0]
+        self.assertEqual(day.id, 1)
+        self.assertEqual(day.days_of_week, [CanonicalDayOfWeek(id=2, day_of_week='Tuesday')])
+        self.assertEqual(day.days_of_week_text, 'Tuesday')
+        self.assertEqual(day.muscles, CanonicalMuscles(back=[muscle2], front=[muscle1]))
+
+        set_obj = day.set_list[0]
+        self.assertEqual(set_obj.id, 1)
+        self.assertFalse(set_obj.is_superset)
+        self.assertEqual(set_obj.muscles, CanonicalMuscles(back=[muscle2], front=[muscle1]))
+        self.assertEqual(set_obj.settings_computed, [setting1] * 2)
+
+        exercise = set_obj.exercise_list[0]
+        self.assertEqual(exercise.id, 1)
+        self.assertEqual(exercise.name, ExerciseBase.objects.get(pk=1).get_translation().name)
+        self.assertEqual([i.image for i in exercise.image_list], [image1, image2])
+        self.assertEqual(exercise.main_image.image, image1)
+        self.assertFalse(exercise.has_weight)
+        self.assertEqual(exercise.setting_list, [setting1])
+        self.assertEqual(exercise.setting_text, '2 \xd7 8 (3 RiR)')
+
+        day = canonical_form.day_list[1]
+        self.assertEqual(day.id, 2)
+        self.assertEqual(day.days_of_week_text, 'Thursday')
+        self.assertEqual(
+            day.muscles,
+            CanonicalMuscles(back=[muscle2], frontsecondary=[muscle1], backsecondary=[muscle1]),
+        )
+
+        set_obj = day.set_list[0]
+        self.assertEqual(set_obj.id, 2)
+        self.assertEqual(set_obj.settings_computed, [setting2] * 4)
+
+        exercise = set_obj.exercise_list[0]
+        self.assertEqual(exercise.id, 2)
+        self.assertEqual([i.image for i in exercise.image_list], [image2])
+        self.assertIsNone(exercise.main_image)
+        self.assertTrue(exercise.has_weight)
+        self.assertEqual(exercise.setting_list, [setting2])
+        self.assertEqual(exercise.setting_text, '4 \xd7 10 (15 kg)')
+
+        self.assertEqual(
+            canonical_form.day_list[2],
+            CanonicalDay(
+                id=4,
+                workout_id=1,
+                description=Day.objects.get(pk=4).description,
+                days_of_week=[CanonicalDayOfWeek(id=5, day_of_week='Friday')],
+                set_list=[],
+                muscles=CanonicalMuscles(),
+            ),
         )
-        self.assertEqual(workout.canonical_representation['obj'], workout)
-
-        canonical_form = {
-            'days_of_week': {
-                'day_list': [DaysOfWeek.objects.get(pk=2)],
-                'text': 'Tuesday'
-            },
-            'muscles': {
-                'back': [muscle2],
-                'frontsecondary': [],
-                'backsecondary': [],
-                'front': [muscle1]
-            },
-            'obj':
-            Day.objects.get(pk=1),
-            'set_list': [
-                {
-                    'exercise_list': [
-                        {
-                            'obj':
-                            ExerciseBase.objects.get(pk=1),
-                            'image_list': [
-                                {
-                                    'image': image1,
-                                    'is_main': True
-                                }, {
-                                    'image': image2,
-                                    'is_main': False
-                                }
-                            ],
-                            'comment_list': [],
-                            'has_weight':
-                            False,
-                            'setting_obj_list': [setting_1],
-                            'setting_text':
-                            '2 \xd7 8 (3 RiR)',
-                        }
-                    ],
-                    'is_superset':
-                    False,
-                    'muscles': {
-                        'back': [muscle2],
-                        'frontsecondary': [],
-                        'backsecondary': [],
-                        'front': [muscle1]
-                    },
-                    'obj':
-                    Set.objects.get(pk=1),
-                    'settings_computed': [setting1] * 2
-                }
-            ]
-        }
-
-        days_test_data = workout.canonical_representation['day_list'][0]
-        self.assertEqual(days_test_data['days_of_week'], canonical_form['days_of_week'])
-        self.assertEqual(days_test_data['muscles'], canonical_form['muscles'])
-        self.assertEqual(days_test_data['obj'], canonical_form['obj'])
-
-        # Check that the content is the same
-        for key in days_test_data['set_list'][0].keys():
-            self.assertEqual(days_test_data['set_list'][0][key], canonical_form['set_list'][0][key])
-
-        canonical_form = {
-            'days_of_week': {
-                'day_list': [DaysOfWeek.objects.get(pk=4)],
-                'text': 'Thursday'
-            },
-            'obj':
-            Day.objects.get(pk=2),
-            'muscles': {
-                'back': [muscle2],
-                'frontsecondary': [muscle1],
-                'backsecondary': [muscle1],
-                'front': []
-            },
-            'set_list': [
-                {
-                    'exercise_list': [
-                        {
-                            'obj': ExerciseBase.objects.get(pk=2),
-                            'image_list': [{
-                                'image': image2,
-                                'is_main': False
-                            }],
-                            'comment_list': [],
-                            'has_weight': True,
-                            'setting_obj_list': [setting_2],
-                            'setting_text': '4 \xd7 10 (15 kg)',
-                        }
-                    ],
-                    'is_superset':
-                    False,
-                    'muscles': {
-                        'back': [muscle2],
-                        'frontsecondary': [muscle1],
-                        'backsecondary': [muscle1],
-                        'front': []
-                    },
-                    'obj':
-                    Set.objects.get(pk=2),
-                    'settings_computed': [setting2] * 4
-                }
-            ]
-        }
-        days_test_data = workout.canonical_representation['day_list'][1]
-        self.assertEqual(days_test_data['days_of_week'], canonical_form['days_of_week'])
-        self.assertEqual(days_test_data['muscles'], canonical_form['muscles'])
-        self.assertEqual(days_test_data['obj'], canonical_form['obj'])
-
-        for key in days_test_data['set_list'][0].keys():
-            self.assertEqual(days_test_data['set_list'][0][key], canonical_form['set_list'][0][key])
-
-        # Check that the content is the same
-        canonical_form = {
-            'days_of_week': {
-                'day_list': [DaysOfWeek.objects.get(pk=5)],
-                'text': 'Friday'
-            },
-            'obj': Day.objects.get(pk=4),
-            'muscles': {
-                'back': [],
-                'front': [],
-                'frontsecondary': [],
-                'backsecondary': []
-            },
-            'set_list': [],
-        }
-        self.assertEqual(workout.canonical_representation['day_list'][2], canonical_form)
 
     def test_canonical_form_day(self):
         """
@@ -194,58 +140,161 @@ class WorkoutCanonicalFormTestCase(WgerTestCase):
         """
 
         day = Day.objects.get(pk=5)
-        weekday1 = DaysOfWeek.objects.get(pk=3)
-        weekday2 = DaysOfWeek.objects.get(pk=5)
-        muscle1 = Muscle.objects.get(pk=1)
-        muscle2 = Muscle.objects.get(pk=2)
-        setting = Setting.objects.get(pk=3)
-        image2 = '/media/exercise-images/1/wildschwein.jpg'
+        muscle1 = self.get_muscle(1)
+        muscle2 = self.get_muscle(2)
+        setting = self.get_setting(3)
+
+        canonical_form = day.canonical_representation
         self.assertEqual(
-            day.canonical_representation['days_of_week'], {
-                'day_list': [weekday1, weekday2],
-                'text': 'Wednesday, Friday'
-            }
+            canonical_form.days_of_week,
+            [
+                CanonicalDayOfWeek(id=3, day_of_week='Wednesday'),
+                CanonicalDayOfWeek(id=5, day_of_week='Friday'),
+            ],
         )
+        self.assertEqual(canonical_form.days_of_week_text, 'Wednesday, Friday')
         self.assertEqual(
-            day.canonical_representation['muscles'], {
-                'back': [muscle2],
-                'frontsecondary': [muscle1],
-                'backsecondary': [muscle1],
-                'front': []
+            canonical_form.muscles,
+            CanonicalMuscles(back=[muscle2], frontsecondary=[muscle1], backsecondary=[muscle1]),
+        )
+        self.assertEqual(canonical_form.id, day.id)
+
+        self.assertEqual(len(canonical_form.set_list), 1)
+        set_obj = canonical_form.set_list[0]
+        self.assertEqual(set_obj.id, 3)
+        self.assertEqual(set_obj.settings_computed, [setting] * 4)
+        self.assertEqual(set_obj.exercise_list[0].id, 2)
+        self.assertEqual(set_obj.exercise_list[0].setting_text, '4 \xd7 10')
+        self.assertEqual(set_obj.exercise_list[0].setting_list, [setting])
+
+    def test_names_by_language(self):
+        """
+        The exercise names are stored for all languages, the current one is used
+        """
+        exercise = Workout.objects.get(pk=1).canonical_representation.day_list[0].set_list[0] \
+            .exercise_list[0]
+        base = ExerciseBase.objects.get(pk=1)
+
+        for translation in base.exercises.all():
+            self.assertEqual(exercise.get_name(translation.language.short_name), translation.name)
+        self.assertEqual(exercise.get_name('xx'), base.get_translation('en').name)
+
+    def test_plain_data(self):
+        """
+        The cached canonical form does not contain model instances
+        """
+        workout = Workout.objects.get(pk=1)
+        workout.canonical_representation
+        data = pickle.dumps(tagged_cache.get(cache_mapper.get_workout_canonical(workout)))
+
+        self.assertNotIn(b'django.db', data)
+        self.assertNotIn(b'wger.manager.models', data)
+        self.assertNotIn(b'wger.exercises.models', data)
+
+    def test_cache_key_version(self):
+        self.assertIn(
+            f'-v{cache_mapper.WORKOUT_CANONICAL_VERSION}-',
+            cache_mapper.get_workout_canonical(1),
+        )
+
+    def test_api(self):
+        """
+        The API returns the same fields for the canonical form as for the models
+        """
+        self.user_login('admin')
+        response = self.client.get('/api/v2/workout/1/canonical_representation/')
+        self.assertEqual(response.status_code, 200)
+
+        result = response.data
+        self.assertEqual(result['obj']['name'], 'A test workout')
+        day = result['day_list'][0]
+        self.assertEqual(
+            dict(day['obj']), {
+                'id': 1,
+                'training': 1,
+                'description': 'A day',
+                'day': [2]
             }
         )
-        self.assertEqual(day.canonical_representation['obj'], day)
-
-        canonical_form = [
-            {
-                'exercise_list': [
-                    {
-                        'obj': ExerciseBase.objects.get(pk=2),
-                        'image_list': [{
-                            'image': image2,
-                            'is_main': False
-                        }],
-                        'comment_list': [],
-                        'has_weight': False,
-                        'setting_obj_list': [Setting.objects.get(pk=3)],
-                        'setting_text': '4 \xd7 10',
-                    }
-                ],
-                'is_superset':
-                False,
-                'muscles': {
-                    'back': [muscle2],
-                    'frontsecondary': [muscle1],
-                    'backsecondary': [muscle1],
-                    'front': []
-                },
-                'obj':
-                Set.objects.get(pk=3),
-                'settings_computed': [setting] * 4
+        self.assertEqual(day['days_of_week']['text'], 'Tuesday')
+
+        set_obj = day['set_list'][0]
+        self.assertEqual(
+            dict(set_obj['obj']), {
+                'id': 1,
+                'exerciseday': 1,
+                'sets': 2,
+                'order': 1,
+                'comment': ''
             }
-        ]
+        )
+        self.assertEqual(set_obj['settings_computed'][0]['exercise_base'], 1)
+        self.assertEqual(set_obj['settings_computed'][0]['rir'], '3')
+
+        exercise = set_obj['exercise_list'][0]
+        self.assertEqual(exercise['obj']['id'], 1)
+        self.assertEqual(exercise['obj']['uuid'], str(ExerciseBase.objects.get(pk=1).uuid))
+        self.assertEqual(exercise['setting_text'], '2 \xd7 8 (3 RiR)')
+        self.assertEqual(
+            result['day_list'][1]['set_list'][0]['settings_computed'][0]['weight'], '15.00'
+        )
+
 
-        self.assertEqual(day.canonical_representation['set_list'], canonical_form)
+    def test_api_deleted_exercise_base(self):
+        """
+        Exercise bases that are not available anymore are left empty
+        """
+        canonical_form = Workout.objects.get(pk=1).canonical_representation
+        result = WorkoutCanonicalFormSerializer(
+            canonical_form,
+            context={'exercise_bases': {}},
+        ).data
+
+        exercise = result['day_list'][0]['set_list'][0]['exercise_list'][0]
+        self.assertIsNone(exercise['obj'])
+        self.assertEqual(exercise['setting_text'], '2 \xd7 8 (3 RiR)')
+
+class WorkoutCanonicalFormQueriesTestCase(WgerTestCase):
+    """
+    Tests the number of queries needed to build the canonical form
+    """
+
+    def add_day(self, workout, nr_sets):
+        day = Day.objects.create(training=workout, description='Extra day')
+        day.day.add(DaysOfWeek.objects.get(pk=6))
+        for i in range(nr_sets):
+            set_obj = Set.objects.create(exerciseday=day, order=i, sets=3)
+            for base_id in (1, 2):
+                Setting.objects.create(
+                    set=set_obj,
+                    exercise_base_id=base_id,
+                    reps=8 + i,
+                    weight=20,
+                    order=1,
+                )
+
+    def test_constant_queries(self):
+        """
+        The number of queries does not depend on the size of the workout
+        """
+        workout = Workout.objects.get(pk=1)
+        with self.assertNumQueries(9):
+            CanonicalFormBuilder.for_workout(workout)
+
+        for _ in range(3):
+            self.add_day(workout, nr_sets=5)
+        with self.assertNumQueries(9):
+            canonical_form = CanonicalFormBuilder.for_workout(workout)
+
+        self.assertEqual(len(canonical_form.day_list), 6)
+        extra_day = canonical_form.day_list[-1]
+        self.assertEqual(len(extra_day.set_list), 5)
+        self.assertTrue(extra_day.set_list[0].is_superset)
+        self.assertEqual(len(extra_day.set_list[0].settings_computed), 6)
+        self.assertEqual(
+            extra_day.set_list[0].exercise_list[0].setting_text,
+            '3 \xd7 8 (20 kg)',
+        )
 
 
 class WorkoutCacheTestCase(WgerTestCase):
@@ -257,11 +306,11 @@ class WorkoutCacheTestCase(WgerTestCase):
         """
         Tests that the workout cache of the canonical form is correctly generated
         """
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
 
         workout = Workout.objects.get(pk=1)
         workout.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
 
     def test_canonical_form_cache_save(self):
         """
@@ -269,10 +318,10 @@ class WorkoutCacheTestCase(WgerTestCase):
         """
         workout = Workout.objects.get(pk=1)
         workout.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
 
         workout.save()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
 
     def test_canonical_form_cache_delete(self):
         """
@@ -280,7 +329,7 @@ class WorkoutCacheTestCase(WgerTestCase):
         """
         workout = Workout.objects.get(pk=1)
         workout.canonical_representation
-        self.assertTrue(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
 
         workout.delete()
-        self.assertFalse(cache.get(cache_mapper.get_workout_canonical(1)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_workout_canonical(1)))
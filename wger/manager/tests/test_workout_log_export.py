@@ -0,0 +1,77 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import csv
+
+# Django
+from django.urls import reverse
+from django.utils import translation
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class WorkoutLogExportTestCase(WgerTestCase):
+    """
+    Test the CSV export of the workout logs
+    """
+
+    def get_rows(self, language='en'):
+        with translation.override(language):
+            response = self.client.get(reverse('manager:log:export-csv'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=Workoutlogs.csv')
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.reader(content.splitlines()))
+
+    def test_export(self):
+        """
+        Test that only the user's own logs are exported, ordered by date
+        """
+        self.user_login('admin')
+        rows = self.get_rows()
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            [row[0] for row in rows[1:]], ['2012-10-01', '2012-10-10', '2012-11-01', '2013-10-30']
+        )
+        self.assertEqual(rows[1][2], 'An exercise')
+        self.assertEqual(rows[1][4], 'Repetitions')
+        self.assertEqual(rows[1][6], 'kg')
+
+    def test_export_translated(self):
+        """
+        Test that the exercise names are exported in the user's language
+        """
+        self.user_login('admin')
+        rows = self.get_rows('fr')
+        self.assertEqual(rows[1][2], 'Test exercise 123')
+
+    def test_export_fallback_english(self):
+        """
+        Test that the English name is used if there is no translation
+        """
+        self.user_login('admin')
+        rows = self.get_rows('de')
+        self.assertEqual(rows[1][2], 'An exercise')
+
+    def test_export_logged_out(self):
+        """
+        Test the export by a logged out user
+        """
+        response = self.client.get(reverse('manager:log:export-csv'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,215 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from decimal import Decimal
+
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    WorkoutLog,
+    WorkoutLogProgression,
+)
+
+
+class WorkoutLogProgressionTestCase(WgerTestCase):
+    """
+    Tests the progression series of the workout logs
+    """
+
+    def get_progression(self, date):
+        return list(
+            WorkoutLogProgression.objects.filter(
+                user_id=1,
+                exercise_base_id=1,
+                date=date,
+            ).values_list('reps', 'weight_unit_id', 'weight', 'log_count')
+        )
+
+    def add_log(self, **kwargs):
+        data = {
+            'user_id': 1,
+            'exercise_base_id': 1,
+            'workout_id': 1,
+            'reps': 8,
+            'weight': 35,
+            'date': datetime.date(2012, 10, 1),
+        }
+        data.update(kwargs)
+        return WorkoutLog.objects.create(**data)
+
+    def test_existing_logs(self):
+        """
+        Test that there is an entry for each day of the existing logs
+        """
+        self.assertEqual(
+            list(
+                WorkoutLogProgression.objects.filter(user_id=1, exercise_base_id=1
+                                                     ).values_list('date', flat=True)
+            ),
+            [
+                datetime.date(2012, 10, 1),
+                datetime.date(2012, 10, 10),
+                datetime.date(2012, 11, 1),
+                datetime.date(2013, 10, 30),
+            ],
+        )
+
+    def test_add_log(self):
+        """
+        Test that the maximum weight per repetitions is updated when adding logs
+        """
+        date = datetime.date(2012, 10, 1)
+        self.assertEqual(self.get_progression(date), [(8, 1, Decimal(30), 1)])
+
+        self.add_log(weight=35)
+        self.add_log(weight=20)
+        self.add_log(reps=10, weight=25)
+        self.assertEqual(
+            self.get_progression(date),
+            [(8, 1, Decimal(35), 3), (10, 1, Decimal(25), 1)],
+        )
+
+    def test_other_units(self):
+        """
+        Test that logs not in repetitions or with other weight units are ignored
+        """
+        date = datetime.date(2012, 10, 1)
+        self.add_log(weight=80, repetition_unit_id=2)
+        self.add_log(weight=80, weight_unit_id=3)
+        self.add_log(weight=80, weight_unit_id=2)
+
+        self.assertEqual(
+            self.get_progression(date),
+            [(8, 1, Decimal(30), 1), (8, 2, Decimal(80), 1)],
+        )
+
+    def test_edit_log(self):
+        """
+        Test that both days are updated when moving a log to another day
+        """
+        log = self.add_log(weight=35, date=datetime.date(2012, 10, 2))
+
+        log.date = datetime.date(2012, 10, 1)
+        log.save()
+        self.assertEqual(self.get_progression(datetime.date(2012, 10, 1)), [(8, 1, Decimal(35), 2)])
+        self.assertEqual(self.get_progression(datetime.date(2012, 10, 2)), [])
+
+    def test_delete_log(self):
+        """
+        Test that deleting logs updates the maximum, and removes empty days
+        """
+        log = self.add_log(weight=35)
+        log.delete()
+        self.assertEqual(self.get_progression(datetime.date(2012, 10, 1)), [(8, 1, Decimal(30), 1)])
+
+        WorkoutLog.objects.get(pk=1).delete()
+        self.assertEqual(self.get_progression(datetime.date(2012, 10, 1)), [])
+
+    def test_rebuild(self):
+        """
+        Test rebuilding the entries from the logs
+        """
+        WorkoutLogProgression.objects.all().delete()
+        WorkoutLogProgression.rebuild()
+
+        self.assertEqual(WorkoutLogProgression.objects.filter(user_id=1).count(), 4)
+        self.assertEqual(self.get_progression(datetime.date(2012, 10, 1)), [(8, 1, Decimal(30), 1)])
+
+    def test_chart(self):
+        """
+        Test the series returned by the API for charting
+        """
+        self.add_log(reps=10, weight=25)
+        self.user_login('admin')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v2/workoutlogprogression/chart/?exercise_base=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(
+                [
+                    q for q in context.captured_queries
+                    if 'manager_workoutlogprogression' in q['sql']
+                ]
+            ),
+            1,
+        )
+
+        self.assertEqual(
+            response.data, {
+                'exercise_base':
+                1,
+                'series': [
+                    {
+                        'reps':
+                        8,
+                        'weight_unit':
+                        1,
+                        'date': [
+                            datetime.date(2012, 10, 1),
+                            datetime.date(2012, 10, 10),
+                            datetime.date(2012, 11, 1),
+                            datetime.date(2013, 10, 30),
+                        ],
+                        'weight': [Decimal(30), Decimal(32),
+                                   Decimal(30), Decimal(38)],
+                        'log_count': [1, 1, 1, 1],
+                    },
+                    {
+                        'reps': 10,
+                        'weight_unit': 1,
+                        'date': [datetime.date(2012, 10, 1)],
+                        'weight': [Decimal(25)],
+                        'log_count': [1],
+                    },
+                ]
+            }
+        )
+
+    def test_chart_date_range(self):
+        """
+        Test that the chart can be limited to a date range
+        """
+        self.user_login('admin')
+        response = self.client.get(
+            '/api/v2/workoutlogprogression/chart/?exercise_base=1&date__gte=2012-10-05'
+            '&date__lte=2012-12-31'
+        )
+        self.assertEqual(
+            response.data['series'][0]['date'],
+            [datetime.date(2012, 10, 10), datetime.date(2012, 11, 1)],
+        )
+
+    def test_chart_other_user(self):
+        """
+        Test that users only see their own progression
+        """
+        self.user_login('test')
+        response = self.client.get('/api/v2/workoutlogprogression/chart/?exercise_base=1')
+        self.assertEqual(response.data['series'], [])
+
+    def test_chart_anonymous(self):
+        """
+        Test that anonymous users can't access the progression
+        """
+        response = self.client.get('/api/v2/workoutlogprogression/chart/?exercise_base=1')
+        self.assertEqual(response.status_code, 403)
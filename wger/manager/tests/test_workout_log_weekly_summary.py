@@ -0,0 +1,294 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from decimal import Decimal
+
+# Django
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.analytics import (
+    week_start,
+    weekly_aggregates,
+)
+from wger.manager.models import (
+    WorkoutLog,
+    WorkoutLogWeeklySummary,
+)
+
+
+class AnalyticsFormulaTestCase(WgerTestCase):
+    """
+    Tests the formulas of the training analytics
+    """
+
+    def test_week_start(self):
+        self.assertEqual(week_start(datetime.date(2012, 10, 1)), datetime.date(2012, 10, 1))
+        self.assertEqual(week_start(datetime.date(2012, 10, 7)), datetime.date(2012, 10, 1))
+        self.assertEqual(week_start(datetime.date(2012, 10, 8)), datetime.date(2012, 10, 8))
+
+    def add_logs(self):
+        for reps, weight in ((1, 100), (10, 100), (37, 50)):
+            WorkoutLog.objects.create(
+                user_id=1,
+                exercise_base_id=1,
+                workout_id=1,
+                reps=reps,
+                weight=weight,
+                date=datetime.date(2020, 1, 8),
+            )
+
+    def test_weekly_aggregates(self):
+        """
+        Test the estimated maximums according to Epley and Brzycki, the latter
+        is not used for more than 36 repetitions
+        """
+        self.add_logs()
+        result = WorkoutLog.objects.filter(
+            user_id=1,
+            date=datetime.date(2020, 1, 8),
+        ).order_by().values('exercise_base_id').annotate(**weekly_aggregates()).get()
+
+        self.assertEqual(result['sets'], 3)
+        self.assertEqual(result['reps'], 48)
+        self.assertAlmostEqual(result['tonnage'], 2950)
+        self.assertAlmostEqual(result['e1rm_epley'], 133.33, places=2)
+        self.assertAlmostEqual(result['e1rm_brzycki'], 133.33, places=2)
+
+    def test_weekly_summary(self):
+        """
+        Test that the summary stores the aggregated values
+        """
+        self.add_logs()
+        summary = WorkoutLogWeeklySummary.objects.get(user_id=1, week=datetime.date(2020, 1, 6))
+
+        self.assertEqual(summary.sets, 3)
+        self.assertEqual(summary.reps, 48)
+        self.assertEqual(summary.tonnage, Decimal(2950))
+        self.assertEqual(summary.e1rm_epley, Decimal('133.33'))
+        self.assertEqual(summary.e1rm_brzycki, Decimal('133.33'))
+
+
+class WorkoutLogWeeklySummaryTestCase(WgerTestCase):
+    """
+    Tests the weekly summaries of the workout logs
+    """
+
+    def get_summary(self, week, user_id=1):
+        return list(
+            WorkoutLogWeeklySummary.objects.filter(
+                user_id=user_id,
+                week=week,
+            ).values_list(
+                'exercise_base_id', 'sets', 'reps', 'tonnage', 'e1rm_epley', 'e1rm_brzycki'
+            )
+        )
+
+    def add_log(self, **kwargs):
+        data = {
+            'user_id': 1,
+            'exercise_base_id': 1,
+            'workout_id': 1,
+            'reps': 8,
+            'weight': 35,
+            'date': datetime.date(2012, 10, 1),
+        }
+        data.update(kwargs)
+        return WorkoutLog.objects.create(**data)
+
+    def test_existing_logs(self):
+        """
+        Test that there is an entry for each week of the existing logs
+        """
+        self.assertEqual(
+            list(WorkoutLogWeeklySummary.objects.filter(user_id=1).values_list('week', flat=True)),
+            [
+                datetime.date(2012, 10, 1),
+                datetime.date(2012, 10, 8),
+                datetime.date(2012, 10, 29),
+                datetime.date(2013, 10, 28),
+            ],
+        )
+        self.assertEqual(
+            self.get_summary(datetime.date(2012, 10, 1)),
+            [(1, 1, 8, Decimal(240), Decimal(38), Decimal('37.24'))],
+        )
+
+    def test_add_log(self):
+        """
+        Test that the summary is updated when adding logs, weights in lb are
+        converted to kg
+        """
+        self.add_log(date=datetime.date(2012, 10, 3), reps=1, weight=40)
+        self.add_log(date=datetime.date(2012, 10, 7), reps=5, weight=100, weight_unit_id=2)
+
+        self.assertEqual(
+            self.get_summary(datetime.date(2012, 10, 1)),
+            [(1, 3, 14, Decimal('506.80'), Decimal('52.92'), Decimal('51.03'))],
+        )
+
+    def test_other_units(self):
+        """
+        Test that logs not in repetitions or with other weight units are only
+        counted as sets
+        """
+        self.add_log(weight=80, repetition_unit_id=2)
+        self.add_log(weight=80, weight_unit_id=3)
+
+        self.assertEqual(
+            self.get_summary(datetime.date(2012, 10, 1)),
+            [(1, 3, 16, Decimal(240), Decimal(38), Decimal('37.24'))],
+        )
+
+    def test_edit_log(self):
+        """
+        Test that both weeks are updated when moving a log to another week
+        """
+        log = WorkoutLog.objects.get(pk=1)
+        log.date = datetime.date(2012, 10, 9)
+        log.save()
+
+        self.assertEqual(self.get_summary(datetime.date(2012, 10, 1)), [])
+        self.assertEqual(self.get_summary(datetime.date(2012, 10, 8))[0][:3], (1, 2, 16))
+
+    def test_delete_log(self):
+        """
+        Test that deleting logs removes empty weeks
+        """
+        WorkoutLog.objects.get(pk=1).delete()
+        self.assertEqual(self.get_summary(datetime.date(2012, 10, 1)), [])
+
+    def test_refresh_queries(self):
+        """
+        Test that the number of queries does not depend on the number of weeks
+        """
+        weeks = [datetime.date(2012, 10, 1), datetime.date(2012, 10, 8)]
+        with CaptureQueriesContext(connection) as context:
+            WorkoutLogWeeklySummary.refresh(1, weeks)
+        queries = len(context.captured_queries)
+
+        for week in range(10):
+            self.add_log(date=datetime.date(2013, 1, 7) + datetime.timedelta(weeks=week))
+            weeks.append(datetime.date(2013, 1, 7) + datetime.timedelta(weeks=week))
+        with self.assertNumQueries(queries):
+            WorkoutLogWeeklySummary.refresh(1, weeks)
+
+    def test_rebuild(self):
+        """
+        Test rebuilding the entries from the logs
+        """
+        WorkoutLogWeeklySummary.objects.all().delete()
+        WorkoutLogWeeklySummary.rebuild(batch_size=1)
+
+        self.assertEqual(WorkoutLogWeeklySummary.objects.filter(user_id=1).count(), 4)
+        self.assertEqual(WorkoutLogWeeklySummary.objects.filter(user_id=2).count(), 1)
+
+    def test_rebuild_command(self):
+        """
+        Test the management command rebuilding the entries of a user
+        """
+        WorkoutLogWeeklySummary.objects.all().delete()
+        call_command('rebuild-workout-analytics', '--user', '2', stdout=open('/dev/null', 'w'))
+
+        self.assertFalse(WorkoutLogWeeklySummary.objects.filter(user_id=1).exists())
+        self.assertEqual(WorkoutLogWeeklySummary.objects.filter(user_id=2).count(), 1)
+
+
+class WorkoutLogWeeklySummaryApiTestCase(WgerTestCase):
+    """
+    Tests the API of the weekly summaries
+    """
+
+    url = '/api/v2/workoutlogweeklysummary/'
+
+    def test_own_summaries(self):
+        """
+        Test that users only see their own summaries, filtered by week
+        """
+        self.user_login('admin')
+        response = self.client.get(self.url + '?week__gte=2012-10-05&week__lte=2012-12-31')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(entry['user'], entry['week']) for entry in response.data['results']],
+            [(1, '2012-10-08'), (1, '2012-10-29')],
+        )
+
+    def test_gym_summaries(self):
+        """
+        Test that trainers can read the summaries of the members of their gym,
+        with a constant number of queries
+        """
+        self.user_login('trainer1')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url + '?gym=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry['user'] for entry in response.data['results']], [2])
+
+        for user_id in (14, 15, 16):
+            WorkoutLog.objects.create(
+                user_id=user_id,
+                exercise_base_id=1,
+                workout_id=1,
+                reps=8,
+                weight=35,
+                date=datetime.date(2012, 10, 1),
+            )
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.client.get(self.url + '?gym=1')
+        self.assertEqual(
+            sorted(entry['user'] for entry in response.data['results']),
+            [2, 14, 15, 16],
+        )
+
+    def test_gym_summaries_other_gym(self):
+        """
+        Test that trainers can't read the summaries of other gyms, nor members
+        the ones of their own
+        """
+        self.user_login('trainer4')
+        self.assertEqual(self.client.get(self.url + '?gym=1').status_code, 403)
+
+        self.user_login('test')
+        self.assertEqual(self.client.get(self.url + '?gym=1').status_code, 403)
+
+        self.user_login('general_manager1')
+        self.assertEqual(self.client.get(self.url + '?gym=1').status_code, 200)
+
+    def test_muscles(self):
+        """
+        Test the sets per muscle and week
+        """
+        self.user_login('admin')
+        response = self.client.get(self.url + 'muscles/?week__lte=2012-10-31')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(entry['week'], entry['muscle'], entry['sets']) for entry in response.data],
+            [
+                (datetime.date(2012, 10, 1), 1, 1),
+                (datetime.date(2012, 10, 1), 2, 1),
+                (datetime.date(2012, 10, 8), 1, 1),
+                (datetime.date(2012, 10, 8), 2, 1),
+                (datetime.date(2012, 10, 29), 1, 1),
+                (datetime.date(2012, 10, 29), 2, 1),
+            ],
+        )
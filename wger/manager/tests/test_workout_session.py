@@ -17,7 +17,6 @@ import datetime
 
 # Django
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.urls import (
     reverse,
@@ -37,7 +36,10 @@ from wger.manager.models import (
     WorkoutLog,
     WorkoutSession,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 """
@@ -203,7 +205,7 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         """
         Test that the caches are cleared when updating a workout session
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
 
@@ -211,13 +213,13 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         session.notes = 'Lorem ipsum'
         session.save()
 
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
     def test_cache_update_session_2(self):
         """
         Test that the caches are only cleared for a the session's month
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
 
@@ -226,33 +228,33 @@ class WorkoutLogCacheTestCase(WgerTestCase):
         session.notes = 'Lorem ipsum'
         session.save()
 
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
     def test_cache_delete_session(self):
         """
         Test that the caches are cleared when deleting a workout session
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
 
         session = WorkoutSession.objects.get(pk=1)
         session.delete()
 
-        self.assertFalse(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertFalse(tagged_cache.get(log_key))
 
     def test_cache_delete_session_2(self):
         """
         Test that the caches are only cleared for a the session's month
         """
-        log_hash = hash((1, 2012, 10))
+        log_key = cache_mapper.get_workout_log_list(1, 2012, 10)
         self.user_login('admin')
         self.client.get(reverse('manager:workout:calendar', kwargs={'year': 2012, 'month': 10}))
 
         session = WorkoutSession.objects.get(pk=2)
         session.delete()
 
-        self.assertTrue(cache.get(cache_mapper.get_workout_log_list(log_hash)))
+        self.assertTrue(tagged_cache.get(log_key))
 
 
 class WorkoutSessionApiTestCase(api_base_test.ApiBaseResourceTestCase):
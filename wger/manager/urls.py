@@ -54,7 +54,12 @@ patterns_log = [
         '<int:pk>/delete',
         log.WorkoutLogDeleteView.as_view(),
         name='delete',
-    )
+    ),
+    path(
+        'export-csv',
+        log.export_csv,
+        name='export-csv',
+    ),
 ]
 
 # sub patterns for templates
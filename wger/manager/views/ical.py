@@ -90,17 +90,17 @@ def get_events_workout(calendar, workout, duration, start_date=None):
     generator = UIDGenerator()
     site = Site.objects.get_current()
 
-    for day in workout.day_set.all():
+    for day in workout.canonical_representation.day_list:
 
         # Make the description of the event with the day's exercises
         description_list = []
-        for set_obj in day.set_set.all():
-            for base in set_obj.exercise_bases:
-                description_list.append(str(base.get_translation()))
+        for set_obj in day.set_list:
+            for exercise in set_obj.exercise_list:
+                description_list.append(exercise.name)
         description = ', '.join(description_list) if description_list else day.description
 
         # Make an event for each weekday
-        for weekday in day.day.all():
+        for weekday in day.days_of_week:
             event = Event()
             event.add('summary', day.description)
             event.add('description', description)
@@ -20,6 +20,7 @@ import logging
 import uuid
 
 # Django
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.forms.models import modelformset_factory
 from django.http import (
@@ -49,6 +50,7 @@ from wger.core.models import (
     RepetitionUnit,
     WeightUnit,
 )
+from wger.manager.exports import WorkoutLogExport
 from wger.manager.forms import (
     HelperWorkoutSessionForm,
     WorkoutLogForm,
@@ -62,11 +64,13 @@ from wger.manager.models import (
     WorkoutLog,
     WorkoutSession,
 )
+from wger.utils.export import export_response
 from wger.utils.generic_views import (
     WgerDeleteMixin,
     WgerFormMixin,
 )
 from wger.utils.helpers import check_access
+from wger.utils.language import load_language
 from wger.weight.helpers import (
     group_log_entries,
     process_log_entries,
@@ -357,3 +361,12 @@ def day(request, username, year, month, day):
     context['is_owner'] = is_owner
 
     return render(request, 'calendar/day.html', context)
+
+
+@login_required
+def export_csv(request):
+    """
+    Exports the workout logs as a CSV file
+    """
+    export = WorkoutLogExport(request.user, language=load_language().short_name)
+    return export_response(request, export)
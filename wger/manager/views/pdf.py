@@ -18,179 +18,66 @@
 import logging
 
 # Django
-from django.http import (
-    HttpResponse,
-    HttpResponseForbidden,
-)
+from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404
-from django.utils.translation import gettext as _
-
-# Third Party
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-)
 
 # wger
-from wger.manager.helpers import render_workout_day
 from wger.manager.models import Workout
+from wger.manager.pdf import WorkoutPdf
 from wger.utils.helpers import check_token
-from wger.utils.pdf import (
-    get_logo,
-    render_footer,
-    styleSheet,
-)
+from wger.utils.pdf_render import pdf_response
 
 
 logger = logging.getLogger(__name__)
 
 
-def workout_log(request, id, images=False, comments=False, uidb64=None, token=None):
+def get_workout(request, id, uidb64=None, token=None):
     """
-    Generates a PDF with the contents of the given workout
-
-    See also
-    * http://www.blog.pythonlibrary.org/2010/09/21/reportlab
-    * http://www.reportlab.com/apis/reportlab/dev/platypus.html
+    Returns the workout, if the user or the token is allowed to access it
     """
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
     if uidb64 is not None and token is not None:
         if check_token(uidb64, token):
-            workout = get_object_or_404(Workout, pk=id)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        workout = get_object_or_404(Workout, pk=id, user=request.user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response = HttpResponse(content_type='application/pdf')
-
-    # Create the PDF object, using the response object as its "file."
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        # pagesize = landscape(A4),
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject=_('Workout for %s') % request.user.username
-    )
-
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Add site logo
-    elements.append(get_logo())
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Set the title
-    p = Paragraph(
-        f'<para align="center"><strong>{workout.name}</strong></para>', styleSheet["HeaderBold"]
-    )
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    if workout.description:
-        p = Paragraph(f'<para align="center">{workout.description}</para>')
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 1.5 * cm))
+            return get_object_or_404(Workout, pk=id)
+        return None
+    if request.user.is_anonymous:
+        return None
+    return get_object_or_404(Workout, pk=id, user=request.user)
 
-    # Iterate through the Workout and render the training days
-    for day in workout.day_set.all():
-        elements.append(render_workout_day(day, images=images, comments=comments))
-        elements.append(Spacer(10 * cm, 0.5 * cm))
 
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    elements.append(render_footer(request.build_absolute_uri(workout.get_absolute_url())))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response['Content-Disposition'] = 'attachment; filename=Workout-{0}-log.pdf'.format(id)
-    response['Content-Length'] = len(response.content)
-    return response
-
-
-def workout_view(request, id, images=False, comments=False, uidb64=None, token=None):
-    """
-    Generates a PDF with the contents of the workout, without table for logs
-    """
+def workout_log(request, id, images=False, comments=False, uidb64=None, token=None):
     """
     Generates a PDF with the contents of the given workout
+
     See also
     * http://www.blog.pythonlibrary.org/2010/09/21/reportlab
     * http://www.reportlab.com/apis/reportlab/dev/platypus.html
     """
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
-    if uidb64 is not None and token is not None:
-        if check_token(uidb64, token):
-            workout = get_object_or_404(Workout, pk=id)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        workout = get_object_or_404(Workout, pk=id, user=request.user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response = HttpResponse(content_type='application/pdf')
-
-    # Create the PDF object, using the response object as its "file."
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject=_('Workout for %s') % request.user.username
+    workout = get_workout(request, id, uidb64, token)
+    if workout is None:
+        return HttpResponseForbidden()
+
+    document = WorkoutPdf(
+        workout.pk,
+        request.build_absolute_uri(workout.get_absolute_url()),
+        images=bool(int(images)),
+        comments=bool(int(comments)),
     )
+    return pdf_response(request, document)
 
-    # container for the 'Flowable' objects
-    elements = []
 
-    # Add site logo
-    elements.append(get_logo())
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Set the title
-    p = Paragraph(
-        '<para align="center"><strong>%(description)s</strong></para>' % {'description': workout},
-        styleSheet["HeaderBold"]
+def workout_view(request, id, images=False, comments=False, uidb64=None, token=None):
+    """
+    Generates a PDF with the contents of the workout, without table for logs
+    """
+    workout = get_workout(request, id, uidb64, token)
+    if workout is None:
+        return HttpResponseForbidden()
+
+    document = WorkoutPdf(
+        workout.pk,
+        request.build_absolute_uri(workout.get_absolute_url()),
+        images=bool(int(images)),
+        comments=bool(int(comments)),
+        only_table=True,
     )
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 1.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for day in workout.day_set.all():
-        elements.append(render_workout_day(day, images=images, comments=comments, only_table=True))
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    elements.append(render_footer(request.build_absolute_uri(workout.get_absolute_url())))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    response['Content-Disposition'] = 'attachment; filename=Workout-{0}-table.pdf'.format(id)
-    response['Content-Length'] = len(response.content)
-    return response
+    return pdf_response(request, document)
@@ -22,7 +22,6 @@ import logging
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.http import (
-    HttpResponse,
     HttpResponseForbidden,
     HttpResponseRedirect,
 )
@@ -44,19 +43,10 @@ from django.views.generic import (
     UpdateView,
 )
 
-# Third Party
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import (
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-)
-
 # wger
 from wger.manager.forms import WorkoutScheduleDownloadForm
-from wger.manager.helpers import render_workout_day
 from wger.manager.models import Schedule
+from wger.manager.pdf import SchedulePdf
 from wger.utils.generic_views import (
     WgerDeleteMixin,
     WgerFormMixin,
@@ -65,10 +55,7 @@ from wger.utils.helpers import (
     check_token,
     make_token,
 )
-from wger.utils.pdf import (
-    render_footer,
-    styleSheet,
-)
+from wger.utils.pdf_render import pdf_response
 
 
 logger = logging.getLogger(__name__)
@@ -118,150 +105,54 @@ def view(request, pk):
     return render(request, 'schedule/view.html', template_data)
 
 
-def export_pdf_log(request, pk, images=False, comments=False, uidb64=None, token=None):
+def get_schedule(request, pk, uidb64=None, token=None):
     """
-    Show the workout schedule
+    Returns the schedule, if the user or the token is allowed to access it
     """
-    user = request.user
-
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
     if uidb64 is not None and token is not None:
         if check_token(uidb64, token):
-            schedule = get_object_or_404(Schedule, pk=pk)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        schedule = get_object_or_404(Schedule, pk=pk, user=user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    # and use it to the create the PDF using it as a file like object
-    response = HttpResponse(content_type='application/pdf')
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject='Schedule for {0}'.format(request.user.username)
-    )
+            return get_object_or_404(Schedule, pk=pk)
+        return None
+    if request.user.is_anonymous:
+        return None
+    return get_object_or_404(Schedule, pk=pk, user=request.user)
 
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Set the title
-    p = Paragraph('<para align="center">{0}</para>'.format(schedule), styleSheet["HeaderBold"])
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for step in schedule.schedulestep_set.all():
-        p = Paragraph(
-            '<para>{0} {1}</para>'.format(step.duration, _('Weeks')),
-            styleSheet["HeaderBold"],
-        )
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-        for day in step.workout.day_set.all():
-            elements.append(
-                render_workout_day(day, images=images, comments=comments, nr_of_weeks=7)
-            )
-            elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-    url = reverse('manager:schedule:view', kwargs={'pk': schedule.id})
-    elements.append(render_footer(request.build_absolute_uri(url)))
 
-    # write the document and send the response to the browser
-    doc.build(elements)
-    response['Content-Disposition'] = 'attachment; filename=Schedule-{0}-log.pdf'.format(pk)
-    response['Content-Length'] = len(response.content)
-    return response
+def export_pdf_log(request, pk, images=False, comments=False, uidb64=None, token=None):
+    """
+    Show the workout schedule
+    """
+    schedule = get_schedule(request, pk, uidb64, token)
+    if schedule is None:
+        return HttpResponseForbidden()
+
+    url = reverse('manager:schedule:view', kwargs={'pk': schedule.id})
+    document = SchedulePdf(
+        schedule.pk,
+        request.build_absolute_uri(url),
+        images=bool(int(images)),
+        comments=bool(int(comments)),
+    )
+    return pdf_response(request, document)
 
 
 def export_pdf_table(request, pk, images=False, comments=False, uidb64=None, token=None):
     """
     Show the workout schedule
     """
-    user = request.user
-
-    comments = bool(int(comments))
-    images = bool(int(images))
-
-    # Load the workout
-    if uidb64 is not None and token is not None:
-        if check_token(uidb64, token):
-            schedule = get_object_or_404(Schedule, pk=pk)
-        else:
-            return HttpResponseForbidden()
-    else:
-        if request.user.is_anonymous:
-            return HttpResponseForbidden()
-        schedule = get_object_or_404(Schedule, pk=pk, user=user)
-
-    # Create the HttpResponse object with the appropriate PDF headers.
-    # and use it to the create the PDF using it as a file like object
-    response = HttpResponse(content_type='application/pdf')
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        leftMargin=cm,
-        rightMargin=cm,
-        topMargin=0.5 * cm,
-        bottomMargin=0.5 * cm,
-        title=_('Workout'),
-        author='wger Workout Manager',
-        subject='Schedule for {0}'.format(request.user.username)
-    )
+    schedule = get_schedule(request, pk, uidb64, token)
+    if schedule is None:
+        return HttpResponseForbidden()
 
-    # container for the 'Flowable' objects
-    elements = []
-
-    # Set the title
-    p = Paragraph('<para align="center">{0}</para>'.format(schedule), styleSheet["HeaderBold"])
-    elements.append(p)
-    elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Iterate through the Workout and render the training days
-    for step in schedule.schedulestep_set.all():
-        p = Paragraph(
-            '<para>{0} {1}</para>'.format(step.duration, _('Weeks')),
-            styleSheet["HeaderBold"],
-        )
-        elements.append(p)
-        elements.append(Spacer(10 * cm, 0.5 * cm))
-
-        for day in step.workout.day_set.all():
-            elements.append(
-                render_workout_day(
-                    day,
-                    images=images,
-                    comments=comments,
-                    nr_of_weeks=7,
-                    only_table=True,
-                )
-            )
-            elements.append(Spacer(10 * cm, 0.5 * cm))
-
-    # Footer, date and info
-    elements.append(Spacer(10 * cm, 0.5 * cm))
     url = reverse('manager:schedule:view', kwargs={'pk': schedule.id})
-    elements.append(render_footer(request.build_absolute_uri(url)))
-
-    # write the document and send the response to the browser
-    doc.build(elements)
-    response['Content-Disposition'] = 'attachment; filename=Schedule-{0}-table.pdf'.format(pk)
-    response['Content-Length'] = len(response.content)
-    return response
+    document = SchedulePdf(
+        schedule.pk,
+        request.build_absolute_uri(url),
+        images=bool(int(images)),
+        comments=bool(int(comments)),
+        only_table=True,
+    )
+    return pdf_response(request, document)
 
 
 @login_required
@@ -137,7 +137,7 @@ def template_view(request, pk):
 
     context = {
         'workout': template,
-        'muscles': template.canonical_representation['muscles'],
+        'muscles': template.canonical_representation.muscles,
         'is_owner': template.user == request.user,
         'owner_user': template.user,
     }
@@ -0,0 +1,48 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.utils.translation import gettext as _
+
+# wger
+from wger.measurements.models import Measurement
+from wger.utils.export import CsvExport
+
+
+class MeasurementExport(CsvExport):
+    """
+    Exports the measurements of a user
+    """
+
+    filename = 'Measurements.csv'
+
+    def get_header(self):
+        return [_('Name'), _('Unit'), _('Date'), _('Value'), _('Notes')]
+
+    def get_queryset(self):
+        return Measurement.objects \
+            .filter(category__user=self.user) \
+            .select_related('category') \
+            .order_by('category__name', 'date')
+
+    def get_row(self, measurement):
+        return [
+            measurement.category.name,
+            measurement.category.unit,
+            measurement.date,
+            measurement.value,
+            measurement.notes,
+        ]
@@ -0,0 +1,53 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import csv
+
+# Django
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class MeasurementExportTestCase(WgerTestCase):
+    """
+    Test the CSV export of the measurements
+    """
+
+    def get_rows(self):
+        response = self.client.get(reverse('measurements:export-csv'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=Measurements.csv')
+        content = b''.join(response.streaming_content).decode()
+        return list(csv.reader(content.splitlines()))
+
+    def test_export(self):
+        """
+        Test exporting the measurements of the user
+        """
+        self.user_login('test')
+        rows = self.get_rows()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][0], 'Biceps')
+
+    def test_export_other_user(self):
+        """
+        Test that the measurements of other users are not exported
+        """
+        self.user_login('admin')
+        self.assertEqual(len(self.get_rows()), 1)
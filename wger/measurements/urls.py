@@ -18,6 +18,7 @@ from django.urls import path
 
 # wger
 from wger.core.views.react import ReactView
+from wger.measurements import views
 
 
 urlpatterns = [
@@ -31,4 +32,9 @@ urlpatterns = [
         ReactView.as_view(login_required=True),
         name='detail',
     ),
+    path(
+        'export-csv',
+        views.export_csv,
+        name='export-csv',
+    ),
 ]
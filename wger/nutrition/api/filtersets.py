@@ -3,6 +3,7 @@ from django_filters import rest_framework as filters
 
 # wger
 from wger.nutrition.models import (
+    DiaryDayTotals,
     Ingredient,
     LogItem,
 )
@@ -21,6 +22,15 @@ class LogItemFilterSet(filters.FilterSet):
         }
 
 
+class DiaryDayTotalsFilterSet(filters.FilterSet):
+
+    class Meta:
+        model = DiaryDayTotals
+        fields = {
+            'date': ['exact', 'gte', 'lte'],
+        }
+
+
 class IngredientFilterSet(filters.FilterSet):
 
     class Meta:
@@ -18,6 +18,7 @@ from rest_framework import serializers
 
 # wger
 from wger.nutrition.models import (
+    DiaryDayTotals,
     Image,
     Ingredient,
     IngredientWeightUnit,
@@ -81,6 +82,8 @@ class IngredientImageSerializer(serializers.ModelSerializer):
 
     ingredient_uuid = serializers.CharField(source='ingredient.uuid', read_only=True)
     ingredient_id = serializers.PrimaryKeyRelatedField(read_only=True)
+    srcset = serializers.ReadOnlyField(source='thumbnail_srcset')
+    sha256 = serializers.ReadOnlyField()
 
     class Meta:
         model = Image
@@ -90,6 +93,8 @@ class IngredientImageSerializer(serializers.ModelSerializer):
             'ingredient_id',
             'ingredient_uuid',
             'image',
+            'srcset',
+            'sha256',
             'created',
             'last_update',
             'size',
@@ -291,6 +296,34 @@ class NutritionalValuesSerializer(serializers.Serializer):
     sodium = serializers.FloatField()
 
 
+class DiaryDayTotalsSerializer(serializers.ModelSerializer):
+    """
+    Daily nutrition diary totals serializer
+    """
+    energy = serializers.FloatField()
+    protein = serializers.FloatField()
+    carbohydrates = serializers.FloatField()
+    carbohydrates_sugar = serializers.FloatField()
+    fat = serializers.FloatField()
+    fat_saturated = serializers.FloatField()
+    fibres = serializers.FloatField()
+    sodium = serializers.FloatField()
+
+    class Meta:
+        model = DiaryDayTotals
+        fields = [
+            'date',
+            'energy',
+            'protein',
+            'carbohydrates',
+            'carbohydrates_sugar',
+            'fat',
+            'fat_saturated',
+            'fibres',
+            'sodium',
+        ]
+
+
 class MealInfoSerializer(serializers.ModelSerializer):
     """
     Meal info serializer
@@ -21,6 +21,7 @@ from dataclasses import asdict
 
 # Django
 from django.conf import settings
+from django.http import Http404
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 
@@ -31,8 +32,6 @@ from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
 )
-from easy_thumbnails.alias import aliases
-from easy_thumbnails.files import get_thumbnailer
 from rest_framework import viewsets
 from rest_framework.decorators import (
     action,
@@ -46,10 +45,12 @@ from rest_framework.response import Response
 
 # wger
 from wger.nutrition.api.filtersets import (
+    DiaryDayTotalsFilterSet,
     IngredientFilterSet,
     LogItemFilterSet,
 )
 from wger.nutrition.api.serializers import (
+    DiaryDayTotalsSerializer,
     IngredientImageSerializer,
     IngredientInfoSerializer,
     IngredientSerializer,
@@ -63,9 +64,12 @@ from wger.nutrition.api.serializers import (
     WeightUnitSerializer,
 )
 from wger.nutrition.forms import UnitChooserForm
+from wger.nutrition.helpers import NutritionalValues
 from wger.nutrition.models import (
+    DiaryDayTotals,
     Image,
     Ingredient,
+    IngredientSearchTerm,
     IngredientWeightUnit,
     LogItem,
     Meal,
@@ -73,6 +77,7 @@ from wger.nutrition.models import (
     NutritionPlan,
     WeightUnit,
 )
+from wger.nutrition.models.totals import nutritional_values_aggregates
 from wger.utils.constants import ENGLISH_SHORT_NAME
 from wger.utils.language import load_language
 from wger.utils.viewsets import WgerOwnerObjectModelViewSet
@@ -218,28 +223,24 @@ def search(request):
         return Response(json_response)
 
     languages = [load_language(l) for l in language_codes.split(',')]
-    ingredients = Ingredient.objects.filter(
-        name__icontains=term,
-        language__in=languages,
-        status=Ingredient.STATUS_ACCEPTED,
-    )[:100]
+    ingredients = IngredientSearchTerm.search(term, languages)
+    images = Image.objects.in_bulk([i['id'] for i in ingredients], field_name='ingredient_id')
 
     for ingredient in ingredients:
-        if hasattr(ingredient, 'image'):
-            image_obj = ingredient.image
+        image = None
+        thumbnail = None
+        if ingredient['id'] in images:
+            image_obj = images[ingredient['id']]
             image = image_obj.image.url
-            t = get_thumbnailer(image_obj.image)
-            thumbnail = t.get_thumbnail(aliases.get('micro_cropped')).url
-        else:
-            ingredient.get_image(request)
-            image = None
-            thumbnail = None
+            thumbnail = image_obj.get_thumbnail_url('micro_cropped')
+            if not image_obj.has_current_thumbnails:
+                image_obj.queue_thumbnails()
 
         ingredient_json = {
-            'value': ingredient.name,
+            'value': ingredient['name'],
             'data': {
-                'id': ingredient.id,
-                'name': ingredient.name,
+                'id': ingredient['id'],
+                'name': ingredient['name'],
                 'image': image,
                 'image_thumbnail': thumbnail
             }
@@ -247,6 +248,8 @@ def search(request):
         results.append(ingredient_json)
     json_response['suggestions'] = results
 
+    Ingredient.queue_image_fetch([i['id'] for i in ingredients if i['id'] not in images], request)
+
     return Response(json_response)
 
 
@@ -257,7 +260,12 @@ class ImageViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Image.objects.all()
     serializer_class = IngredientImageSerializer
     ordering_fields = '__all__'
-    filterset_fields = ('uuid', 'ingredient_id', 'ingredient__uuid')
+    filterset_fields = {
+        'uuid': ['exact'],
+        'ingredient_id': ['exact'],
+        'ingredient__uuid': ['exact'],
+        'last_update': ['exact', 'gt', 'lt'],
+    }
 
     @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
     def dispatch(self, request, *args, **kwargs):
@@ -424,7 +432,10 @@ class MealItemViewSet(WgerOwnerObjectModelViewSet):
         """
         Return an overview of the nutritional plan's values
         """
-        return Response(MealItem.objects.get(pk=pk).get_nutritional_values())
+        values = self.get_queryset().filter(pk=pk).aggregate(**nutritional_values_aggregates())
+        if values['energy'] is None:
+            raise Http404
+        return Response(NutritionalValuesSerializer(NutritionalValues(**values)).data)
 
 
 class LogItemViewSet(WgerOwnerObjectModelViewSet):
@@ -458,6 +469,30 @@ class LogItemViewSet(WgerOwnerObjectModelViewSet):
         """
         Return an overview of the nutritional plan's values
         """
-        return Response(
-            LogItem.objects.get(pk=pk, plan__user=self.request.user).get_nutritional_values()
-        )
+        values = self.get_queryset().filter(pk=pk).aggregate(**nutritional_values_aggregates())
+        if values['energy'] is None:
+            raise Http404
+        return Response(NutritionalValuesSerializer(NutritionalValues(**values)).data)
+
+
+class DiaryDayTotalsViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the daily totals of the nutrition diary, over all plans
+
+    Use the date filters to read a range, e.g. ?date__gte=2023-01-01&date__lte=2023-12-31&limit=366
+    """
+
+    serializer_class = DiaryDayTotalsSerializer
+    is_private = True
+    ordering_fields = ['date']
+    filterset_class = DiaryDayTotalsFilterSet
+
+    def get_queryset(self):
+        """
+        Only allow access to appropriate objects
+        """
+        # REST API generation
+        if getattr(self, "swagger_fake_view", False):
+            return DiaryDayTotals.objects.none()
+
+        return DiaryDayTotals.objects.filter(user=self.request.user)
@@ -36,3 +36,27 @@ Simple approximation of energy (kcal) provided per gram or ounce
 """
 
 KJ_PER_KCAL = 4.184
+
+NUTRITIONAL_FIELDS = (
+    'energy',
+    'protein',
+    'carbohydrates',
+    'carbohydrates_sugar',
+    'fat',
+    'fat_saturated',
+    'fibres',
+    'sodium',
+)
+"""
+Fields of the nutritional values, in the same order as in NutritionalValues
+"""
+
+NULLABLE_NUTRITIONAL_FIELDS = (
+    'carbohydrates_sugar',
+    'fat_saturated',
+    'fibres',
+    'sodium',
+)
+"""
+These are None instead of 0 if no item has a value
+"""
@@ -0,0 +1,58 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.utils.translation import gettext as _
+
+# wger
+from wger.nutrition.models import LogItem
+from wger.utils.export import CsvExport
+
+
+class DiaryExport(CsvExport):
+    """
+    Exports the nutrition diary of a user
+    """
+
+    filename = 'Nutritiondiary.csv'
+
+    def get_header(self):
+        return [
+            _('Date and Time (Approx.)'),
+            _('Nutrition plan'),
+            _('Meal'),
+            _('Ingredient'),
+            _('Amount'),
+            _('Unit'),
+            _('Comment'),
+        ]
+
+    def get_queryset(self):
+        return LogItem.objects \
+            .filter(plan__user=self.user) \
+            .select_related('plan', 'meal', 'ingredient', 'weight_unit__unit') \
+            .order_by('datetime', 'id')
+
+    def get_row(self, item):
+        return [
+            item.datetime,
+            str(item.plan),
+            item.meal.name if item.meal else '',
+            item.ingredient.name,
+            item.amount,
+            item.weight_unit.unit.name if item.weight_unit else _('g'),
+            item.comment or '',
+        ]
@@ -55,6 +55,14 @@ class Command(BaseCommand):
             f'["WGER_INSTANCE"] - {settings.WGER_SETTINGS["WGER_INSTANCE"]})'
         )
 
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            dest='incremental',
+            default=False,
+            help='Only process images that were modified on the server since the last run'
+        )
+
     def handle(self, **options):
 
         if not settings.MEDIA_ROOT:
@@ -67,4 +75,9 @@ class Command(BaseCommand):
         except ValidationError:
             raise CommandError('Please enter a valid URL')
 
-        download_ingredient_images(self.stdout.write, remote_url, self.style.SUCCESS)
+        download_ingredient_images(
+            self.stdout.write,
+            remote_url,
+            self.style.SUCCESS,
+            incremental=options['incremental'],
+        )
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.6 on 2026-10-17 04:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from wger.utils.helpers import search_term_suffixes
+
+
+def build_search_index(apps, schema_editor):
+    """
+    Fill the search index for the existing, accepted, ingredients
+    """
+    Ingredient = apps.get_model('nutrition', 'Ingredient')
+    IngredientSearchTerm = apps.get_model('nutrition', 'IngredientSearchTerm')
+
+    entries = []
+    ingredients = Ingredient.objects.filter(status='2').order_by().values_list(
+        'id',
+        'language_id',
+        'name',
+        'brand',
+    )
+    for ingredient_id, language_id, name, brand in ingredients.iterator(chunk_size=2000):
+        terms = {}
+        for rank, text in ((0, name), (2, brand)):
+            for position, term in enumerate(search_term_suffixes(text)):
+                terms.setdefault(term[:200], rank + 1 if position and rank == 0 else rank)
+
+        for term, rank in terms.items():
+            entries.append(
+                IngredientSearchTerm(
+                    ingredient_id=ingredient_id,
+                    language_id=language_id,
+                    term=term,
+                    rank=rank,
+                    name=name,
+                )
+            )
+
+        if len(entries) >= 5000:
+            IngredientSearchTerm.objects.bulk_create(entries)
+            entries = []
+
+    IngredientSearchTerm.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nutrition', '0019_alter_image_license_author_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngredientSearchTerm',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('term', models.CharField(db_index=True, max_length=200)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('name', models.CharField(max_length=200)),
+                (
+                    'ingredient',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='search_terms',
+                        to='nutrition.ingredient'
+                    )
+                ),
+                (
+                    'language',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='core.language'
+                    )
+                ),
+            ],
+            options={
+                'indexes':
+                [models.Index(fields=['language', 'term'], name='nutrition_i_languag_58851e_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,182 @@
+# Generated by Django 4.2.6 on 2026-10-17 04:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import TruncDate
+
+from wger.nutrition.models.totals import nutritional_values_aggregates
+
+
+def store_totals(model, rows):
+    entries = []
+    for row in rows.iterator(chunk_size=2000):
+        if row['energy'] is None:
+            continue
+
+        entries.append(model(**row))
+        if len(entries) >= 2000:
+            model.objects.bulk_create(entries)
+            entries = []
+    model.objects.bulk_create(entries)
+
+
+def calculate_totals(apps, schema_editor):
+    """
+    Calculate the totals for the existing plans, meals and logs
+    """
+    Meal = apps.get_model('nutrition', 'Meal')
+    MealItem = apps.get_model('nutrition', 'MealItem')
+    LogItem = apps.get_model('nutrition', 'LogItem')
+
+    store_totals(
+        apps.get_model('nutrition', 'MealTotals'),
+        MealItem.objects.order_by().values('meal_id').annotate(**nutritional_values_aggregates()),
+    )
+    store_totals(
+        apps.get_model('nutrition', 'PlanTotals'),
+        Meal.objects.order_by().values('plan_id').annotate(
+            **nutritional_values_aggregates('mealitem__')
+        ),
+    )
+    store_totals(
+        apps.get_model('nutrition', 'LogDayTotals'),
+        LogItem.objects.annotate(
+            date=TruncDate('datetime')
+        ).order_by().values('plan_id', 'date').annotate(**nutritional_values_aggregates()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nutrition', '0020_ingredient_search_term'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MealTotals',
+            fields=[
+                ('energy', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('protein', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('carbohydrates', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'carbohydrates_sugar',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('fat', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'fat_saturated',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'fibres',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'sodium',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'meal',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='totals',
+                        serialize=False,
+                        to='nutrition.meal',
+                        verbose_name='Meal'
+                    )
+                ),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanTotals',
+            fields=[
+                ('energy', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('protein', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('carbohydrates', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'carbohydrates_sugar',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('fat', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'fat_saturated',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'fibres',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'sodium',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'plan',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='totals',
+                        serialize=False,
+                        to='nutrition.nutritionplan',
+                        verbose_name='Nutrition plan'
+                    )
+                ),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LogDayTotals',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('energy', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('protein', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('carbohydrates', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'carbohydrates_sugar',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('fat', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'fat_saturated',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'fibres',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'sodium',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('date', models.DateField(verbose_name='Date')),
+                (
+                    'plan',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='log_day_totals',
+                        to='nutrition.nutritionplan',
+                        verbose_name='Nutrition plan'
+                    )
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='logdaytotals',
+            constraint=models.UniqueConstraint(
+                fields=('plan', 'date'), name='unique_log_day_totals'
+            ),
+        ),
+        migrations.RunPython(calculate_totals, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.6 on 2026-10-17 05:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import F
+from django.db.models.functions import TruncDate
+
+from wger.nutrition.models.totals import nutritional_values_aggregates
+
+
+def calculate_totals(apps, schema_editor):
+    """
+    Calculate the diary totals for the existing logs
+    """
+    LogItem = apps.get_model('nutrition', 'LogItem')
+    DiaryDayTotals = apps.get_model('nutrition', 'DiaryDayTotals')
+
+    rows = LogItem.objects.annotate(
+        user_id=F('plan__user_id'),
+        date=TruncDate('datetime'),
+    ).order_by().values('user_id', 'date').annotate(**nutritional_values_aggregates())
+
+    entries = []
+    for row in rows.iterator(chunk_size=2000):
+        if row['energy'] is None:
+            continue
+
+        entries.append(DiaryDayTotals(**row))
+        if len(entries) >= 2000:
+            DiaryDayTotals.objects.bulk_create(entries)
+            entries = []
+    DiaryDayTotals.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('nutrition', '0021_nutritional_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiaryDayTotals',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    )
+                ),
+                ('energy', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('protein', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                ('carbohydrates', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'carbohydrates_sugar',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('fat', models.DecimalField(decimal_places=9, default=0, max_digits=20)),
+                (
+                    'fat_saturated',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'fibres',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                (
+                    'sodium',
+                    models.DecimalField(decimal_places=9, default=None, max_digits=20, null=True)
+                ),
+                ('date', models.DateField(verbose_name='Date')),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='diary_day_totals',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='User'
+                    )
+                ),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='diarydaytotals',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'date'), name='unique_diary_day_totals'
+            ),
+        ),
+        migrations.RunPython(calculate_totals, reverse_code=migrations.RunPython.noop),
+    ]
@@ -23,5 +23,12 @@ from .log import LogItem
 from .meal import Meal
 from .meal_item import MealItem
 from .plan import NutritionPlan
+from .search import IngredientSearchTerm
 from .sources import Source
+from .totals import (
+    DiaryDayTotals,
+    LogDayTotals,
+    MealTotals,
+    PlanTotals,
+)
 from .weight_unit import WeightUnit
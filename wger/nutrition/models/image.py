@@ -25,7 +25,10 @@ from django.utils.translation import gettext_lazy as _
 # wger
 from wger.core.models import License
 from wger.utils.helpers import BaseImage
-from wger.utils.models import AbstractLicenseModel
+from wger.utils.models import (
+    AbstractLicenseModel,
+    AbstractThumbnailModel,
+)
 
 
 def ingredient_image_upload_dir(instance, filename):
@@ -36,7 +39,7 @@ def ingredient_image_upload_dir(instance, filename):
     return "ingredients/{0}/{1}{2}".format(instance.ingredient.pk, instance.uuid, ext)
 
 
-class Image(AbstractLicenseModel, models.Model, BaseImage):
+class Image(AbstractLicenseModel, AbstractThumbnailModel, models.Model, BaseImage):
     """
     Model for an ingredient image
     """
@@ -84,11 +87,11 @@ class Image(AbstractLicenseModel, models.Model, BaseImage):
     def from_json(
         cls,
         connect_to,
-        retrieved_image,
+        blob,
         json_data: dict,
         generate_uuid: bool = False,
     ):
-        image: cls = super().from_json(connect_to, retrieved_image, json_data, generate_uuid)
+        image: cls = super().from_json(connect_to, blob, json_data, generate_uuid)
 
         image.ingredient = connect_to
         image.license_id = json_data['license']
@@ -99,7 +102,7 @@ class Image(AbstractLicenseModel, models.Model, BaseImage):
         image.license_derivative_source_url = json_data['license_derivative_source_url']
         image.size = json_data['size']
 
-        image.save_image(retrieved_image, json_data)
+        image.save_image(blob)
 
         image.save()
 
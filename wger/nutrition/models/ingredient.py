@@ -19,6 +19,7 @@ import logging
 import uuid as uuid
 from decimal import Decimal
 from json import JSONDecodeError
+from typing import List
 
 # Django
 from django.conf import settings
@@ -445,6 +446,16 @@ class Ingredient(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         if hasattr(self, 'image'):
             return self.image
 
+        self.queue_image_fetch([self.pk], request)
+
+    @staticmethod
+    def queue_image_fetch(pks: List[int], request: HttpRequest):
+        """
+        Lets celery fetch the images of the given ingredients
+
+        Every image is only requested once per hour, since e.g. the autocompleter
+        asks for the same ingredients on each keystroke
+        """
         if not request.user.is_authenticated:
             return
 
@@ -452,10 +463,12 @@ class Ingredient(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
             logger.info('Celery deactivated, skipping retrieving ingredient image')
             return
 
-        # Let celery fetch the image
         # wger
         from wger.nutrition.tasks import fetch_ingredient_image_task
-        fetch_ingredient_image_task.delay(self.pk)
+
+        for pk in pks:
+            if cache.add(cache_mapper.get_ingredient_image_fetch_key(pk), True, 60 * 60):
+                fetch_ingredient_image_task.delay(pk)
 
     @classmethod
     def fetch_ingredient_from_off(cls, code: str):
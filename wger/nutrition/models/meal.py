@@ -27,7 +27,6 @@ from wger.utils.constants import TWOPLACES
 from wger.utils.fields import Html5TimeField
 
 # Local
-from ..helpers import NutritionalValues
 from .plan import NutritionPlan
 
 
@@ -84,13 +83,14 @@ class Meal(models.Model):
 
     def get_nutritional_values(self, use_metric=True):
         """
-        Sums the nutritional info of all items in the meal
+        Returns the sum of the nutritional info of all items in the meal
+
+        The totals are stored and kept up to date when the items change, see
+        MealTotals
 
         :param: use_metric Flag that controls the units used
         """
-        nutritional_values = NutritionalValues()
-
-        for item in self.mealitem_set.select_related():
-            nutritional_values += item.get_nutritional_values(use_metric=use_metric)
+        # wger
+        from wger.nutrition.models import MealTotals
 
-        return nutritional_values
+        return MealTotals.get_values(self)
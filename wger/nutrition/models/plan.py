@@ -21,7 +21,6 @@ from decimal import Decimal
 
 # Django
 from django.contrib.auth.models import User
-from django.core.cache import cache
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -29,7 +28,10 @@ from django.utils.translation import gettext_lazy as _
 # wger
 from wger.nutrition.consts import ENERGY_FACTOR
 from wger.nutrition.helpers import NutritionalValues
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 from wger.utils.constants import TWOPLACES
 from wger.weight.models import WeightEntry
 
@@ -117,53 +119,78 @@ class NutritionPlan(models.Model):
         """
         Sums the nutritional info of all items in the plan
         """
-        nutritional_representation = cache.get(cache_mapper.get_nutrition_cache_by_key(self.pk))
-        if not nutritional_representation:
-            nutritional_values = NutritionalValues()
-            use_metric = self.user.userprofile.use_metric
-            unit = 'kg' if use_metric else 'lb'
-            result = {
-                'total': NutritionalValues(),
-                'percent': {
-                    'protein': 0,
-                    'carbohydrates': 0,
-                    'fat': 0
-                },
-                'per_kg': {
-                    'protein': 0,
-                    'carbohydrates': 0,
-                    'fat': 0
-                },
-            }
-
-            # Energy
-            for meal in self.meal_set.select_related():
-                nutritional_values += meal.get_nutritional_values(use_metric=use_metric)
-            result['total'] = nutritional_values
-
-            energy = nutritional_values.energy
-
-            # In percent
-            if energy:
-                result['percent']['protein'] = nutritional_values.protein * \
-                                               ENERGY_FACTOR['protein'][unit] / energy * 100
-                result['percent']['carbohydrates'] = nutritional_values.carbohydrates * \
-                                                     ENERGY_FACTOR['carbohydrates'][
-                                                         unit] / energy * 100
-                result['percent']['fat'] = nutritional_values.fat * \
-                                           ENERGY_FACTOR['fat'][unit] / energy * 100
-
-            # Per body weight
-            weight_entry = self.get_closest_weight_entry()
-            if weight_entry and weight_entry.weight:
-                result['per_kg']['protein'] = nutritional_values.protein / weight_entry.weight
-                result['per_kg']['carbohydrates'
-                                 ] = nutritional_values.carbohydrates / weight_entry.weight
-                result['per_kg']['fat'] = nutritional_values.fat / weight_entry.weight
-
-            nutritional_representation = result
-            cache.set(cache_mapper.get_nutrition_cache_by_key(self.pk), nutritional_representation)
-        return nutritional_representation
+        return tagged_cache.get_or_set(
+            cache_mapper.get_nutrition_cache_by_key(self.pk),
+            self.compute_nutritional_values,
+            tags=[cache_mapper.get_nutrition_plan_tag(self.pk)],
+        )
+
+    def compute_nutritional_values(self):
+        """
+        Sums the nutritional info of all items in the plan, without using the cache
+        """
+        use_metric = self.user.userprofile.use_metric
+        unit = 'kg' if use_metric else 'lb'
+        result = {
+            'total': NutritionalValues(),
+            'percent': {
+                'protein': 0,
+                'carbohydrates': 0,
+                'fat': 0
+            },
+            'per_kg': {
+                'protein': 0,
+                'carbohydrates': 0,
+                'fat': 0
+            },
+        }
+
+        # Energy
+        nutritional_values = self.get_total_values()
+        result['total'] = nutritional_values
+
+        energy = nutritional_values.energy
+
+        # In percent
+        if energy:
+            result['percent']['protein'] = nutritional_values.protein * \
+                                           ENERGY_FACTOR['protein'][unit] / energy * 100
+            result['percent']['carbohydrates'] = nutritional_values.carbohydrates * \
+                                                 ENERGY_FACTOR['carbohydrates'][
+                                                     unit] / energy * 100
+            result['percent']['fat'] = nutritional_values.fat * \
+                                       ENERGY_FACTOR['fat'][unit] / energy * 100
+
+        # Per body weight
+        weight_entry = self.get_closest_weight_entry()
+        if weight_entry and weight_entry.weight:
+            result['per_kg']['protein'] = nutritional_values.protein / weight_entry.weight
+            result['per_kg']['carbohydrates'
+                             ] = nutritional_values.carbohydrates / weight_entry.weight
+            result['per_kg']['fat'] = nutritional_values.fat / weight_entry.weight
+
+        return result
+
+    def get_total_values(self) -> NutritionalValues:
+        """
+        Returns the stored sum of the nutritional values of all meals
+        """
+        # wger
+        from wger.nutrition.models import PlanTotals
+
+        return PlanTotals.get_values(self)
+
+    def get_log_day_values(self, date=None) -> NutritionalValues:
+        """
+        Returns the stored sum of the nutritional values logged on a given date
+        """
+        # wger
+        from wger.nutrition.models import LogDayTotals
+
+        if not date:
+            date = datetime.date.today()
+
+        return LogDayTotals.get_values(self, date) or NutritionalValues()
 
     def get_closest_weight_entry(self):
         """
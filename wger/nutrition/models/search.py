@@ -0,0 +1,218 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+from typing import (
+    Iterable,
+    List,
+)
+
+# Django
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models import (
+    Case,
+    IntegerField,
+    Value,
+    When,
+)
+from django.db.models.functions import Length
+
+# wger
+from wger.core.models import Language
+from wger.utils.helpers import (
+    normalize_search_term,
+    search_term_suffixes,
+)
+
+# Local
+from .ingredient import Ingredient
+
+
+class IngredientSearchTerm(models.Model):
+    """
+    Search index for the accepted ingredients
+
+    The name and brand of every ingredient are stored normalized (lower case,
+    no accents or punctuation) once for each of their words, so that the
+    autocompleter can match the start of any word with an indexed prefix
+    query instead of scanning the whole ingredient table.
+
+    The entries are kept up to date with signals and by the Open Food Facts
+    import, see wger.nutrition.signals and wger.nutrition.off
+    """
+
+    RANK_NAME = 0
+    RANK_NAME_WORD = 1
+    RANK_BRAND = 2
+
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+    )
+
+    language = models.ForeignKey(
+        Language,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+
+    term = models.CharField(max_length=200, db_index=True)
+    """Normalized name or brand, starting at one of its words"""
+
+    rank = models.PositiveSmallIntegerField()
+    """Lower is better, see the RANK_* constants"""
+
+    name = models.CharField(max_length=200)
+
+    class Meta:
+        indexes = [models.Index(fields=['language', 'term'])]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'{self.term} ({self.ingredient_id})'
+
+    @classmethod
+    def search(cls, query: str, languages: List[Language], limit: int = 100) -> List[dict]:
+        """
+        Searches the index, returns the ID and name of the best matches
+
+        Barcodes are looked up directly. Otherwise exact matches come first,
+        then matches at the start of the name, of a later word in the name and
+        of the brand. Ties are broken by the order of the languages (the first
+        one is preferred) and by the length of the name, so that "Milk" comes
+        before "Milk chocolate with hazelnuts".
+
+        :param query: the search term as entered by the user
+        :param languages: the languages to search in, by preference
+        :param limit: the maximum number of results
+        """
+        results = []
+        query = query.strip()
+        if query.isdigit():
+            results = list(
+                Ingredient.objects.filter(
+                    code=query,
+                    language__in=languages,
+                    status=Ingredient.STATUS_ACCEPTED,
+                ).values('id', 'name')[:limit]
+            )
+
+        term = normalize_search_term(query)
+        if not term or not languages:
+            return results
+
+        entries = cls.objects.filter(
+            language__in=languages,
+            term__startswith=term,
+        ).annotate(
+            exact=Case(
+                When(term=term, then=Value(0)), default=Value(1), output_field=IntegerField()
+            ),
+            language_order=Case(
+                *[When(language=l, then=Value(i)) for i, l in enumerate(languages)],
+                output_field=IntegerField(),
+            ),
+            name_length=Length('name'),
+        ).order_by('exact', 'rank', 'language_order', 'name_length', 'name')
+
+        # An ingredient can match more than one of its terms, fetch a bit more
+        # than needed to fill the list after removing the duplicates
+        seen = {r['id'] for r in results}
+        for ingredient_id, name in entries.values_list('ingredient_id', 'name')[:limit * 3]:
+            if len(results) >= limit:
+                break
+            if ingredient_id not in seen:
+                seen.add(ingredient_id)
+                results.append({'id': ingredient_id, 'name': name})
+        return results
+
+    @classmethod
+    def index_ingredients(cls, ingredient_ids: Iterable[int], batch_size: int = 1000):
+        """
+        (Re)builds the index entries for the given ingredients
+
+        Only accepted ingredients are indexed.
+
+        :param ingredient_ids: IDs of the ingredients to index
+        :param batch_size: number of entries written at once
+        """
+        ingredient_ids = list(ingredient_ids)
+        if not ingredient_ids:
+            return
+
+        ingredients = Ingredient.objects.filter(
+            id__in=ingredient_ids,
+            status=Ingredient.STATUS_ACCEPTED,
+        ).order_by().values_list('id', 'language_id', 'name', 'brand')
+
+        entries = []
+        for ingredient_id, language_id, name, brand in ingredients:
+            terms = {}
+            for rank_name, rank_word, text in (
+                (cls.RANK_NAME, cls.RANK_NAME_WORD, name),
+                (cls.RANK_BRAND, cls.RANK_BRAND, brand),
+            ):
+                for position, term in enumerate(search_term_suffixes(text)):
+                    terms.setdefault(term[:200], rank_word if position else rank_name)
+
+            for term, rank in terms.items():
+                entries.append(
+                    cls(
+                        ingredient_id=ingredient_id,
+                        language_id=language_id,
+                        term=term,
+                        rank=rank,
+                        name=name,
+                    )
+                )
+
+        with transaction.atomic():
+            cls.objects.filter(ingredient_id__in=ingredient_ids).delete()
+            cls.objects.bulk_create(entries, batch_size=batch_size)
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 1000, print_fn=None):
+        """
+        Rebuilds the whole index
+
+        :param batch_size: number of ingredients processed at once
+        :param print_fn: optional function used to report the progress
+        """
+        cls.objects.all().delete()
+
+        last_id = 0
+        count = 0
+        while True:
+            ids = list(
+                Ingredient.objects.filter(
+                    id__gt=last_id,
+                    status=Ingredient.STATUS_ACCEPTED,
+                ).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            cls.index_ingredients(ids)
+            last_id = ids[-1]
+            count += len(ids)
+            if print_fn:
+                print_fn(f'Indexed {count} ingredients')
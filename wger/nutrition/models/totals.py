@@ -0,0 +1,443 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+from decimal import Decimal
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+)
+
+# Django
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import (
+    NullIf,
+    TruncDate,
+)
+from django.utils.translation import gettext_lazy as _
+
+# wger
+from wger.nutrition.consts import (
+    NULLABLE_NUTRITIONAL_FIELDS,
+    NUTRITIONAL_FIELDS,
+)
+from wger.nutrition.helpers import NutritionalValues
+from wger.utils.cache import reset_nutrition_plan_cache
+
+# Local
+from .log import LogItem
+from .meal import Meal
+from .meal_item import MealItem
+from .plan import NutritionPlan
+
+
+def total_field(null=False):
+    """
+    Field used to store a total. The precision is high enough to hold the exact
+    result, so the totals are the same as when summing the items in python.
+    """
+    return models.DecimalField(
+        max_digits=20,
+        decimal_places=9,
+        null=null,
+        default=None if null else 0,
+    )
+
+
+def nutritional_values_aggregates(prefix: str = '') -> Dict[str, Sum]:
+    """
+    Returns the aggregates that sum the nutritional values of meal or log items
+
+    The calculation is the same as in BaseMealItem.get_nutritional_values, but
+    done by the database so that any number of items is summed in one query.
+
+    :param prefix: path from the aggregated model to the item, e.g. 'mealitem__'
+    """
+    output_field = DecimalField(max_digits=20, decimal_places=9)
+    weight = Case(
+        When(**{f'{prefix}weight_unit__isnull': True}, then=F(f'{prefix}amount')),
+        default=F(f'{prefix}amount') * F(f'{prefix}weight_unit__amount') *
+        F(f'{prefix}weight_unit__gram'),
+        output_field=output_field,
+    )
+
+    aggregates = {}
+    for field in NUTRITIONAL_FIELDS:
+        value = F(f'{prefix}ingredient__{field}')
+        if field in NULLABLE_NUTRITIONAL_FIELDS:
+            # Like in the python calculation, 0 is treated as "no value"
+            value = NullIf(value, Value(0))
+
+        # Multiplying instead of dividing by 100 avoids an integer division on SQLite
+        aggregates[field] = Sum(weight * value * Value(Decimal('0.01')), output_field=output_field)
+    return aggregates
+
+
+class AbstractNutritionalTotals(models.Model):
+    """
+    Stored sum of the nutritional values of a group of meal or log items
+    """
+
+    energy = total_field()
+    protein = total_field()
+    carbohydrates = total_field()
+    carbohydrates_sugar = total_field(null=True)
+    fat = total_field()
+    fat_saturated = total_field(null=True)
+    fibres = total_field(null=True)
+    sodium = total_field(null=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def nutritional_values(self) -> NutritionalValues:
+        return NutritionalValues(**{f: getattr(self, f) for f in NUTRITIONAL_FIELDS})
+
+    @staticmethod
+    def get_sums(rows: Iterable[dict], key: str) -> dict:
+        """
+        Maps the aggregated rows by their key, groups without items are left out
+        """
+        return {row.pop(key): row for row in rows if row['energy'] is not None}
+
+    @classmethod
+    def store(cls, sums: dict, pks: set, key: str, unique_fields: list):
+        """
+        Writes the sums with a single upsert, the totals of groups that have no
+        items (anymore) are deleted
+        """
+        cls.objects.filter(**{f'{key}__in': pks - sums.keys()}).delete()
+        if sums:
+            cls.objects.bulk_create(
+                [cls(**{key: pk}, **values) for pk, values in sums.items()],
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=NUTRITIONAL_FIELDS,
+            )
+
+
+class MealTotals(AbstractNutritionalTotals):
+    """
+    Sum of the nutritional values of all items of a meal
+    """
+
+    meal = models.OneToOneField(
+        Meal,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='totals',
+        verbose_name=_('Meal'),
+    )
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Nutritional totals for meal {self.meal_id}'
+
+    @classmethod
+    def refresh(cls, meal_ids: Iterable[int]):
+        """
+        Recalculates the totals of the given meals, with one aggregation query
+        """
+        meal_ids = set(meal_ids)
+        if not meal_ids:
+            return
+
+        sums = cls.get_sums(
+            MealItem.objects.filter(meal_id__in=meal_ids).order_by().values('meal_id').annotate(
+                **nutritional_values_aggregates()
+            ),
+            'meal_id',
+        )
+        cls.store(sums, meal_ids, 'meal_id', ['meal'])
+
+    @classmethod
+    def get_values(cls, meal: Meal) -> NutritionalValues:
+        """
+        Returns the stored totals of the meal, they are calculated if necessary
+
+        Meals without items have no stored totals.
+        """
+        totals = cls.objects.filter(meal=meal).first()
+        if totals is None:
+            cls.refresh([meal.pk])
+            totals = cls.objects.filter(meal=meal).first()
+        return totals.nutritional_values if totals else NutritionalValues()
+
+
+class PlanTotals(AbstractNutritionalTotals):
+    """
+    Sum of the nutritional values of all meals of a nutrition plan
+    """
+
+    plan = models.OneToOneField(
+        NutritionPlan,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='totals',
+        verbose_name=_('Nutrition plan'),
+    )
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Nutritional totals for plan {self.plan_id}'
+
+    @classmethod
+    def refresh(cls, plan_ids: Iterable[int]):
+        """
+        Recalculates the totals of the given plans, with one aggregation query
+        """
+        plan_ids = set(plan_ids)
+        if not plan_ids:
+            return
+
+        sums = cls.get_sums(
+            Meal.objects.filter(plan_id__in=plan_ids).order_by().values('plan_id').annotate(
+                **nutritional_values_aggregates('mealitem__')
+            ),
+            'plan_id',
+        )
+        cls.store(sums, plan_ids, 'plan_id', ['plan'])
+
+    @classmethod
+    def get_values(cls, plan: NutritionPlan) -> NutritionalValues:
+        """
+        Returns the stored totals of the plan, they are calculated if necessary
+
+        Plans without items have no stored totals.
+        """
+        totals = cls.objects.filter(plan=plan).first()
+        if totals is None:
+            cls.refresh([plan.pk])
+            totals = cls.objects.filter(plan=plan).first()
+        return totals.nutritional_values if totals else NutritionalValues()
+
+
+class LogDayTotals(AbstractNutritionalTotals):
+    """
+    Sum of the nutritional values of all items logged on a day for a plan
+    """
+
+    plan = models.ForeignKey(
+        NutritionPlan,
+        on_delete=models.CASCADE,
+        related_name='log_day_totals',
+        verbose_name=_('Nutrition plan'),
+    )
+
+    date = models.DateField(verbose_name=_('Date'))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['plan', 'date'],
+                name='unique_log_day_totals',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Nutritional totals for plan {self.plan_id} on {self.date}'
+
+    @classmethod
+    def refresh(cls, plan_id: int, dates: Iterable[datetime.date]):
+        """
+        Recalculates the totals of the given days of a plan, with one aggregation query
+
+        Days without any log entries are removed.
+        """
+        dates = set(dates)
+        if not dates:
+            return
+
+        sums = cls.get_sums(
+            LogItem.objects.filter(
+                plan_id=plan_id,
+                datetime__date__in=dates,
+            ).annotate(day=TruncDate('datetime')
+                       ).order_by().values('day').annotate(**nutritional_values_aggregates()),
+            'day',
+        )
+        cls.objects.filter(plan_id=plan_id, date__in=dates - sums.keys()).delete()
+        if sums:
+            cls.objects.bulk_create(
+                [cls(plan_id=plan_id, date=day, **values) for day, values in sums.items()],
+                update_conflicts=True,
+                unique_fields=['plan', 'date'],
+                update_fields=NUTRITIONAL_FIELDS,
+            )
+
+    @classmethod
+    def get_values(cls, plan: NutritionPlan, date: datetime.date) -> Optional[NutritionalValues]:
+        """
+        Returns the stored totals of the day, or None if nothing was logged
+        """
+        totals = cls.objects.filter(plan=plan, date=date).first()
+        return totals.nutritional_values if totals else None
+
+
+class DiaryDayTotals(AbstractNutritionalTotals):
+    """
+    Sum of the nutritional values of everything a user logged on a day, over
+    all their nutrition plans
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='diary_day_totals',
+        verbose_name=_('User'),
+    )
+
+    date = models.DateField(verbose_name=_('Date'))
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'date'],
+                name='unique_diary_day_totals',
+            ),
+        ]
+
+    def __str__(self):
+        """
+        Return a more human-readable representation
+        """
+        return f'Nutritional totals for user {self.user_id} on {self.date}'
+
+    @classmethod
+    def refresh(cls, user_id: int, dates: Iterable[datetime.date]):
+        """
+        Recalculates the totals of the given days of a user, with one aggregation query
+
+        Days without any log entries are removed.
+        """
+        dates = set(dates)
+        if not dates:
+            return
+
+        sums = cls.get_sums(
+            LogItem.objects.filter(
+                plan__user_id=user_id,
+                datetime__date__in=dates,
+            ).annotate(day=TruncDate('datetime')
+                       ).order_by().values('day').annotate(**nutritional_values_aggregates()),
+            'day',
+        )
+        cls.objects.filter(user_id=user_id, date__in=dates - sums.keys()).delete()
+        if sums:
+            cls.objects.bulk_create(
+                [cls(user_id=user_id, date=day, **values) for day, values in sums.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'date'],
+                update_fields=NUTRITIONAL_FIELDS,
+            )
+
+    @classmethod
+    def refresh_plan_days(cls, plan_days: Dict[int, Set[datetime.date]]):
+        """
+        Recalculates the totals of the users that own the plans, on the given days
+        """
+        user_days = {}
+        for plan_id, user_id in NutritionPlan.objects.filter(pk__in=plan_days
+                                                             ).values_list('pk', 'user_id'):
+            user_days.setdefault(user_id, set()).update(plan_days[plan_id])
+
+        for user_id, days in user_days.items():
+            cls.refresh(user_id, days)
+
+
+def get_log_days(log_items: models.QuerySet) -> Dict[int, Set[datetime.date]]:
+    """
+    Returns the days (by plan) on which the given log items were logged
+    """
+    log_days = {}
+    for plan_id, day in log_items.annotate(day=TruncDate('datetime')
+                                           ).order_by().values_list('plan_id', 'day').distinct():
+        log_days.setdefault(plan_id, set()).add(day)
+    return log_days
+
+
+def refresh_nutritional_totals(**filters):
+    """
+    Recalculates all the totals that contain meal or log items matching the filters
+
+    This is needed when the nutritional values of an ingredient or the size
+    of a weight unit change, e.g. refresh_nutritional_totals(ingredient_id__in=[1, 2])
+    """
+    meal_ids = set(MealItem.objects.filter(**filters).values_list('meal_id', flat=True))
+    MealTotals.refresh(meal_ids)
+    plan_ids = set(Meal.objects.filter(pk__in=meal_ids).values_list('plan_id', flat=True))
+    PlanTotals.refresh(plan_ids)
+    for plan_id in plan_ids:
+        reset_nutrition_plan_cache(plan_id)
+
+    log_days = get_log_days(LogItem.objects.filter(**filters))
+    for plan_id, days in log_days.items():
+        LogDayTotals.refresh(plan_id, days)
+    DiaryDayTotals.refresh_plan_days(log_days)
+
+
+def rebuild_nutritional_totals(print_fn=None):
+    """
+    Recalculates all stored totals, grouped aggregations in batches of plans
+    """
+    plan_ids = list(NutritionPlan.objects.order_by('pk').values_list('pk', flat=True))
+    for i in range(0, len(plan_ids), 500):
+        batch = plan_ids[i:i + 500]
+        MealTotals.refresh(Meal.objects.filter(plan_id__in=batch).values_list('pk', flat=True))
+        PlanTotals.refresh(batch)
+
+        LogDayTotals.objects.filter(plan_id__in=batch).delete()
+        for plan_id, days in get_log_days(LogItem.objects.filter(plan_id__in=batch)).items():
+            LogDayTotals.refresh(plan_id, days)
+
+        if print_fn:
+            print_fn(f'Processed {i + len(batch)} of {len(plan_ids)} nutrition plans')
+
+    user_ids = list(
+        LogItem.objects.order_by('plan__user_id').values_list('plan__user_id', flat=True).distinct()
+    )
+    DiaryDayTotals.objects.exclude(user_id__in=user_ids).delete()
+    for i, user_id in enumerate(user_ids, start=1):
+        DiaryDayTotals.objects.filter(user_id=user_id).delete()
+        DiaryDayTotals.refresh(
+            user_id,
+            LogItem.objects.filter(plan__user_id=user_id).annotate(day=TruncDate('datetime')
+                                                                   ).values_list('day', flat=True),
+        )
+
+        if print_fn and (i % 500 == 0 or i == len(user_ids)):
+            print_fn(f'Processed the diary of {i} of {len(user_ids)} users')
@@ -14,15 +14,45 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # Standard Library
+import csv
+import gzip
+import json
+from collections import (
+    Counter,
+    defaultdict,
+    deque,
+)
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import (
     asdict,
     dataclass,
+    fields,
+)
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
 )
-from typing import Optional
+
+# Django
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
 
 # wger
 from wger.nutrition.consts import KJ_PER_KCAL
-from wger.nutrition.models import Source
+from wger.nutrition.models import (
+    Ingredient,
+    IngredientSearchTerm,
+    Source,
+)
+from wger.nutrition.models.totals import refresh_nutritional_totals
+from wger.utils.cache import (
+    cache_mapper,
+    reset_ingredient_cache,
+)
 from wger.utils.constants import ODBL_LICENSE_ID
 from wger.utils.models import AbstractSubmissionModel
 
@@ -32,12 +62,38 @@ OFF_REQUIRED_TOP_LEVEL = [
     'code',
     'nutriments',
 ]
+
+# Nutriment columns in the CSV export
+OFF_CSV_NUTRIMENTS = [
+    'energy-kcal_100g',
+    'energy-kj_100g',
+    'proteins_100g',
+    'carbohydrates_100g',
+    'sugars_100g',
+    'fat_100g',
+    'saturated-fat_100g',
+    'sodium_100g',
+    'fiber_100g',
+]
 OFF_REQUIRED_NUTRIMENTS = [
     'proteins_100g',
     'carbohydrates_100g',
     'fat_100g',
 ]
 
+# Fields of the products that are actually read, used e.g. as a projection
+# when reading from the mongo dump
+OFF_PRODUCT_FIELDS = [
+    'code',
+    'lang',
+    'completeness',
+    'product_name',
+    'generic_name',
+    'brands',
+    'editors_tags',
+    'nutriments',
+]
+
 
 @dataclass
 class IngredientData:
@@ -66,6 +122,10 @@ class IngredientData:
         return asdict(self)
 
 
+# Fields written when updating existing ingredients
+INGREDIENT_UPDATE_FIELDS = [f.name for f in fields(IngredientData)] + ['last_update']
+
+
 def extract_info_from_off(product_data, language: int):
     if not all(req in product_data for req in OFF_REQUIRED_TOP_LEVEL):
         raise KeyError('Missing required top-level key')
@@ -132,3 +192,252 @@ def extract_info_from_off(product_data, language: int):
         license_title=name,
         license_object_url=object_url
     )
+
+
+def extract_info_from_off_batch(
+    products: List[Tuple[dict, int]],
+) -> Tuple[List[IngredientData], int]:
+    """
+    Extracts the ingredient data of a batch of products
+
+    Products with missing data or without a name or common name are skipped.
+    This function doesn't access the database, so it can run in a worker process.
+
+    :param products: list of tuples with the product data and the language ID
+    :return: the extracted ingredients and the number of skipped products
+    """
+    ingredients = []
+    skipped = 0
+    for product, language in products:
+        try:
+            ingredient_data = extract_info_from_off(product, language)
+        except KeyError:
+            skipped += 1
+            continue
+
+        if not ingredient_data.name or not ingredient_data.common_name:
+            skipped += 1
+            continue
+
+        ingredients.append(ingredient_data)
+
+    return ingredients, skipped
+
+
+def extract_batches(
+    batches: Iterable[List[Tuple[dict, int]]],
+    jobs: int = 1,
+) -> Iterator[Tuple[List[IngredientData], int]]:
+    """
+    Runs extract_info_from_off_batch over the batches, optionally in a process pool
+
+    The results are returned in order. Only a bounded number of batches is
+    submitted to the pool at a time, so the memory use doesn't depend on the
+    size of the dump.
+
+    :param batches: iterable with the batches of products
+    :param jobs: number of worker processes, 1 processes everything in this one
+    """
+    if jobs <= 1:
+        yield from map(extract_info_from_off_batch, batches)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(extract_info_from_off_batch, batch))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def insert_ingredients(ingredients: List[IngredientData], counter: Counter, print_fn=print):
+    """
+    Inserts the ingredients as new entries
+
+    If the bulk insert fails, the ingredients are saved individually since most
+    of them will be correct.
+    """
+    objects = [Ingredient(**i.dict()) for i in ingredients]
+    try:
+        with transaction.atomic():
+            Ingredient.objects.bulk_create(objects)
+        counter['new'] += len(objects)
+
+        # Bulk inserts don't send signals, so the search index is updated here
+        if all(o.pk for o in objects):
+            ids = [o.pk for o in objects]
+        else:
+            ids = Ingredient.objects.filter(code__in=[o.code for o in objects]
+                                            ).values_list('pk', flat=True)
+        IngredientSearchTerm.index_ingredients(ids)
+    except Exception as e:
+        print_fn('--> Error while saving the product bucket. Saving individually')
+        print_fn(str(e))
+
+        for ingredient in objects:
+            try:
+                ingredient.save()
+                counter['new'] += 1
+
+            # ¯\_(ツ)_/¯
+            except Exception as e:
+                print_fn('--> Error while saving the product individually')
+                print_fn(str(e))
+                counter['error'] += 1
+
+
+def upsert_ingredients(ingredients: List[IngredientData], counter: Counter, print_fn=print):
+    """
+    Updates the ingredients that already exist (the look-up key is the code)
+    and inserts the rest
+
+    The existing entries are loaded with a single query and written back with
+    one bulk update, which works the same on all supported databases. If the
+    bulk update fails, the ingredients are saved individually.
+    """
+    # If a code appears more than once in the batch, the last one wins
+    by_code = {i.code: i for i in ingredients}
+
+    existing = defaultdict(list)
+    for code, pk in Ingredient.objects.filter(code__in=by_code.keys()
+                                              ).order_by().values_list('code', 'pk'):
+        existing[code].append(pk)
+
+    now = timezone.now()
+    updated = []
+    new = []
+    for code, ingredient_data in by_code.items():
+        if code not in existing:
+            new.append(ingredient_data)
+            continue
+
+        for pk in existing[code]:
+            updated.append(Ingredient(pk=pk, last_update=now, **ingredient_data.dict()))
+
+    if updated:
+        try:
+            with transaction.atomic():
+                Ingredient.objects.bulk_update(updated, INGREDIENT_UPDATE_FIELDS)
+        except Exception as e:
+            print_fn('--> Error while updating the product bucket. Saving individually')
+            print_fn(str(e))
+
+            saved = []
+            for ingredient in updated:
+                try:
+                    with transaction.atomic():
+                        ingredient.save(update_fields=INGREDIENT_UPDATE_FIELDS)
+                    saved.append(ingredient)
+
+                except Exception as e:
+                    print_fn('--> Error while updating the product individually')
+                    print_fn(str(e))
+                    counter['error'] += 1
+            updated = saved
+
+    if updated:
+        cache.delete_many([cache_mapper.get_ingredient_key(i.pk) for i in updated])
+        reset_ingredient_cache(*[i.pk for i in updated])
+        IngredientSearchTerm.index_ingredients([i.pk for i in updated])
+        refresh_nutritional_totals(ingredient_id__in=[i.pk for i in updated])
+        counter['edited'] += len(updated)
+
+    if new:
+        insert_ingredients(new, counter, print_fn)
+
+
+class OffDumpReader:
+    """
+    Streams the products from an Open Food Facts export file
+
+    Both the JSONL and the (tab separated) CSV exports are supported, compressed
+    with gzip or not. The file is read line by line, so the memory use doesn't
+    depend on its size. Products in other languages or below the completeness
+    threshold are filtered out before anything else is done with them.
+
+    The offset is the number of lines (CSV: rows) that were consumed, it can be
+    used to resume an interrupted import.
+    """
+
+    def __init__(self, path: str, languages: dict, completeness: float, offset: int = 0):
+        self.path = path
+        self.languages = languages
+        self.completeness = completeness
+        self.start_offset = offset
+        self.offset = offset
+        self.is_csv = '.csv' in path.lower()
+
+    def open(self):
+        if self.path.lower().endswith('.gz'):
+            return gzip.open(self.path, 'rt', encoding='utf-8', newline='')
+        return open(self.path, 'r', encoding='utf-8', newline='')
+
+    def __iter__(self) -> Iterator[Tuple[dict, int]]:
+        with self.open() as f:
+            if self.is_csv:
+                csv.field_size_limit(2**31 - 1)
+                lines = csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+            else:
+                lines = f
+
+            self.offset = 0
+            for line in lines:
+                self.offset += 1
+                if self.offset <= self.start_offset:
+                    continue
+
+                product = self.parse_csv_row(line) if self.is_csv else self.parse_json_line(line)
+                if product is None:
+                    continue
+
+                language = self.languages.get(product.get('lang'))
+                if language is None:
+                    continue
+
+                try:
+                    if float(product.get('completeness') or 0) <= self.completeness:
+                        continue
+                except ValueError:
+                    continue
+
+                yield product, language
+
+    @staticmethod
+    def parse_json_line(line: str) -> Optional[dict]:
+        """
+        Parses a line of the JSONL export, keeping only the fields that are needed
+        """
+        try:
+            product = json.loads(line)
+        except ValueError:
+            return None
+
+        return {key: product[key] for key in OFF_PRODUCT_FIELDS if key in product}
+
+    @staticmethod
+    def parse_csv_row(row: dict) -> dict:
+        """
+        Converts a row of the CSV export to the structure of the JSON products
+        """
+        nutriments = {}
+        for key in OFF_CSV_NUTRIMENTS:
+            try:
+                nutriments[key] = float(row[key])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        product = {
+            'code': row.get('code'),
+            'lang': row.get('lang'),
+            'completeness': row.get('completeness'),
+            'product_name': row.get('product_name'),
+            'generic_name': row.get('generic_name') or '',
+            'brands': row.get('brands') or None,
+            'nutriments': nutriments,
+        }
+        if row.get('creator'):
+            product['editors_tags'] = [row['creator']]
+        return product
@@ -15,26 +15,46 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Django
-from django.core.cache import cache
 from django.db.models.signals import (
     post_delete,
     post_save,
+    pre_save,
 )
+from django.utils import timezone
 
 # wger
 from wger.nutrition.models import (
+    DiaryDayTotals,
+    Image,
+    Ingredient,
+    IngredientSearchTerm,
+    IngredientWeightUnit,
+    LogDayTotals,
+    LogItem,
     Meal,
     MealItem,
+    MealTotals,
     NutritionPlan,
+    PlanTotals,
+    WeightUnit,
+)
+from wger.nutrition.models.totals import refresh_nutritional_totals
+from wger.utils.cache import (
+    reset_ingredient_cache,
+    reset_nutrition_plan_cache,
+    reset_weight_unit_cache,
+)
+from wger.utils.models import (
+    delete_image_thumbnail_formats,
+    schedule_thumbnails,
 )
-from wger.utils.cache import cache_mapper
 
 
 def reset_nutritional_values_canonical_form(sender, instance, **kwargs):
     """
     Reset the nutrition values canonical form in cache
     """
-    cache.delete(cache_mapper.get_nutrition_cache_by_key(instance.get_owner_object().id))
+    reset_nutrition_plan_cache(instance.get_owner_object().id)
 
 
 post_save.connect(reset_nutritional_values_canonical_form, sender=NutritionPlan)
@@ -43,3 +63,146 @@ post_save.connect(reset_nutritional_values_canonical_form, sender=Meal)
 post_delete.connect(reset_nutritional_values_canonical_form, sender=Meal)
 post_save.connect(reset_nutritional_values_canonical_form, sender=MealItem)
 post_delete.connect(reset_nutritional_values_canonical_form, sender=MealItem)
+
+
+def reset_ingredient_tag(sender, instance, **kwargs):
+    """
+    Reset the cached entries showing the ingredient, e.g. the plan PDFs
+    """
+    if isinstance(instance, Ingredient):
+        reset_ingredient_cache(instance.pk)
+    else:
+        reset_ingredient_cache(instance.ingredient_id)
+
+
+post_save.connect(reset_ingredient_tag, sender=Ingredient)
+post_save.connect(reset_ingredient_tag, sender=IngredientWeightUnit)
+post_delete.connect(reset_ingredient_tag, sender=IngredientWeightUnit)
+
+
+def reset_weight_unit_tag(sender, instance: WeightUnit, **kwargs):
+    """
+    Reset the cached entries showing the weight unit
+    """
+    reset_weight_unit_cache(instance.pk)
+
+
+post_save.connect(reset_weight_unit_tag, sender=WeightUnit)
+
+
+def update_ingredient_search_index(sender, instance, **kwargs):
+    """
+    Update the search index entries of the ingredient
+    """
+    IngredientSearchTerm.index_ingredients([instance.pk])
+
+
+post_save.connect(update_ingredient_search_index, sender=Ingredient)
+
+
+def store_previous_meal(sender, instance: MealItem, **kwargs):
+    """
+    Remember the meal the item was in, in case it is moved to another one
+    """
+    instance._previous_meal_id = None
+    if instance.pk:
+        previous = MealItem.objects.filter(pk=instance.pk).values_list('meal_id', flat=True)
+        instance._previous_meal_id = previous.first()
+
+
+def update_meal_totals(sender, instance: MealItem, **kwargs):
+    """
+    Update the stored nutritional totals of the meal and its plan
+    """
+    meal_ids = {instance.meal_id}
+
+    previous = getattr(instance, '_previous_meal_id', None)
+    if previous:
+        meal_ids.add(previous)
+
+    MealTotals.refresh(meal_ids)
+    PlanTotals.refresh(Meal.objects.filter(pk__in=meal_ids).values_list('plan_id', flat=True))
+
+
+pre_save.connect(store_previous_meal, sender=MealItem)
+post_save.connect(update_meal_totals, sender=MealItem)
+post_delete.connect(update_meal_totals, sender=MealItem)
+
+
+def store_previous_plan(sender, instance: Meal, **kwargs):
+    """
+    Remember the plan the meal was in, in case it is moved to another one
+    """
+    instance._previous_plan_id = None
+    if instance.pk:
+        previous = Meal.objects.filter(pk=instance.pk).values_list('plan_id', flat=True)
+        instance._previous_plan_id = previous.first()
+
+
+def update_plan_totals(sender, instance: Meal, **kwargs):
+    """
+    Update the stored nutritional totals of both plans when a meal is moved
+    """
+    previous = getattr(instance, '_previous_plan_id', None)
+    if previous and previous != instance.plan_id:
+        PlanTotals.refresh([previous, instance.plan_id])
+
+
+pre_save.connect(store_previous_plan, sender=Meal)
+post_save.connect(update_plan_totals, sender=Meal)
+
+
+def get_log_day(instance: LogItem):
+    if timezone.is_aware(instance.datetime):
+        return timezone.localdate(instance.datetime)
+    return instance.datetime.date()
+
+
+def store_previous_log_day(sender, instance: LogItem, **kwargs):
+    """
+    Remember the day the log entry was on, in case it is moved to another one
+    """
+    instance._previous_log_day = None
+    if instance.pk:
+        previous = LogItem.objects.filter(pk=instance.pk).first()
+        if previous:
+            instance._previous_log_day = (previous.plan_id, get_log_day(previous))
+
+
+def update_log_day_totals(sender, instance: LogItem, **kwargs):
+    """
+    Update the stored nutritional totals of the logged day, for the plan and
+    the user's diary
+    """
+    plan_days = {instance.plan_id: {get_log_day(instance)}}
+
+    previous = getattr(instance, '_previous_log_day', None)
+    if previous:
+        plan_days.setdefault(previous[0], set()).add(previous[1])
+
+    for plan_id, days in plan_days.items():
+        LogDayTotals.refresh(plan_id, days)
+    DiaryDayTotals.refresh_plan_days(plan_days)
+
+
+pre_save.connect(store_previous_log_day, sender=LogItem)
+post_save.connect(update_log_day_totals, sender=LogItem)
+post_delete.connect(update_log_day_totals, sender=LogItem)
+
+
+def update_totals_ingredient(sender, instance, **kwargs):
+    """
+    Update all totals that use the ingredient or weight unit
+    """
+    if isinstance(instance, Ingredient):
+        refresh_nutritional_totals(ingredient=instance)
+    else:
+        refresh_nutritional_totals(weight_unit=instance)
+
+
+post_save.connect(update_totals_ingredient, sender=Ingredient)
+post_save.connect(update_totals_ingredient, sender=IngredientWeightUnit)
+
+# Generate the thumbnails of new images
+post_save.connect(schedule_thumbnails, sender=Image)
+post_delete.connect(delete_image_thumbnail_formats, sender=Image)
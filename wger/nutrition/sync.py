@@ -16,6 +16,7 @@
 import logging
 import os
 from typing import Optional
+from urllib.parse import quote
 
 # Django
 from django.conf import settings
@@ -25,6 +26,10 @@ from django.db import IntegrityError
 import requests
 
 # wger
+from wger.core.models import (
+    MediaBlob,
+    SyncCheckpoint,
+)
 from wger.nutrition.api.endpoints import IMAGE_ENDPOINT
 from wger.nutrition.models import (
     Image,
@@ -37,7 +42,9 @@ from wger.utils.constants import (
     DOWNLOAD_INGREDIENT_WGER,
 )
 from wger.utils.requests import (
+    DOWNLOAD_WORKERS,
     get_paginated_generator,
+    max_timestamp,
     wger_headers,
 )
 from wger.utils.url import make_uri
@@ -85,8 +92,11 @@ def fetch_image_from_wger_instance(ingredient):
         logger.info('image already present locally, skipping...')
         return
     except Image.DoesNotExist:
-        retrieved_image = requests.get(image_data['image'], headers=wger_headers())
-        Image.from_json(ingredient, retrieved_image, image_data)
+        blob = MediaBlob.find(image_data['image'], image_data.get('sha256'), headers=wger_headers())
+        if blob is None:
+            retrieved_image = requests.get(image_data['image'], headers=wger_headers())
+            blob = MediaBlob.from_response(retrieved_image, image_data['image'])
+        Image.from_json(ingredient, blob, image_data)
 
 
 def fetch_image_from_off(ingredient):
@@ -144,7 +154,8 @@ def fetch_image_from_off(ingredient):
         'size': len(response.content)
     }
     try:
-        Image.from_json(ingredient, response, image_data, generate_uuid=True)
+        blob = MediaBlob.from_response(response, image_url)
+        Image.from_json(ingredient, blob, image_data, generate_uuid=True)
     # Due to a race condition (e.g. when adding tasks over the search), we might
     # try to save an image to an ingredient that already has one. In that case,
     # just ignore the error
@@ -158,13 +169,30 @@ def download_ingredient_images(
     print_fn,
     remote_url=settings.WGER_SETTINGS['WGER_INSTANCE'],
     style_fn=lambda x: x,
+    incremental=False,
+    max_workers=DOWNLOAD_WORKERS,
 ):
+    """
+    Downloads the ingredient images from the remote server
+
+    If incremental is set, only the images that were modified on the server
+    since the last run are requested. Images of ingredients that are not
+    present locally at that point are only picked up again by a full run.
+    """
     headers = wger_headers()
-    url = make_uri(IMAGE_ENDPOINT, server_url=remote_url, query={'limit': 100})
+    query = {'limit': 100}
+    since = SyncCheckpoint.get_mark(remote_url, IMAGE_ENDPOINT) if incremental else None
+    if since:
+        query['last_update__gt'] = quote(since.isoformat())
+    url = make_uri(IMAGE_ENDPOINT, server_url=remote_url, query=query)
+    last_update = None
 
     print_fn('*** Processing images ***')
     for result in get_paginated_generator(url, headers=headers):
+        last_update = max_timestamp(last_update, result, 'last_update')
 
+        pending = []
+        queued = set()
         for image_data in result:
             image_uuid = image_data['uuid']
 
@@ -176,16 +204,26 @@ def download_ingredient_images(
                 print_fn('    Remote ingredient not found in local DB, skipping...')
                 continue
 
-            if hasattr(ingredient, 'image'):
+            if hasattr(ingredient, 'image') or ingredient.pk in queued:
                 continue
 
-            try:
-                Image.objects.get(uuid=image_uuid)
+            if Image.objects.filter(uuid=image_uuid).exists():
                 print_fn('    Image already present locally, skipping...')
                 continue
-            except Image.DoesNotExist:
-                print_fn('    Image not found in local DB, creating now...')
-                retrieved_image = requests.get(image_data['image'], headers=headers)
-                Image.from_json(ingredient, retrieved_image, image_data)
 
-            print_fn(style_fn('    successfully saved'))
+            print_fn('    Image not found in local DB, queued for download...')
+            pending.append((ingredient, image_data))
+            queued.add(ingredient.pk)
+
+        # The files of the page are downloaded in parallel, unless they are
+        # already in the media store
+        blobs = MediaBlob.fetch_many(
+            [(image_data['image'], image_data.get('sha256')) for _, image_data in pending],
+            headers=headers,
+            max_workers=max_workers,
+        )
+        for (ingredient, image_data), blob in zip(pending, blobs):
+            Image.from_json(ingredient, blob, image_data)
+            print_fn(style_fn(f"Image {image_data['uuid']} successfully saved"))
+
+    SyncCheckpoint.set_mark(remote_url, IMAGE_ENDPOINT, last_update)
@@ -0,0 +1,51 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import csv
+
+# Django
+from django.urls import reverse
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+
+
+class DiaryExportTestCase(WgerTestCase):
+    """
+    Test the CSV export of the nutrition diary
+    """
+
+    def test_export(self):
+        """
+        Test that only the entries of the user's plans are exported
+        """
+        self.user_login('test')
+        response = self.client.get(reverse('nutrition:plan:export-diary'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=Nutritiondiary.csv')
+
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(content.splitlines()))
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row[1] == 'Nutrition plan' for row in rows[1:]))
+
+    def test_export_logged_out(self):
+        """
+        Test the export by a logged out user
+        """
+        response = self.client.get(reverse('nutrition:plan:export-diary'))
+        self.assertEqual(response.status_code, 302)
@@ -39,6 +39,7 @@ from wger.core.tests.base_testcase import (
 )
 from wger.nutrition.models import (
     Ingredient,
+    IngredientSearchTerm,
     Meal,
 )
 from wger.utils.constants import (
@@ -261,15 +262,17 @@ class IngredientSearchTestCase(WgerTestCase):
         self.assertEqual(response.status_code, 200)
         result = json.loads(response.content.decode('utf8'))
         self.assertEqual(len(result['suggestions']), 2)
-        self.assertEqual(result['suggestions'][0]['value'], 'Ingredient, test, 2, organic, raw')
-        self.assertEqual(result['suggestions'][0]['data']['id'], 2)
-        suggestion_0_name = 'Ingredient, test, 2, organic, raw'
-        self.assertEqual(result['suggestions'][0]['data']['name'], suggestion_0_name)
+
+        # Names starting with the search term come first
+        self.assertEqual(result['suggestions'][0]['value'], 'Test ingredient 1')
+        self.assertEqual(result['suggestions'][0]['data']['id'], 1)
+        self.assertEqual(result['suggestions'][0]['data']['name'], 'Test ingredient 1')
         self.assertEqual(result['suggestions'][0]['data']['image'], None)
         self.assertEqual(result['suggestions'][0]['data']['image_thumbnail'], None)
-        self.assertEqual(result['suggestions'][1]['value'], 'Test ingredient 1')
-        self.assertEqual(result['suggestions'][1]['data']['id'], 1)
-        self.assertEqual(result['suggestions'][1]['data']['name'], 'Test ingredient 1')
+        self.assertEqual(result['suggestions'][1]['value'], 'Ingredient, test, 2, organic, raw')
+        self.assertEqual(result['suggestions'][1]['data']['id'], 2)
+        suggestion_1_name = 'Ingredient, test, 2, organic, raw'
+        self.assertEqual(result['suggestions'][1]['data']['name'], suggestion_1_name)
         self.assertEqual(result['suggestions'][1]['data']['image'], None)
         self.assertEqual(result['suggestions'][1]['data']['image_thumbnail'], None)
 
@@ -294,6 +297,49 @@ class IngredientSearchTestCase(WgerTestCase):
         self.user_login('test')
         self.search_ingredient()
 
+    def test_search_ranking(self):
+        """
+        Exact matches and the preferred language come first, then shorter names
+        """
+        ingredient = Ingredient.objects.get(pk=1)
+        for name, language in (('Milk chocolate', 2), ('Milk', 2), ('Milch', 1), ('Milk', 1)):
+            Ingredient(
+                name=name,
+                language_id=language,
+                energy=10,
+                protein=1,
+                carbohydrates=1,
+                fat=1,
+                license=ingredient.license,
+                status=Ingredient.STATUS_ACCEPTED,
+            ).save()
+
+        ingredients = IngredientSearchTerm.search('milk', Language.objects.filter(pk__in=[2, 1]))
+        self.assertEqual([i['name'] for i in ingredients], ['Milk', 'Milk', 'Milk chocolate'])
+
+        languages = [Language.objects.get(pk=1), Language.objects.get(pk=2)]
+        first = IngredientSearchTerm.search('milk', languages)[0]
+        self.assertEqual(Ingredient.objects.get(pk=first['id']).language_id, 1)
+
+    def test_search_brand_and_code(self):
+        """
+        Ingredients can be found by brand and barcode
+        """
+        Ingredient.objects.filter(pk=1).update(brand='The Bar Company')
+        IngredientSearchTerm.index_ingredients([1])
+        languages = [Language.objects.get(pk=2)]
+
+        self.assertEqual(IngredientSearchTerm.search('bar comp', languages)[0]['id'], 1)
+        code = Ingredient.objects.get(pk=2).code
+        self.assertEqual(IngredientSearchTerm.search(code, languages)[0]['id'], 2)
+
+    def test_search_only_accepted(self):
+        ingredient = Ingredient.objects.get(pk=1)
+        ingredient.status = Ingredient.STATUS_DECLINED
+        ingredient.save()
+
+        self.assertFalse(IngredientSearchTerm.objects.filter(ingredient=ingredient).exists())
+
 
 class IngredientValuesTestCase(WgerTestCase):
     """
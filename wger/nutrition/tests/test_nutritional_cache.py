@@ -1,6 +1,5 @@
 # Django
 from django.contrib.auth.models import User
-from django.core.cache import cache
 
 # wger
 from wger.core.models import Language
@@ -10,7 +9,10 @@ from wger.nutrition.models import (
     MealItem,
     NutritionPlan,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
 
 
 class NutritionalPlanCacheTestCase(WgerTestCase):
@@ -43,9 +45,9 @@ class NutritionalPlanCacheTestCase(WgerTestCase):
         Test that a cache is set once the nutritional instance is created
         """
         plan = self.create_nutrition_plan()[0]
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
 
     def test_nutrition_save_and_delete(self):
         """
@@ -53,13 +55,13 @@ class NutritionalPlanCacheTestCase(WgerTestCase):
         """
         plan = self.create_nutrition_plan()[0]
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         plan.save()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         plan.delete()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
 
     def test_meal_save_delete(self):
         """
@@ -69,13 +71,13 @@ class NutritionalPlanCacheTestCase(WgerTestCase):
         plan = test_object_list[0]
         meal = test_object_list[1]
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         meal.save()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan.pk)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan.pk)))
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         meal.delete()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
 
     def test_meal_item_save_delete(self):
         """
@@ -85,10 +87,10 @@ class NutritionalPlanCacheTestCase(WgerTestCase):
         plan = test_object_list[0]
         meal_item = test_object_list[2]
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         meal_item.save()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(plan.pk)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan.pk)))
         plan.get_nutritional_values()
-        self.assertTrue(cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
+        self.assertTrue(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(plan)))
         meal_item.delete()
-        self.assertFalse(cache.get(cache_mapper.get_nutrition_cache_by_key(meal_item)))
+        self.assertFalse(tagged_cache.get(cache_mapper.get_nutrition_cache_by_key(meal_item)))
@@ -0,0 +1,268 @@
+# Standard Library
+import datetime
+from io import StringIO
+
+# Django
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.nutrition.helpers import NutritionalValues
+from wger.nutrition.models import (
+    DiaryDayTotals,
+    Ingredient,
+    LogDayTotals,
+    LogItem,
+    Meal,
+    MealItem,
+    MealTotals,
+    NutritionPlan,
+    PlanTotals,
+)
+
+
+class NutritionalTotalsTestCase(WgerTestCase):
+    """
+    Tests the stored nutritional totals of plans, meals and logged days
+    """
+
+    def sum_items(self, items):
+        values = NutritionalValues()
+        for item in items:
+            values += item.get_nutritional_values()
+        return values
+
+    def test_totals_match_items(self):
+        """
+        The stored totals are the same as summing the items one by one
+        """
+        for plan in NutritionPlan.objects.all():
+            items = MealItem.objects.filter(meal__plan=plan)
+            self.assertEqual(plan.get_total_values(), self.sum_items(items))
+
+            for meal in plan.meal_set.all():
+                self.assertEqual(
+                    meal.get_nutritional_values(), self.sum_items(meal.mealitem_set.all())
+                )
+
+    def test_read_single_query(self):
+        plan = NutritionPlan.objects.get(pk=1)
+        plan.get_total_values()
+
+        with self.assertNumQueries(1):
+            plan.get_total_values()
+
+    def test_item_changes(self):
+        """
+        The totals are updated when items are added, changed or deleted
+        """
+        meal = Meal.objects.get(pk=1)
+        plan = meal.plan
+        item = MealItem(meal=meal, ingredient_id=1, amount=150, order=10)
+        item.save()
+        self.assertEqual(meal.get_nutritional_values(), self.sum_items(meal.mealitem_set.all()))
+
+        item.amount = 10
+        item.save()
+        self.assertEqual(meal.get_nutritional_values(), self.sum_items(meal.mealitem_set.all()))
+
+        for item in meal.mealitem_set.all():
+            item.delete()
+        self.assertFalse(MealTotals.objects.filter(meal=meal).exists())
+        self.assertEqual(meal.get_nutritional_values(), NutritionalValues())
+        self.assertEqual(
+            plan.get_total_values(),
+            self.sum_items(MealItem.objects.filter(meal__plan=plan)),
+        )
+
+    def test_move_item(self):
+        """
+        Moving an item to a meal of another plan updates the totals of both
+        """
+        item = MealItem.objects.filter(meal_id=1).first()
+        old_meal = item.meal
+        new_meal = Meal.objects.get(pk=2)
+        self.assertNotEqual(old_meal.plan_id, new_meal.plan_id)
+        for meal in (old_meal, new_meal):
+            meal.get_nutritional_values()
+            meal.plan.get_total_values()
+
+        item.meal = new_meal
+        item.save()
+
+        for meal in (old_meal, new_meal):
+            self.assertEqual(
+                meal.get_nutritional_values(), self.sum_items(meal.mealitem_set.all())
+            )
+            self.assertEqual(
+                meal.plan.get_total_values(),
+                self.sum_items(MealItem.objects.filter(meal__plan=meal.plan)),
+            )
+
+    def test_move_meal(self):
+        """
+        Moving a meal to another plan updates the totals of both plans
+        """
+        meal = Meal.objects.get(pk=1)
+        old_plan = meal.plan
+        new_plan = NutritionPlan.objects.get(pk=2)
+        old_plan.get_total_values()
+        new_plan.get_total_values()
+
+        meal.plan = new_plan
+        meal.save()
+
+        for plan in (old_plan, new_plan):
+            self.assertEqual(
+                plan.get_total_values(),
+                self.sum_items(MealItem.objects.filter(meal__plan=plan)),
+            )
+
+    def test_delete_plan(self):
+        plan = NutritionPlan.objects.get(pk=1)
+        plan.get_total_values()
+        plan.delete()
+
+        self.assertFalse(PlanTotals.objects.filter(plan_id=1).exists())
+        self.assertFalse(LogDayTotals.objects.filter(plan_id=1).exists())
+
+    def test_ingredient_changes(self):
+        """
+        Changing the nutritional values of an ingredient updates the totals
+        """
+        plan = NutritionPlan.objects.get(pk=1)
+        before = plan.get_total_values()
+
+        ingredient = Ingredient.objects.get(pk=1)
+        ingredient.energy += 100
+        ingredient.save()
+
+        after = plan.get_total_values()
+        self.assertNotEqual(before.energy, after.energy)
+        self.assertEqual(after, self.sum_items(MealItem.objects.filter(meal__plan=plan)))
+
+    def test_log_day_totals(self):
+        """
+        The totals of the logged days are kept up to date
+        """
+        plan = NutritionPlan.objects.get(pk=1)
+        day = datetime.date(2016, 5, 15)
+        self.assertEqual(plan.get_log_day_values(day), self.sum_items(plan.get_log_entries(day)))
+
+        # Move an entry to another day
+        item = LogItem.objects.get(pk=3)
+        item.datetime = item.datetime + datetime.timedelta(days=2)
+        item.save()
+        self.assertEqual(plan.get_log_day_values(day), self.sum_items(plan.get_log_entries(day)))
+        self.assertEqual(
+            plan.get_log_day_values(day + datetime.timedelta(days=2)),
+            item.get_nutritional_values(),
+        )
+
+        # Delete all entries of a day
+        plan.get_log_entries(day).delete()
+        self.assertEqual(plan.get_log_day_values(day), NutritionalValues())
+        self.assertFalse(LogDayTotals.objects.filter(plan=plan, date=day).exists())
+
+    def test_diary_day_totals(self):
+        """
+        The diary totals of a user sum the days of all their plans
+        """
+        day = datetime.date(2016, 5, 15)
+        user = User.objects.get(username='test')
+        item = LogItem.objects.get(pk=1)
+        other_plan = NutritionPlan.objects.filter(user=user).exclude(pk=item.plan_id).first()
+
+        new_item = LogItem(
+            plan=other_plan,
+            ingredient_id=2,
+            amount=80,
+            datetime=item.datetime,
+        )
+        new_item.save()
+        self.assertEqual(
+            DiaryDayTotals.objects.get(user=user, date=day).nutritional_values,
+            self.sum_items(LogItem.objects.filter(plan__user=user, datetime__date=day)),
+        )
+
+        # Moving the entry to another plan of someone else updates both diaries
+        new_item.plan = NutritionPlan.objects.exclude(user=user).first()
+        new_item.save()
+        self.assertEqual(
+            DiaryDayTotals.objects.get(user=user, date=day).nutritional_values,
+            item.plan.get_log_day_values(day),
+        )
+        self.assertEqual(
+            DiaryDayTotals.objects.get(user=new_item.plan.user, date=day).nutritional_values,
+            new_item.get_nutritional_values(),
+        )
+
+        # Deleting everything removes the day
+        LogItem.objects.filter(plan__user=user, datetime__date=day).delete()
+        self.assertFalse(DiaryDayTotals.objects.filter(user=user, date=day).exists())
+
+    def test_diary_totals_api(self):
+        """
+        The range of daily totals is read from the stored totals
+        """
+        self.user_login('test')
+        user = User.objects.get(username='test')
+        for days in range(1, 30):
+            LogItem(
+                plan=NutritionPlan.objects.filter(user=user).first(),
+                ingredient_id=1,
+                amount=days,
+                datetime=datetime.datetime(2016, 6, days, 12, 0, tzinfo=datetime.timezone.utc),
+            ).save()
+        url = '/api/v2/nutritiondiarytotals/'
+        params = {'date__gte': '2016-05-15', 'date__lte': '2016-06-10', 'limit': 100}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+
+        # The page and the total count, the log entries themselves are not read
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if 'nutrition_diarydaytotals' in q]), 2)
+        self.assertFalse([q for q in sql if 'nutrition_logitem' in q])
+
+        self.assertEqual(response.status_code, 200)
+        result = response.data['results']
+        self.assertEqual(response.data['count'], 11)
+        self.assertEqual(result[0]['date'], '2016-05-15')
+        self.assertEqual(result[-1]['date'], '2016-06-10')
+        self.assertAlmostEqual(
+            result[0]['energy'],
+            float(DiaryDayTotals.objects.get(user=user, date='2016-05-15').energy),
+        )
+
+    def test_diary_totals_api_other_user(self):
+        self.user_login('admin')
+        response = self.client.get('/api/v2/nutritiondiarytotals/')
+        dates = {entry['date'] for entry in response.data['results']}
+        self.assertEqual(dates, {'2016-05-14'})
+
+    def test_rebuild_command(self):
+        PlanTotals.objects.all().delete()
+        MealTotals.objects.all().delete()
+        LogDayTotals.objects.all().delete()
+        DiaryDayTotals.objects.all().delete()
+
+        call_command('rebuild-nutritional-totals', stdout=StringIO())
+
+        self.assertEqual(
+            PlanTotals.objects.count(),
+            NutritionPlan.objects.filter(meal__mealitem__isnull=False).distinct().count(),
+        )
+        plan = NutritionPlan.objects.get(pk=1)
+        self.assertEqual(
+            plan.get_total_values(),
+            self.sum_items(MealItem.objects.filter(meal__plan=plan)),
+        )
+        self.assertEqual(LogDayTotals.objects.filter(plan=plan).count(), 1)
+        self.assertEqual(
+            list(DiaryDayTotals.objects.values_list('user__username', 'date')),
+            [('admin', datetime.date(2016, 5, 14)), ('test', datetime.date(2016, 5, 15))],
+        )
@@ -0,0 +1,48 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.nutrition.models import (
+    LogItem,
+    MealItem,
+)
+
+
+class NutritionalValuesItemApiTestCase(WgerTestCase):
+    """
+    Tests the nutritional values endpoints of meal and log items
+    """
+
+    def check_endpoint(self, endpoint, item):
+        self.user_login(item.get_owner_object().user.username)
+        response = self.client.get(f'/api/v2/{endpoint}/{item.pk}/nutritional_values/')
+        self.assertEqual(response.status_code, 200)
+
+        expected = item.get_nutritional_values()
+        self.assertAlmostEqual(response.data['energy'], float(expected.energy), 6)
+        self.assertAlmostEqual(response.data['protein'], float(expected.protein), 6)
+
+    def test_meal_item(self):
+        self.check_endpoint('mealitem', MealItem.objects.get(pk=1))
+
+    def test_log_item(self):
+        self.check_endpoint('nutritiondiary', LogItem.objects.get(pk=1))
+
+    def test_other_user(self):
+        self.user_login('test')
+        item = MealItem.objects.exclude(meal__plan__user__username='test').first()
+        response = self.client.get(f'/api/v2/mealitem/{item.pk}/nutritional_values/')
+        self.assertEqual(response.status_code, 404)
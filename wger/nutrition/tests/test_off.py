@@ -13,13 +13,30 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with Workout Manager.  If not, see <http://www.gnu.org/licenses/>.
 
+# Standard Library
+import gzip
+import json
+import os
+import tempfile
+from collections import Counter
+from dataclasses import replace
+from importlib import import_module
+from io import StringIO
+
 # Django
+from django.core.management import call_command
 from django.test import SimpleTestCase
 
 # wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.nutrition.models import Ingredient
 from wger.nutrition.off import (
     IngredientData,
+    OffDumpReader,
+    extract_batches,
     extract_info_from_off,
+    extract_info_from_off_batch,
+    upsert_ingredients,
 )
 from wger.utils.constants import ODBL_LICENSE_ID
 from wger.utils.models import AbstractSubmissionModel
@@ -113,3 +130,246 @@ class ExtractInfoFromOffTestCase(SimpleTestCase):
 
         self.assertEqual(result.carbohydrates_sugar, 0)
         self.assertEqual(result.fat_saturated, 0)
+
+
+class OffImportPipelineTestCase(WgerTestCase):
+    """
+    Test the batched extraction and bulk upsert used by the OFF import
+    """
+
+    def get_product(self, code, name='Foo with chocolate'):
+        return {
+            'code': code,
+            'lang': 'de',
+            'product_name': name,
+            'generic_name': f'{name}, 250g package',
+            'nutriments': {
+                'energy-kcal_100g': 120,
+                'proteins_100g': 10,
+                'carbohydrates_100g': 20,
+                'fat_100g': 4,
+            }
+        }
+
+    def test_extract_batch(self):
+        """
+        Products with missing data are skipped
+        """
+        invalid = self.get_product('1')
+        del invalid['nutriments']['fat_100g']
+        no_common_name = self.get_product('2')
+        no_common_name['generic_name'] = ''
+
+        ingredients, skipped = extract_info_from_off_batch(
+            [(self.get_product('3'), 1), (invalid, 1), (no_common_name, 1)]
+        )
+        self.assertEqual(skipped, 2)
+        self.assertEqual([i.code for i in ingredients], ['3'])
+
+    def test_extract_batches_order(self):
+        batches = [[(self.get_product(str(i)), 1)] for i in range(5)]
+        result = list(extract_batches(batches))
+        self.assertEqual([r[0][0].code for r in result], ['0', '1', '2', '3', '4'])
+
+    def test_upsert(self):
+        """
+        Existing ingredients are updated, the rest is inserted
+        """
+        count_before = Ingredient.objects.count()
+        ingredients, skipped = extract_info_from_off_batch(
+            [
+                (self.get_product('1234567890', 'Updated name'), 1),
+                (self.get_product('99999999'), 1),
+            ]
+        )
+        counter = Counter()
+
+        with self.assertNumQueries(25):
+            upsert_ingredients(ingredients, counter)
+
+        self.assertEqual(counter['edited'], 1)
+        self.assertEqual(counter['new'], 1)
+        self.assertEqual(Ingredient.objects.count(), count_before + 1)
+        self.assertEqual(Ingredient.objects.get(code='1234567890').name, 'Updated name')
+        self.assertEqual(Ingredient.objects.get(code='99999999').name, 'Foo with chocolate')
+
+    def test_upsert_invalid_update(self):
+        """
+        If the bulk update fails, the valid ingredients are still updated
+        """
+        ingredients, skipped = extract_info_from_off_batch(
+            [
+                (self.get_product('1234567890', 'Updated name'), 1),
+                (self.get_product('1223334444'), 1),
+            ]
+        )
+        ingredients[1] = replace(ingredients[1], name=None)
+        counter = Counter()
+
+        upsert_ingredients(ingredients, counter, print_fn=lambda *args: None)
+
+        self.assertEqual(counter['edited'], 1)
+        self.assertEqual(counter['error'], 1)
+        self.assertEqual(Ingredient.objects.get(code='1234567890').name, 'Updated name')
+        self.assertIsNotNone(Ingredient.objects.get(code='1223334444').name)
+
+    def test_import_command_last_batch(self):
+        """
+        The last, partial, batch is written as well and the counts are correct
+        """
+        module = import_module('wger.nutrition.management.commands.import-off-products')
+        command = module.Command(stdout=StringIO())
+        command.mode = module.Mode.INSERT
+        command.bulk_size = 2
+
+        count_before = Ingredient.objects.count()
+        counter = command.import_products((self.get_product(str(1000 + i)), 1) for i in range(5))
+        self.assertEqual(counter['new'], 5)
+        self.assertEqual(Ingredient.objects.count(), count_before + 5)
+
+    def test_import_command_dump_file(self):
+        """
+        The products can be read from a dump file, the offsets to resume are printed
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'products.jsonl.gz')
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                for i in range(5):
+                    product = self.get_product(str(2000 + i))
+                    product['completeness'] = 0.8
+                    f.write(json.dumps(product) + '\n')
+
+            count_before = Ingredient.objects.count()
+            out = StringIO()
+            call_command(
+                'import-off-products',
+                '--dump-file',
+                path,
+                '--batch-size',
+                '2',
+                '--resume-from-offset',
+                '1',
+                '--set-mode',
+                'insert',
+                stdout=out,
+            )
+
+        self.assertEqual(Ingredient.objects.count(), count_before + 4)
+        self.assertFalse(Ingredient.objects.filter(code='2000').exists())
+        self.assertIn('--resume-from-offset 3', out.getvalue())
+        self.assertIn('--resume-from-offset 5', out.getvalue())
+
+
+class OffDumpReaderTestCase(SimpleTestCase):
+    """
+    Test reading the products directly from the OFF export files
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.languages = {'de': 1, 'en': 2}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_jsonl(self, products):
+        path = os.path.join(self.tmp_dir.name, 'products.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for product in products:
+                f.write(json.dumps(product) + '\n')
+        return path
+
+    def get_products(self):
+        return [
+            {
+                'code': '1',
+                'lang': 'de',
+                'completeness': 0.9,
+                'product_name': 'Eins'
+            },
+            {
+                'code': '2',
+                'lang': 'fr',
+                'completeness': 0.9,
+                'product_name': 'Deux'
+            },
+            {
+                'code': '3',
+                'lang': 'en',
+                'completeness': 0.2,
+                'product_name': 'Three'
+            },
+            {
+                'code': '4',
+                'lang': 'en',
+                'completeness': 0.8,
+                'product_name': 'Four',
+                'x': 1
+            },
+        ]
+
+    def test_jsonl_filters(self):
+        """
+        Products in other languages or below the completeness threshold are skipped
+        """
+        reader = OffDumpReader(self.write_jsonl(self.get_products()), self.languages, 0.7)
+        result = list(reader)
+
+        self.assertEqual([(p['code'], language) for p, language in result], [('1', 1), ('4', 2)])
+        self.assertNotIn('x', result[1][0])
+        self.assertEqual(reader.offset, 4)
+
+    def test_jsonl_resume(self):
+        """
+        The lines before the offset are skipped
+        """
+        path = self.write_jsonl(self.get_products())
+        reader = OffDumpReader(path, self.languages, 0.1, offset=2)
+
+        self.assertEqual([p['code'] for p, _ in reader], ['3', '4'])
+        self.assertEqual(reader.offset, 4)
+
+    def test_invalid_lines(self):
+        path = os.path.join(self.tmp_dir.name, 'products.jsonl')
+        with open(path, 'w') as f:
+            f.write('{"code": "1", "lang": "de", "completeness": 0.9}\n')
+            f.write('not json\n')
+            f.write('{"code": "3", "lang": "de", "completeness": "n/a"}\n')
+
+        self.assertEqual([p['code'] for p, _ in OffDumpReader(path, self.languages, 0.5)], ['1'])
+
+    def test_csv(self):
+        """
+        The rows of the CSV export are converted to the structure of the JSON products
+        """
+        path = os.path.join(self.tmp_dir.name, 'products.csv')
+        header = [
+            'code', 'creator', 'lang', 'completeness', 'product_name', 'generic_name', 'brands',
+            'energy-kcal_100g', 'proteins_100g', 'carbohydrates_100g', 'fat_100g'
+        ]
+        rows = [
+            ['1', 'MrX', 'de', '0.9', 'Eins', 'Eins, 250g', 'Bar', '120', '10', '20', '4'],
+            ['2', 'MrY', 'fr', '0.9', 'Deux', '', '', '120', '10', '20', '4'],
+            ['3', '', 'en', '0.8', 'Three', '', '', '120', '', '20', '4'],
+        ]
+        with open(path, 'w') as f:
+            for row in [header] + rows:
+                f.write('\t'.join(row) + '\n')
+
+        result = list(OffDumpReader(path, self.languages, 0.5))
+        self.assertEqual(len(result), 2)
+
+        product, language = result[0]
+        self.assertEqual(language, 1)
+        self.assertEqual(product['editors_tags'], ['MrX'])
+        self.assertEqual(product['brands'], 'Bar')
+        self.assertEqual(product['nutriments']['energy-kcal_100g'], 120)
+
+        product, language = result[1]
+        self.assertEqual(language, 2)
+        self.assertNotIn('editors_tags', product)
+        self.assertNotIn('proteins_100g', product['nutriments'])
+
+        ingredient = extract_info_from_off(result[0][0], 1)
+        self.assertEqual(ingredient.name, 'Eins')
+        self.assertEqual(ingredient.license_author, 'MrX')
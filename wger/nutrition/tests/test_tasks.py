@@ -36,6 +36,7 @@ class MockOffResponse:
     def __init__(self):
         self.status_code = 200
         self.content = b'2000'
+        self.headers = {}
 
     # yapf: disable
     @staticmethod
@@ -62,6 +63,7 @@ class MockWgerApiResponse:
     def __init__(self):
         self.status_code = 200
         self.content = b'2000'
+        self.headers = {}
 
     # yapf: disable
     @staticmethod
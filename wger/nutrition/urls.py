@@ -57,6 +57,11 @@ patterns_plan = [
         plan.export_pdf,
         name='export-pdf',
     ),
+    path(
+        'diary/export-csv',
+        plan.export_diary,
+        name='export-diary',
+    ),
 ]
 
 # sub patterns for ingredient
@@ -378,6 +378,29 @@ THUMBNAIL_ALIASES = {
     },
 }
 
+# Modern formats saved next to every thumbnail and their quality, which can be
+# set per alias. Formats that Pillow can't write are skipped (AVIF needs
+# Pillow 11.2 or newer)
+THUMBNAIL_FORMATS = {
+    'webp': {
+        'quality': 80,
+        'aliases': {
+            'large': 90,
+            'large_cropped': 90
+        },
+    },
+    'avif': {
+        'quality': 60,
+        'aliases': {
+            'large': 75,
+            'large_cropped': 75
+        },
+    },
+}
+
+# Thumbnail aliases with the original aspect ratio, used for the srcset of the images
+THUMBNAIL_SRCSET_ALIASES = ['micro', 'thumbnail', 'small', 'medium', 'large']
+
 STATIC_ROOT = ''
 USE_S3 = os.getenv('USE_S3') == 'TRUE'
 
@@ -79,6 +79,16 @@ router.register(
     r'workoutsession', manager_api_views.WorkoutSessionViewSet, basename='workoutsession'
 )
 router.register(r'workoutlog', manager_api_views.WorkoutLogViewSet, basename='workoutlog')
+router.register(
+    r'workoutlogprogression',
+    manager_api_views.WorkoutLogProgressionViewSet,
+    basename='workoutlogprogression',
+)
+router.register(
+    r'workoutlogweeklysummary',
+    manager_api_views.WorkoutLogWeeklySummaryViewSet,
+    basename='workoutlogweeklysummary',
+)
 router.register(r'schedulestep', manager_api_views.ScheduleStepViewSet, basename='schedulestep')
 router.register(r'schedule', manager_api_views.ScheduleViewSet, basename='schedule')
 
@@ -188,6 +198,11 @@ router.register(
     basename='nutritionplaninfo'
 )
 router.register(r'nutritiondiary', nutrition_api_views.LogItemViewSet, basename='nutritiondiary')
+router.register(
+    r'nutritiondiarytotals',
+    nutrition_api_views.DiaryDayTotalsViewSet,
+    basename='nutritiondiarytotals'
+)
 router.register(r'meal', nutrition_api_views.MealViewSet, basename='meal')
 router.register(r'mealitem', nutrition_api_views.MealItemViewSet, basename='mealitem')
 router.register(r'ingredient-image', nutrition_api_views.ImageViewSet, basename='ingredientimage')
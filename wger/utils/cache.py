@@ -14,9 +14,20 @@
 
 # Standard Library
 import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 # Django
 from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.utils import make_template_fragment_key
 
 
@@ -32,23 +43,64 @@ def delete_template_fragment_cache(fragment_name='', vary_on=None):
 
 
 def reset_workout_canonical_form(workout_id):
-    cache.delete(cache_mapper.get_workout_canonical(workout_id))
+    tagged_cache.invalidate(cache_mapper.get_workout_tag(workout_id))
 
 
 def reset_exercise_api_cache(uuid: str):
-    cache.delete(cache_mapper.get_exercise_api_key(uuid))
+    tagged_cache.delete(cache_mapper.get_exercise_api_key(uuid))
 
 
-def reset_workout_log(user_pk, year, month, day=None):
+def reset_exercise_base_cache(base_id):
     """
-    Resets the cached workout logs
+    Resets all cached entries that contain data from the given exercise base,
+    e.g. the exercise API responses and the canonical form of the workouts
+    """
+    tagged_cache.invalidate(cache_mapper.get_exercise_base_tag(base_id))
+
+
+def reset_muscle_cache(muscle_id):
+    """
+    Resets all cached entries that contain data from the given muscle
+    """
+    tagged_cache.invalidate(cache_mapper.get_muscle_tag(muscle_id))
+
+
+def reset_nutrition_plan_cache(plan_id):
+    """
+    Resets the cached nutritional values of the given plan
+    """
+    tagged_cache.invalidate(cache_mapper.get_nutrition_plan_tag(plan_id))
+
+
+def reset_ingredient_cache(*ingredient_ids):
+    """
+    Resets all cached entries that contain data from the given ingredients
     """
+    tagged_cache.invalidate(*map(cache_mapper.get_ingredient_tag, ingredient_ids))
 
-    log_hash = hash((user_pk, year, month))
-    cache.delete(cache_mapper.get_workout_log_list(log_hash))
 
-    log_hash = hash((user_pk, year, month, day))
-    cache.delete(cache_mapper.get_workout_log_list(log_hash))
+def reset_weight_unit_cache(weight_unit_id):
+    """
+    Resets all cached entries that contain data from the given weight unit
+    """
+    tagged_cache.invalidate(cache_mapper.get_weight_unit_tag(weight_unit_id))
+
+
+def reset_schedule_cache(schedule_id):
+    """
+    Resets all cached entries that contain data from the given schedule
+    """
+    tagged_cache.invalidate(cache_mapper.get_schedule_tag(schedule_id))
+
+
+def reset_workout_log(user_pk, year=None, month=None, day=None):
+    """
+    Resets the cached workout logs
+
+    Resetting a day also resets its month, resetting a month resets all its days
+    and passing only the user resets all cached logs of the user.
+    """
+    tagged_cache.invalidate(cache_mapper.get_workout_log_tag(user_pk, year, month, day))
 
 
 class CacheKeyMapper:
@@ -59,10 +111,30 @@ class CacheKeyMapper:
     # Keys used by the cache
     LANGUAGE_CACHE_KEY = 'language-{0}'
     INGREDIENT_CACHE_KEY = 'ingredient-{0}'
-    WORKOUT_CANONICAL_REPRESENTATION = 'workout-canonical-representation-{0}'
-    WORKOUT_LOG_LIST = 'workout-log-hash-{0}'
+    INGREDIENT_IMAGE_FETCH_KEY = 'ingredient-image-fetch-{0}'
+    WORKOUT_CANONICAL_REPRESENTATION = 'workout-canonical-representation-v{version}-{0}'
+    WORKOUT_CANONICAL_VERSION = 2
+    """Version of the records in wger.manager.canonical, increase when they change"""
+
+    WORKOUT_LOG_LIST = 'workout-log-calendar-{0}-{1}-{2}'
+    WORKOUT_LOG_LIST_DAY = 'workout-log-calendar-{0}-{1}-{2}-{3}'
     NUTRITION_CACHE_KEY = 'nutrition-cache-log-{0}'
     EXERCISE_API_KEY = 'base-uuid-{0}'
+    EXPORT_KEY = 'export-{0}'
+    PDF_KEY = 'pdf-{0}'
+    PDF_LATEST_KEY = 'pdf-latest-{0}'
+
+    # Tags used to invalidate groups of cache entries, see TaggedCache
+    WORKOUT_TAG = 'workout:{0}'
+    EXERCISE_BASE_TAG = 'exercise-base:{0}'
+    MUSCLE_TAG = 'muscle:{0}'
+    NUTRITION_PLAN_TAG = 'plan:{0}'
+    INGREDIENT_TAG = 'ingredient:{0}'
+    WEIGHT_UNIT_TAG = 'weight-unit:{0}'
+    SCHEDULE_TAG = 'schedule:{0}'
+    WORKOUT_LOG_TAG = 'user:{0}:logs'
+    WORKOUT_LOG_MONTH_TAG = 'user:{0}:logs:{1:04d}-{2:02d}'
+    WORKOUT_LOG_DAY_TAG = 'user:{0}:logs:{1:04d}-{2:02d}-{3:02d}'
 
     def get_pk(self, param):
         """
@@ -82,17 +154,28 @@ class CacheKeyMapper:
         """
         return self.INGREDIENT_CACHE_KEY.format(self.get_pk(param))
 
+    def get_ingredient_image_fetch_key(self, param):
+        """
+        Return the key used to mark that the ingredient image is being fetched
+        """
+        return self.INGREDIENT_IMAGE_FETCH_KEY.format(self.get_pk(param))
+
     def get_workout_canonical(self, param):
         """
         Return the workout canonical representation
         """
-        return self.WORKOUT_CANONICAL_REPRESENTATION.format(self.get_pk(param))
+        return self.WORKOUT_CANONICAL_REPRESENTATION.format(
+            self.get_pk(param),
+            version=self.WORKOUT_CANONICAL_VERSION,
+        )
 
-    def get_workout_log_list(self, hash_value):
+    def get_workout_log_list(self, user, year, month, day=None):
         """
-        Return the workout canonical representation
+        Return the key of the cached workout logs of a user for a month or a day
         """
-        return self.WORKOUT_LOG_LIST.format(hash_value)
+        if day:
+            return self.WORKOUT_LOG_LIST_DAY.format(self.get_pk(user), year, month, day)
+        return self.WORKOUT_LOG_LIST.format(self.get_pk(user), year, month)
 
     def get_nutrition_cache_by_key(self, params):
         """
@@ -107,5 +190,226 @@ class CacheKeyMapper:
         """
         return cls.EXERCISE_API_KEY.format(base_uuid)
 
+    def get_export_key(self, token: str):
+        """
+        Return the key of a CSV export prepared in the background
+        """
+        return self.EXPORT_KEY.format(token)
+
+    def get_pdf_key(self, key: str):
+        """
+        Return the key of a PDF that is being rendered in the background
+        """
+        return self.PDF_KEY.format(key)
+
+    def get_pdf_latest_key(self, key: str):
+        """
+        Return the key of the last rendered version of a PDF
+        """
+        return self.PDF_LATEST_KEY.format(key)
+
+    def get_workout_tag(self, param):
+        """
+        Return the tag of the entries depending on a workout
+        """
+        return self.WORKOUT_TAG.format(self.get_pk(param))
+
+    def get_exercise_base_tag(self, param):
+        """
+        Return the tag of the entries depending on an exercise base
+        """
+        return self.EXERCISE_BASE_TAG.format(self.get_pk(param))
+
+    def get_muscle_tag(self, param):
+        """
+        Return the tag of the entries depending on a muscle
+        """
+        return self.MUSCLE_TAG.format(self.get_pk(param))
+
+    def get_nutrition_plan_tag(self, param):
+        """
+        Return the tag of the entries depending on a nutrition plan
+        """
+        return self.NUTRITION_PLAN_TAG.format(self.get_pk(param))
+
+    def get_ingredient_tag(self, param):
+        """
+        Return the tag of the entries depending on an ingredient
+        """
+        return self.INGREDIENT_TAG.format(self.get_pk(param))
+
+    def get_weight_unit_tag(self, param):
+        """
+        Return the tag of the entries depending on a weight unit
+        """
+        return self.WEIGHT_UNIT_TAG.format(self.get_pk(param))
+
+    def get_schedule_tag(self, param):
+        """
+        Return the tag of the entries depending on a schedule
+        """
+        return self.SCHEDULE_TAG.format(self.get_pk(param))
+
+    def get_workout_log_tag(self, user, year=None, month=None, day=None):
+        """
+        Return the tag of the cached workout logs of a user, optionally only
+        for a month or a day
+        """
+        if day:
+            return self.WORKOUT_LOG_DAY_TAG.format(self.get_pk(user), year, month, day)
+        if month:
+            return self.WORKOUT_LOG_MONTH_TAG.format(self.get_pk(user), year, month)
+        return self.WORKOUT_LOG_TAG.format(self.get_pk(user))
+
 
 cache_mapper = CacheKeyMapper()
+
+
+class TaggedEntry(NamedTuple):
+    """
+    A value saved by TaggedCache, together with the generations of its tags
+    """
+
+    value: Any
+    generations: Tuple[Tuple[str, int], ...]
+
+
+class TaggedCache:
+    """
+    Cache for values that depend on other objects
+
+    Every entry is saved together with a list of tags (e.g. "exercise-base:42")
+    that name the objects it was built from. Each tag has a generation counter
+    in the cache, and invalidating a tag simply increments it. Entries saved
+    with an older generation are stale, so writers don't need to know which
+    keys depend on the objects they change.
+
+    Stale entries are recomputed by the first reader. While this happens, other
+    readers get the stale value instead of recomputing it again at the same time
+    (stale-while-revalidate).
+    """
+
+    TAG_KEY = 'cache-tag-{0}'
+    REVALIDATE_KEY = 'cache-revalidate-{0}'
+
+    REVALIDATE_TIMEOUT = 60
+    """Seconds after which a revalidation that didn't finish can be started again"""
+
+    def __init__(self, backend=cache):
+        self.backend = backend
+
+    def get_generations(self, tags: Iterable[str]) -> Dict[str, int]:
+        """
+        Returns the current generation of the given tags, in one cache call
+
+        Tags that are not in the cache yet (or were evicted) get a new one. This
+        is based on the current time, so that entries saved with an evicted
+        generation don't become fresh again.
+        """
+        tags = list(dict.fromkeys(tags))
+        keys = {self.TAG_KEY.format(tag): tag for tag in tags}
+        found = self.backend.get_many(keys)
+
+        generations = {keys[key]: generation for key, generation in found.items()}
+        for key, tag in keys.items():
+            if tag not in generations:
+                self.backend.add(key, time.time_ns(), None)
+                generations[tag] = self.backend.get(key)
+        return generations
+
+    def invalidate(self, *tags: str):
+        """
+        Marks all entries saved with any of the given tags as stale
+        """
+        for tag in tags:
+            try:
+                self.backend.incr(self.TAG_KEY.format(tag))
+            except ValueError:
+                # There is no generation for this tag, so no entry can be fresh
+                pass
+
+    def is_fresh(self, entry: TaggedEntry) -> bool:
+        generations = dict(entry.generations)
+        return self.get_generations(generations) == generations
+
+    def get(self, key: str, default=None, allow_stale=False):
+        """
+        Returns the value saved under the given key, or default if there is none
+        or, unless allow_stale is set, if it is stale
+        """
+        entry = self.backend.get(key)
+        if not isinstance(entry, TaggedEntry):
+            return default
+        if not allow_stale and not self.is_fresh(entry):
+            return default
+        return entry.value
+
+    def set(
+        self,
+        key: str,
+        value,
+        tags: Iterable[str],
+        timeout=DEFAULT_TIMEOUT,
+        generations: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Saves a value with the given tags
+
+        :param generations: the generations of the tags from before the value
+                            was computed. Defaults to the current ones.
+        """
+        if generations is None:
+            generations = self.get_generations(tags)
+        entry = TaggedEntry(value, tuple(generations.items()))
+        self.backend.set(key, entry, timeout)
+
+    def delete(self, key: str):
+        self.backend.delete(key)
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        tags: Iterable[str],
+        value_tags: Optional[Callable[[Any], Iterable[str]]] = None,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        """
+        Returns the value saved under the given key, computing and saving it if
+        it is missing or stale
+
+        :param compute: callable that returns the value
+        :param tags: the tags of the value
+        :param value_tags: optional callable returning further tags that depend
+                           on the computed value itself, e.g. the IDs it contains
+        """
+        entry = self.backend.get(key)
+        revalidate_key = None
+        if isinstance(entry, TaggedEntry):
+            if self.is_fresh(entry):
+                return entry.value
+
+            # Somebody else is already computing the new value
+            revalidate_key = self.REVALIDATE_KEY.format(key)
+            if not self.backend.add(revalidate_key, True, self.REVALIDATE_TIMEOUT):
+                return entry.value
+
+        # Read the generations of the tags first, so that invalidations made while
+        # computing the value mark it as stale. The value tags are only known
+        # afterwards, so invalidations of those made in the meantime are missed.
+        generations = self.get_generations(tags)
+        try:
+            value = compute()
+            if value_tags:
+                generations = {
+                    **self.get_generations(value_tags(value)),
+                    **generations,
+                }
+            self.set(key, value, list(generations), timeout, generations)
+        finally:
+            if revalidate_key:
+                self.backend.delete(revalidate_key)
+        return value
+
+
+tagged_cache = TaggedCache()
@@ -61,6 +61,9 @@ DOWNLOAD_INGREDIENT_WGER = 'WGER'
 DOWNLOAD_INGREDIENT_OFF = 'OFF'
 DOWNLOAD_INGREDIENT_OPTIONS = (DOWNLOAD_INGREDIENT_WGER, DOWNLOAD_INGREDIENT_OFF, None)
 
+# Number of rows written per query when synchronizing data from a remote instance
+SYNC_BATCH_SIZE = 500
+
 # OFF Api
 OFF_SEARCH_PRODUCT_FOUND = 1
 OFF_SEARCH_PRODUCT_NOT_FOUND = 0
@@ -0,0 +1,220 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Streaming CSV exports
+
+The rows are read from the database in chunks and written to the response as
+they are generated, so that exports of big gyms or long time users neither
+need to fit in memory nor tie up a worker for a long time before the first
+byte is sent. With celery, very large exports can also be prepared in the
+background and downloaded later. Prepared files are deleted once they were
+downloaded or, at the latest, when their download link expires.
+"""
+
+# Standard Library
+import csv
+import datetime
+import tempfile
+import uuid
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+)
+
+# Django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.http import (
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils import translation
+from django.utils.timezone import now
+
+# wger
+from wger.utils.cache import cache_mapper
+
+
+EXPORT_CHUNK_SIZE = 2000
+"""Number of rows read from the database at once"""
+
+EXPORT_TIMEOUT = 60 * 60 * 24
+"""Time prepared exports can be downloaded"""
+
+EXPORT_DIRECTORY = 'exports'
+"""Directory in the storage the prepared exports are written to"""
+
+
+class Echo:
+    """
+    Pseudo buffer that returns the written value, so that the rows of the CSV
+    writer can be yielded instead of collected in a file
+    """
+
+    def write(self, value):
+        return value
+
+
+class CsvExport:
+    """
+    Base class for the CSV exports
+
+    Subclasses define the header, the queryset and how each object is
+    converted to a row. Any keyword arguments (e.g. the gym) are stored, so
+    that the export can be recreated by the celery task.
+    """
+
+    filename = 'export.csv'
+    delimiter = ','
+    quoting = csv.QUOTE_MINIMAL
+
+    def __init__(self, user: User, **kwargs):
+        self.user = user
+        self.kwargs = kwargs
+
+    def get_filename(self) -> str:
+        return self.filename
+
+    def get_header(self) -> List[str]:
+        raise NotImplementedError
+
+    def get_queryset(self) -> QuerySet:
+        raise NotImplementedError
+
+    def get_row(self, obj) -> Iterable:
+        raise NotImplementedError
+
+    def rows(self) -> Iterator[Iterable]:
+        """
+        Returns the header and the rows, the objects are fetched in chunks
+        """
+        yield self.get_header()
+        for obj in self.get_queryset().iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield self.get_row(obj)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Returns the lines of the CSV file
+        """
+        writer = csv.writer(Echo(), delimiter=self.delimiter, quoting=self.quoting)
+        for row in self.rows():
+            yield writer.writerow(row)
+
+    def response(self) -> StreamingHttpResponse:
+        """
+        Returns a response streaming the CSV file to the browser
+        """
+        response = StreamingHttpResponse(self.stream(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename={self.get_filename()}'
+        return response
+
+    def save(self, token: str) -> str:
+        """
+        Writes the CSV file to the storage and returns its name
+        """
+        with tempfile.TemporaryFile() as f:
+            for line in self.stream():
+                f.write(line.encode('utf-8'))
+            f.seek(0)
+            return default_storage.save(
+                f'{EXPORT_DIRECTORY}/{token}/{self.get_filename()}', File(f)
+            )
+
+    def prepare(self) -> str:
+        """
+        Queues the export to be prepared by celery and returns its token,
+        see the download view for retrieving it
+        """
+        # wger
+        from wger.utils.tasks import prepare_export_task
+
+        token = uuid.uuid4().hex
+        cache.set(
+            cache_mapper.get_export_key(token),
+            {
+                'user': self.user.pk,
+                'file': None,
+                'filename': self.get_filename()
+            },
+            EXPORT_TIMEOUT,
+        )
+        prepare_export_task.delay(
+            f'{self.__class__.__module__}.{self.__class__.__qualname__}',
+            self.user.pk,
+            self.kwargs,
+            token,
+            translation.get_language(),
+        )
+        return token
+
+
+class PreparedExportFile(File):
+    """
+    Prepared export that is deleted from the storage once it was downloaded
+    """
+
+    def close(self):
+        super().close()
+        default_storage.delete(self.name)
+
+
+def open_prepared_export(name: str) -> PreparedExportFile:
+    """
+    Opens a prepared export for downloading it
+    """
+    return PreparedExportFile(default_storage.open(name, 'rb'), name)
+
+
+def delete_expired_exports() -> int:
+    """
+    Deletes the prepared exports whose download link expired and returns how
+    many files were deleted
+    """
+    if not default_storage.exists(EXPORT_DIRECTORY):
+        return 0
+
+    limit = now() - datetime.timedelta(seconds=EXPORT_TIMEOUT)
+    counter = 0
+    for token in default_storage.listdir(EXPORT_DIRECTORY)[0]:
+        directory = f'{EXPORT_DIRECTORY}/{token}'
+        for filename in default_storage.listdir(directory)[1]:
+            name = f'{directory}/{filename}'
+            if default_storage.get_modified_time(name) <= limit:
+                default_storage.delete(name)
+                counter += 1
+
+        # Remove the directory of the token as well once all its files are gone
+        if default_storage.listdir(directory) == ([], []):
+            default_storage.delete(directory)
+    return counter
+
+
+def export_response(request, export: CsvExport):
+    """
+    Streams the export, or, when requested with the 'prepare' GET parameter
+    and celery is used, prepares it in the background and redirects to the
+    page where it can be downloaded once it's ready
+    """
+    if request.GET.get('prepare') and settings.WGER_SETTINGS['USE_CELERY']:
+        token = export.prepare()
+        return HttpResponseRedirect(reverse('core:user:export-download', kwargs={'token': token}))
+    return export.response()
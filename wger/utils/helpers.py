@@ -22,13 +22,13 @@ import logging
 import os
 import random
 import string
+import unicodedata
 from functools import wraps
+from typing import Optional
 
 # Django
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
-from django.core.files import File
-from django.core.files.temp import NamedTemporaryFile
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils.encoding import force_bytes
@@ -93,6 +93,30 @@ def disable_for_loaddata(signal_handler):
     return wrapper
 
 
+def normalize_search_term(text: str) -> str:
+    """
+    Normalizes a text for searching: lower case, without accents or punctuation
+    and with single spaces between the words
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(
+        ' ' if unicodedata.category(c)[0] in ('P', 'S') else c for c in decomposed
+        if not unicodedata.combining(c)
+    )
+    return ' '.join(text.casefold().split())
+
+
+def search_term_suffixes(text: str) -> list:
+    """
+    Returns the normalized text, starting at each of its words
+
+    Storing these allows matching any word of a text with a prefix search,
+    e.g. "Biceps curl" can be found with "bic" as well as with "cur".
+    """
+    words = normalize_search_term(text).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
 def next_weekday(date, weekday):
     """
     Helper function to find the next weekday after a given date,
@@ -233,23 +257,24 @@ def random_string(length=32):
 
 class BaseImage:
 
-    def save_image(self, retrieved_image, json_data: dict):
-        # Save the downloaded image
-        # http://stackoverflow.com/questions/1308386/programmatically-saving-image-to
-        if os.name == 'nt':
-            img_temp = NamedTemporaryFile()
-        else:
-            img_temp = NamedTemporaryFile(delete=True)
-        img_temp.write(retrieved_image.content)
-        img_temp.flush()
-
-        self.image.save(
-            os.path.basename(json_data['image']),
-            File(img_temp),
-        )
+    def save_image(self, blob):
+        """
+        Uses a downloaded file of the media store as image, see MediaBlob
+        """
+        self.image = blob.name
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """
+        The SHA-256 of the image, if it is in the media store
+        """
+        # wger
+        from wger.core.models import MediaBlob
+
+        return MediaBlob.get_sha256(self.image.name)
 
     @classmethod
-    def from_json(cls, connect_to, retrieved_image, json_data: dict, generate_uuid: bool = False):
+    def from_json(cls, connect_to, blob, json_data: dict, generate_uuid: bool = False):
         image: cls = cls()
         if not generate_uuid:
             image.uuid = json_data['uuid']
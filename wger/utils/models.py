@@ -12,15 +12,46 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import io
+import logging
+import os
+from typing import (
+    Dict,
+    Optional,
+    Set,
+)
+
 # Django
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import (
+    models,
+    transaction,
+)
 from django.utils.translation import gettext_lazy as _
 
+# Third Party
+from easy_thumbnails import engine
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.files import get_thumbnailer
+from easy_thumbnails.storage import thumbnail_default_storage
+from easy_thumbnails.utils import is_transparent
+from PIL import Image
+
 # wger
-from wger.core.models import License
+from wger.core.models import (
+    License,
+    MediaBlob,
+)
 from wger.utils.constants import CC_BY_SA_4_ID
 
 
+logger = logging.getLogger(__name__)
+
+
 """
 Abstract model classes
 """
@@ -170,3 +201,217 @@ def collect_models_author_history(model_list):
     for model in model_list:
         out = out.union(collect_model_author_history(model))
     return out
+
+
+class AbstractThumbnailModel(models.Model):
+    """
+    Abstract class for models with an image that is shown as thumbnails
+
+    The thumbnails of all the aliases in THUMBNAIL_ALIASES are generated in the
+    background when the image is saved (see schedule_thumbnails). Their URLs
+    and sizes are kept in a manifest, so that they can be returned without
+    opening the image.
+    """
+
+    class Meta:
+        abstract = True
+
+    THUMBNAIL_QUEUE_KEY = 'thumbnails-queued-{0}-{1}'
+    THUMBNAIL_QUEUE_TIMEOUT = 60 * 10
+
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+    """
+    Manifest of the thumbnails: the name of the image they were generated from
+    and the name, URL, width and height of each alias
+    """
+
+    @property
+    def has_current_thumbnails(self) -> bool:
+        """
+        Whether the thumbnails were generated from the current image
+        """
+        return bool(self.image) and self.thumbnails.get('source') == self.image.name
+
+    def get_thumbnail(self, alias: str) -> Optional[Dict]:
+        """
+        Returns the manifest entry of the thumbnail, if it was generated
+        """
+        if not self.has_current_thumbnails:
+            return None
+        return self.thumbnails['aliases'].get(alias)
+
+    def get_thumbnail_url(self, alias: str) -> Optional[str]:
+        thumbnail = self.get_thumbnail(alias)
+        return thumbnail['url'] if thumbnail else None
+
+    @property
+    def thumbnail_srcset(self) -> Dict[str, str]:
+        """
+        The thumbnails in THUMBNAIL_SRCSET_ALIASES as srcset, for the original
+        format of the thumbnails and each of THUMBNAIL_FORMATS
+
+        E.g. {'original': '/media/a.jpg.30x30_q85.jpg 30w, ...', 'webp': ...}
+        """
+        srcset = {}
+        for alias in settings.THUMBNAIL_SRCSET_ALIASES:
+            thumbnail = self.get_thumbnail(alias)
+            if not thumbnail:
+                continue
+            urls = {'original': thumbnail['url']}
+            urls.update({f: entry['url'] for f, entry in thumbnail.get('formats', {}).items()})
+            for image_format, url in urls.items():
+                srcset.setdefault(image_format, []).append(f"{url} {thumbnail['width']}w")
+        return {image_format: ', '.join(urls) for image_format, urls in srcset.items()}
+
+    def generate_thumbnails(self):
+        """
+        Generates the thumbnails of all aliases and saves the manifest
+
+        The thumbnails in the THUMBNAIL_FORMATS are resized from the image
+        itself, not converted from the other thumbnails.
+        """
+        thumbnailer = get_thumbnailer(self.image)
+        formats = get_thumbnail_formats()
+        source = None
+        manifest = {'source': self.image.name, 'aliases': {}}
+        for alias, options in aliases.all().items():
+            thumbnail = thumbnailer.get_thumbnail(options)
+            manifest['aliases'][alias] = {
+                'name': thumbnail.name,
+                'url': thumbnail.url,
+                'width': thumbnail.width,
+                'height': thumbnail.height,
+                'formats': {},
+            }
+            if not formats:
+                continue
+
+            if source is None:
+                source = engine.generate_source_image(thumbnailer, {})
+                if source is None:
+                    raise InvalidImageFormatError(f'Could not read the image {self.image.name}')
+            image = engine.process_image(source, thumbnailer.get_options(options))
+            for image_format, format_options in formats.items():
+                quality = format_options['aliases'].get(alias, format_options['quality'])
+                manifest['aliases'][alias]['formats'][image_format] = save_thumbnail_format(
+                    image,
+                    f'{thumbnail.name}.{image_format}',
+                    quality,
+                )
+
+        # Don't send the save signals, nothing else changed
+        previous = self.thumbnails
+        type(self).objects.filter(pk=self.pk).update(thumbnails=manifest)
+        self.thumbnails = manifest
+        delete_thumbnail_formats(previous, keep=get_thumbnail_format_names(manifest))
+        self.thumbnails_generated()
+
+    def thumbnails_generated(self):
+        """
+        Called after new thumbnails were generated, e.g. to update denormalized URLs
+        """
+        pass
+
+    def queue_thumbnails(self):
+        """
+        Generates the thumbnails in a celery task, if it is not already queued
+        """
+        if not settings.WGER_SETTINGS['USE_CELERY']:
+            return
+
+        # wger
+        from wger.utils.tasks import generate_thumbnails_task
+
+        key = self.THUMBNAIL_QUEUE_KEY.format(self._meta.label_lower, self.pk)
+        if cache.add(key, True, self.THUMBNAIL_QUEUE_TIMEOUT):
+            generate_thumbnails_task.delay(self._meta.label_lower, self.pk)
+
+
+def get_thumbnail_formats() -> Dict[str, Dict]:
+    """
+    Returns the THUMBNAIL_FORMATS that Pillow can write
+    """
+    Image.init()
+    extensions = Image.registered_extensions()
+    return {
+        image_format: options
+        for image_format, options in settings.THUMBNAIL_FORMATS.items()
+        if extensions.get(f'.{image_format}') in Image.SAVE
+    }
+
+
+def save_thumbnail_format(image: Image.Image, name: str, quality: int) -> Dict:
+    """
+    Saves a thumbnail in the format of its extension, replacing any previous file
+    """
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if is_transparent(image) else 'RGB')
+
+    buffer = io.BytesIO()
+    image_format = Image.registered_extensions()[os.path.splitext(name)[1]]
+    image.save(buffer, format=image_format, quality=quality)
+
+    thumbnail_default_storage.delete(name)
+    name = thumbnail_default_storage.save(name, ContentFile(buffer.getvalue()))
+    return {'name': name, 'url': thumbnail_default_storage.url(name)}
+
+
+def get_thumbnail_format_names(manifest: Dict) -> Set[str]:
+    """
+    Returns the file names of the thumbnails in the THUMBNAIL_FORMATS of a manifest
+    """
+    return {
+        entry['name']
+        for thumbnail in manifest.get('aliases', {}).values()
+        for entry in thumbnail.get('formats', {}).values()
+    }
+
+
+def delete_thumbnail_formats(manifest: Dict, keep: Set[str] = frozenset()):
+    """
+    Deletes the thumbnails in the THUMBNAIL_FORMATS of a manifest
+
+    The other thumbnails are handled by easy-thumbnails. The thumbnails of files
+    in the media store can be used by other images, they are deleted with the
+    file (see MediaBlob).
+    """
+    if MediaBlob.is_blob(manifest.get('source')):
+        return
+
+    for name in get_thumbnail_format_names(manifest) - keep:
+        thumbnail_default_storage.delete(name)
+
+
+def generate_thumbnails(instance: AbstractThumbnailModel) -> bool:
+    """
+    Generates the thumbnails of the image, logging images that can't be read
+    """
+    try:
+        instance.generate_thumbnails()
+    except (InvalidImageFormatError, OSError):
+        logger.info(f'Could not create the thumbnails for {instance._meta.label} {instance.pk}')
+        return False
+    return True
+
+
+def schedule_thumbnails(sender, instance: AbstractThumbnailModel, raw=False, **kwargs):
+    """
+    Generates the thumbnails of a saved image once the transaction is committed,
+    in a celery task if available
+
+    Images loaded from fixtures are skipped, their files are usually not there.
+    """
+    if raw or not instance.image or instance.has_current_thumbnails:
+        return
+
+    if settings.WGER_SETTINGS['USE_CELERY']:
+        transaction.on_commit(instance.queue_thumbnails)
+    else:
+        transaction.on_commit(lambda: generate_thumbnails(instance))
+
+
+def delete_image_thumbnail_formats(sender, instance: AbstractThumbnailModel, **kwargs):
+    """
+    Deletes the thumbnails in the THUMBNAIL_FORMATS of a deleted image
+    """
+    delete_thumbnail_formats(instance.thumbnails)
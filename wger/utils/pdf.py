@@ -14,14 +14,16 @@
 
 # Standard Library
 import datetime
+import functools
+import io
 from os.path import join as path_join
 
 # Django
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist
-from django.utils import translation
+from django.core.files.storage import default_storage
 
 # Third Party
+from PIL import Image as PILImage
 from reportlab.lib import colors
 from reportlab.lib.colors import HexColor
 from reportlab.lib.styles import (
@@ -34,13 +36,17 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (
     Image,
     Paragraph,
+    TableStyle,
 )
 
 # wger
 from wger import get_version
-from wger.core.models import Language
+from wger.utils import language as language_utils
 
 
+PDF_IMAGE_SIZE = 300
+"""Maximum width and height in pixels of the exercise images in the PDFs"""
+
 # ************************
 # Language functions
 # ************************
@@ -50,19 +56,7 @@ def load_language():
     """
     Returns the currently used language, e.g. to load appropriate exercises
     """
-    # TODO: perhaps store a language preference in the user's profile?
-
-    # Read the first part of a composite language, e.g. 'de-at'
-    used_language = translation.get_language().split('-')[0]
-
-    try:
-        language = Language.objects.get(short_name=used_language)
-
-    # No luck, load english as our fall-back language
-    except ObjectDoesNotExist:
-        language = Language.objects.get(short_name="en")
-
-    return language
+    return language_utils.load_language()
 
 
 def render_footer(url, date=None):
@@ -85,16 +79,59 @@ def render_footer(url, date=None):
     return p
 
 
-def get_logo(width=1.5):
+@functools.lru_cache(maxsize=None)
+def read_static_file(path: str) -> bytes:
     """
-    Returns the wger logo
+    Reads a file that ships with wger, only once per process
+    """
+    with open(path_join(settings.SITE_ROOT, path), 'rb') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=256)
+def read_image(name: str) -> bytes:
+    """
+    Reads an image from the storage, downsized for the PDFs
+
+    The images are printed only a couple of centimeters wide, so they are
+    resized once per process instead of decoding and embedding the full image
+    in every document.
+    """
+    with default_storage.open(name) as f:
+        image = PILImage.open(f)
+        image.thumbnail((PDF_IMAGE_SIZE, PDF_IMAGE_SIZE))
+        output = io.BytesIO()
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image.save(output, format='PNG')
+        else:
+            image.convert('RGB').save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+def scaled_image(content: bytes, width: float) -> Image:
     """
-    image = Image(path_join(settings.SITE_ROOT, 'core/static/images/logos/logo.png'))
+    Returns an image flowable with the given width in cm
+    """
+    image = Image(io.BytesIO(content))
     image.drawHeight = width * cm * image.drawHeight / image.drawWidth
     image.drawWidth = width * cm
     return image
 
 
+def get_logo(width=1.5):
+    """
+    Returns the wger logo
+    """
+    return scaled_image(read_static_file('core/static/images/logos/logo.png'), width)
+
+
+def get_image(name: str, width: float) -> Image:
+    """
+    Returns an image from the storage, e.g. of an exercise
+    """
+    return scaled_image(read_image(name), width)
+
+
 # register new truetype fonts for reportlab
 pdfmetrics.registerFont(
     TTFont('OpenSans', path_join(settings.SITE_ROOT, 'core/static/fonts/OpenSans-Light.ttf'))
@@ -161,3 +198,28 @@ styleSheet.add(
 
 header_colour = HexColor(0x24416b)
 row_color = HexColor(0xd1def0)
+
+# Styles shared by all the tables of manager.helpers.render_workout_day, only the
+# ones that depend on the sets of the day are added for each table
+workout_day_table_style = TableStyle(
+    [
+        ('FONT', (0, 0), (-1, -1), 'OpenSans'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 2),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 3),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.black),
+
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), header_colour),
+        ('BOX', (0, 0), (-1, -1), 1.25, colors.black),
+        ('BOX', (0, 1), (-1, -1), 1.25, colors.black),
+        ('SPAN', (0, 0), (-1, 0)),
+
+        # Cell with 'date'
+        ('SPAN', (0, 1), (2, 1)),
+        ('ALIGN', (0, 1), (2, 1), 'RIGHT')
+    ]
+)
@@ -0,0 +1,207 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Cached PDF rendering
+
+Building the PDFs with ReportLab is slow, especially for long schedules or when
+the exercise images are included. The documents are therefore rendered once
+and saved to the storage, under a name derived from their options, the language,
+the generations of the cache tags of the objects they show (see TaggedCache)
+and the date printed in the footer. As long as none of these change, the stored
+file is served again.
+With celery, documents that are not stored yet are rendered by a worker and the
+browser is redirected to a page that waits for them.
+"""
+
+# Standard Library
+import datetime
+import io
+import json
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    HttpResponseRedirect,
+)
+from django.urls import reverse
+from django.utils import translation
+from django.utils.crypto import salted_hmac
+from django.utils.timezone import (
+    localdate,
+    now,
+)
+
+# wger
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
+
+
+PDF_TIMEOUT = 60 * 60
+"""Time a PDF rendered in the background can take until it is downloaded"""
+
+PDF_DIRECTORY = 'pdf'
+
+PDF_EXPIRY = 24 * 60 * 60 + PDF_TIMEOUT
+"""Age after which a stored PDF can't be served anymore, since its date changed"""
+
+
+class PdfDocument:
+    """
+    Base class for the cached PDFs
+
+    Subclasses define the cache tags of the objects shown and build the
+    document. The keyword arguments (e.g. the workout and the options) identify
+    the document and are used to recreate it in the celery task, so they must
+    be serializable.
+    """
+
+    filename = 'document.pdf'
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def get_filename(self) -> str:
+        return self.filename
+
+    def get_tags(self) -> List[str]:
+        raise NotImplementedError
+
+    def build(self, buffer):
+        """
+        Writes the PDF to the given file-like object
+        """
+        raise NotImplementedError
+
+    def get_class_path(self) -> str:
+        return f'{self.__class__.__module__}.{self.__class__.__qualname__}'
+
+    def get_key(
+        self,
+        language: str,
+        generations: Dict[str, int] = None,
+        date: Optional[datetime.date] = None,
+    ) -> str:
+        """
+        Returns the key of the document with the given language, tag generations
+        and render date, without the last two it identifies all its versions
+        """
+        value = json.dumps(
+            [
+                self.get_class_path(),
+                self.kwargs,
+                language,
+                sorted((generations or {}).items()),
+                date.isoformat() if date else None,
+            ],
+            sort_keys=True,
+        )
+        return salted_hmac('wger.utils.pdf_render', value, algorithm='sha256').hexdigest()
+
+    def render(self, language: str, key: str) -> str:
+        """
+        Builds the document, saves it to the storage and returns its name
+
+        The previous version of the document is deleted.
+        """
+        name = get_storage_name(key)
+        if default_storage.exists(name):
+            return name
+
+        buffer = io.BytesIO()
+        with translation.override(language):
+            self.build(buffer)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+
+        latest_key = cache_mapper.get_pdf_latest_key(self.get_key(language))
+        previous = cache.get(latest_key)
+        if previous and previous != name:
+            default_storage.delete(previous)
+        cache.set(latest_key, name, None)
+        return name
+
+
+def get_storage_name(key: str) -> str:
+    return f'{PDF_DIRECTORY}/{key}.pdf'
+
+
+def delete_expired_pdfs() -> int:
+    """
+    Deletes the stored PDFs that are older than a day, and are therefore not
+    used anymore, and returns how many files were deleted
+
+    This also removes the PDFs of deleted or changed workouts, schedules and
+    plans that were not requested again.
+    """
+    if not default_storage.exists(PDF_DIRECTORY):
+        return 0
+
+    limit = now() - datetime.timedelta(seconds=PDF_EXPIRY)
+    counter = 0
+    for filename in default_storage.listdir(PDF_DIRECTORY)[1]:
+        name = f'{PDF_DIRECTORY}/{filename}'
+        if default_storage.get_modified_time(name) <= limit:
+            default_storage.delete(name)
+            counter += 1
+    return counter
+
+
+def stored_pdf_response(name: str, filename: str) -> FileResponse:
+    """
+    Sends a stored PDF to the browser, the size is read from the file
+    """
+    response = FileResponse(default_storage.open(name), content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def pdf_response(request, document: PdfDocument):
+    """
+    Returns the stored version of the document
+
+    If there is none, the document is rendered. With celery this happens in
+    the background and the browser is redirected to a page that waits for it.
+    """
+    language = translation.get_language()
+    key = document.get_key(
+        language,
+        tagged_cache.get_generations(document.get_tags()),
+        localdate(),
+    )
+    name = get_storage_name(key)
+
+    if not default_storage.exists(name):
+        if settings.WGER_SETTINGS['USE_CELERY']:
+            # wger
+            from wger.utils.tasks import render_pdf_task
+
+            # Only queue the document once, even if it's requested again
+            if cache.add(cache_mapper.get_pdf_key(key), document.get_filename(), PDF_TIMEOUT):
+                render_pdf_task.delay(document.get_class_path(), document.kwargs, language, key)
+            return HttpResponseRedirect(reverse('core:pdf-download', kwargs={'key': key}))
+
+        name = document.render(language, key)
+    return stored_pdf_response(name, document.get_filename())
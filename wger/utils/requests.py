@@ -12,13 +12,51 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+import datetime
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Iterable,
+    Iterator,
+    Optional,
+)
+
+# Django
+from django.utils.dateparse import parse_datetime
+
 # Third Party
 import requests
+from requests.adapters import HTTPAdapter
 
 # wger
 from wger import get_version
 
 
+logger = logging.getLogger(__name__)
+
+# Default timeout in seconds (connect, read) for requests to remote servers
+REQUEST_TIMEOUT = (10, 60)
+
+# Number of times a failed request is retried
+REQUEST_RETRIES = 3
+
+# Base delay in seconds for the exponential backoff between retries
+REQUEST_BACKOFF = 0.5
+
+# Status codes that are considered temporary and are retried
+REQUEST_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Number of parallel downloads when fetching media files
+DOWNLOAD_WORKERS = 4
+
+_local = threading.local()
+
+
 def wger_user_agent():
     return f'wger/{get_version()} - https://github.com/wger-project'
 
@@ -27,6 +65,108 @@ def wger_headers():
     return {'User-agent': wger_user_agent()}
 
 
+def get_session() -> requests.Session:
+    """
+    Returns the HTTP session of the current thread
+
+    Sessions keep the connections to the remote servers alive between requests.
+    Since they are not guaranteed to be thread safe, every thread gets its own.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _local.session = session
+    return session
+
+
+def fetch(
+    url: str,
+    headers=None,
+    timeout=REQUEST_TIMEOUT,
+    retries=REQUEST_RETRIES,
+    backoff=REQUEST_BACKOFF,
+) -> requests.Response:
+    """
+    Performs a GET request, retrying temporary errors
+
+    Connection errors, timeouts and the status codes in REQUEST_RETRY_STATUS are
+    retried with an exponential backoff with jitter. The response of the last
+    attempt is returned, or its exception raised.
+
+    :param url: The URL to fetch.
+    :param headers: Optional headers to send with the request.
+    :param timeout: Timeout in seconds, see the requests library for details.
+    :param retries: Number of times the request is retried.
+    :param backoff: Base delay in seconds between retries.
+    :return: The response object.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout)
+            if response.status_code not in REQUEST_RETRY_STATUS or attempt >= retries:
+                return response
+            logger.info(f'Got status {response.status_code} for {url}, retrying...')
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= retries:
+                raise
+            logger.info(f'Error fetching {url}, retrying: {e}')
+
+        time.sleep(random.uniform(0, backoff * 2**attempt))
+        attempt += 1
+
+
+def fetch_etag(url: str, headers=None, timeout=REQUEST_TIMEOUT) -> Optional[str]:
+    """
+    Returns the ETag of a URL with a HEAD request, without downloading it
+
+    :param url: The URL to check.
+    :param headers: Optional headers to send with the request.
+    :param timeout: Timeout in seconds, see the requests library for details.
+    :return: The ETag or None if the server didn't send one or the request failed.
+    """
+    try:
+        response = get_session().head(url, headers=headers, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        logger.info(f'Error fetching the ETag of {url}: {e}')
+        return None
+
+    if response.status_code != 200:
+        return None
+    return response.headers.get('ETag')
+
+
+def fetch_many(
+    urls: Iterable[str],
+    headers=None,
+    max_workers=DOWNLOAD_WORKERS,
+) -> Iterator[requests.Response]:
+    """
+    Downloads several URLs in parallel
+
+    The responses are returned in the same order as the URLs. Only a bounded
+    number of requests is in flight at the same time, so that the results don't
+    pile up in memory if the caller processes them slower than they arrive.
+
+    :param urls: The URLs to fetch.
+    :param headers: Optional headers to send with the requests.
+    :param max_workers: Number of parallel downloads.
+    :return: Generator with the responses.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for url in urls:
+            pending.append(executor.submit(fetch, url, headers=headers))
+            if len(pending) >= max_workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
 def get_paginated(url: str, headers=None):
     """
     Fetch all results from a paginated endpoint.
@@ -35,17 +175,9 @@ def get_paginated(url: str, headers=None):
     :param headers: Optional headers to send with the request.
     :return: A list of all results.
     """
-    if headers is None:
-        headers = {}
-
     results = []
-    while True:
-        response = requests.get(url, headers=headers).json()
-        url = response['next']
-        results.extend(response['results'])
-
-        if not url:
-            break
+    for page in get_paginated_generator(url, headers=headers):
+        results.extend(page)
     return results
 
 
@@ -53,6 +185,9 @@ def get_paginated_generator(url: str, headers=None):
     """
     Generator that iterates over a paginated endpoint
 
+    The next page is already requested in the background while the caller
+    processes the current one.
+
     :param url: The URL to fetch from.
     :param headers: Optional headers to send with the request.
     :return: Generator with the contents of the 'result' key
@@ -60,10 +195,34 @@ def get_paginated_generator(url: str, headers=None):
     if headers is None:
         headers = {}
 
-    while True:
-        response = requests.get(url, headers=headers).json()
-        yield response['results']
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        response = fetch(url, headers=headers).json()
+        while True:
+            url = response['next']
+            next_page = executor.submit(fetch, url, headers=headers) if url else None
+
+            yield response['results']
+
+            if not next_page:
+                break
+            response = next_page.result().json()
+
+
+def max_timestamp(
+    current: Optional[datetime.datetime],
+    results: list,
+    key: str,
+) -> Optional[datetime.datetime]:
+    """
+    Returns the newest of the given timestamp and the timestamps in the results
+
+    :param current: The newest timestamp seen so far, or None.
+    :param results: List of entries as returned by the API.
+    :param key: The key in the entries with the timestamp.
+    :return: The newest timestamp or None if there is none.
+    """
+    timestamps = [parse_datetime(r[key]) for r in results if r.get(key)]
+    if current:
+        timestamps.append(current)
 
-        url = response['next']
-        if not url:
-            break
+    return max(timestamps, default=None)
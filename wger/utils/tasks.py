@@ -0,0 +1,130 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import logging
+import random
+
+# Django
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+# Third Party
+from celery.schedules import crontab
+
+# wger
+from wger.celery_configuration import app
+from wger.utils.cache import cache_mapper
+from wger.utils.export import (
+    EXPORT_TIMEOUT,
+    delete_expired_exports,
+)
+from wger.utils.pdf_render import delete_expired_pdfs
+
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def prepare_export_task(
+    export_class: str,
+    user_id: int,
+    kwargs: dict,
+    token: str,
+    language: str,
+):
+    """
+    Writes a CSV export to the storage, so that it can be downloaded later
+    """
+    key = cache_mapper.get_export_key(token)
+    entry = cache.get(key)
+    if not entry:
+        logger.info(f'Export {token} expired before it could be prepared')
+        return
+
+    try:
+        export = import_string(export_class)(User.objects.get(pk=user_id), **kwargs)
+        with translation.override(language):
+            entry['file'] = export.save(token)
+    except Exception:
+        # Don't let the download page wait for a file that will never exist
+        cache.delete(key)
+        raise
+    cache.set(key, entry, EXPORT_TIMEOUT)
+
+
+@app.task
+def delete_expired_exports_task():
+    """
+    Deletes the prepared exports that can't be downloaded anymore
+    """
+    counter = delete_expired_exports()
+    logger.info(f'Deleted {counter} expired exports')
+
+
+@app.task
+def render_pdf_task(document_class: str, kwargs: dict, language: str, key: str):
+    """
+    Renders a PDF and saves it to the storage, see wger.utils.pdf_render
+    """
+    try:
+        import_string(document_class)(**kwargs).render(language, key)
+    except Exception:
+        # Allow the document to be queued again
+        cache.delete(cache_mapper.get_pdf_key(key))
+        raise
+
+
+@app.task
+def delete_expired_pdfs_task():
+    """
+    Deletes the stored PDFs that are not used anymore
+    """
+    counter = delete_expired_pdfs()
+    logger.info(f'Deleted {counter} expired PDFs')
+
+
+@app.task
+def generate_thumbnails_task(model: str, pk: int):
+    """
+    Generates the thumbnails of an image, see AbstractThumbnailModel
+    """
+    # wger
+    from wger.utils.models import generate_thumbnails
+
+    model_class = apps.get_model(model)
+    cache.delete(model_class.THUMBNAIL_QUEUE_KEY.format(model, pk))
+    instance = model_class.objects.filter(pk=pk).first()
+    if instance is None or instance.has_current_thumbnails:
+        return
+    generate_thumbnails(instance)
+
+
+@app.on_after_finalize.connect
+def setup_periodic_tasks(sender, **kwargs):
+    sender.add_periodic_task(
+        crontab(minute=random.randint(0, 59)),
+        delete_expired_exports_task.s(),
+        name='Delete expired exports',
+    )
+    sender.add_periodic_task(
+        crontab(hour=random.randint(0, 23), minute=random.randint(0, 59)),
+        delete_expired_pdfs_task.s(),
+        name='Delete expired PDFs',
+    )
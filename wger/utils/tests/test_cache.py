@@ -0,0 +1,189 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    ExerciseImage,
+    Muscle,
+)
+from wger.manager.models import Workout
+from wger.utils.cache import (
+    TaggedCache,
+    cache_mapper,
+    tagged_cache,
+)
+
+
+class TaggedCacheTestCase(WgerTestCase):
+    """
+    Tests the tag based invalidation of cache entries
+    """
+
+    def test_invalidate(self):
+        """
+        Invalidating a tag only marks the entries with that tag as stale
+        """
+        tagged_cache.set('key-1', 1, ['tag:1', 'tag:2'])
+        tagged_cache.set('key-2', 2, ['tag:2'])
+        tagged_cache.set('key-3', 3, ['tag:3'])
+
+        tagged_cache.invalidate('tag:1')
+        self.assertIsNone(tagged_cache.get('key-1'))
+        self.assertEqual(tagged_cache.get('key-1', allow_stale=True), 1)
+        self.assertEqual(tagged_cache.get('key-2'), 2)
+        self.assertEqual(tagged_cache.get('key-3'), 3)
+
+        tagged_cache.invalidate('tag:2', 'tag:3')
+        self.assertIsNone(tagged_cache.get('key-2'))
+        self.assertIsNone(tagged_cache.get('key-3'))
+
+    def test_evicted_tag(self):
+        """
+        Entries are stale if the generation of one of their tags was evicted
+        """
+        tagged_cache.set('key-1', 1, ['tag:1'])
+        cache.delete(TaggedCache.TAG_KEY.format('tag:1'))
+
+        self.assertIsNone(tagged_cache.get('key-1'))
+
+    def test_get_or_set(self):
+        """
+        The value is only computed if it is missing or stale
+        """
+        calls = []
+
+        def compute():
+            calls.append(True)
+            return len(calls)
+
+        self.assertEqual(tagged_cache.get_or_set('key-1', compute, ['tag:1']), 1)
+        self.assertEqual(tagged_cache.get_or_set('key-1', compute, ['tag:1']), 1)
+
+        tagged_cache.invalidate('tag:1')
+        self.assertEqual(tagged_cache.get_or_set('key-1', compute, ['tag:1']), 2)
+        self.assertEqual(len(calls), 2)
+
+    def test_get_or_set_value_tags(self):
+        """
+        Tags can depend on the computed value
+        """
+        tagged_cache.get_or_set(
+            'key-1',
+            lambda: [1, 2],
+            tags=['list'],
+            value_tags=lambda value: [f'item:{i}' for i in value],
+        )
+
+        tagged_cache.invalidate('item:2')
+        self.assertIsNone(tagged_cache.get('key-1'))
+
+    def test_stale_while_revalidate(self):
+        """
+        While a stale value is being computed, other readers get the stale one
+        """
+        tagged_cache.set('key-1', 'old', ['tag:1'])
+        tagged_cache.invalidate('tag:1')
+
+        def compute():
+            self.assertEqual(tagged_cache.get_or_set('key-1', lambda: 'other', ['tag:1']), 'old')
+            return 'new'
+
+        self.assertEqual(tagged_cache.get_or_set('key-1', compute, ['tag:1']), 'new')
+        self.assertEqual(tagged_cache.get('key-1'), 'new')
+
+    def test_invalidate_while_computing(self):
+        """
+        Values are stale if their tags are invalidated while computing them
+        """
+
+        def compute():
+            tagged_cache.invalidate('tag:1')
+            return 'value'
+
+        self.assertEqual(tagged_cache.get_or_set('key-1', compute, ['tag:1']), 'value')
+        self.assertIsNone(tagged_cache.get('key-1'))
+
+
+class DependentEntriesTestCase(WgerTestCase):
+    """
+    Tests that editing an object refreshes all the entries built from it
+    """
+
+    workout_key = cache_mapper.get_workout_canonical(1)
+    exercise_key = cache_mapper.get_exercise_api_key('acad3949-36fb-4481-9a72-be2ddae2bc05')
+
+    def test_edit_muscle(self):
+        """
+        Editing a muscle resets the workouts and exercises that show it
+        """
+        Workout.objects.get(pk=1).canonical_representation
+        self.client.get('/api/v2/exercisebaseinfo/1/')
+        self.assertTrue(tagged_cache.get(self.workout_key))
+        self.assertTrue(tagged_cache.get(self.exercise_key))
+
+        muscle = Muscle.objects.get(pk=1)
+        muscle.name_en = 'Biceps'
+        muscle.save()
+
+        self.assertFalse(tagged_cache.get(self.workout_key))
+        self.assertFalse(tagged_cache.get(self.exercise_key))
+        self.assertEqual(
+            Workout.objects.get(pk=1).canonical_representation.muscles.front[0].name_en,
+            'Biceps',
+        )
+
+    def test_edit_other_muscle(self):
+        """
+        Editing a muscle that is not used doesn't reset the workout
+        """
+        Workout.objects.get(pk=1).canonical_representation
+
+        muscle = Muscle.objects.get(pk=3)
+        muscle.name_en = 'Biceps'
+        muscle.save()
+
+        self.assertTrue(tagged_cache.get(self.workout_key))
+
+    def test_delete_image(self):
+        """
+        Deleting an image resets the workouts and exercises that show it
+        """
+        Workout.objects.get(pk=1).canonical_representation
+        self.client.get('/api/v2/exercisebaseinfo/1/')
+
+        ExerciseImage.objects.get(pk=1).delete()
+
+        self.assertFalse(tagged_cache.get(self.workout_key))
+        self.assertFalse(tagged_cache.get(self.exercise_key))
+
+    def test_clear_cache_command(self):
+        """
+        The clear-cache command invalidates the given tags
+        """
+        Workout.objects.get(pk=1).canonical_representation
+        self.client.get('/api/v2/exercisebaseinfo/1/')
+
+        call_command('clear-cache', tag=[cache_mapper.get_exercise_base_tag(2)])
+        self.assertFalse(tagged_cache.get(self.workout_key))
+        self.assertTrue(tagged_cache.get(self.exercise_key))
+
+        call_command('clear-cache', tag=['exercise-base:1'])
+        self.assertFalse(tagged_cache.get(self.exercise_key))
@@ -0,0 +1,178 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import translation
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.utils.cache import cache_mapper
+from wger.utils.export import EXPORT_TIMEOUT
+from wger.utils.tasks import prepare_export_task
+
+
+class PrepareExportTestCase(WgerTestCase):
+    """
+    Test preparing an export in the background and downloading it later
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        wger_settings = dict(settings.WGER_SETTINGS, USE_CELERY=True)
+        self.settings = override_settings(MEDIA_ROOT=self.media_root, WGER_SETTINGS=wger_settings)
+        self.settings.enable()
+        self.user_login('test')
+
+    def tearDown(self):
+        self.settings.disable()
+        super().tearDown()
+
+    def prepare(self):
+        with mock.patch.object(prepare_export_task, 'delay') as delay:
+            response = self.client.get(reverse('weight:export-csv') + '?prepare=1')
+        self.assertEqual(response.status_code, 302)
+        token = response['Location'].rsplit('/', 1)[-1]
+        return token, delay
+
+    def test_without_celery(self):
+        """
+        Test that the export is streamed directly if celery is not used
+        """
+        with override_settings(WGER_SETTINGS=dict(settings.WGER_SETTINGS, USE_CELERY=False)):
+            response = self.client.get(reverse('weight:export-csv') + '?prepare=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+    def test_prepare_and_download(self):
+        """
+        Test the whole flow, from queueing the export to downloading the file
+        """
+        token, delay = self.prepare()
+        self.assertEqual(delay.call_count, 1)
+        url = reverse('core:user:export-download', kwargs={'token': token})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Refresh'], '5')
+
+        prepare_export_task(*delay.call_args.args)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="Weightdata.csv"',
+        )
+        streamed = self.client.get(reverse('weight:export-csv')).streaming_content
+        self.assertEqual(b''.join(response.streaming_content), b''.join(streamed))
+
+    def test_download_deletes_file(self):
+        """
+        Test that the prepared file is deleted once it was downloaded
+        """
+        token, delay = self.prepare()
+        prepare_export_task(*delay.call_args.args)
+        directory = os.path.join(self.media_root, 'exports', token)
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+        url = reverse('core:user:export-download', kwargs={'token': token})
+        response = self.client.get(url)
+        b''.join(response.streaming_content)
+        response.close()
+        self.assertEqual(os.listdir(directory), [])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_prepare_failure(self):
+        """
+        Test that a failing export doesn't leave the download page waiting
+        """
+        token, delay = self.prepare()
+        with mock.patch('wger.weight.exports.WeightExport.save', side_effect=ValueError):
+            self.assertRaises(ValueError, prepare_export_task, *delay.call_args.args)
+
+        self.assertIsNone(cache.get(cache_mapper.get_export_key(token)))
+        response = self.client.get(reverse('core:user:export-download', kwargs={'token': token}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_prepare_language(self):
+        """
+        Test that the export is prepared in the language of the request
+        """
+        with translation.override('de'):
+            url = reverse('weight:export-csv')
+        with mock.patch.object(prepare_export_task, 'delay') as delay:
+            self.client.get(url + '?prepare=1')
+        self.assertEqual(delay.call_args.args[-1], 'de')
+        token = delay.call_args.args[3]
+
+        prepare_export_task(*delay.call_args.args)
+        response = self.client.get(reverse('core:user:export-download', kwargs={'token': token}))
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'Datum,Gewicht'))
+        response.close()
+
+    def test_delete_expired_exports(self):
+        """
+        Test that prepared exports are deleted once their link expired
+        """
+        token, delay = self.prepare()
+        prepare_export_task(*delay.call_args.args)
+        directory = os.path.join(self.media_root, 'exports', token)
+
+        call_command('delete-expired-exports', stdout=StringIO())
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+        path = os.path.join(directory, os.listdir(directory)[0])
+        expired = datetime.datetime.now() - datetime.timedelta(seconds=EXPORT_TIMEOUT + 60)
+        os.utime(path, (expired.timestamp(), expired.timestamp()))
+        call_command('delete-expired-exports', stdout=StringIO())
+        self.assertFalse(os.path.exists(directory))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'exports')))
+
+    def test_download_other_user(self):
+        """
+        Test that users can't download the exports of others
+        """
+        token, delay = self.prepare()
+        prepare_export_task(*delay.call_args.args)
+
+        self.user_login('admin')
+        response = self.client.get(reverse('core:user:export-download', kwargs={'token': token}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_expired(self):
+        """
+        Test downloading an expired export
+        """
+        token, delay = self.prepare()
+        cache.delete(cache_mapper.get_export_key(token))
+        prepare_export_task(*delay.call_args.args)
+
+        response = self.client.get(reverse('core:user:export-download', kwargs={'token': token}))
+        self.assertEqual(response.status_code, 404)
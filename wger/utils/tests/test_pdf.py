@@ -0,0 +1,76 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import io
+
+# Django
+from django.test import override_settings
+
+# Third Party
+from PIL import Image
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.utils.pdf import (
+    PDF_IMAGE_SIZE,
+    get_image,
+    get_logo,
+    read_image,
+)
+
+
+class PdfImageTestCase(WgerTestCase):
+    """
+    Test the images used in the PDFs
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.init_media_root()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+        read_image.cache_clear()
+
+    def tearDown(self):
+        read_image.cache_clear()
+        self.settings.disable()
+        super().tearDown()
+
+    def test_read_image(self):
+        """
+        Test that the images are downsized and only read once
+        """
+        content = read_image('exercise-images/1/protestschwein.jpg')
+        image = Image.open(io.BytesIO(content))
+        self.assertEqual(image.format, 'JPEG')
+        self.assertEqual(max(image.size), PDF_IMAGE_SIZE)
+
+        self.assertIs(read_image('exercise-images/1/protestschwein.jpg'), content)
+        self.assertEqual(read_image.cache_info().hits, 1)
+
+    def test_get_image(self):
+        """
+        Test that the images keep their aspect ratio
+        """
+        image = get_image('exercise-images/1/protestschwein.jpg', 2)
+        self.assertAlmostEqual(image.drawWidth / image.drawHeight, 500 / 332, places=2)
+
+    def test_get_logo(self):
+        """
+        Test that a new logo is returned every time
+        """
+        self.assertIsNot(get_logo(), get_logo())
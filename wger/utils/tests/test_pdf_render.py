@@ -0,0 +1,218 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import datetime
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+# Django
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import translation
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.manager.models import (
+    Schedule,
+    Workout,
+)
+from wger.manager.pdf import (
+    SchedulePdf,
+    WorkoutPdf,
+)
+from wger.nutrition.models import (
+    Ingredient,
+    MealItem,
+    WeightUnit,
+)
+from wger.nutrition.pdf import NutritionPlanPdf
+from wger.utils.pdf_render import PDF_EXPIRY
+from wger.utils.tasks import render_pdf_task
+
+
+class PdfRenderTestCase(WgerTestCase):
+    """
+    Test that the PDFs are only rendered again when their content changes
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+        self.user_login('test')
+
+    def tearDown(self):
+        self.settings.disable()
+        super().tearDown()
+
+    def stored_files(self):
+        return os.listdir(os.path.join(self.media_root, 'pdf'))
+
+    def get_pdf(self, url, document_class=WorkoutPdf, builds=1):
+        with mock.patch.object(
+            document_class,
+            'build',
+            autospec=True,
+            side_effect=document_class.build,
+        ) as build:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build.call_count, builds)
+        return response
+
+    def test_repeat_download(self):
+        """
+        Test that repeat downloads are served from the stored file
+        """
+        url = reverse('manager:workout:pdf-log', kwargs={'id': 3})
+        response = self.get_pdf(url)
+        content = b''.join(response.streaming_content)
+        self.assertEqual(int(response['Content-Length']), len(content))
+
+        response = self.get_pdf(url, builds=0)
+        self.assertEqual(b''.join(response.streaming_content), content)
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_options(self):
+        """
+        Test that the options and the language are part of the key
+        """
+        self.get_pdf(reverse('manager:workout:pdf-log', kwargs={'id': 3}))
+        self.get_pdf(reverse('manager:workout:pdf-table', kwargs={'id': 3}))
+        self.get_pdf(
+            reverse('manager:workout:pdf-log', kwargs={
+                'id': 3,
+                'images': 1,
+                'comments': 0
+            })
+        )
+        with translation.override('de'):
+            self.get_pdf(reverse('manager:workout:pdf-log', kwargs={'id': 3}))
+        self.assertEqual(len(self.stored_files()), 4)
+
+    def test_changed_workout(self):
+        """
+        Test that changing the workout renders it again and deletes the old file
+        """
+        url = reverse('manager:workout:pdf-log', kwargs={'id': 3})
+        self.get_pdf(url)
+
+        workout = Workout.objects.get(pk=3)
+        workout.name = 'A new name'
+        workout.save()
+        self.get_pdf(url)
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_changed_schedule(self):
+        """
+        Test that changing the schedule renders it again
+        """
+        url = reverse('manager:schedule:pdf-log', kwargs={'pk': 1})
+        self.get_pdf(url, SchedulePdf)
+        self.get_pdf(url, SchedulePdf, builds=0)
+
+        schedule = Schedule.objects.get(pk=1)
+        schedule.schedulestep_set.first().delete()
+        self.get_pdf(url, SchedulePdf)
+
+    def test_changed_date(self):
+        """
+        Test that the PDF is rendered again on the next day, for the footer
+        """
+        url = reverse('manager:workout:pdf-log', kwargs={'id': 3})
+        self.get_pdf(url)
+
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        with mock.patch('wger.utils.pdf_render.localdate', return_value=tomorrow):
+            self.get_pdf(url)
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_delete_expired_pdfs(self):
+        """
+        Test that the stored PDFs are deleted once they can't be used anymore
+        """
+        self.get_pdf(reverse('manager:workout:pdf-log', kwargs={'id': 3}))
+        call_command('delete-expired-pdfs', stdout=StringIO())
+        self.assertEqual(len(self.stored_files()), 1)
+
+        path = os.path.join(self.media_root, 'pdf', self.stored_files()[0])
+        expired = datetime.datetime.now() - datetime.timedelta(seconds=PDF_EXPIRY + 60)
+        os.utime(path, (expired.timestamp(), expired.timestamp()))
+        call_command('delete-expired-pdfs', stdout=StringIO())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_changed_ingredient(self):
+        """
+        Test that renaming an ingredient or weight unit of a plan renders it again
+        """
+        item = MealItem.objects.get(pk=16)
+        item.weight_unit_id = 1
+        item.save()
+
+        url = reverse('nutrition:plan:export-pdf', kwargs={'id': 4})
+        self.get_pdf(url, NutritionPlanPdf)
+        self.get_pdf(url, NutritionPlanPdf, builds=0)
+
+        ingredient = Ingredient.objects.get(pk=3)
+        ingredient.name = 'A new name'
+        ingredient.save()
+        self.get_pdf(url, NutritionPlanPdf)
+
+        unit = WeightUnit.objects.get(pk=4)
+        unit.name = 'A new unit'
+        unit.save()
+        self.get_pdf(url, NutritionPlanPdf)
+
+    def test_celery(self):
+        """
+        Test rendering the PDF in the background
+        """
+        url = reverse('manager:workout:pdf-log', kwargs={'id': 3})
+        wger_settings = dict(settings.WGER_SETTINGS, USE_CELERY=True)
+        with override_settings(WGER_SETTINGS=wger_settings):
+            with mock.patch.object(render_pdf_task, 'delay') as delay:
+                response = self.client.get(url)
+                self.client.get(url)
+            self.assertEqual(delay.call_count, 1)
+            self.assertEqual(response.status_code, 302)
+            download_url = response['Location']
+
+            response = self.client.get(download_url)
+            self.assertEqual(response.status_code, 202)
+
+            render_pdf_task(*delay.call_args.args)
+            response = self.client.get(download_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/pdf')
+            self.assertEqual(
+                response['Content-Disposition'], 'attachment; filename=Workout-3-log.pdf'
+            )
+
+            # Once rendered, the file is returned directly
+            response = self.get_pdf(url, builds=0)
+
+    def test_download_unknown_key(self):
+        """
+        Test waiting for a PDF that was not requested
+        """
+        response = self.client.get(reverse('core:pdf-download', kwargs={'key': 'abc123'}))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,166 @@
+# This file is part of wger Workout Manager.
+#
+# wger Workout Manager is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# wger Workout Manager is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+# Standard Library
+import json
+import threading
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from unittest.mock import patch
+
+# Django
+from django.test import SimpleTestCase
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import ExerciseCategory
+from wger.exercises.sync import sync_categories
+from wger.utils.requests import (
+    fetch,
+    fetch_etag,
+    fetch_many,
+    get_paginated,
+    get_paginated_generator,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal wger API stub
+
+    - /api/v2/exercisecategory/?page=N returns three pages of categories
+    - /flaky/ returns a 503 on every second request
+    - /file/<name> returns the name as content, and as ETag for HEAD requests
+    """
+
+    flaky_requests = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send(self, status, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server_url = f'http://{self.server.server_address[0]}:{self.server.server_address[1]}'
+
+        if self.path.startswith('/api/v2/exercisecategory/'):
+            page = int(self.path.partition('page=')[2] or 1)
+            data = {
+                'count': 3,
+                'next':
+                f'{server_url}/api/v2/exercisecategory/?page={page + 1}' if page < 3 else None,
+                'previous': None,
+                'results': [{
+                    'id': page + 100,
+                    'name': f'Category from page {page}'
+                }],
+            }
+            self.send(200, json.dumps(data).encode())
+
+        elif self.path == '/flaky/':
+            StubHandler.flaky_requests += 1
+            if StubHandler.flaky_requests % 2:
+                self.send(503, b'')
+            else:
+                self.send(200, b'ok')
+
+        elif self.path.startswith('/file/'):
+            self.send(200, self.path.removeprefix('/file/').encode())
+
+        else:
+            self.send(404, b'')
+
+    def do_HEAD(self):
+        if self.path.startswith('/file/'):
+            name = self.path.removeprefix('/file/')
+            self.send_response(200)
+            self.send_header('ETag', f'"{name}"')
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+
+class StubServerMixin:
+    """
+    Starts the stub server in a background thread
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+
+class HttpClientTestCase(StubServerMixin, SimpleTestCase):
+    """
+    Test the HTTP client helpers against a local stub server
+    """
+
+    def test_get_paginated(self):
+        results = get_paginated(f'{self.server_url}/api/v2/exercisecategory/')
+        self.assertEqual([r['id'] for r in results], [101, 102, 103])
+
+    def test_get_paginated_generator(self):
+        pages = list(get_paginated_generator(f'{self.server_url}/api/v2/exercisecategory/'))
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[2][0]['name'], 'Category from page 3')
+
+    @patch('time.sleep')
+    def test_fetch_retry(self, mock_sleep):
+        StubHandler.flaky_requests = 0
+        response = fetch(f'{self.server_url}/flaky/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StubHandler.flaky_requests, 2)
+        mock_sleep.assert_called_once()
+
+    @patch('time.sleep')
+    def test_fetch_retry_exhausted(self, mock_sleep):
+        StubHandler.flaky_requests = 0
+        response = fetch(f'{self.server_url}/flaky/', retries=0)
+        self.assertEqual(response.status_code, 503)
+        mock_sleep.assert_not_called()
+
+    def test_fetch_many(self):
+        urls = [f'{self.server_url}/file/{i}' for i in range(20)]
+        responses = list(fetch_many(urls, max_workers=3))
+        self.assertEqual([r.content for r in responses], [str(i).encode() for i in range(20)])
+
+    def test_fetch_etag(self):
+        self.assertEqual(fetch_etag(f'{self.server_url}/file/abc'), '"abc"')
+        self.assertIsNone(fetch_etag(f'{self.server_url}/missing/'))
+
+
+class SyncStubServerTestCase(StubServerMixin, WgerTestCase):
+    """
+    Test a synchronization against a local stub server
+    """
+
+    def test_sync_categories(self):
+        sync_categories(lambda x: x, remote_url=self.server_url)
+        self.assertEqual(ExerciseCategory.objects.get(pk=103).name, 'Category from page 3')
@@ -0,0 +1,231 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Standard Library
+import io
+import os
+from unittest import mock
+
+# Django
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+# Third Party
+from easy_thumbnails.alias import aliases
+from PIL import Image as PilImage
+
+# wger
+from wger.core.tests.base_testcase import WgerTestCase
+from wger.exercises.models import (
+    ExerciseImage,
+    ExerciseSearchTerm,
+)
+from wger.utils.models import (
+    generate_thumbnails,
+    get_thumbnail_format_names,
+    get_thumbnail_formats,
+)
+from wger.utils.tasks import generate_thumbnails_task
+
+
+class ThumbnailTestCase(WgerTestCase):
+    """
+    Test the pregenerated thumbnails and their manifest
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.init_media_root()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        super().tearDown()
+
+    def save_image(self, pk=1):
+        image = ExerciseImage.objects.get(pk=pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+        return ExerciseImage.objects.get(pk=pk)
+
+    def test_generate_on_save(self):
+        """
+        Test that saving an image generates the thumbnails of all aliases
+        """
+        image = ExerciseImage.objects.get(pk=1)
+        self.assertFalse(image.has_current_thumbnails)
+        self.assertIsNone(image.get_thumbnail_url('small'))
+
+        image = self.save_image()
+        self.assertTrue(image.has_current_thumbnails)
+        self.assertEqual(image.thumbnails['source'], 'exercise-images/1/protestschwein.jpg')
+        self.assertEqual(set(image.thumbnails['aliases']), set(aliases.all()))
+
+        small = image.get_thumbnail('small')
+        self.assertEqual(max(small['width'], small['height']), 200)
+        self.assertTrue(small['url'].startswith('/media/exercise-images/1/protestschwein.jpg.'))
+
+        # The search index shows the new thumbnail
+        entry = ExerciseSearchTerm.objects.filter(exercise_base_id=1).first()
+        self.assertEqual(entry.image_thumbnail, image.get_thumbnail_url('micro_cropped'))
+
+    def test_formats(self):
+        """
+        Test that the thumbnails are also saved in the formats Pillow can write
+        """
+        image = self.save_image()
+        formats = get_thumbnail_formats()
+        self.assertIn('webp', formats)
+
+        large = image.get_thumbnail('large')
+        self.assertEqual(set(large['formats']), set(formats))
+        webp = large['formats']['webp']
+        self.assertEqual(webp['name'], f"{large['name']}.webp")
+        with PilImage.open(os.path.join(self.media_root, webp['name'])) as thumbnail:
+            self.assertEqual(thumbnail.format, 'WEBP')
+            self.assertEqual(thumbnail.size, (large['width'], large['height']))
+
+    def test_formats_unsupported(self):
+        """
+        Test that formats Pillow can't write are skipped
+        """
+        with override_settings(THUMBNAIL_FORMATS={'xyz': {'quality': 50, 'aliases': {}}}):
+            image = self.save_image()
+        self.assertTrue(image.has_current_thumbnails)
+        self.assertEqual(image.get_thumbnail('small')['formats'], {})
+
+    def test_formats_quality(self):
+        """
+        Test that the quality of the formats can be set per alias
+        """
+        image = ExerciseImage.objects.get(pk=1)
+
+        def size(alias):
+            name = image.get_thumbnail(alias)['formats']['webp']['name']
+            return os.path.getsize(os.path.join(self.media_root, name))
+
+        with override_settings(THUMBNAIL_FORMATS={'webp': {'quality': 10, 'aliases': {}}}):
+            image.generate_thumbnails()
+        sizes = {'small': size('small'), 'medium': size('medium')}
+
+        thumbnail_formats = {'webp': {'quality': 10, 'aliases': {'small': 95}}}
+        with override_settings(THUMBNAIL_FORMATS=thumbnail_formats):
+            image.generate_thumbnails()
+        self.assertGreater(size('small'), sizes['small'])
+        self.assertEqual(size('medium'), sizes['medium'])
+
+    def test_formats_deleted(self):
+        """
+        Test that the thumbnails in other formats are deleted with the image
+        """
+        image = self.save_image()
+        names = get_thumbnail_format_names(image.thumbnails)
+        self.assertTrue(names)
+
+        image.delete()
+        for name in names:
+            self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_srcset(self):
+        """
+        Test the srcset of the image in all formats
+        """
+        image = ExerciseImage.objects.get(pk=1)
+        self.assertEqual(image.thumbnail_srcset, {})
+
+        image = self.save_image()
+        srcset = image.thumbnail_srcset
+        self.assertEqual(set(srcset), {'original', 'webp'})
+        entries = srcset['webp'].split(', ')
+        self.assertEqual(len(entries), len(settings.THUMBNAIL_SRCSET_ALIASES))
+
+        small = image.get_thumbnail('small')
+        self.assertIn(f"{small['formats']['webp']['url']} {small['width']}w", entries)
+        self.assertIn(f"{small['url']} {small['width']}w", srcset['original'])
+
+        response = self.client.get(reverse('exerciseimage-detail', kwargs={'pk': 1}))
+        self.assertEqual(response.data['srcset'], srcset)
+
+    def test_stale_manifest(self):
+        """
+        Test that the manifest is not used once the image changes
+        """
+        image = self.save_image()
+        image.image.name = 'exercise-images/1/wildschwein.jpg'
+        self.assertFalse(image.has_current_thumbnails)
+        self.assertIsNone(image.get_thumbnail_url('small'))
+
+    def test_missing_file(self):
+        """
+        Test that images that can't be read have no thumbnails
+        """
+        image = ExerciseImage.objects.get(pk=1)
+        image.image.name = 'exercise-images/1/does-not-exist.jpg'
+        self.assertFalse(generate_thumbnails(image))
+        self.assertEqual(ExerciseImage.objects.get(pk=1).thumbnails, {})
+
+    def test_skip_current(self):
+        """
+        Test that saving an image with current thumbnails doesn't generate them again
+        """
+        self.save_image()
+        with mock.patch.object(ExerciseImage, 'generate_thumbnails') as generate:
+            self.save_image()
+        generate.assert_not_called()
+
+    def test_queue_celery(self):
+        """
+        Test that the thumbnails are generated in a task if celery is used
+        """
+        wger_settings = dict(settings.WGER_SETTINGS, USE_CELERY=True)
+        with override_settings(WGER_SETTINGS=wger_settings), \
+                mock.patch.object(generate_thumbnails_task, 'delay') as delay:
+            self.save_image()
+            self.save_image()
+        delay.assert_called_once_with('exercises.exerciseimage', 1)
+
+        generate_thumbnails_task('exercises.exerciseimage', 1)
+        self.assertTrue(ExerciseImage.objects.get(pk=1).has_current_thumbnails)
+
+    def test_api_fallback(self):
+        """
+        Test that the API returns the original image until the thumbnails are there
+        """
+        url = reverse('exerciseimage-thumbnails', kwargs={'pk': 1})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['small']['url'], response.data['original'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        image = self.save_image()
+        response = self.client.get(url)
+        self.assertEqual(response.data['small']['url'], image.get_thumbnail_url('small'))
+
+    def test_command(self):
+        """
+        Test the command generating the missing thumbnails
+        """
+        out = io.StringIO()
+        call_command('generate-thumbnails', processes=1, stdout=out)
+        self.assertTrue(ExerciseImage.objects.get(pk=1).has_current_thumbnails)
+        self.assertTrue(ExerciseImage.objects.get(pk=2).has_current_thumbnails)
+
+        with mock.patch.object(ExerciseImage, 'generate_thumbnails') as generate:
+            call_command('generate-thumbnails', processes=1, stdout=out)
+        generate.assert_not_called()
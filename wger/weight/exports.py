@@ -0,0 +1,39 @@
+#  This file is part of wger Workout Manager <https://github.com/wger-project>.
+#  Copyright (C) 2013 - 2021 wger Team
+#
+#  wger Workout Manager is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  wger Workout Manager is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Django
+from django.utils.translation import gettext as _
+
+# wger
+from wger.utils.export import CsvExport
+from wger.weight.models import WeightEntry
+
+
+class WeightExport(CsvExport):
+    """
+    Exports the weight entries of a user
+    """
+
+    filename = 'Weightdata.csv'
+
+    def get_header(self):
+        return [_('Date'), _('Weight')]
+
+    def get_queryset(self):
+        return WeightEntry.objects.filter(user=self.user).values_list('date', 'weight')
+
+    def get_row(self, entry):
+        return entry
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import calendar
 import csv
 import datetime
 import decimal
@@ -22,16 +23,34 @@ import io
 import json
 import logging
 from collections import OrderedDict
+from dataclasses import (
+    dataclass,
+    field,
+)
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
 
 # Django
-from django.core.cache import cache
+from django.urls import reverse
+from django.utils.translation import (
+    get_language,
+    gettext as _,
+)
 
 # wger
+from wger.exercises.models import Exercise
 from wger.manager.models import (
     WorkoutLog,
     WorkoutSession,
 )
-from wger.utils.cache import cache_mapper
+from wger.utils.cache import (
+    cache_mapper,
+    tagged_cache,
+)
+from wger.utils.constants import ENGLISH_SHORT_NAME
 from wger.utils.helpers import DecimalJsonEncoder
 from wger.weight.models import WeightEntry
 
@@ -87,69 +106,201 @@ def parse_weight_csv(request, cleaned_data):
     return (weight_list, error_list)
 
 
-def group_log_entries(user, year, month, day=None):
+@dataclass
+class LogCalendarSet:
+    id: int
+    reps: int
+    repetition_unit_name: str
+    is_repetition: bool
+    weight: Optional[decimal.Decimal]
+    weight_unit_name: str
+
+
+@dataclass
+class LogCalendarExercise:
+    id: int
+    translations: Dict[str, str]
+    """The exercise's name, by language short name"""
+
+    sets: List[LogCalendarSet] = field(default_factory=list)
+
+    @property
+    def name(self):
+        translations = self.translations
+        language = get_language()
+        if language not in translations:
+            language = ENGLISH_SHORT_NAME if ENGLISH_SHORT_NAME in translations \
+                else next(iter(translations), None)
+        return translations.get(language, '')
+
+    def get_absolute_url(self):
+        return reverse('exercise:exercise:view-base', kwargs={'pk': self.id})
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass
+class LogCalendarWorkout:
+    id: int
+    name: str
+    creation_date: datetime.date
+    is_template: bool
+
+    def get_absolute_url(self):
+        return reverse(
+            'manager:template:view' if self.is_template else 'manager:workout:view',
+            kwargs={'pk': self.id}
+        )
+
+    def __str__(self):
+        return self.name or "{0} ({1})".format(_('Workout'), self.creation_date)
+
+
+@dataclass
+class LogCalendarSession:
+    id: int
+    impression: str
+    time_start: Optional[datetime.time]
+    time_end: Optional[datetime.time]
+    notes: str
+
+    def get_impression_display(self):
+        return dict(WorkoutSession.IMPRESSION).get(self.impression, self.impression)
+
+
+@dataclass
+class LogCalendarDay:
+    """
+    Summary of the logs and session of a user on one day
+    """
+
+    date: datetime.date
+    workout: LogCalendarWorkout
+    session: Optional[LogCalendarSession] = None
+    exercises: List[LogCalendarExercise] = field(default_factory=list)
+
+    @property
+    def set_count(self):
+        return sum(len(exercise.sets) for exercise in self.exercises)
+
+
+def group_log_entries(user, year, month, day=None) -> Dict[datetime.date, LogCalendarDay]:
     """
     Processes and regroups a list of log entries so they can be more easily
     used in the different calendar pages
 
+    The result only contains plain data and is cached per month or day, the
+    entries are reset when the logs, sessions, workouts or exercises change.
+
     :param user: the user to filter the logs for
     :param year: year
     :param month: month
     :param day: optional, day
 
-    :return: a dictionary with grouped logs by date and exercise
+    :return: a dictionary with the summary of each day, sorted by date
     """
     if day:
-        log_hash = hash((user.pk, year, month, day))
+        days = [day]
+        tags = [cache_mapper.get_workout_log_tag(user, year, month, day)]
     else:
-        log_hash = hash((user.pk, year, month))
+        days = range(1, calendar.monthrange(year, month)[1] + 1)
+        tags = [cache_mapper.get_workout_log_tag(user, year, month, d) for d in days]
+    tags += [
+        cache_mapper.get_workout_log_tag(user),
+        cache_mapper.get_workout_log_tag(user, year, month),
+    ]
+
+    def get_value_tags(out):
+        workout_ids = {entry.workout.id for entry in out.values()}
+        base_ids = {exercise.id for entry in out.values() for exercise in entry.exercises}
+        return [
+            *map(cache_mapper.get_workout_tag, workout_ids),
+            *map(cache_mapper.get_exercise_base_tag, base_ids),
+        ]
+
+    return tagged_cache.get_or_set(
+        cache_mapper.get_workout_log_list(user, year, month, day),
+        lambda: build_log_calendar(user, [datetime.date(year, month, d) for d in days]),
+        tags=tags,
+        value_tags=get_value_tags,
+    )
+
+
+def build_log_calendar(user, dates: List[datetime.date]) -> Dict[datetime.date, LogCalendarDay]:
+    """
+    Builds the summaries for group_log_entries, with a fixed number of queries
+    """
+    date_filter = {'date__gte': dates[0], 'date__lte': dates[-1]}
 
     # There can be workout sessions without any associated log entries, so it is
     # not enough so simply iterate through the logs
-    if day:
-        filter_date = datetime.date(year, month, day)
-        logs = WorkoutLog.objects.filter(user=user, date=filter_date)
-        sessions = WorkoutSession.objects.filter(user=user, date=filter_date)
-
-    else:
-        logs = WorkoutLog.objects.filter(user=user, date__year=year, date__month=month)
-
-        sessions = WorkoutSession.objects.filter(user=user, date__year=year, date__month=month)
-
-    logs = logs.order_by('date', 'id')
-    out = cache.get(cache_mapper.get_workout_log_list(log_hash))
-    # out = OrderedDict()
-
-    if not out:
-        out = OrderedDict()
-
-        # Logs
-        for entry in logs:
-            if not out.get(entry.date):
-                out[entry.date] = {
-                    'date': entry.date,
-                    'workout': entry.workout,
-                    'session': entry.get_workout_session(),
-                    'logs': OrderedDict()
-                }
-
-            if not out[entry.date]['logs'].get(entry.exercise_base):
-                out[entry.date]['logs'][entry.exercise_base] = []
-
-            out[entry.date]['logs'][entry.exercise_base].append(entry)
+    sessions = {
+        session.date: session
+        for session in WorkoutSession.objects.filter(user=user, **date_filter
+                                                     ).select_related('workout')
+    }
+    logs = WorkoutLog.objects.filter(user=user, **date_filter).select_related(
+        'workout',
+        'repetition_unit',
+        'weight_unit',
+    ).order_by('date', 'id')
+
+    translations = {}
+    for base_id, language, name in Exercise.objects.filter(
+        exercise_base__in=logs.values('exercise_base_id')
+    ).values_list('exercise_base_id', 'language__short_name', 'name'):
+        translations.setdefault(base_id, {})[language] = name
+
+    def get_day(date, workout):
+        if date not in out:
+            session = sessions.get(date)
+            out[date] = LogCalendarDay(
+                date=date,
+                workout=LogCalendarWorkout(
+                    id=workout.id,
+                    name=workout.name,
+                    creation_date=workout.creation_date,
+                    is_template=workout.is_template,
+                ),
+                session=LogCalendarSession(
+                    id=session.id,
+                    impression=session.impression,
+                    time_start=session.time_start,
+                    time_end=session.time_end,
+                    notes=session.notes,
+                ) if session else None,
+            )
+        return out[date]
+
+    out = {}
+    exercises = {}
+    for entry in logs:
+        log_day = get_day(entry.date, entry.workout)
+
+        key = (entry.date, entry.exercise_base_id)
+        if key not in exercises:
+            exercises[key] = LogCalendarExercise(
+                id=entry.exercise_base_id,
+                translations=translations.get(entry.exercise_base_id, {}),
+            )
+            log_day.exercises.append(exercises[key])
+
+        exercises[key].sets.append(
+            LogCalendarSet(
+                id=entry.id,
+                reps=entry.reps,
+                repetition_unit_name=entry.repetition_unit.name,
+                is_repetition=entry.repetition_unit.is_repetition,
+                weight=entry.weight,
+                weight_unit_name=entry.weight_unit.name,
+            )
+        )
 
-        # Sessions
-        for entry in sessions:
-            if not out.get(entry.date):
-                out[entry.date] = {
-                    'date': entry.date,
-                    'workout': entry.workout,
-                    'session': entry,
-                    'logs': {}
-                }
+    for date, session in sessions.items():
+        get_day(date, session.workout)
 
-        cache.set(cache_mapper.get_workout_log_list(log_hash), out)
-    return out
+    return dict(sorted(out.items()))
 
 
 def process_log_entries(logs):
@@ -185,7 +336,7 @@ def process_log_entries(logs):
 
     for entry in logs:
         if not entry_list.get(entry.reps):
-            entry_list[entry.reps] = {'list': [], 'seen': []}
+            entry_list[entry.reps] = {'list': [], 'seen': set()}
 
         # Only add if weight is the maximum for the day
         if entry.weight != max_weight[entry.date][entry.reps]:
@@ -193,7 +344,7 @@ def process_log_entries(logs):
         if (entry.date, entry.reps, entry.weight) in entry_list[entry.reps]['seen']:
             continue
 
-        entry_list[entry.reps]['seen'].append((entry.date, entry.reps, entry.weight))
+        entry_list[entry.reps]['seen'].add((entry.date, entry.reps, entry.weight))
         entry_list[entry.reps]['list'].append(
             {
                 'date': entry.date,
@@ -39,8 +39,9 @@ class WeightCsvExportTestCase(WgerTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertEqual(response['Content-Disposition'], 'attachment; filename=Weightdata.csv')
-        self.assertGreaterEqual(len(response.content), 120)
-        self.assertLessEqual(len(response.content), 150)
+        content = b''.join(response.streaming_content)
+        self.assertGreaterEqual(len(content), 120)
+        self.assertLessEqual(len(content), 150)
 
     def test_export_csv_logged_in(self):
         """
@@ -58,8 +58,9 @@ class WeightExportCsvTestCase(WgerTestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'text/csv')
-        self.assertGreaterEqual(len(response.content), 120)
-        self.assertLessEqual(len(response.content), 150)
+        content = b''.join(response.streaming_content)
+        self.assertGreaterEqual(len(content), 120)
+        self.assertLessEqual(len(content), 150)
 
     def test_csv_export_loged_in(self):
         """
@@ -15,17 +15,13 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
-import csv
 import datetime
 import logging
 
 # Django
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import (
-    HttpResponse,
-    HttpResponseRedirect,
-)
+from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.translation import (
@@ -42,12 +38,14 @@ from django.views.generic import (
 from formtools.preview import FormPreview
 
 # wger
+from wger.utils.export import export_response
 from wger.utils.generic_views import (
     WgerDeleteMixin,
     WgerFormMixin,
 )
 from wger.utils.helpers import check_access
 from wger.weight import helpers
+from wger.weight.exports import WeightExport
 from wger.weight.forms import WeightForm
 from wger.weight.models import WeightEntry
 
@@ -131,23 +129,7 @@ def export_csv(request):
     """
     Exports the saved weight data as a CSV file
     """
-
-    # Prepare the response headers
-    response = HttpResponse(content_type='text/csv')
-
-    # Convert all weight data to CSV
-    writer = csv.writer(response)
-
-    weights = WeightEntry.objects.filter(user=request.user)
-    writer.writerow([_('Date'), _('Weight')])
-
-    for entry in weights:
-        writer.writerow([entry.date, entry.weight])
-
-    # Send the data to the browser
-    response['Content-Disposition'] = 'attachment; filename=Weightdata.csv'
-    response['Content-Length'] = len(response.content)
-    return response
+    return export_response(request, WeightExport(request.user))
 
 
 @login_required